@@ -0,0 +1,243 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the compile time of the relay pipeline.
+
+Every stage of the compilation (model import, each relay pass, TE lowering,
+LLVM codegen and export_library) is timed separately, and the peak resident
+memory of the process is recorded after each stage. Results are written as
+JSON so that runs on different commits can be compared with --compare.
+see README.md for the usage of this script.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import tvm
+from tvm import relay
+from tvm.contrib.utils import tempdir
+
+from util import get_network, print_progress
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return peak / (1024.0 * 1024.0)
+    return peak / 1024.0
+
+
+class StageTimer(object):
+    """Collect the wall time and peak memory of compilation stages of a network."""
+
+    def __init__(self, network):
+        self.network = network
+        self.records = []
+
+    def measure(self, stage, func, *args, **kwargs):
+        """Run func, record the stage and return the result of func."""
+        print_progress("%-20s %-40s" % (self.network, stage))
+        start = time.perf_counter()
+        ret = func(*args, **kwargs)
+        self.records.append(
+            {
+                "network": self.network,
+                "stage": stage,
+                "seconds": time.perf_counter() - start,
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        )
+        return ret
+
+
+def optimize_passes():
+    """The relay passes of relay.build at opt_level=3, in order.
+
+    The list is a copy of the pipeline of RelayBuildModule::Optimize in
+    src/relay/backend/build_module.cc, which is not exposed to python. It has
+    to be updated by hand when that pipeline changes.
+    """
+    transform = relay.transform
+    return [
+        transform.InferType(),
+        relay.qnn.transform.Legalize(),
+        transform.Legalize(),
+        transform.DynamicToStatic(),
+        transform.SimplifyInference(),
+        transform.EliminateCommonSubexpr(),
+        transform.SimplifyExpr(),
+        transform.CombineParallelConv2D(3),
+        transform.CombineParallelDense(3),
+        transform.CombineParallelBatchMatmul(3),
+        transform.FoldConstant(),
+        transform.FoldScaleAxis(),
+        transform.CanonicalizeCast(),
+        transform.CanonicalizeOps(),
+        transform.InferType(),
+        transform.AlterOpLayout(),
+        transform.FoldConstant(),
+        transform.FuseOps(),
+    ]
+
+
+def import_network(timer, network, batch_size):
+    """Import the network, from a model file when one is given."""
+    if network.endswith(".onnx"):
+        import onnx  # pylint: disable=import-outside-toplevel
+
+        model = timer.measure("frontend:load_onnx", onnx.load, network)
+        mod, params = timer.measure("frontend:from_onnx", relay.frontend.from_onnx, model)
+        return mod, params
+    mod, params, _, _ = timer.measure("frontend:testing", get_network, network, batch_size)
+    return mod, params
+
+
+def benchmark_network(network, target, batch_size, export):
+    """Time all compilation stages of one network."""
+    timer = StageTimer(os.path.basename(network))
+    mod, params = import_network(timer, network, batch_size)
+    if params:
+        mod["main"] = relay.build_module.bind_params_by_name(mod["main"], params)
+
+    with tvm.transform.PassContext(opt_level=3):
+        optimized = mod
+        with target:
+            for pass_ in optimize_passes():
+                optimized = timer.measure("relay:" + pass_.info.name, pass_, optimized)
+
+        # Lower every fused function to TIR and generate code for them together.
+        engine = relay.backend.compile_engine.get()
+        engine.clear()
+        funcs = relay.analysis.extract_fused_functions(optimized)
+        lowered = tvm.IRModule({})
+
+        def _lower_all():
+            for func in funcs.values():
+                lowered.update(engine.lower(func, target).funcs)
+
+        timer.measure("te:lower", _lower_all)
+        timer.measure("codegen:" + target.kind.name, tvm.build, lowered, target=target)
+        engine.clear()
+
+        # relay.build runs the whole pipeline again on the module as imported
+        lib = timer.measure("relay.build", relay.build, mod, target=target, params=params)
+
+    if export:
+        temp = tempdir()
+        timer.measure("export_library", lib.export_library, temp.relpath("deploy_lib.so"))
+    return timer.records
+
+
+def git_revision():
+    """The git revision of the tvm source tree, if known."""
+    try:
+        out = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        )
+        return out.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base_file, new_file, threshold):
+    """Compare two result files, return the number of regressed stages."""
+    with open(base_file) as f:
+        base = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+    base_records = {(r["network"], r["stage"]): r for r in base["results"]}
+
+    print("%-20s %-40s %10s %10s %8s" % ("Network", "Stage", "Base(s)", "New(s)", "Ratio"))
+    num_regressions = 0
+    for record in new["results"]:
+        key = (record["network"], record["stage"])
+        if key not in base_records:
+            continue
+        old_time = base_records[key]["seconds"]
+        ratio = record["seconds"] / old_time if old_time > 0 else float("inf")
+        mark = ""
+        if ratio > 1.0 + threshold and record["seconds"] - old_time > 0.01:
+            mark = " <- regression"
+            num_regressions += 1
+        print(
+            "%-20s %-40s %10.4f %10.4f %8.2f%s"
+            % (key[0], key[1], old_time, record["seconds"], ratio, mark)
+        )
+    return num_regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        nargs="+",
+        default=["resnet-18", "mobilenet", "inception_v3", "lstm", "dcgan"],
+        help="Names of relay.testing networks or paths to .onnx model files",
+    )
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--no-export", action="store_true", help="Skip export_library")
+    parser.add_argument("--output", type=str, default="compile_time.json")
+    parser.add_argument(
+        "--compare",
+        type=str,
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="Compare two result files instead of running the benchmark",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression by --compare",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(args.compare[0], args.compare[1], args.threshold) else 0)
+
+    target = tvm.target.Target(args.target)
+    results = []
+    for name in args.network:
+        results.extend(benchmark_network(name, target, args.batch_size, not args.no_export))
+
+    print("%-20s %-40s %10s %12s" % ("Network", "Stage", "Time(s)", "PeakRSS(MB)"))
+    for record in results:
+        print(
+            "%-20s %-40s %10.4f %12.1f"
+            % (record["network"], record["stage"], record["seconds"], record["peak_rss_mb"])
+        )
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "git_revision": git_revision(),
+                "tvm_version": tvm.__version__,
+                "target": str(target),
+                "batch_size": args.batch_size,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
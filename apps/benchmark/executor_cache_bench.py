@@ -0,0 +1,86 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the executor cache of relay.create_executor.
+
+The first measurement evaluates structurally identical functions, created
+anew each time as tests do, with every kind of executor, with the cache
+disabled and enabled. The second one runs test files with pytest in fresh
+interpreters, with the cache disabled, as it is by default, and enabled with
+TVM_EXECUTOR_CACHE_SIZE, and reports the wall time of each test suite.
+see README.md for the usage of this script.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.relay.backend.executor_cache import executor_cache
+
+
+def make_func():
+    x = relay.var("x", shape=(16, 16))
+    w = relay.var("w", shape=(16, 16))
+    return relay.Function([x, w], relay.nn.relu(relay.nn.dense(x, w) + x))
+
+
+def evaluate_many(kind, count, capacity):
+    """Evaluate count new functions, return the mean time per evaluation in ms."""
+    executor_cache.clear()
+    executor_cache.capacity = capacity
+    data = np.random.uniform(size=(16, 16)).astype("float32")
+    start = time.perf_counter()
+    for _ in range(count):
+        mod = tvm.IRModule.from_expr(make_func())
+        relay.create_executor(kind, mod=mod).evaluate()(data, data)
+    return (time.perf_counter() - start) * 1e3 / count
+
+
+def run_tests(paths, cache_size):
+    """Run the tests in a fresh interpreter, return the wall time in seconds."""
+    env = dict(os.environ)
+    if cache_size is not None:
+        env["TVM_EXECUTOR_CACHE_SIZE"] = str(cache_size)
+    start = time.perf_counter()
+    subprocess.call([sys.executable, "-m", "pytest", "-q", "-x"] + paths, env=env)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", type=str, nargs="+", default=["debug", "graph", "vm"])
+    parser.add_argument("--count", type=int, default=20, help="Evaluations per kind and mode")
+    parser.add_argument("--tests", type=str, nargs="*", default=[], help="Test files to time")
+    parser.add_argument("--cache-size", type=int, default=256, help="Entries of the cache")
+    args = parser.parse_args()
+
+    for kind in args.kind:
+        uncached = evaluate_many(kind, args.count, 0)
+        cached = evaluate_many(kind, args.count, args.cache_size)
+        print(
+            "%-6s uncached %8.2f ms  cached %8.2f ms  speedup %6.1fx"
+            % (kind, uncached, cached, uncached / cached)
+        )
+
+    if args.tests:
+        uncached = run_tests(args.tests, 0)
+        cached = run_tests(args.tests, args.cache_size)
+        print("tests  uncached %8.1f s   cached %8.1f s" % (uncached, cached))
@@ -0,0 +1,123 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the memory used by the frontends to import the weights.
+
+A large multi layer perceptron is saved as TorchScript and as ONNX, with its
+weights inline and in an external data file. Every measurement loads one of the
+files and imports it with the Relay frontend in a fresh interpreter, and records
+the peak resident memory after loading the model and after the import. The
+growth of the peak is reported relative to the size of the weights: an import
+sharing the memory of the weights adds little, an import copying them adds one.
+see README.md for the usage of this script.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# Run in the measured interpreter, prints the peak RSS after the load and after the import.
+MEASURE_SCRIPT = """
+import json, os, resource, sys
+import tvm
+from tvm import relay
+
+def peak_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+kind, path, hidden = {kind!r}, {path!r}, {hidden}
+if kind == "pytorch":
+    import torch
+    model = torch.jit.load(path)
+    loaded = peak_mb()
+    mod, params = relay.frontend.from_pytorch(model, [("input", (1, hidden))])
+else:
+    import onnx
+    model = onnx.load(path, load_external_data=kind == "onnx")
+    loaded = peak_mb()
+    mod, params = relay.frontend.from_onnx(
+        model, {{"input": (1, hidden)}}, external_data_dir=os.path.dirname(path)
+    )
+print(json.dumps({{"loaded_mb": loaded, "imported_mb": peak_mb()}}))
+"""
+
+
+def save_models(directory, layers, hidden):
+    """Save the model in every format, return the path of each and the weight size."""
+    import torch
+    import onnx
+
+    model = torch.nn.Sequential(
+        *[torch.nn.Linear(hidden, hidden, bias=True) for _ in range(layers)]
+    ).eval()
+    data = torch.randn(1, hidden)
+    traced = torch.jit.trace(model, data)
+    paths = {"pytorch": os.path.join(directory, "model.pt")}
+    traced.save(paths["pytorch"])
+
+    paths["onnx"] = os.path.join(directory, "model.onnx")
+    torch.onnx.export(model, data, paths["onnx"], input_names=["input"])
+    paths["onnx-external"] = os.path.join(directory, "model_external.onnx")
+    onnx.save_model(
+        onnx.load(paths["onnx"]),
+        paths["onnx-external"],
+        save_as_external_data=True,
+        location="model_external.bin",
+    )
+    weight_mb = sum(p.numel() * p.element_size() for p in model.parameters()) / (1024.0 * 1024.0)
+    return paths, weight_mb
+
+
+def measure(kind, path, hidden):
+    """Import the model in a fresh interpreter and return its measurements."""
+    script = MEASURE_SCRIPT.format(kind=kind, path=path, hidden=hidden)
+    out = subprocess.check_output([sys.executable, "-c", script])
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layers", type=int, default=16)
+    parser.add_argument("--hidden", type=int, default=2048)
+    parser.add_argument(
+        "--frontend",
+        type=str,
+        nargs="+",
+        default=["pytorch", "onnx", "onnx-external"],
+        choices=["pytorch", "onnx", "onnx-external"],
+    )
+    parser.add_argument("--output", type=str, help="The file to write the JSON results to")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        model_paths, weights = save_models(tmp, args.layers, args.hidden)
+        print("weights: %.1f MB" % weights)
+        for frontend in args.frontend:
+            record = measure(frontend, model_paths[frontend], args.hidden)
+            record["frontend"] = frontend
+            record["growth"] = (record["imported_mb"] - record["loaded_mb"]) / weights
+            results.append(record)
+            print(
+                "%-14s loaded %10.1f MB  imported %10.1f MB  growth %5.2fx weights"
+                % (frontend, record["loaded_mb"], record["imported_mb"], record["growth"])
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the start up time and memory of the TVM python package.
+
+Every measurement imports a module in a fresh interpreter, once with the eager
+imports and once with TVM_LAZY_IMPORT=1, and records the import time and the
+peak resident memory of the interpreter. The script exits with 1 when a lazy
+import exceeds the given time or memory budget, so it can guard against
+regressions of the start up cost.
+see README.md for the usage of this script.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Run in the measured interpreter, prints the import time and the peak RSS.
+MEASURE_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+peak_mb = peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+print(json.dumps({{"seconds": seconds, "peak_rss_mb": peak_mb, "modules": len(sys.modules)}}))
+"""
+
+
+def measure(module, lazy):
+    """Import module in a fresh interpreter and return its measurements."""
+    env = dict(os.environ)
+    env["TVM_LAZY_IMPORT"] = "1" if lazy else "0"
+    out = subprocess.check_output(
+        [sys.executable, "-c", MEASURE_SCRIPT.format(module=module)], env=env
+    )
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+def benchmark(modules, repeat):
+    """Measure each module repeat times in both modes, keeping the fastest run."""
+    records = []
+    for module in modules:
+        for lazy in [False, True]:
+            runs = [measure(module, lazy) for _ in range(repeat)]
+            best = min(runs, key=lambda run: run["seconds"])
+            best["module"] = module
+            best["mode"] = "lazy" if lazy else "eager"
+            records.append(best)
+            print(
+                "%-12s %-6s %10.1f ms %10.1f MB %6d modules"
+                % (
+                    module,
+                    best["mode"],
+                    best["seconds"] * 1e3,
+                    best["peak_rss_mb"],
+                    best["modules"],
+                )
+            )
+    return records
+
+
+def check_budget(records, max_ms, max_rss_mb):
+    """Return the lazy imports that exceed the time or memory budget."""
+    failures = []
+    for record in records:
+        if record["mode"] != "lazy":
+            continue
+        if max_ms is not None and record["seconds"] * 1e3 > max_ms:
+            failures.append("%s takes %.1f ms" % (record["module"], record["seconds"] * 1e3))
+        if max_rss_mb is not None and record["peak_rss_mb"] > max_rss_mb:
+            failures.append("%s uses %.1f MB" % (record["module"], record["peak_rss_mb"]))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--module",
+        type=str,
+        action="append",
+        help="The module to import, can be given several times. Defaults to tvm and tvm.relay",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="The number of imports per mode")
+    parser.add_argument("--max-ms", type=float, help="The import time budget of the lazy mode")
+    parser.add_argument("--max-rss-mb", type=float, help="The memory budget of the lazy mode")
+    parser.add_argument("--output", type=str, help="The file to write the JSON results to")
+    args = parser.parse_args()
+
+    results = benchmark(args.module or ["tvm", "tvm.relay"], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    over_budget = check_budget(results, args.max_ms, args.max_rss_mb)
+    for failure in over_budget:
+        print("over budget: %s" % failure)
+    sys.exit(1 if over_budget else 0)
@@ -0,0 +1,105 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the automatic mixed precision pass.
+
+The networks are built in float32 and after ToMixedPrecision, and the latency,
+the size of the weights and the difference of the outputs are reported.
+see README.md for the usage of this script.
+"""
+import argparse
+
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.contrib import graph_runtime
+from tvm.relay.build_module import bind_params_by_name
+
+from util import get_network
+
+
+def build(mod, target, mixed_precision_type=None):
+    """Build a module with its weights bound, optionally in mixed precision."""
+    passes = [relay.transform.InferType()]
+    if mixed_precision_type:
+        passes.append(relay.transform.ToMixedPrecision(mixed_precision_type))
+    # store the weights in the mixed precision type
+    passes.append(relay.transform.FoldConstant())
+    mod = tvm.transform.Sequential(passes)(mod)
+    with tvm.transform.PassContext(opt_level=3):
+        return relay.build(mod, target=target)
+
+
+def evaluate(lib, data, repeat):
+    """Run a built module, return its output, mean latency in ms and weight size in MB."""
+    ctx = tvm.cpu()
+    module = graph_runtime.GraphModule(lib["default"](ctx))
+    module.set_input("data", data)
+    module.run()
+    output = module.get_output(0).asnumpy()
+    ftimer = module.module.time_evaluator("run", ctx, number=1, repeat=repeat)
+    latency = np.mean(ftimer().results) * 1e3
+    weights = sum(p.asnumpy().nbytes for p in lib.get_params().values()) / 1024.0 / 1024.0
+    return output, latency, weights
+
+
+def benchmark(network, target, batch_size, dtypes, repeat):
+    """Print the latency and accuracy of a network in float32 and mixed precision."""
+    mod, params, input_shape, _ = get_network(network, batch_size)
+    mod["main"] = bind_params_by_name(mod["main"], params)
+    data = np.random.uniform(-1, 1, size=input_shape).astype("float32")
+    ref, ref_latency, ref_weights = evaluate(build(mod, target), data, repeat)
+    print(
+        "%-20s %-10s %10.2f %10.1f %12s %10s"
+        % (network, "float32", ref_latency, ref_weights, "-", "-")
+    )
+    for dtype in dtypes:
+        out, latency, weights = evaluate(build(mod, target, dtype), data, repeat)
+        top1 = np.mean(np.argmax(out, axis=-1) == np.argmax(ref, axis=-1))
+        print(
+            "%-20s %-10s %10.2f %10.1f %12.2e %10.2f"
+            % (network, dtype, latency, weights, np.max(np.abs(out - ref)), top1)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        nargs="+",
+        default=["resnet-18", "mobilenet", "vgg-16"],
+        help="Names of relay.testing networks",
+    )
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        nargs="+",
+        default=["float16", "bfloat16"],
+        help="Mixed precision types",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        "%-20s %-10s %10s %10s %12s %10s"
+        % ("Network", "Type", "Mean(ms)", "Weights(MB)", "MaxAbsDiff", "Top1Agree")
+    )
+    for name in args.network:
+        benchmark(name, tvm.target.Target(args.target), args.batch_size, args.dtype, args.repeat)
@@ -0,0 +1,124 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for several models run concurrently in one process.
+
+Every model runs in its own thread for a fixed time, first with the default
+thread pools, which all use every core of the host, then with the cores
+partitioned between the models with thread pool groups. The throughput of
+each model and of the process is reported for both.
+see README.md for the usage of this script.
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.contrib import graph_runtime
+from tvm.runtime.thread_pool import partition_cores
+
+from util import get_network
+
+
+def build_models(networks, target, batch_size):
+    """Build the networks, return the name, the library and an input of each."""
+    models = []
+    for name in networks:
+        mod, params, input_shape, _ = get_network(name, batch_size)
+        with tvm.transform.PassContext(opt_level=3):
+            lib = relay.build(mod, target=target, params=params)
+        data = np.random.uniform(size=input_shape).astype("float32")
+        models.append((name, lib, data))
+    return models
+
+
+def run_concurrently(models, groups, duration, warmup):
+    """Run every model in its own thread, return the number of runs of each."""
+    ctx = tvm.cpu()
+    modules = []
+    for i, (_, lib, data) in enumerate(models):
+        module = lib["default"](ctx)
+        if groups:
+            module = groups[i].bind(module)
+        module = graph_runtime.GraphModule(module)
+        module.set_input("data", data)
+        modules.append(module)
+
+    counts = [0] * len(modules)
+    barrier = threading.Barrier(len(modules))
+
+    def _worker(i):
+        module = modules[i]
+        for _ in range(warmup):
+            module.run()
+        barrier.wait()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            module.run()
+            counts[i] += 1
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(len(modules))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def report(title, models, counts, duration):
+    """Print the throughput of each model and of the process."""
+    print("%s:" % title)
+    for (name, _, _), count in zip(models, counts):
+        print("  %-20s %8.1f runs/s" % (name, count / duration))
+    print("  %-20s %8.1f runs/s" % ("total", sum(counts) / duration))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        nargs="+",
+        default=["resnet-18", "mobilenet"],
+        help="Names of relay.testing networks, run concurrently",
+    )
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--cpus",
+        type=int,
+        nargs="+",
+        help="Cores partitioned between the models, defaults to the physical cores",
+    )
+    args = parser.parse_args()
+
+    models = build_models(args.network, tvm.target.Target(args.target), args.batch_size)
+    counts = run_concurrently(models, None, args.duration, args.warmup)
+    report("shared thread pools", models, counts, args.duration)
+
+    groups = partition_cores(len(models), args.cpus)
+    counts = run_concurrently(models, groups, args.duration, args.warmup)
+    report(
+        "partitioned cores %s" % ", ".join(str(list(g.cpus)) for g in groups),
+        models,
+        counts,
+        args.duration,
+    )
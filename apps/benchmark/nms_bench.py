@@ -0,0 +1,123 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the post-processing of detection models on x86.
+
+Non-maximum suppression is timed with the generic schedule and with the x86
+one, top-k against a full argsort. Each kernel is timed with one thread of
+the runtime and with all of them.
+see README.md for the usage of this script.
+"""
+import argparse
+
+import numpy as np
+
+import tvm
+from tvm import te, topi
+
+config_threadpool = tvm.get_global_func("runtime.config_threadpool")
+
+
+def random_boxes(batch, num_anchors, num_classes):
+    """Boxes in the layout of get_valid_counts: class id, score, corners."""
+    data = np.zeros((batch, num_anchors, 6), "float32")
+    data[:, :, 0] = np.random.randint(0, num_classes, size=(batch, num_anchors))
+    data[:, :, 1] = np.random.uniform(size=(batch, num_anchors))
+    corners = np.random.uniform(0, 512, size=(batch, num_anchors, 2))
+    data[:, :, 2:4] = corners
+    data[:, :, 4:6] = corners + np.random.uniform(8, 64, size=(batch, num_anchors, 2))
+    return data
+
+
+def time_func(func, args, num_threads, repeat):
+    """Run func with a number of threads, 0 for all, return the time in ms."""
+    config_threadpool(0, num_threads)
+    timer = func.time_evaluator(func.entry_name, tvm.cpu(0), number=1, repeat=repeat)
+    return np.median(timer(*args).results) * 1e3
+
+
+def bench_nms(target, batch, num_anchors, num_classes, top_k, repeat):
+    """Time the generic and x86 non-maximum suppression."""
+    data = te.placeholder((batch, num_anchors, 6), name="data")
+    valid_count = te.placeholder((batch,), dtype="int32", name="valid_count")
+    indices = te.placeholder((batch, num_anchors), dtype="int32", name="indices")
+    ctx = tvm.cpu(0)
+    args = [
+        tvm.nd.array(random_boxes(batch, num_anchors, num_classes), ctx),
+        tvm.nd.array(np.full((batch,), num_anchors, "int32"), ctx),
+        tvm.nd.array(np.tile(np.arange(num_anchors, dtype="int32"), (batch, 1)), ctx),
+        tvm.nd.empty((batch, num_anchors), "int32", ctx),
+        tvm.nd.empty((batch, 1), "int32", ctx),
+    ]
+    for name, fcompute in [
+        ("nms.generic", topi.vision.non_max_suppression),
+        ("nms.x86", topi.x86.non_max_suppression),
+    ]:
+        with tvm.target.Target(target):
+            out = fcompute(data, valid_count, indices, -1, 0.5, False, top_k)
+            s = topi.generic.schedule_nms(out)
+        func = tvm.build(s, [data, valid_count, indices, out[0], out[1]], target)
+        print(
+            "%-12s batch %3d anchors %6d  1 thread %9.3f ms  all threads %9.3f ms"
+            % (
+                name,
+                batch,
+                num_anchors,
+                time_func(func, args, 1, repeat),
+                time_func(func, args, 0, repeat),
+            )
+        )
+
+
+def bench_topk(target, batch, num_anchors, k, repeat):
+    """Time top-k, which sorts partially, against a full argsort."""
+    scores = te.placeholder((batch, num_anchors), name="scores")
+    ctx = tvm.cpu(0)
+    scores_nd = tvm.nd.array(np.random.uniform(size=(batch, num_anchors)).astype("float32"), ctx)
+    for name, out, shape in [
+        ("argsort", topi.argsort(scores, axis=1, is_ascend=False), (batch, num_anchors)),
+        ("topk", topi.topk(scores, k, axis=1, ret_type="indices"), (batch, k)),
+    ]:
+        out = out[0] if isinstance(out, list) else out
+        with tvm.target.Target(target):
+            s = topi.generic.schedule_topk(out)
+        func = tvm.build(s, [scores, out], target)
+        args = [scores_nd, tvm.nd.empty(shape, out.dtype, ctx)]
+        print(
+            "%-12s batch %3d anchors %6d  1 thread %9.3f ms  all threads %9.3f ms"
+            % (
+                name,
+                batch,
+                num_anchors,
+                time_func(func, args, 1, repeat),
+                time_func(func, args, 0, repeat),
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--anchors", type=int, default=8000)
+    parser.add_argument("--classes", type=int, default=80)
+    parser.add_argument("--top-k", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for num_batch in args.batch:
+        bench_nms(args.target, num_batch, args.anchors, args.classes, args.top_k, args.repeat)
+        bench_topk(args.target, num_batch, args.anchors, args.top_k, args.repeat)
@@ -0,0 +1,105 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the serialization of IR objects.
+
+The IRModules of the networks (with their weights bound as constants) and the
+compute DAGs of their auto_scheduler tasks are saved and loaded with the json
+format, which pickle uses, and with the binary format, and the time and size of
+both are reported.
+see README.md for the usage of this script.
+"""
+import argparse
+import pickle
+import time
+
+import tvm
+from tvm import relay, auto_scheduler
+from tvm.relay.build_module import bind_params_by_name
+
+from util import get_network
+
+
+def measure(func, *args, repeat=5):
+    """Best time of func over repeat runs, and its last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ret = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, ret
+
+
+def compare_formats(name, obj, repeat):
+    """Time saving and loading obj with both formats and print the results."""
+    save_json, json_str = measure(tvm.ir.save_json, obj, repeat=repeat)
+    load_json, _ = measure(tvm.ir.load_json, json_str, repeat=repeat)
+    save_binary, blob = measure(tvm.ir.save_binary, obj, repeat=repeat)
+    load_binary, loaded = measure(tvm.ir.load_binary, blob, repeat=repeat)
+    assert tvm.ir.structural_equal(loaded, obj, map_free_vars=True)
+    print(
+        "%-30s %8.1f %8.1f %10.2f %10.2f %10.2f %10.2f"
+        % (
+            name,
+            len(json_str) / 1024.0,
+            len(blob) / 1024.0,
+            save_json * 1e3,
+            load_json * 1e3,
+            save_binary * 1e3,
+            load_binary * 1e3,
+        )
+    )
+
+
+def benchmark(network, target, batch_size, repeat):
+    """Benchmark the module of a network and the compute DAGs of its tasks."""
+    mod, params, _, _ = get_network(network, batch_size)
+    mod["main"] = bind_params_by_name(mod["main"], params)
+    mod = relay.transform.InferType()(mod)
+    compare_formats(network, mod, repeat)
+
+    tasks, _ = auto_scheduler.extract_tasks(mod, {}, target)
+    start = time.perf_counter()
+    for task in tasks:
+        pickle.loads(pickle.dumps(task.compute_dag))
+    print(
+        "%-30s %d compute DAGs pickled in %.2f ms"
+        % (network, len(tasks), (time.perf_counter() - start) * 1e3)
+    )
+    for i, task in enumerate(tasks[:3]):
+        compare_formats("%s task %d" % (network, i), task.compute_dag.tensors, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        nargs="+",
+        default=["resnet-18", "mobilenet", "inception_v3"],
+        help="Names of relay.testing networks",
+    )
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        "%-30s %8s %8s %10s %10s %10s %10s"
+        % ("Object", "JSON(KB)", "Bin(KB)", "SaveJSON", "LoadJSON", "SaveBin", "LoadBin")
+    )
+    for name in args.network:
+        benchmark(name, tvm.target.Target(args.target), args.batch_size, args.repeat)
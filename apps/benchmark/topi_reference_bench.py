@@ -0,0 +1,266 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, too-many-locals, too-many-arguments
+"""Benchmark script for the reference kernels of topi.testing.
+
+Each reference kernel is timed against the loop implementation it replaced,
+copied below, on a layer of a real network size. The outputs of both are
+compared, and the time of each and the speedup are reported.
+see README.md for the usage of this script.
+"""
+import argparse
+import itertools
+import math
+import timeit
+
+import numpy as np
+import scipy.signal
+
+import tvm.topi.testing
+
+
+def loop_conv2d_nchw(a_np, w_np, stride, padding):
+    """conv2d_nchw_python with a convolve2d per batch, filter and channel."""
+    batch, in_channel, in_height, in_width = a_np.shape
+    num_filter, _, kernel_h, kernel_w = w_np.shape
+    pad_h, pad_w = 2 * padding, 2 * padding
+    out_height = (in_height - kernel_h + pad_h) // stride + 1
+    out_width = (in_width - kernel_w + pad_w) // stride + 1
+    b_np = np.zeros((batch, num_filter, out_height, out_width))
+    for n in range(batch):
+        for f in range(num_filter):
+            for c in range(in_channel):
+                apad = np.zeros((in_height + pad_h, in_width + pad_w))
+                apad[padding : padding + in_height, padding : padding + in_width] = a_np[n, c]
+                out = scipy.signal.convolve2d(apad, np.rot90(np.rot90(w_np[f, c])), mode="valid")
+                b_np[n, f] += out[::stride, ::stride]
+    return b_np
+
+
+def loop_conv3d_ncdhw(a_np, w_np, stride, padding):
+    """conv3d_ncdhw_python with a convolve per batch, filter and channel."""
+    batch, in_channel = a_np.shape[:2]
+    num_filter = w_np.shape[0]
+    pad = 2 * padding
+    out_shape = [(i - k + pad) // stride + 1 for i, k in zip(a_np.shape[2:], w_np.shape[2:])]
+    b_np = np.zeros([batch, num_filter] + out_shape)
+    for n in range(batch):
+        for f in range(num_filter):
+            for c in range(in_channel):
+                apad = np.pad(a_np[n, c].astype("float64"), padding)
+                out = scipy.signal.convolve(apad, np.flip(w_np[f, c]), mode="valid")
+                b_np[n, f] += out[::stride, ::stride, ::stride]
+    return b_np
+
+
+def loop_pool3d(np_data, kernel, stride, padding, out_shape, pool_type):
+    """pool3d_ncdhw_python with a reduction per output position."""
+    pad_np = np.pad(np_data, [(0, 0), (0, 0)] + [(padding, padding)] * 3)
+    ret_np = np.zeros(shape=out_shape).astype(np_data.dtype)
+    reduce = np.mean if pool_type == "avg" else np.max
+    for k, i, j in itertools.product(*[range(o) for o in out_shape[2:]]):
+        ret_np[:, :, k, i, j] = reduce(
+            pad_np[
+                :,
+                :,
+                k * stride : k * stride + kernel,
+                i * stride : i * stride + kernel,
+                j * stride : j * stride + kernel,
+            ],
+            axis=(2, 3, 4),
+        )
+    return np.maximum(ret_np, 0.0)
+
+
+def loop_deformable_conv2d_nchw(a_np, offset_np, w_np, stride, padding, dilation):
+    """deformable_conv2d_nchw_python with a bilinear sample per element."""
+    batch, in_channel, in_height, in_width = a_np.shape
+    out_channel, _, kernel_h, kernel_w = w_np.shape
+    out_height, out_width = offset_np.shape[-2:]
+
+    def _bilinear(n, c, h, w):
+        low_h, low_w = int(h), int(w)
+        high_h = min(low_h + 1, in_height - 1)
+        high_w = min(low_w + 1, in_width - 1)
+        y_lerp = h - low_h
+        x_lerp = w - low_w
+        bottom = (1 - x_lerp) * a_np[n, c, low_h, low_w] + x_lerp * a_np[n, c, low_h, high_w]
+        top = (1 - x_lerp) * a_np[n, c, high_h, low_w] + x_lerp * a_np[n, c, high_h, high_w]
+        return (1 - y_lerp) * bottom + y_lerp * top
+
+    a_deform = np.zeros((batch, in_channel, out_height, out_width, kernel_h, kernel_w))
+    for n, h, w in itertools.product(range(batch), range(out_height), range(out_width)):
+        offset = offset_np[n, :, h, w].reshape(kernel_h, kernel_w, 2)
+        for c, kh, kw in itertools.product(range(in_channel), range(kernel_h), range(kernel_w)):
+            y = h * stride - padding + kh * dilation + offset[kh, kw, 0]
+            x = w * stride - padding + kw * dilation + offset[kh, kw, 1]
+            if y < 0 or y >= in_height or x < 0 or x >= in_width:
+                continue
+            a_deform[n, c, h, w, kh, kw] = _bilinear(n, c, y, x)
+
+    b_np = np.zeros((batch, out_channel, out_height, out_width))
+    for n, c, f, h, w in itertools.product(
+        range(batch), range(in_channel), range(out_channel), range(out_height), range(out_width)
+    ):
+        b_np[n, f, h, w] += np.tensordot(a_deform[n, c, h, w], w_np[f, c])
+    return b_np
+
+
+def loop_roi_align_nchw(a_np, rois_np, pooled_size, spatial_scale, sample_ratio):
+    """roi_align_nchw_python with a bilinear sample per element."""
+    _, channel, height, width = a_np.shape
+    b_np = np.zeros((rois_np.shape[0], channel, pooled_size, pooled_size), dtype=a_np.dtype)
+
+    def _bilinear(b, c, y, x):
+        if y < -1 or y > height or x < -1 or x > width:
+            return 0
+        y, x = max(y, 0.0), max(x, 0.0)
+        y_low, x_low = int(y), int(x)
+        y_high, x_high = min(y_low + 1, height - 1), min(x_low + 1, width - 1)
+        ly, lx = y - y_low, x - x_low
+        return (
+            (1 - ly) * (1 - lx) * a_np[b, c, y_low, x_low]
+            + (1 - ly) * lx * a_np[b, c, y_low, x_high]
+            + ly * (1 - lx) * a_np[b, c, y_high, x_low]
+            + ly * lx * a_np[b, c, y_high, x_high]
+        )
+
+    for i, roi in enumerate(rois_np):
+        roi_start_w, roi_start_h, roi_end_w, roi_end_h = roi[1:] * spatial_scale
+        bin_h = max(roi_end_h - roi_start_h, 1.0) / pooled_size
+        bin_w = max(roi_end_w - roi_start_w, 1.0) / pooled_size
+        for c, ph, pw in itertools.product(range(channel), range(pooled_size), range(pooled_size)):
+            total = 0.0
+            for iy, ix in itertools.product(range(sample_ratio), range(sample_ratio)):
+                y = roi_start_h + ph * bin_h + (iy + 0.5) * bin_h / sample_ratio
+                x = roi_start_w + pw * bin_w + (ix + 0.5) * bin_w / sample_ratio
+                total += _bilinear(int(roi[0]), c, y, x)
+            b_np[i, c, ph, pw] = total / sample_ratio ** 2
+    return b_np
+
+
+def loop_bilinear_resize_nchw(image, out_size):
+    """bilinear_resize_python in NCHW with half pixel coordinates, per pixel."""
+    batch, channel, h, w = image.shape
+    new_h, new_w = out_size
+    height_scale = np.float32(h) / np.float32(new_h)
+    width_scale = np.float32(w) / np.float32(new_w)
+    scaled_image = np.ones((batch, channel, new_h, new_w))
+
+    def _lerp(A, B, t):
+        return A * (1.0 - t) + B * t
+
+    for b, i, j, k in itertools.product(range(batch), range(channel), range(new_h), range(new_w)):
+        in_y = (j + 0.5) * height_scale - 0.5
+        y0 = int(math.floor(in_y))
+        y1 = max(min(y0 + 1, h - 1), 0)
+        y0 = max(y0, 0)
+        y_lerp = in_y - math.floor(in_y)
+        in_x = (k + 0.5) * width_scale - 0.5
+        x0 = int(math.floor(in_x))
+        x1 = max(min(x0 + 1, w - 1), 0)
+        x0 = max(x0, 0)
+        x_lerp = in_x - math.floor(in_x)
+        top = _lerp(image[b, i, y0, x0], image[b, i, y0, x1], x_lerp)
+        bottom = _lerp(image[b, i, y1, x0], image[b, i, y1, x1], x_lerp)
+        scaled_image[b, i, j, k] = np.float32(_lerp(top, bottom, y_lerp))
+    return scaled_image
+
+
+def get_cases(scale):
+    """The ops, their inputs, and the loop and reference implementations."""
+    rng = np.random.RandomState(0)
+
+    def rand(*shape):
+        return rng.uniform(-1, 1, size=shape).astype("float32")
+
+    size = 56 // scale
+    data = rand(1, 64 // scale, size, size)
+    offset = rand(1, 2 * 9, size, size)
+    rois = np.array([[0, 2, 2, size - 4, size - 8], [0, 0, 4, size / 2, size - 1]], "float32")
+    volume = rand(1, 16 // scale, 16, 16, 16)
+    pooled = [1, 16 // scale, 8, 8, 8]
+    return [
+        (
+            "conv2d_nchw",
+            (data, rand(64 // scale, 64 // scale, 3, 3), 1, 1),
+            loop_conv2d_nchw,
+            tvm.topi.testing.conv2d_nchw_python,
+        ),
+        (
+            "conv3d_ncdhw",
+            (volume, rand(16 // scale, 16 // scale, 3, 3, 3), 1, 1),
+            loop_conv3d_ncdhw,
+            tvm.topi.testing.conv3d_ncdhw_python,
+        ),
+        (
+            "max_pool3d",
+            (volume, 3, 2, 1, pooled, "max"),
+            loop_pool3d,
+            lambda *args: tvm.topi.testing.pool3d_ncdhw_python(*args[:3], [args[3]] * 6, *args[4:]),
+        ),
+        (
+            "avg_pool3d",
+            (volume, 3, 2, 1, pooled, "avg"),
+            loop_pool3d,
+            lambda *args: tvm.topi.testing.pool3d_ncdhw_python(*args[:3], [args[3]] * 6, *args[4:]),
+        ),
+        (
+            "deformable_conv2d_nchw",
+            (data, offset, rand(64 // scale, 64 // scale, 3, 3), 1, 1, 1),
+            loop_deformable_conv2d_nchw,
+            lambda *args: tvm.topi.testing.deformable_conv2d_nchw_python(*args, 1, 1),
+        ),
+        (
+            "roi_align_nchw",
+            (data, rois, 7, 1.0, 2),
+            loop_roi_align_nchw,
+            tvm.topi.testing.roi_align_nchw_python,
+        ),
+        (
+            "bilinear_resize",
+            (data, (2 * size, 2 * size)),
+            loop_bilinear_resize_nchw,
+            lambda *args: tvm.topi.testing.bilinear_resize_python(*args, "NCHW", "half_pixel"),
+        ),
+    ]
+
+
+def measure(func, args, repeat):
+    """The output of func and its best time in ms."""
+    output = func(*args)
+    seconds = min(timeit.repeat(lambda: func(*args), number=1, repeat=repeat))
+    return output, seconds * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=str, nargs="+", help="The ops to run, all by default")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Divide the channels and sizes of the layers by it"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("%-24s %12s %12s %9s %10s" % ("op", "loop (ms)", "ref (ms)", "speedup", "max diff"))
+    for name, inputs, loop_func, ref_func in get_cases(args.scale):
+        if args.ops and name not in args.ops:
+            continue
+        loop_out, loop_ms = measure(loop_func, inputs, args.repeat)
+        ref_out, ref_ms = measure(ref_func, inputs, args.repeat)
+        diff = np.max(np.abs(loop_out - ref_out))
+        print("%-24s %12.2f %12.2f %8.1fx %10.2e" % (name, loop_ms, ref_ms, loop_ms / ref_ms, diff))
@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the TVM script parser and its parse cache.
+
+The scripts are generated from the functions of test_tvmscript_roundtrip.py:
+a module with copies of a function under different names is printed with
+asscript, so the size of the script grows with the number of copies. Each
+script is parsed with the cache disabled, with a profile of the phases of the
+parser, from the cache on disk and from the cache in memory.
+see README.md for the usage of this script.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import tvm
+from tvm.script import ParseProfile
+from tvm.script.parse_cache import parse_cache
+
+ROUNDTRIP_TESTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "tests", "python", "unittest"
+)
+
+
+def generate_script(func, copies):
+    """Print a module with copies of a function, return the script."""
+    functions = {}
+    for i in range(copies):
+        name = "%s_%d" % (func.attrs["global_symbol"], i)
+        functions[name] = func.with_attr("global_symbol", name)
+    return tvm.script.asscript(tvm.IRModule(functions), True)
+
+
+def parse(script, capacity, directory, profile=None):
+    """Parse the script with a configuration of the cache, return the time in ms."""
+    parse_cache.capacity = capacity
+    parse_cache.directory = directory
+    start = time.perf_counter()
+    tvm.script.from_source(script, profile=profile)
+    return (time.perf_counter() - start) * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--function",
+        type=str,
+        default="opt_conv_tensorcore_lower",
+        help="The function of test_tvmscript_roundtrip.py to copy",
+    )
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--profile", action="store_true", help="Print the phases of the parser")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROUNDTRIP_TESTS)
+    import test_tvmscript_roundtrip  # pylint: disable=import-error
+
+    base_func = getattr(test_tvmscript_roundtrip, args.function)
+    capacity = parse_cache.capacity
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_copies in args.copies:
+            source = generate_script(base_func, num_copies)
+            parse_cache.clear()
+            uncached = parse(source, 0, None)
+            phases = ParseProfile()
+            parse(source, 0, None, phases)
+            parse(source, 0, tmp)  # store the module on disk
+            from_disk = parse(source, 0, tmp)
+            parse(source, capacity, None)  # store the module in memory
+            from_memory = parse(source, capacity, None)
+            print(
+                "%6d lines  parse %10.1f ms  disk cache %8.1f ms  memory cache %8.3f ms"
+                % (source.count("\n"), uncached, from_disk, from_memory)
+            )
+            if args.profile:
+                print(phases)
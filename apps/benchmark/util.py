@@ -27,7 +27,8 @@ def get_network(name, batch_size, dtype="float32"):
     Parameters
     ----------
     name: str
-        The name of the network, can be 'resnet-18', 'resnet-50', 'vgg-16', 'inception_v3', 'mobilenet', ...
+        The name of the network, can be 'resnet-18', 'resnet-50', 'vgg-16', 'inception_v3', 'mobilenet',
+        'lstm', 'dcgan', ...
     batch_size: int
         batch size
     dtype: str
@@ -72,6 +73,16 @@ def get_network(name, batch_size, dtype="float32"):
         net, params = testing.squeezenet.get_workload(
             batch_size=batch_size, version=version, dtype=dtype
         )
+    elif name == "lstm":
+        input_shape = (batch_size, 128)
+        output_shape = (batch_size, 128)
+        net, params = testing.lstm.get_workload(
+            iterations=10, num_hidden=128, batch_size=batch_size, dtype=dtype
+        )
+    elif name == "dcgan":
+        input_shape = (batch_size, 100)
+        output_shape = (batch_size, 3, 64, 64)
+        net, params = testing.dcgan.get_workload(batch_size=batch_size, dtype=dtype)
     elif name == "mxnet":
         # an example for mxnet model
         from mxnet.gluon.model_zoo.vision import get_model
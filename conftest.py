@@ -14,13 +14,71 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+import shutil
+import tempfile
+
+import pytest
 import tvm.testing
 from pytest import ExitCode
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--build-cache",
+        action="store_true",
+        default=False,
+        help="Reuse the modules built by tvm.build for structurally equal kernels, "
+        "the pytest-xdist workers share them through TVM_TEST_BUILD_CACHE_DIR",
+    )
+    parser.addoption(
+        "--shard",
+        default=os.environ.get("TVM_TEST_SHARD", None),
+        help="Run the tests of a shard i/n, to split a run across machines",
+    )
+
+
 def pytest_configure(config):
     print("enabled targets:", "; ".join(map(lambda x: x[0], tvm.testing.enabled_targets())))
     print("pytest marker:", config.option.markexpr)
+    # the controller of pytest-xdist creates the directory shared by its workers
+    is_worker = hasattr(config, "workerinput")
+    if (
+        config.getoption("build_cache")
+        and getattr(config.option, "numprocesses", None)
+        and not is_worker
+        and "TVM_TEST_BUILD_CACHE_DIR" not in os.environ
+    ):
+        config.build_cache_dir = tempfile.mkdtemp(prefix="tvm-build-cache-")
+        os.environ["TVM_TEST_BUILD_CACHE_DIR"] = config.build_cache_dir
+
+
+def pytest_unconfigure(config):
+    directory = getattr(config, "build_cache_dir", None)
+    if directory:
+        del os.environ["TVM_TEST_BUILD_CACHE_DIR"]
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    shard = config.getoption("shard")
+    if not shard:
+        return
+    index, count = map(int, shard.split("/"))
+    selected, deselected = tvm.testing.shard_items(items, index, count)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.fixture(scope="session", autouse=True)
+def build_cache(request):
+    """The build cache of the session, None unless enabled with --build-cache."""
+    if not request.config.getoption("build_cache"):
+        yield None
+        return
+    with tvm.testing.build_cache() as cache:
+        yield cache
 
 
 def pytest_sessionfinish(session, exitstatus):
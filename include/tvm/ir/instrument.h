@@ -0,0 +1,128 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file tvm/ir/instrument.h
+ *
+ * This file introduces a pass instrument infrastructure, inspired by LLVM's
+ * pass instrumentation. A PassInstrument is attached to a PassContext and is
+ * notified when the context is entered and exited, and before and after every
+ * module, function and sequential pass that runs under it, as well as when a
+ * pass raises an error.
+ *
+ * Instruments are typically used to profile the passes, e.g. to collect the
+ * wall time, the size of the IR or the memory used by each pass.
+ */
+#ifndef TVM_IR_INSTRUMENT_H_
+#define TVM_IR_INSTRUMENT_H_
+
+#include <tvm/ir/module.h>
+#include <tvm/node/reflection.h>
+#include <tvm/runtime/container.h>
+#include <tvm/runtime/packed_func.h>
+
+#include <string>
+
+namespace tvm {
+
+// Forward declare to avoid a cyclic include with tvm/ir/transform.h.
+namespace transform {
+class PassInfo;
+}  // namespace transform
+
+namespace instrument {
+
+/*!
+ * \brief PassInstrumentNode forwards the instrumentation points of the pass
+ *  infrastructure to a set of callbacks. A callback that is not defined is
+ *  skipped.
+ * \sa PassInstrument
+ */
+class PassInstrumentNode : public Object {
+ public:
+  /*! \brief Name of the instrument. */
+  String name;
+  /*! \brief Invoked when the PassContext is entered, f() -> void. */
+  runtime::PackedFunc f_enter_pass_ctx;
+  /*! \brief Invoked when the PassContext is exited, f() -> void. */
+  runtime::PackedFunc f_exit_pass_ctx;
+  /*! \brief Invoked before a pass runs, f(IRModule, PassInfo) -> void. */
+  runtime::PackedFunc f_run_before_pass;
+  /*! \brief Invoked after a pass runs, f(IRModule, PassInfo) -> void. */
+  runtime::PackedFunc f_run_after_pass;
+  /*! \brief Invoked when a pass raises an error, f(PassInfo, String) -> void. */
+  runtime::PackedFunc f_run_on_exception;
+
+  /*! \brief Notify that the PassContext is entered. */
+  void EnterPassContext() const;
+  /*! \brief Notify that the PassContext is exited. */
+  void ExitPassContext() const;
+  /*!
+   * \brief Notify that a pass is about to run.
+   * \param mod The module the pass is applied on.
+   * \param info The pass information.
+   */
+  void RunBeforePass(const IRModule& mod, const transform::PassInfo& info) const;
+  /*!
+   * \brief Notify that a pass has run.
+   * \param mod The module produced by the pass.
+   * \param info The pass information.
+   */
+  void RunAfterPass(const IRModule& mod, const transform::PassInfo& info) const;
+  /*!
+   * \brief Notify that a pass raised an error. RunAfterPass is not invoked for it.
+   * \param info The pass information.
+   * \param what The error message.
+   */
+  void RunOnException(const transform::PassInfo& info, const std::string& what) const;
+
+  void VisitAttrs(AttrVisitor* v) { v->Visit("name", &name); }
+
+  static constexpr const char* _type_key = "instrument.PassInstrument";
+  TVM_DECLARE_FINAL_OBJECT_INFO(PassInstrumentNode, Object);
+};
+
+/*!
+ * \brief Managed reference class for PassInstrumentNode.
+ * \sa PassInstrumentNode
+ */
+class PassInstrument : public ObjectRef {
+ public:
+  /*!
+   * \brief Constructor.
+   * \param name Name of the instrument.
+   * \param f_enter_pass_ctx Callback invoked when the PassContext is entered.
+   * \param f_exit_pass_ctx Callback invoked when the PassContext is exited.
+   * \param f_run_before_pass Callback invoked before a pass runs.
+   * \param f_run_after_pass Callback invoked after a pass runs.
+   * \param f_run_on_exception Callback invoked when a pass raises an error.
+   */
+  TVM_DLL PassInstrument(String name, runtime::PackedFunc f_enter_pass_ctx,
+                         runtime::PackedFunc f_exit_pass_ctx,
+                         runtime::PackedFunc f_run_before_pass,
+                         runtime::PackedFunc f_run_after_pass,
+                         runtime::PackedFunc f_run_on_exception);
+
+  TVM_DEFINE_OBJECT_REF_METHODS(PassInstrument, ObjectRef, PassInstrumentNode);
+};
+
+}  // namespace instrument
+}  // namespace tvm
+
+#endif  // TVM_IR_INSTRUMENT_H_
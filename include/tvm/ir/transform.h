@@ -58,6 +58,7 @@
 
 #include <tvm/ir/diagnostic.h>
 #include <tvm/ir/error.h>
+#include <tvm/ir/instrument.h>
 #include <tvm/ir/module.h>
 #include <tvm/node/container.h>
 #include <tvm/runtime/container.h>
@@ -98,6 +99,8 @@ class PassContextNode : public Object {
   Map<String, ObjectRef> config;
   /*! \brief Trace function to be invoked before and after each pass. */
   TraceFunc trace_func;
+  /*! \brief The instruments notified before and after each pass. */
+  Array<instrument::PassInstrument> instruments;
 
   PassContextNode() = default;
 
@@ -136,6 +139,7 @@ class PassContextNode : public Object {
     v->Visit("required_pass", &required_pass);
     v->Visit("disabled_pass", &disabled_pass);
     v->Visit("config", &config);
+    v->Visit("instruments", &instruments);
     v->Visit("diag_ctx", &diag_ctx);
   }
 
@@ -197,6 +201,27 @@ class PassContext : public ObjectRef {
    */
   TVM_DLL void Trace(const IRModule& module, const PassInfo& info, bool is_before) const;
 
+  /*!
+   * \brief Notify the instruments of the context that a pass is about to run.
+   * \param module The IRModule the pass is applied on.
+   * \param info The pass information.
+   */
+  TVM_DLL void InstrumentBeforePass(const IRModule& module, const PassInfo& info) const;
+
+  /*!
+   * \brief Notify the instruments of the context that a pass has run.
+   * \param module The IRModule produced by the pass.
+   * \param info The pass information.
+   */
+  TVM_DLL void InstrumentAfterPass(const IRModule& module, const PassInfo& info) const;
+
+  /*!
+   * \brief Notify the instruments of the context that a pass raised an error.
+   * \param info The pass information.
+   * \param what The error message.
+   */
+  TVM_DLL void InstrumentOnException(const PassInfo& info, const std::string& what) const;
+
   /*!
    * \brief Check whether a pass is enabled.
    * \param info The pass information.
@@ -47,5 +47,22 @@ TVM_DLL std::string SaveJSON(const runtime::ObjectRef& node);
  */
 TVM_DLL runtime::ObjectRef LoadJSON(std::string json_str);
 
+/*!
+ * \brief save the node as well as all the node it depends on in a compact binary format.
+ *  It holds the same information as SaveJSON, with the strings interned and the
+ *  tensors stored as raw bytes, and can only be loaded by the same version of TVM.
+ *
+ * \return The binary representation of the node.
+ */
+TVM_DLL std::string SaveBinary(const runtime::ObjectRef& node);
+
+/*!
+ * \brief Load tvm Node object saved by SaveBinary.
+ * \param blob The binary representation to load from.
+ *
+ * \return The loaded object.
+ */
+TVM_DLL runtime::ObjectRef LoadBinary(std::string blob);
+
 }  // namespace tvm
 #endif  // TVM_NODE_SERIALIZATION_H_
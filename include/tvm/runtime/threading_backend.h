@@ -80,6 +80,17 @@ class ThreadGroup {
    */
   int Configure(AffinityMode mode, int nthreads, bool exclude_worker0);
 
+  /*!
+   * \brief configure the CPU id affinity with an explicit list of cores
+   *
+   * \param cpus The cores to use, worker i is bound to cpus[i].
+   * \param exclude_worker0 Whether to use the main thread as a worker.
+   *        If `true`, cpus[0] is left to the main thread, which is not bound.
+   *
+   * \return The number of workers to use.
+   */
+  int Configure(const std::vector<unsigned int>& cpus, bool exclude_worker0);
+
  private:
   Impl* impl_;
 };
@@ -94,6 +105,25 @@ void Yield();
  */
 int MaxConcurrency();
 
+/*!
+ * \brief Whether the calling thread runs a task of a parallel job of the
+ *  runtime thread pool, from which no other parallel job can be launched.
+ */
+bool IsInParallelJob();
+
+/*!
+ * \brief Get the cores the calling thread may run on.
+ * \return The core ids, empty when the platform does not support affinity.
+ */
+std::vector<unsigned int> GetThreadAffinity();
+
+/*!
+ * \brief Restrict the calling thread to a set of cores.
+ * \param cpus The core ids, nothing is done when it is empty or when the
+ *        platform does not support affinity.
+ */
+void SetThreadAffinity(const std::vector<unsigned int>& cpus);
+
 }  // namespace threading
 }  // namespace runtime
 }  // namespace tvm
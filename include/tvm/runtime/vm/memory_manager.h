@@ -31,6 +31,7 @@
 #include <functional>
 #include <memory>
 #include <mutex>
+#include <string>
 #include <unordered_map>
 #include <vector>
 
@@ -67,6 +68,7 @@ struct Buffer {
 enum AllocatorType {
   kNaive = 1,
   kPooled,
+  kSizeClass,
 };
 
 class Allocator {
@@ -97,6 +99,10 @@ class Allocator {
    *  \return The amount of memory currently allocated.
    */
   virtual size_t UsedMemory() const = 0;
+  /*! \brief The statistics of the allocator.
+   *  \return The statistics by name, by default only the used memory in used_bytes.
+   */
+  virtual std::unordered_map<std::string, int64_t> Stats() const;
 
  private:
   AllocatorType type_;
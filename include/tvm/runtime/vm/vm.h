@@ -33,6 +33,7 @@
 #include <tvm/runtime/vm/executable.h>
 #include <tvm/runtime/vm/memory_manager.h>
 
+#include <list>
 #include <memory>
 #include <string>
 #include <unordered_map>
@@ -132,6 +133,33 @@ struct VMFrame {
         caller_return_register(0) {}
 };
 
+/*!
+ * \brief The state memoized for the invocations of a function with the same
+ *  input signature, i.e. the same function, input shapes, dtypes and contexts.
+ */
+struct ShapeCacheEntry {
+  /*! \brief The outputs of the shape functions, keyed by packed index and input values. */
+  std::unordered_map<std::string, std::vector<NDArray>> shape_func_outputs;
+  /*! \brief The storage allocated by each AllocStorage instruction, with its size. */
+  std::unordered_map<const Instruction*, std::vector<std::pair<int64_t, Storage>>> storages;
+};
+
+/*! \brief The counters of the shape cache. */
+struct ShapeCacheStats {
+  /*! \brief The invocations whose input signature was in the cache. */
+  int64_t hits{0};
+  /*! \brief The invocations whose input signature was not in the cache. */
+  int64_t misses{0};
+  /*! \brief The signatures evicted from the cache. */
+  int64_t evictions{0};
+  /*! \brief The shape function calls answered from the cache. */
+  int64_t shape_func_hits{0};
+  /*! \brief The shape function calls that were run. */
+  int64_t shape_func_misses{0};
+  /*! \brief The AllocStorage instructions that reused a cached storage. */
+  int64_t storage_reuses{0};
+};
+
 /*!
  * \brief The virtual machine.
  *
@@ -248,6 +276,45 @@ class VirtualMachine : public runtime::ModuleNode {
   /*! \brief Run VM dispatch loop. */
   void RunLoop();
 
+  /*!
+   * \brief Set the number of input signatures memoized by the shape cache.
+   *
+   *  When the cache is enabled, the results of the shape functions and the storage
+   *  allocated by each invocation are kept per input signature, and are reused by
+   *  the later invocations with the same signature. The least recently used
+   *  signature is evicted when the cache is full.
+   *
+   * \param capacity The number of signatures, 0 disables and clears the cache.
+   */
+  void SetShapeCache(size_t capacity);
+
+  /*!
+   * \brief Find or create the shape cache entry of an invocation.
+   * \param func The invoked function.
+   * \param args The arguments of the invocation.
+   * \return The entry.
+   */
+  ShapeCacheEntry* LookupShapeCache(const VMFunction& func, const std::vector<ObjectRef>& args);
+
+  /*!
+   * \brief Invoke a shape function, or copy its outputs from the current shape cache entry.
+   * \param packed_index The offset of the shape function in all functions.
+   * \param func The shape function.
+   * \param arg_count The number of arguments to the shape function.
+   * \param output_size The number of outputs of the shape function.
+   * \param args Arguments to the shape function.
+   */
+  void InvokeShapeFunc(Index packed_index, const PackedFunc& func, Index arg_count,
+                       Index output_size, const std::vector<ObjectRef>& args);
+
+  /*!
+   * \brief Allocate the storage of an AllocStorage instruction, reusing the storage
+   *  cached for it in the current shape cache entry when none of its tensors is alive.
+   * \param instr The AllocStorage instruction.
+   * \return The storage.
+   */
+  Storage AllocStorage(const Instruction& instr);
+
   /*! \brief Get context from the context list based on a given device type. */
   TVMContext GetContext(Index device_type) const;
 
@@ -284,6 +351,19 @@ class VirtualMachine : public runtime::ModuleNode {
    * object to avoid rellocation of constants during inference.
    */
   std::vector<ObjectRef> const_pool_;
+  /*! \brief Whether each packed function is a shape function. */
+  std::vector<bool> is_shape_func_;
+  /*! \brief The number of signatures memoized by the shape cache, 0 if disabled. */
+  size_t shape_cache_capacity_{0};
+  /*! \brief The shape cache entries by signature, most recently used first. */
+  std::list<std::pair<std::string, ShapeCacheEntry>> shape_cache_;
+  /*! \brief The position of each signature in the shape cache. */
+  std::unordered_map<std::string, std::list<std::pair<std::string, ShapeCacheEntry>>::iterator>
+      shape_cache_index_;
+  /*! \brief The shape cache entry of the running invocation, if any. */
+  ShapeCacheEntry* shape_cache_entry_{nullptr};
+  /*! \brief The counters of the shape cache. */
+  ShapeCacheStats shape_cache_stats_;
 };
 
 }  // namespace vm
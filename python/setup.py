@@ -36,6 +36,8 @@ else:
 CURRENT_DIR = os.path.dirname(__file__)
 FFI_MODE = os.environ.get("TVM_FFI", "auto")
 CONDA_BUILD = os.getenv("CONDA_BUILD") is not None
+# Package the runtime only, linked against libtvm_runtime, see get_package_kwargs.
+RUNTIME_ONLY = bool(os.environ.get("TVM_USE_RUNTIME_LIB", False))
 
 
 def get_lib_path():
@@ -97,7 +99,7 @@ def config_cython():
         extra_compile_args = ["-std=c++14"]
         if os.name == "nt":
             library_dirs = ["tvm", "../build/Release", "../build"]
-            libraries = ["tvm"]
+            libraries = ["tvm_runtime" if RUNTIME_ONLY else "tvm"]
             extra_compile_args = None
             # library is available via conda env.
             if CONDA_BUILD:
@@ -171,44 +173,71 @@ def get_package_data_files():
     return ["relay/std/prelude.rly", "relay/std/core.rly"]
 
 
+def get_package_kwargs():
+    """Get the name, contents and dependencies of the package"""
+    if RUNTIME_ONLY:
+        # Only what is needed to load and run compiled modules, the import path
+        # stays tvm and the compiler packages are not installed.
+        return {
+            "name": "tvm-runtime",
+            "description": "TVM runtime: load and run modules compiled by TVM",
+            "install_requires": ["numpy"],
+            "extras_require": {"rpc": ["tornado"]},
+            "packages": find_packages(
+                include=[
+                    "tvm",
+                    "tvm._ffi",
+                    "tvm._ffi.*",
+                    "tvm.runtime",
+                    "tvm.contrib",
+                    "tvm.contrib.debugger",
+                    "tvm.rpc",
+                ]
+            ),
+        }
+    return {
+        "name": "tvm",
+        "description": "TVM: An End to End Tensor IR/DSL Stack for Deep Learning Systems",
+        "entry_points": {"console_scripts": ["tvmc = tvm.driver.tvmc.main:main"]},
+        "install_requires": [
+            "numpy",
+            "scipy",
+            "decorator",
+            "attrs",
+            "psutil",
+            "synr>=0.2.1",
+        ],
+        "extras_require": {
+            "test": ["pillow<7", "matplotlib"],
+            "extra_feature": [
+                "tornado",
+                "psutil",
+                "xgboost>=1.1.0",
+                "mypy",
+                "orderedset",
+            ],
+            "tvmc": [
+                "tensorflow>=2.1.0",
+                "tflite>=2.1.0",
+                "onnx>=1.7.0",
+                "onnxruntime>=1.0.0",
+                "torch>=1.4.0",
+                "torchvision>=0.5.0",
+            ],
+        },
+        "packages": find_packages(),
+        "package_data": {"tvm": get_package_data_files()},
+    }
+
+
 setup(
-    name="tvm",
     version=__version__,
-    description="TVM: An End to End Tensor IR/DSL Stack for Deep Learning Systems",
     zip_safe=False,
-    entry_points={"console_scripts": ["tvmc = tvm.driver.tvmc.main:main"]},
-    install_requires=[
-        "numpy",
-        "scipy",
-        "decorator",
-        "attrs",
-        "psutil",
-        "synr>=0.2.1",
-    ],
-    extras_require={
-        "test": ["pillow<7", "matplotlib"],
-        "extra_feature": [
-            "tornado",
-            "psutil",
-            "xgboost>=1.1.0",
-            "mypy",
-            "orderedset",
-        ],
-        "tvmc": [
-            "tensorflow>=2.1.0",
-            "tflite>=2.1.0",
-            "onnx>=1.7.0",
-            "onnxruntime>=1.0.0",
-            "torch>=1.4.0",
-            "torchvision>=0.5.0",
-        ],
-    },
-    packages=find_packages(),
     package_dir={"tvm": "tvm"},
-    package_data={"tvm": get_package_data_files()},
     distclass=BinaryDistribution,
     url="https://github.com/apache/tvm",
     ext_modules=config_cython(),
+    **get_package_kwargs(),
     **setup_kwargs,
 )
 
@@ -23,7 +23,7 @@ import traceback
 
 # top-level alias
 # tvm._ffi
-from ._ffi.base import TVMError, __version__
+from ._ffi.base import TVMError, __version__, _RUNTIME_ONLY
 from ._ffi.runtime_ctypes import DataTypeCode, DataType
 from ._ffi import register_object, register_func, register_extension, get_global_func
 
@@ -37,35 +37,63 @@ from .runtime import ndarray as nd
 # tvm.error
 from . import error
 
-# tvm.ir
-from .ir import IRModule
-from .ir import transform
-from .ir import container
-from . import ir
-
-# tvm.tir
-from . import tir
-
-# tvm.target
-from . import target
-
-# tvm.te
-from . import te
-
-# tvm.driver
-from .driver import build, lower
-
-# tvm.parser
-from . import parser
-
-# others
-from . import arith
-
-# support infra
-from . import support
-
-# Contrib initializers
-from .contrib import rocm as _rocm, nvcc as _nvcc, sdaccel as _sdaccel
+from . import _lazy
+
+# The compiler packages, resolved on their first use in lazy import mode.
+_COMPILER_ATTRS = {
+    "tir": (".tir", None),
+    "target": (".target", None),
+    "te": (".te", None),
+    "build": (".driver", "build"),
+    "lower": (".driver", "lower"),
+    "parser": (".parser", None),
+    "arith": (".arith", None),
+    "support": (".support", None),
+}
+
+if _RUNTIME_ONLY:
+    # libtvm_runtime cannot compile, only import the runtime unless more is asked for.
+    _COMPILER_ATTRS.update(
+        {
+            "ir": (".ir", None),
+            "IRModule": (".ir", "IRModule"),
+            "transform": (".ir", "transform"),
+            "instrument": (".ir", "instrument"),
+            "container": (".ir", "container"),
+        }
+    )
+    _lazy.install(__name__, _COMPILER_ATTRS)
+else:
+    # tvm.ir
+    from .ir import IRModule
+    from .ir import transform
+    from .ir import instrument
+    from .ir import container
+    from . import ir
+
+    if _lazy.is_enabled():
+        _lazy.install(__name__, _COMPILER_ATTRS)
+    else:
+        # tvm.tir
+        from . import tir
+
+        # tvm.target
+        from . import target
+
+        # tvm.te
+        from . import te
+
+        # tvm.driver
+        from .driver import build, lower
+
+        # tvm.parser
+        from . import parser
+
+        # others
+        from . import arith
+
+        # support infra
+        from . import support
 
 
 def _should_print_backtrace():
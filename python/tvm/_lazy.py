@@ -0,0 +1,77 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Lazy loading of TVM subpackages.
+
+Setting the environment variable ``TVM_LAZY_IMPORT=1`` makes ``import tvm``
+and ``import tvm.relay`` only load the core of the packages. The other
+subpackages are imported, with their registration side effects, the first
+time they are accessed as an attribute of the package (PEP 562) or imported
+explicitly. This keeps the start up time and memory of processes that only
+load and run compiled modules low. When the runtime only library is loaded
+(``TVM_USE_RUNTIME_LIB=1``), ``tvm.ir`` and the compiler packages are always
+resolved this way.
+"""
+import importlib
+import os
+import sys
+
+
+def is_enabled():
+    """Whether the lazy import mode is enabled.
+
+    Returns
+    -------
+    enabled : bool
+        True if TVM_LAZY_IMPORT is set and the interpreter supports
+        module level __getattr__.
+    """
+    if sys.version_info < (3, 7):
+        return False
+    return os.environ.get("TVM_LAZY_IMPORT", "0").lower() in ("1", "true", "on")
+
+
+def install(module_name, attrs):
+    """Resolve attributes of a package on their first access.
+
+    Parameters
+    ----------
+    module_name : str
+        The name of the package, usually ``__name__``.
+
+    attrs : Dict[str, Tuple[str, Optional[str]]]
+        Map from attribute name to the relative name of the module that
+        defines it and the name of the attribute in that module. The module
+        itself is the attribute when the second element is None.
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in attrs:
+            raise AttributeError("module {!r} has no attribute {!r}".format(module_name, name))
+        submodule, attr = attrs[name]
+        value = importlib.import_module(submodule, module_name)
+        if attr is not None:
+            value = getattr(value, attr)
+        # Cache the value so that the next accesses do not go through __getattr__.
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attrs))
+
+    module.__getattr__ = __getattr__
+    module.__dir__ = __dir__
@@ -22,7 +22,7 @@ import hashlib
 
 import tvm._ffi
 from tvm.runtime import Object
-from tvm.runtime._ffi_node_api import LoadJSON, SaveJSON
+from tvm.runtime._ffi_node_api import LoadBinary, LoadJSON, SaveJSON
 from tvm.te import ComputeOp, PlaceholderOp
 
 from . import _ffi_api
@@ -267,7 +267,9 @@ class ComputeDAG(Object):
     def __setstate__(self, state):
         # Since we always use tensors to recover the ComputeDAG, we do not support
         # (de)serialization of the ComputeDAG constructed by a schedule.
-        self.__init_handle_by_constructor__(_ffi_api.ComputeDAG, LoadJSON(state["tensors"]), None)
+        tensors = state["tensors"]
+        tensors = LoadJSON(tensors) if isinstance(tensors, str) else LoadBinary(tensors)
+        self.__init_handle_by_constructor__(_ffi_api.ComputeDAG, tensors, None)
 
 
 def get_shape_from_rewritten_layout(rewritten_layout, axis_names):
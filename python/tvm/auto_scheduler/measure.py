@@ -38,7 +38,8 @@ import tempfile
 import multiprocessing
 
 import tvm._ffi
-from tvm.runtime import Object, module, ndarray
+from tvm.runtime import Object, module, ndarray, convert
+from tvm.runtime._ffi_node_api import LoadBinary, SaveBinary
 from tvm.driver import build_module
 from tvm.ir import transform
 from tvm.autotvm.measure.measure_methods import set_cuda_target_arch
@@ -129,6 +130,10 @@ class MeasureInput(Object):
         Note that we do not implement __getstate__ as it does not seem to work
         with initialization of the workload registry (maybe because of
         initialization order?).
+
+        The state is stored as the record of its transform steps, which are not
+        reflected. The only IR graph, the tensors of the workload, is stored in
+        the binary format, see :code:`serialize_workload_registry_entry`.
         """
         return [
             _ffi_api.SerializeMeasureInput(self),
@@ -634,7 +639,9 @@ def _timed_func(inp_serialized, build_func, verbose):
         else:
             print(".E", end="", flush=True)  # Build error
 
-    return filename, args, error_no, error_msg, time.time() - tic
+    # The arguments are sent back to the builder, which runs the same version
+    # of TVM, in the binary format.
+    return filename, SaveBinary(convert(args)), error_no, error_msg, time.time() - tic
 
 
 def local_build_worker(args):
@@ -666,6 +673,9 @@ def local_build_worker(args):
         if verbose >= 1:
             print(".E", end="", flush=True)  # Build error
         res = None, [], MeasureErrorNo.COMPILE_HOST, str(res), timeout
+    else:
+        filename, args, error_no, error_msg, cost = res
+        res = filename, list(LoadBinary(args)), error_no, error_msg, cost
 
     return res
 
@@ -35,6 +35,7 @@ import pickle
 import json
 
 import tvm._ffi
+from tvm.runtime._ffi_node_api import LoadBinary, SaveBinary
 from .utils import serialize_args, deserialize_args, get_func_name
 
 logger = logging.getLogger("auto_scheduler")
@@ -213,6 +214,10 @@ def serialize_workload_registry_entry(workload_key):
     name = workload[0]
     value = WORKLOAD_FUNC_REGISTRY[name]
 
+    # The entry is only loaded by the measure processes, which run the same
+    # version of TVM, so the tensors are stored in the binary format.
+    if not callable(value):
+        value = SaveBinary(tvm.runtime.convert(value))
     return name, value
 
 
@@ -230,6 +235,8 @@ def deserialize_workload_registry_entry(data):
 
     name, value = data
     if name not in WORKLOAD_FUNC_REGISTRY:
+        if isinstance(value, (bytes, bytearray)):
+            value = list(LoadBinary(value))
         WORKLOAD_FUNC_REGISTRY[name] = value
 
 
@@ -25,6 +25,7 @@ import numpy as np
 
 from tvm import runtime
 from tvm.ir import container
+from tvm.runtime._ffi_node_api import LoadBinary, SaveBinary
 from tvm.target import Target
 from tvm.te import placeholder, tensor
 from tvm.tir import expr
@@ -35,6 +36,15 @@ from .dispatcher import ApplyConfig, DispatchContext
 from .space import ConfigSpace
 
 
+def _save_target(target):
+    return SaveBinary(target) if isinstance(target, Target) else target
+
+
+def _load_target(target):
+    # targets pickled by previous versions are stored as objects
+    return LoadBinary(target) if isinstance(target, (bytes, bytearray)) else target
+
+
 def _lookup_task(name):
     task = TASK_TABLE.get(name)
     if task is None:
@@ -173,6 +183,8 @@ class Task(object):
         # some unpickable local task functions.
         # So we only pickle the name of the function
         # and restore the function by name when unpickling it.
+        # Tasks are pickled to send them to the measure processes, which run
+        # the same version of TVM, so the targets are stored in the binary format.
         import cloudpickle  # pylint: disable=import-outside-toplevel
 
         return {
@@ -181,8 +193,8 @@ class Task(object):
             "kwargs": self.kwargs,
             "config_space": self.config_space,
             "flop": self.flop,
-            "target": self.target,
-            "target_host": self.target_host,
+            "target": _save_target(self.target),
+            "target_host": _save_target(self.target_host),
             "func": cloudpickle.dumps(self.func),
         }
 
@@ -195,8 +207,8 @@ class Task(object):
         self.config_space = state["config_space"]
         self.func = cloudpickle.loads(state["func"])
         self.flop = state["flop"]
-        self.target = state["target"]
-        self.target_host = state["target_host"]
+        self.target = _load_target(state["target"])
+        self.target_host = _load_target(state["target_host"])
 
     def __repr__(self):
         return "Task(func_name=%s, args=%s, kwargs=%s, workload=%s)" % (
@@ -0,0 +1,542 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Pipeline executor that runs the stages of a relay graph concurrently.
+
+The main function is cut into stages, each stage is built into a graph
+runtime module and runs in its own thread, on its own thread pool group.
+The stages are connected by bounded queues, so that while stage ``i`` runs
+on one input, stage ``i - 1`` already runs on the next one.
+"""
+import queue
+import threading
+import time
+
+import tvm
+from tvm import relay
+from tvm.relay import expr as _expr
+from tvm.relay.build_module import bind_params_by_name
+from tvm.runtime.thread_pool import partition_cores
+from . import graph_runtime
+
+
+def _num_elements(ty):
+    num = 1
+    for dim in ty.shape:
+        num *= int(dim) if isinstance(dim, tvm.tir.IntImm) else 1
+    return num
+
+
+def _flat_types(ty):
+    """The tensor types of a possibly nested tuple type, in graph runtime output order."""
+    if isinstance(ty, relay.TupleType):
+        return [t for field in ty.fields for t in _flat_types(field)]
+    if not isinstance(ty, relay.TensorType):
+        raise ValueError("values of type %s cannot be passed between stages" % ty)
+    return [ty]
+
+
+def estimate_cost(call):
+    """Estimate the cost of a call, in multiply-accumulates for the heavy operators.
+
+    Parameters
+    ----------
+    call : tvm.relay.Call
+        A call of a type checked function.
+
+    Returns
+    -------
+    cost : int
+        The number of output elements, times the reduction size for the
+        convolutions, dense and batch_matmul.
+    """
+    num_outputs = sum(_num_elements(t) for t in _flat_types(call.checked_type))
+    if not isinstance(call.op, tvm.ir.Op):
+        return num_outputs
+    name = call.op.name
+    if name in ("nn.conv2d", "nn.conv3d", "nn.conv2d_transpose", "nn.conv1d"):
+        weight = call.args[1].checked_type
+        # the weight has the output channels first and the reduction axes after
+        return num_outputs * _num_elements(weight) // max(1, int(weight.shape[0]))
+    if name in ("nn.dense", "nn.batch_matmul"):
+        return num_outputs * int(call.args[0].checked_type.shape[-1])
+    return num_outputs
+
+
+def _split_by_cost(costs, num_stages):
+    """Split a sequence of costs into contiguous chunks, minimizing the largest chunk."""
+
+    def _chunks(limit):
+        ends, total = [], 0
+        for i, cost in enumerate(costs):
+            if total and total + cost > limit:
+                ends.append(i)
+                total = 0
+            total += cost
+        return ends
+
+    low, high = max(costs), sum(costs)
+    while low < high:
+        mid = (low + high) // 2
+        if len(_chunks(mid)) < num_stages:
+            high = mid
+        else:
+            low = mid + 1
+    ends = _chunks(low)
+    # use all the stages when the costs allow fewer
+    i = len(costs) - 1
+    while len(ends) < num_stages - 1:
+        while i in ends:
+            i -= 1
+        ends.append(i)
+        ends.sort()
+    return ends
+
+
+class PipelineStage(object):
+    """One stage of a pipeline.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The stage, its main function takes the inputs and returns the outputs.
+
+    input_names : List[str]
+        The names of the inputs, the inputs of the model keep their names.
+
+    output_names : List[str]
+        The names of the outputs, in the output order of the graph runtime.
+    """
+
+    def __init__(self, mod, input_names, output_names):
+        self.mod = mod
+        self.input_names = input_names
+        self.output_names = output_names
+
+
+def partition(mod, num_stages=None, split_points=None, params=None):
+    """Cut the main function of a module into pipeline stages.
+
+    The calls of the main function are ordered topologically and cut into
+    contiguous stages, so that the values only flow from a stage to the later
+    ones. A value used by a later stage is an output of the stage that computes
+    it and an input of the stages that use it, the tuples are passed field by
+    field.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module. Its main function must be a dataflow graph, without let,
+        if or local functions.
+
+    num_stages : Optional[int]
+        The number of stages, the stages are balanced with :py:func:`estimate_cost`.
+
+    split_points : Optional[List[tvm.relay.Expr]]
+        The nodes of the main function that end each stage but the last, instead
+        of num_stages. They must be ordered from the inputs to the outputs.
+
+    params : Optional[Dict[str, NDArray]]
+        Parameters of the main function, bound as constants before the split.
+
+    Returns
+    -------
+    stages : List[PipelineStage]
+        The stages.
+    """
+    if (num_stages is None) == (split_points is None):
+        raise ValueError("exactly one of num_stages and split_points must be given")
+    func = mod["main"]
+    if params:
+        func = bind_params_by_name(func, params)
+    mod = tvm.IRModule(dict(mod.functions), type_definitions=mod.type_definitions)
+    mod["main"] = func
+    mod = relay.transform.InferType()(mod)
+    func = mod["main"]
+
+    nodes = []
+
+    def _visit(node):
+        if isinstance(node, (_expr.Call, _expr.Tuple, _expr.TupleGetItem)):
+            nodes.append(node)
+        elif isinstance(node, (_expr.Let, _expr.If, relay.Function)):
+            raise ValueError("only dataflow graphs can be pipelined, found %s" % type(node))
+
+    relay.analysis.post_order_visit(func.body, _visit)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    if split_points is None:
+        if num_stages < 1 or num_stages > max(1, len(nodes)):
+            raise ValueError("cannot split %d nodes into %d stages" % (len(nodes), num_stages))
+        costs = [estimate_cost(n) if isinstance(n, _expr.Call) else 0 for n in nodes]
+        ends = _split_by_cost(costs, num_stages) if num_stages > 1 else []
+    else:
+        ends = []
+        for point in split_points:
+            if point not in index:
+                raise ValueError("split point %s is not a node of the main function" % point)
+            ends.append(index[point] + 1)
+        if ends != sorted(set(ends)) or (ends and ends[-1] >= len(nodes)):
+            raise ValueError("split points must be ordered and leave nodes to the last stage")
+        num_stages = len(ends) + 1
+    bounds = [0] + ends + [len(nodes)]
+    stage_of = {}
+    for stage, (begin, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        for node in nodes[begin:end]:
+            stage_of[node] = stage
+
+    # The stage that needs each value computed by an earlier stage or given as input.
+    crossing = {}
+
+    def _record(value, stage):
+        if isinstance(value, relay.Var) or (value in stage_of and stage_of[value] < stage):
+            crossing.setdefault(value, set()).add(stage)
+
+    for node in nodes:
+        args = (
+            node.args
+            if isinstance(node, _expr.Call)
+            else node.fields
+            if isinstance(node, _expr.Tuple)
+            else [node.tuple_value]
+        )
+        for arg in args:
+            _record(arg, stage_of[node])
+    _record(func.body, num_stages - 1)
+
+    def _names(value):
+        if isinstance(value, relay.Var):
+            if len(_flat_types(value.checked_type)) != 1:
+                raise ValueError("tuple inputs are not supported: %s" % value.name_hint)
+            return [value.name_hint]
+        num = len(_flat_types(value.checked_type))
+        return ["pipeline_%d_%d" % (index[value], i) for i in range(num)]
+
+    def _flatten(value, ty):
+        if isinstance(ty, relay.TupleType):
+            return [
+                field
+                for i, field_ty in enumerate(ty.fields)
+                for field in _flatten(relay.TupleGetItem(value, i), field_ty)
+            ]
+        return [value]
+
+    def _unflatten(fields, ty):
+        if isinstance(ty, relay.TupleType):
+            return relay.Tuple([_unflatten(fields, field_ty) for field_ty in ty.fields])
+        return next(fields)
+
+    stages = []
+    for stage in range(num_stages):
+        input_names, params_, memo = [], [], {}
+
+        def _lookup(value):
+            if value in memo:
+                return memo[value]
+            if isinstance(value, relay.Constant) or (
+                not isinstance(value, relay.Var) and value not in crossing
+            ):
+                return value
+            names = _names(value)
+            stage_params = [
+                relay.var(name, type_annotation=ty)
+                for name, ty in zip(names, _flat_types(value.checked_type))
+            ]
+            input_names.extend(names)
+            params_.extend(stage_params)
+            memo[value] = _unflatten(iter(stage_params), value.checked_type)
+            return memo[value]
+
+        for node in nodes[bounds[stage] : bounds[stage + 1]]:
+            if isinstance(node, _expr.Call):
+                new = relay.Call(
+                    node.op, [_lookup(a) for a in node.args], node.attrs, node.type_args
+                )
+            elif isinstance(node, _expr.Tuple):
+                new = relay.Tuple([_lookup(f) for f in node.fields])
+            else:
+                new = relay.TupleGetItem(_lookup(node.tuple_value), node.index)
+            memo[node] = new
+
+        if stage == num_stages - 1:
+            body, output_names = _lookup(func.body), None
+        else:
+            outputs = [v for v in nodes[bounds[stage] : bounds[stage + 1]] if v in crossing]
+            fields, output_names = [], []
+            for value in outputs:
+                fields.extend(_flatten(memo[value], value.checked_type))
+                output_names.extend(_names(value))
+            body = fields[0] if len(fields) == 1 else relay.Tuple(fields)
+        stage_mod = tvm.IRModule(dict(mod.functions), type_definitions=mod.type_definitions)
+        stage_mod["main"] = relay.Function(params_, body)
+        stages.append(PipelineStage(stage_mod, input_names, output_names))
+    return stages
+
+
+def build(mod, target, num_stages=None, split_points=None, params=None, target_host=None):
+    """Cut a module into stages and build each of them.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module, see :py:func:`partition`.
+
+    target : str or tvm.target.Target
+        The target of the stages.
+
+    num_stages : Optional[int]
+        The number of stages balanced by cost.
+
+    split_points : Optional[List[tvm.relay.Expr]]
+        The nodes that end each stage but the last, instead of num_stages.
+
+    params : Optional[Dict[str, NDArray]]
+        Parameters of the main function.
+
+    target_host : Optional[str or tvm.target.Target]
+        The host target.
+
+    Returns
+    -------
+    stages : List[Tuple[PipelineStage, tvm.runtime.Module]]
+        Each stage with its graph runtime factory module.
+    """
+    built = []
+    for stage in partition(mod, num_stages, split_points, params):
+        lib = relay.build(stage.mod, target=target, target_host=target_host)
+        built.append((stage, lib))
+    return built
+
+
+class _Error(object):
+    """Forwarded through the queues in place of the values when a stage fails."""
+
+    def __init__(self, seq, error):
+        self.seq = seq
+        self.error = error
+
+
+class PipelineModule(object):
+    """Run built pipeline stages concurrently on a stream of inputs.
+
+    Every stage runs in its own thread, bound to a thread pool group, and
+    hands its outputs to the next stage through a bounded queue.
+
+    Parameters
+    ----------
+    stages : List[Tuple[PipelineStage, tvm.runtime.Module]]
+        The stages returned by :py:func:`build`.
+
+    ctx : Optional[TVMContext]
+        The context to run the stages on, the CPU by default.
+
+    groups : Optional[List[tvm.runtime.ThreadPoolGroup]]
+        The thread pool group of each stage, by default the cores are split
+        evenly between the stages. An entry can be None to use the thread
+        local pool of the stage thread.
+
+    queue_size : int
+        The number of inputs that can wait in front of each stage.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        stages = pipeline_executor.build(mod, "llvm", num_stages=2, params=params)
+        with pipeline_executor.PipelineModule(stages) as pipeline:
+            outputs = pipeline.run([{"data": batch} for batch in batches])
+            print(pipeline.stage_stats())
+    """
+
+    def __init__(self, stages, ctx=None, groups=None, queue_size=2):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.ctx = ctx if ctx is not None else tvm.cpu()
+        if groups is None:
+            groups = partition_cores(min(len(stages), tvm.runtime._ffi_api.MaxConcurrency()))
+            groups = [groups[i * len(groups) // len(stages)] for i in range(len(stages))]
+        if len(groups) != len(stages):
+            raise ValueError("expected %d thread pool groups, got %d" % (len(stages), len(groups)))
+
+        self._stages = [stage for stage, _ in stages]
+        self._modules = []
+        for (_, lib), group in zip(stages, groups):
+            module = lib["default"](self.ctx)
+            if group is not None:
+                module = group.bind(module)
+            self._modules.append(graph_runtime.GraphModule(module))
+
+        # the values each stage is the last to read, dropped after it ran
+        last_use = {}
+        for i, stage in enumerate(self._stages):
+            for name in stage.input_names:
+                last_use[name] = i
+        self._release = [
+            [name for name, i in last_use.items() if i == stage] for stage in range(len(stages))
+        ]
+
+        self._queues = [queue.Queue(queue_size) for _ in range(len(stages) + 1)]
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._busy = [0.0] * len(stages)
+        self._runs = [0] * len(stages)
+        self._start = None
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(i,), daemon=True)
+            for i in range(len(stages))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _run_stage(self, i):
+        stage, module = self._stages[i], self._modules[i]
+        inputs, outputs = self._queues[i], self._queues[i + 1]
+        while True:
+            item = inputs.get()
+            if item is None or isinstance(item, _Error):
+                outputs.put(item)
+                if item is None:
+                    return
+                continue
+            seq, values = item
+            try:
+                tic = time.perf_counter()
+                module.set_input(**{name: values[name] for name in stage.input_names})
+                module.run()
+                # the outputs are overwritten by the next run, copy them out
+                results = [
+                    module.get_output(k).copyto(self.ctx) for k in range(module.get_num_outputs())
+                ]
+                self._busy[i] += time.perf_counter() - tic
+                self._runs[i] += 1
+            except Exception as err:  # pylint: disable=broad-except
+                outputs.put(_Error(seq, err))
+                continue
+            for name in self._release[i]:
+                values.pop(name, None)
+            if stage.output_names is None:
+                outputs.put((seq, results))
+            else:
+                values.update(zip(stage.output_names, results))
+                outputs.put((seq, values))
+
+    def submit(self, inputs):
+        """Feed an input to the pipeline, blocks while the first stage is full.
+
+        Parameters
+        ----------
+        inputs : Dict[str, Union[NDArray, numpy.ndarray]]
+            The inputs of the model by name.
+
+        Returns
+        -------
+        seq : int
+            The sequence number of the input, the outputs come out in order.
+        """
+        with self._lock:
+            seq = self._seq
+            self._seq += 1
+            if self._start is None:
+                self._start = time.perf_counter()
+        values = {
+            name: value if isinstance(value, tvm.nd.NDArray) else tvm.nd.array(value, self.ctx)
+            for name, value in inputs.items()
+        }
+        self._queues[0].put((seq, values))
+        return seq
+
+    def get(self):
+        """Get the outputs of the oldest input still in the pipeline.
+
+        Returns
+        -------
+        outputs : List[NDArray]
+            The outputs of the model, with the tuples flattened.
+        """
+        item = self._queues[-1].get()
+        if item is None:
+            raise RuntimeError("the pipeline is closed")
+        if isinstance(item, _Error):
+            raise RuntimeError("pipeline input %d failed: %s" % (item.seq, item.error))
+        return item[1]
+
+    def run(self, inputs):
+        """Run a sequence of inputs through the pipeline.
+
+        Parameters
+        ----------
+        inputs : Iterable[Dict[str, Union[NDArray, numpy.ndarray]]]
+            The inputs.
+
+        Returns
+        -------
+        outputs : List[List[NDArray]]
+            The outputs of each input, in order.
+        """
+        inputs = list(inputs)
+        feeder = threading.Thread(target=lambda: [self.submit(x) for x in inputs], daemon=True)
+        feeder.start()
+        # read every output, so that the feeder is not blocked by a failed input
+        outputs, error = [], None
+        for _ in inputs:
+            try:
+                outputs.append(self.get())
+            except RuntimeError as err:
+                error = error or err
+        feeder.join()
+        if error is not None:
+            raise error
+        return outputs
+
+    def stage_stats(self):
+        """Report how busy each stage was since the first input.
+
+        Returns
+        -------
+        stats : List[Dict[str, float]]
+            For each stage, the number of runs, the time spent running in
+            seconds, the mean time of a run in milliseconds and the utilization,
+            the fraction of the time since the first input the stage was busy.
+            The stage with the highest utilization bounds the throughput.
+        """
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        return [
+            {
+                "runs": self._runs[i],
+                "busy_s": self._busy[i],
+                "mean_ms": self._busy[i] * 1e3 / self._runs[i] if self._runs[i] else 0.0,
+                "utilization": self._busy[i] / elapsed if elapsed > 0 else 0.0,
+            }
+            for i in range(len(self._stages))
+        ]
+
+    def close(self):
+        """Stop the stage threads once the pending inputs went through."""
+        if self._threads:
+            self._queues[0].put(None)
+            # drain the outputs nobody read so that the stages can exit
+            while self._queues[-1].get() is not None:
+                pass
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
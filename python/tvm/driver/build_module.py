@@ -19,6 +19,7 @@
 """The build utils in python.
 """
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import tvm.tir
 
@@ -298,6 +299,52 @@ def _build_for_device(input_mod, target, target_host):
     return mod_host, rt_mod_dev
 
 
+def _build_host_module(mod_host, target_host):
+    """Generate code for the host functions.
+
+    When ``tir.host_module_num_partitions`` is greater than one and the host
+    is an llvm target, the functions are split into that many modules by name,
+    generated on a thread pool and imported into the first one, so that
+    export_library writes one object file per partition.
+
+    Parameters
+    ----------
+    mod_host : IRModule
+        The host functions.
+
+    target_host : Union[str, Target]
+        The host target.
+
+    Returns
+    -------
+    rt_mod_host : runtime.Module
+        The host runtime module.
+    """
+    pass_ctx = PassContext.current()
+    num_partitions = int(pass_ctx.config.get("tir.host_module_num_partitions", 1))
+    # Instruments expect to be notified from a single thread.
+    if num_partitions <= 1 or pass_ctx.instruments or Target(target_host).kind.name != "llvm":
+        return codegen.build_module(mod_host, target_host)
+    funcs = sorted(mod_host.functions.items(), key=lambda kv: kv[0].name_hint)
+    num_partitions = min(num_partitions, len(funcs))
+    if num_partitions <= 1:
+        return codegen.build_module(mod_host, target_host)
+    parts = [tvm.IRModule({}) for _ in range(num_partitions)]
+    for i, (gvar, func) in enumerate(funcs):
+        parts[i % num_partitions][gvar] = func
+
+    def _build_part(part):
+        # The pass context stack is thread local, re-enter it for the codegen options.
+        with pass_ctx:
+            return codegen.build_module(part, target_host)
+
+    with ThreadPoolExecutor(max_workers=num_partitions) as executor:
+        built = list(executor.map(_build_part, parts))
+    for rt_mod in built[1:]:
+        built[0].import_module(rt_mod)
+    return built[0]
+
+
 def build(inputs, args=None, target=None, target_host=None, name="default_function", binds=None):
     """Build a function with arguments as signature. Code will be generated
     for devices coupled with target information.
@@ -417,8 +464,11 @@ def build(inputs, args=None, target=None, target_host=None, name="default_functi
         mod_host_all.update(mod_host)
         device_modules.append(mdev)
 
-    # Generate a unified host module.
-    rt_mod_host = codegen.build_module(mod_host_all, target_host)
+    # Generate a unified host module, partitioned when there is no device code.
+    if any(device_modules):
+        rt_mod_host = codegen.build_module(mod_host_all, target_host)
+    else:
+        rt_mod_host = _build_host_module(mod_host_all, target_host)
 
     # Import all modules.
     for mdev in device_modules:
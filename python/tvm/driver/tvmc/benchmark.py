@@ -0,0 +1,359 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Provides support to benchmark compiled networks locally, with latency
+percentiles and throughput of concurrent module instances.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import tarfile
+import tempfile
+import time
+
+import numpy as np
+import tvm
+from tvm.contrib import graph_runtime as runtime
+
+from .common import TVMCException
+from .main import register_parser
+from .runner import get_input_info, make_inputs_dict
+
+
+# pylint: disable=invalid-name
+logger = logging.getLogger("TVMC")
+
+
+@register_parser
+def add_benchmark_parser(subparsers):
+    """ Include parser for 'benchmark' subcommand """
+
+    parser = subparsers.add_parser("benchmark", help="benchmark a compiled module")
+    parser.set_defaults(func=drive_benchmark)
+
+    parser.add_argument(
+        "--device",
+        choices=["cpu", "gpu", "cl"],
+        default="cpu",
+        help="target device to run the compiled module. Defaults to 'cpu'",
+    )
+    parser.add_argument(
+        "--fill-mode",
+        choices=["zeros", "ones", "random"],
+        default="random",
+        help="fill all input tensors with values. In case --inputs/-i is provided, "
+        "they will take precedence over --fill-mode. Any remaining inputs will be "
+        "filled using the chosen fill mode. Defaults to 'random'",
+    )
+    parser.add_argument("-i", "--inputs", help="path to the .npz input file")
+    parser.add_argument(
+        "--warmup",
+        metavar="N",
+        type=int,
+        default=10,
+        help="number of untimed runs of each instance before measuring. Defaults to '10'",
+    )
+    parser.add_argument(
+        "--iterations",
+        metavar="N",
+        type=int,
+        default=100,
+        help="number of timed runs of each instance. Ignored if --duration is given. "
+        "Defaults to '100'",
+    )
+    parser.add_argument(
+        "--duration",
+        metavar="SECONDS",
+        type=float,
+        help="run each instance for a fixed time instead of a fixed number of iterations",
+    )
+    parser.add_argument(
+        "--concurrency",
+        metavar="N",
+        type=int,
+        default=1,
+        help="number of module instances run concurrently, each in its own process. "
+        "Defaults to '1'",
+    )
+    parser.add_argument(
+        "--num-threads",
+        metavar="N",
+        type=int,
+        help="number of runtime threads of each instance. Defaults to splitting "
+        "the CPU cores evenly between the instances",
+    )
+    parser.add_argument("--json", metavar="FILE", help="path to write the JSON report to")
+    parser.add_argument("FILE", help="path to the compiled module file")
+
+
+def drive_benchmark(args):
+    """Invoke benchmark module with command line arguments
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        Arguments from command line parser.
+    """
+
+    report = benchmark_module(
+        args.FILE,
+        device=args.device,
+        inputs_file=args.inputs,
+        fill_mode=args.fill_mode,
+        warmup=args.warmup,
+        iterations=args.iterations,
+        duration=args.duration,
+        concurrency=args.concurrency,
+        num_threads=args.num_threads,
+    )
+
+    # print here is intentional
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(report, json_file, indent=2)
+
+
+def compute_statistics(times):
+    """Compute the latency statistics of a list of execution times.
+
+    Parameters
+    ----------
+    times : list
+        A list of execution times (in seconds).
+
+    Returns
+    -------
+    stats : dict
+        Mean, standard deviation, min, max and the 50th, 90th and 99th
+        percentiles of the times, in milliseconds.
+    """
+    if len(times) == 0:
+        raise TVMCException("no execution times were recorded")
+
+    times_ms = np.array(times) * 1000.0
+    return {
+        "mean": float(np.mean(times_ms)),
+        "std": float(np.std(times_ms)),
+        "min": float(np.min(times_ms)),
+        "max": float(np.max(times_ms)),
+        "p50": float(np.percentile(times_ms, 50)),
+        "p90": float(np.percentile(times_ms, 90)),
+        "p99": float(np.percentile(times_ms, 99)),
+    }
+
+
+def _run_instance(
+    module_file, device, inputs_file, fill_mode, warmup, iterations, duration, start_barrier=None
+):
+    """Load one instance of the module and time its runs.
+
+    After the warmup the instance waits at ``start_barrier``, if given, so that
+    the timed runs of all instances start together.
+
+    Returns the per-run times and the wall clock start and end of the timed runs.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        logger.debug("extracting module file %s", module_file)
+        with tarfile.open(module_file) as t:
+            t.extractall(tmp_dir)
+        graph = open(os.path.join(tmp_dir, "mod.json")).read()
+        params = bytearray(open(os.path.join(tmp_dir, "mod.params"), "rb").read())
+        lib = tvm.runtime.load_module(os.path.join(tmp_dir, "mod.so"))
+
+    if device == "gpu":
+        ctx = tvm.gpu()
+    elif device == "cl":
+        ctx = tvm.cl()
+    else:
+        assert device == "cpu"
+        ctx = tvm.cpu()
+
+    module = runtime.create(graph, lib, ctx)
+    module.load_params(params)
+    shape_dict, dtype_dict = get_input_info(graph, params)
+    module.set_input(**make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode))
+
+    for _ in range(warmup):
+        module.run()
+    ctx.sync()
+    if start_barrier is not None:
+        start_barrier.wait()
+
+    times = []
+    # Wall clock time is comparable across the instance processes.
+    start = time.time()
+    deadline = time.perf_counter() + duration if duration else None
+    while (deadline is None and len(times) < iterations) or (
+        deadline is not None and time.perf_counter() < deadline
+    ):
+        tic = time.perf_counter()
+        module.run()
+        ctx.sync()
+        times.append(time.perf_counter() - tic)
+    end = time.time()
+    return times, start, end
+
+
+def _run_instance_in_worker(num_threads, start_barrier, *args):
+    # The runtime thread pool reads the variable when it is created on the first run.
+    if num_threads:
+        os.environ["TVM_NUM_THREADS"] = str(num_threads)
+    try:
+        return _run_instance(*args, start_barrier=start_barrier)
+    except Exception:
+        # Do not leave the other instances waiting for this one.
+        if start_barrier is not None:
+            start_barrier.abort()
+        raise
+
+
+def benchmark_module(
+    module_file,
+    device="cpu",
+    inputs_file=None,
+    fill_mode="random",
+    warmup=10,
+    iterations=100,
+    duration=None,
+    concurrency=1,
+    num_threads=None,
+):
+    """Benchmark a compiled graph runtime module locally.
+
+    Each instance runs ``warmup`` untimed iterations, then either ``iterations``
+    timed runs or as many as fit in ``duration`` seconds. With a concurrency
+    above one, every instance runs in its own process so that the instances
+    compete for the cores of the host like independent model servers would,
+    and the instances start their timed runs together after the warmup. A
+    single instance also runs in its own process when num_threads is given,
+    so the thread count of the calling process is left untouched.
+
+    Parameters
+    ----------
+    module_file : str
+        The path to the module file (a .tar file).
+    device: str, optional
+        The device (e.g. "cpu" or "gpu") to run on.
+    inputs_file : str, optional
+        Path to an .npz file containing the inputs.
+    fill_mode : str, optional
+        The fill-mode to use when generating data for input tensors.
+        Valid options are "zeros", "ones" and "random".
+    warmup : int, optional
+        Number of untimed runs of each instance.
+    iterations : int, optional
+        Number of timed runs of each instance, ignored if duration is set.
+    duration : float, optional
+        Number of seconds each instance runs for.
+    concurrency : int, optional
+        Number of module instances run at the same time.
+    num_threads : int, optional
+        Number of runtime threads of each instance. When concurrency is above
+        one it defaults to the CPU cores divided evenly between the instances.
+
+    Returns
+    -------
+    report : dict
+        The benchmark settings, the latency statistics of all runs and of each
+        instance (in milliseconds), and the throughput in runs per second.
+    """
+    if concurrency < 1:
+        raise TVMCException("concurrency must be at least 1, got {}".format(concurrency))
+    if duration is None and iterations < 1:
+        raise TVMCException("iterations must be at least 1, got {}".format(iterations))
+
+    run_args = (module_file, device, inputs_file, fill_mode, warmup, iterations, duration)
+    if concurrency == 1 and not num_threads:
+        results = [_run_instance(*run_args)]
+    else:
+        if not num_threads:
+            num_threads = max(1, multiprocessing.cpu_count() // concurrency)
+        # Use fresh interpreters, the runtime thread pool does not survive a fork.
+        mp_ctx = multiprocessing.get_context("spawn")
+        with mp_ctx.Manager() as manager, mp_ctx.Pool(concurrency) as pool:
+            start_barrier = manager.Barrier(concurrency) if concurrency > 1 else None
+            pending = [
+                pool.apply_async(_run_instance_in_worker, (num_threads, start_barrier) + run_args)
+                for _ in range(concurrency)
+            ]
+            results = [p.get() for p in pending]
+
+    all_times = []
+    instances = []
+    for times, start, end in results:
+        all_times.extend(times)
+        instances.append(
+            {
+                "iterations": len(times),
+                "latency_ms": compute_statistics(times),
+                "throughput": len(times) / (end - start),
+            }
+        )
+    wall_time = max(r[2] for r in results) - min(r[1] for r in results)
+
+    return {
+        "module": os.path.basename(module_file),
+        "device": device,
+        "concurrency": concurrency,
+        "num_threads": num_threads,
+        "warmup": warmup,
+        "iterations": len(all_times),
+        "wall_time_s": wall_time,
+        "latency_ms": compute_statistics(all_times),
+        "throughput": len(all_times) / wall_time,
+        "instances": instances,
+    }
+
+
+def format_report(report):
+    """Format the latency percentiles and throughput of a benchmark report.
+
+    This has the effect of producing a small table that looks like:
+
+        Benchmark summary (2 instances, 200 runs):
+        mean (ms)  p50 (ms)   p90 (ms)   p99 (ms)   max (ms)   runs/s
+         14.3100    14.1000    15.2000    16.1610    16.1610    139.7
+
+    Parameters
+    ----------
+    report : dict
+        A report returned by benchmark_module.
+
+    Returns
+    -------
+    str
+        A formatted string containing the statistics.
+    """
+    latency = report["latency_ms"]
+    header = "Benchmark summary ({} instances, {} runs):\n".format(
+        report["concurrency"], report["iterations"]
+    )
+    header += "{0:^10} {1:^10} {2:^10} {3:^10} {4:^10} {5:^10}".format(
+        "mean (ms)", "p50 (ms)", "p90 (ms)", "p99 (ms)", "max (ms)", "runs/s"
+    )
+    stats = "{0:^10.4f} {1:^10.4f} {2:^10.4f} {3:^10.4f} {4:^10.4f} {5:^10.1f}".format(
+        latency["mean"],
+        latency["p50"],
+        latency["p90"],
+        latency["p99"],
+        latency["max"],
+        report["throughput"],
+    )
+    return "%s\n%s\n" % (header, stats)
@@ -16,7 +16,7 @@
 # under the License.
 # pylint: disable=unused-import
 """Common data structures across all IR variants."""
-from .base import SourceName, Span, Node, EnvFunc, load_json, save_json
+from .base import SourceName, Span, Node, EnvFunc, load_json, save_json, load_binary, save_binary
 from .base import structural_equal, assert_structural_equal, structural_hash
 from .type import Type, TypeKind, PrimType, PointerType, TypeVar, GlobalTypeVar, TupleType
 from .type import TypeConstraint, FuncType, IncompleteType, RelayRefType
@@ -31,4 +31,5 @@ from .attrs import Attrs, DictAttrs, make_node
 from .container import Array, Map
 
 from . import transform
+from . import instrument
 from . import diagnostics
@@ -157,6 +157,42 @@ def save_json(node):
     return tvm.runtime._ffi_node_api.SaveJSON(node)
 
 
+def load_binary(blob):
+    """Load tvm object saved by :py:func:`save_binary`.
+
+    Parameters
+    ----------
+    blob : Union[bytes, bytearray]
+        The binary representation.
+
+    Returns
+    -------
+    node : Object
+        The loaded tvm node.
+    """
+    return tvm.runtime._ffi_node_api.LoadBinary(blob)
+
+
+def save_binary(node):
+    """Save tvm object in a compact binary format.
+
+    The format holds the same information as :py:func:`save_json`, but is
+    faster to save and load and smaller. It can only be loaded by the same
+    version of TVM, use :py:func:`save_json` to store objects durably.
+
+    Parameters
+    ----------
+    node : Object
+        A TVM object to be saved.
+
+    Returns
+    -------
+    blob : bytearray
+        The binary representation.
+    """
+    return tvm.runtime._ffi_node_api.SaveBinary(node)
+
+
 def structural_equal(lhs, rhs, map_free_vars=False):
     """Check structural equality of lhs and rhs.
 
@@ -0,0 +1,321 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name,unused-argument
+"""Common pass instrumentation across IR variants."""
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import tvm._ffi
+import tvm.runtime
+
+from . import _ffi_instrument_api
+
+
+@tvm._ffi.register_object("instrument.PassInstrument")
+class PassInstrument(tvm.runtime.Object):
+    """A pass instrument is notified by the PassContext it is attached to.
+
+    Subclasses override any of :py:meth:`enter_pass_ctx`, :py:meth:`exit_pass_ctx`,
+    :py:meth:`run_before_pass`, :py:meth:`run_after_pass` and
+    :py:meth:`run_on_exception`. The hooks are invoked for every module, function,
+    primfunc and sequential pass run under the context, including nested ones.
+    Methods that are not overridden are not called from the backend.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        The name of the instrument, defaults to the class name.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        class PrintPasses(tvm.instrument.PassInstrument):
+            def run_before_pass(self, mod, info):
+                print("running", info.name)
+
+        with tvm.transform.PassContext(instruments=[PrintPasses()]):
+            mod = relay.transform.FoldConstant()(mod)
+    """
+
+    def __init__(self, name=None):
+        cls = type(self)
+
+        def _hook(method):
+            if getattr(cls, method) is getattr(PassInstrument, method):
+                return None
+            return getattr(self, method)
+
+        self.__init_handle_by_constructor__(
+            _ffi_instrument_api.PassInstrument,
+            name if name else cls.__name__,
+            _hook("enter_pass_ctx"),
+            _hook("exit_pass_ctx"),
+            _hook("run_before_pass"),
+            _hook("run_after_pass"),
+            _hook("run_on_exception"),
+        )
+
+    def enter_pass_ctx(self):
+        """Called when the PassContext is entered."""
+
+    def exit_pass_ctx(self):
+        """Called when the PassContext is exited."""
+
+    def run_before_pass(self, mod, info):
+        """Called before a pass runs.
+
+        Parameters
+        ----------
+        mod : tvm.IRModule
+            The module the pass is applied on.
+
+        info : tvm.transform.PassInfo
+            The pass information.
+        """
+
+    def run_after_pass(self, mod, info):
+        """Called after a pass has run.
+
+        Parameters
+        ----------
+        mod : tvm.IRModule
+            The module produced by the pass.
+
+        info : tvm.transform.PassInfo
+            The pass information.
+        """
+
+    def run_on_exception(self, info, what):
+        """Called when a pass raises an error, instead of run_after_pass.
+
+        Parameters
+        ----------
+        info : tvm.transform.PassInfo
+            The pass information.
+
+        what : str
+            The error message.
+        """
+
+
+def count_ir_nodes(mod):
+    """Count the distinct IR nodes reachable from a module.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module.
+
+    Returns
+    -------
+    count : int
+        The number of nodes, excluding containers.
+    """
+    return _ffi_instrument_api.CountIRNodes(mod)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return peak / (1024.0 * 1024.0)
+    return peak / 1024.0
+
+
+class PassProfile(object):
+    """The metrics recorded for one pass invocation and the passes it ran.
+
+    Parameters
+    ----------
+    name : str
+        The pass name.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.metrics = {}
+        self.failed = False
+
+
+class PassProfileInstrument(PassInstrument):
+    """Base class of the instruments that record metrics per pass invocation.
+
+    The invocations are recorded as a tree of :py:class:`PassProfile`, so that
+    passes run by other passes, e.g. in a Sequential, appear as children.
+    Subclasses implement :py:meth:`start` and :py:meth:`stop`, and list the
+    metrics shown by :py:meth:`render` in ``columns``.
+    """
+
+    # List of (metric name, header, format) shown by render.
+    columns = []
+
+    def __init__(self, name=None):
+        super().__init__(name)
+        self.root = PassProfile("root")
+        self._stack = [self.root]
+        self._depth = 0
+
+    def enter_pass_ctx(self):
+        # the context may be entered again while it is in effect, only the
+        # outermost enter starts a new profile
+        if self._depth == 0:
+            self.root = PassProfile("root")
+            self._stack = [self.root]
+        self._depth += 1
+
+    def exit_pass_ctx(self):
+        self._depth = max(self._depth - 1, 0)
+
+    def run_before_pass(self, mod, info):
+        profile = PassProfile(info.name)
+        self._stack[-1].children.append(profile)
+        self._stack.append(profile)
+        self.start(profile, mod)
+
+    def run_after_pass(self, mod, info):
+        self.stop(self._stack.pop(), mod)
+
+    def run_on_exception(self, info, what):
+        profile = self._stack.pop()
+        profile.failed = True
+        self.stop(profile, None)
+
+    def start(self, profile, mod):
+        """Record the metrics before a pass runs."""
+        raise NotImplementedError()
+
+    def stop(self, profile, mod):
+        """Record the metrics after a pass has run, mod is None when it failed."""
+        raise NotImplementedError()
+
+    def _merge(self, profiles):
+        """Merge the sibling invocations of the same pass, keeping the first order."""
+        merged = {}
+        for profile in profiles:
+            if profile.name not in merged:
+                merged[profile.name] = ([], [])
+            merged[profile.name][0].append(profile)
+            merged[profile.name][1].extend(profile.children)
+        return merged
+
+    def aggregate(self, profiles):
+        """Combine the metrics of several invocations of the same pass.
+
+        The default sums all metrics, subclasses override it for metrics
+        that do not add up.
+        """
+        metrics = {}
+        for profile in profiles:
+            for key, value in profile.metrics.items():
+                metrics[key] = metrics.get(key, 0) + value
+        return metrics
+
+    def render(self):
+        """Render the recorded invocations as a hierarchical summary.
+
+        Invocations of the same pass under the same parent are merged.
+
+        Returns
+        -------
+        summary : str
+            One line per pass, indented by nesting level.
+        """
+        header = "%-50s %6s" % ("Pass", "Calls")
+        for _, title, _ in self.columns:
+            header += " %14s" % title
+        lines = [header]
+
+        def _render(profiles, depth):
+            for name, (group, children) in self._merge(profiles).items():
+                metrics = self.aggregate(group)
+                failed = " (failed)" if any(p.failed for p in group) else ""
+                line = "%-50s %6d" % ("  " * depth + name + failed, len(group))
+                for key, _, fmt in self.columns:
+                    line += " %14s" % (fmt % metrics[key] if key in metrics else "-")
+                lines.append(line)
+                _render(children, depth + 1)
+
+        _render(self.root.children, 0)
+        return "\n".join(lines)
+
+
+class PassTimingInstrument(PassProfileInstrument):
+    """Record the wall time of each pass invocation, including the passes it runs."""
+
+    columns = [("time_ms", "Time(ms)", "%.3f")]
+
+    def start(self, profile, mod):
+        profile.metrics["start"] = time.perf_counter()
+
+    def stop(self, profile, mod):
+        profile.metrics["time_ms"] = (time.perf_counter() - profile.metrics.pop("start")) * 1e3
+
+
+class PassNodeCountInstrument(PassProfileInstrument):
+    """Record the number of IR nodes in the module before and after each pass."""
+
+    columns = [("nodes_before", "NodesBefore", "%d"), ("nodes_after", "NodesAfter", "%d")]
+
+    def start(self, profile, mod):
+        profile.metrics["nodes_before"] = count_ir_nodes(mod)
+
+    def stop(self, profile, mod):
+        if mod is not None:
+            profile.metrics["nodes_after"] = count_ir_nodes(mod)
+
+    def aggregate(self, profiles):
+        # Report the module size around the first and the last invocation.
+        metrics = {}
+        if "nodes_before" in profiles[0].metrics:
+            metrics["nodes_before"] = profiles[0].metrics["nodes_before"]
+        if "nodes_after" in profiles[-1].metrics:
+            metrics["nodes_after"] = profiles[-1].metrics["nodes_after"]
+        return metrics
+
+
+class PassMemoryInstrument(PassProfileInstrument):
+    """Record the peak resident memory of the process around each pass.
+
+    The peak RSS of a process never decreases, so ``peak_increase_mb`` is the
+    amount by which a pass raised the high-water mark of the process.
+    """
+
+    columns = [("peak_increase_mb", "PeakInc(MB)", "%.1f"), ("peak_rss_mb", "PeakRSS(MB)", "%.1f")]
+
+    def start(self, profile, mod):
+        profile.metrics["peak_rss_mb"] = _peak_rss_mb()
+
+    def stop(self, profile, mod):
+        peak = _peak_rss_mb()
+        profile.metrics["peak_increase_mb"] = peak - profile.metrics["peak_rss_mb"]
+        profile.metrics["peak_rss_mb"] = peak
+
+    def aggregate(self, profiles):
+        return {
+            "peak_increase_mb": sum(p.metrics.get("peak_increase_mb", 0) for p in profiles),
+            "peak_rss_mb": max(p.metrics.get("peak_rss_mb", 0) for p in profiles),
+        }
@@ -67,10 +67,19 @@ class PassContext(tvm.runtime.Object):
 
     config : Optional[Dict[str, Object]]
         Additional configurations for specific passes.
+
+    instruments : Optional[Sequence[tvm.instrument.PassInstrument]]
+        The instruments notified before and after each pass run under the context.
     """
 
     def __init__(
-        self, opt_level=2, required_pass=None, disabled_pass=None, trace=None, config=None
+        self,
+        opt_level=2,
+        required_pass=None,
+        disabled_pass=None,
+        trace=None,
+        config=None,
+        instruments=None,
     ):
         required = list(required_pass) if required_pass else []
         if not isinstance(required, (list, tuple)):
@@ -81,8 +90,15 @@ class PassContext(tvm.runtime.Object):
             raise TypeError("disabled_pass is expected to be the type of " + "list/tuple/set.")
 
         config = config if config else None
+        instruments = list(instruments) if instruments else None
         self.__init_handle_by_constructor__(
-            _ffi_transform_api.PassContext, opt_level, required, disabled, trace, config
+            _ffi_transform_api.PassContext,
+            opt_level,
+            required,
+            disabled,
+            trace,
+            config,
+            instruments,
         )
 
     def __enter__(self):
@@ -50,10 +50,23 @@ from .op.reduce import *
 from .op.tensor import *
 from .op.transform import *
 from .op.algorithm import *
-from . import frontend
 from . import backend
-from . import quantize
-from . import data_dep_optimization
+from .. import _lazy
+
+if _lazy.is_enabled():
+    # The frontends and the optional transformations are imported on their first use.
+    _lazy.install(
+        __name__,
+        {
+            "frontend": (".frontend", None),
+            "quantize": (".quantize", None),
+            "data_dep_optimization": (".data_dep_optimization", None),
+        },
+    )
+else:
+    from . import frontend
+    from . import quantize
+    from . import data_dep_optimization
 
 # Dialects
 from . import qnn
@@ -29,6 +29,7 @@ from tvm.target import Target
 from .. import function as _function
 from .. import ty as _ty
 from . import _backend
+from . import kernel_cache
 
 logger = logging.getLogger("compile_engine")
 autotvm_logger = logging.getLogger("autotvm")
@@ -186,6 +187,7 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     ret : tuple(relay.op.OpImplementation, List[tvm.te.Tensor])
         The best op implementation and the corresponding output tensors.
     """
+    _load_target_strategies(target)
     all_impls = get_valid_implementations(op, attrs, inputs, out_type, target)
     best_plevel_impl = max(all_impls, key=lambda x: x.plevel)
 
@@ -263,6 +265,22 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     return best_plevel_impl, outputs[best_plevel_impl]
 
 
+# The targets whose strategies have been imported, see _load_target_strategies.
+_STRATEGY_TARGETS = set()
+
+
+def _load_target_strategies(target):
+    """Import the op strategies of a target the first time it is compiled for."""
+    target_str = str(target)
+    if target_str in _STRATEGY_TARGETS:
+        return
+    # pylint: disable=import-outside-toplevel
+    from ..op import strategy as _strategy
+
+    _strategy.load_target_strategies(target)
+    _STRATEGY_TARGETS.add(target_str)
+
+
 @tvm._ffi.register_func("relay.backend.lower_call")
 def lower_call(call, inputs, target):
     """Lower the call expression to op implementation and tensor outputs."""
@@ -320,6 +338,11 @@ class CompileEngine(Object):
     def lower(self, source_func, target=None):
         """Lower a source_func to a CachedFunc.
 
+        When ``relay.backend.kernel_cache_dir`` is set in the current PassContext,
+        the functions compiled for llvm targets are served by the
+        :py:class:`~tvm.relay.backend.kernel_cache.KernelCache` in that directory.
+        Their CachedFunc only names the compiled kernel and holds no lowered functions.
+
         Parameters
         ----------
         source_func : Union[tvm.relay.Function, CCacheKey]
@@ -354,6 +377,10 @@ class CompileEngine(Object):
     def jit(self, source_func, target=None):
         """JIT a source_func to a tvm.runtime.PackedFunc.
 
+        When ``relay.backend.kernel_cache_dir`` is set in the current PassContext,
+        the kernel is served by the
+        :py:class:`~tvm.relay.backend.kernel_cache.KernelCache` in that directory.
+
         Parameters
         ----------
         source_func : Union[tvm.relay.Function, CCacheKey]
@@ -373,6 +400,7 @@ class CompileEngine(Object):
     def clear(self):
         """clear the existing cached functions"""
         _backend._CompileEngineClear(self)
+        kernel_cache.clear_loaded()
 
     def items(self):
         """List items in the cache.
@@ -0,0 +1,154 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""In-memory cache of the artifacts built by the executors of create_executor.
+
+Tests and frontends evaluate many small, structurally identical modules, and
+every executor used to optimize or build its module again. The executors
+store what they build here instead: the optimized module and interpreter of
+the debug executor, the library of the graph executor and the executable of
+the VM executor. The entries are shared by all the executors of the process.
+
+Entries are keyed on the kind of executor, the structural hash of the module,
+the target, the current target, the options of the current PassContext and
+the AutoTVM and auto-scheduler dispatch contexts. A hit also checks that
+the modules are structurally equal.
+
+Every entry keeps a library with the weights bound into it, or an executable,
+alive, so the cache is disabled by default. The environment variable
+TVM_EXECUTOR_CACHE_SIZE sets the number of entries to keep, e.g. 256 for a
+test session.
+"""
+import os
+from collections import OrderedDict
+
+import tvm
+from tvm.ir.transform import PassContext
+from tvm.target import Target
+
+from .kernel_cache import dispatch_context_key
+
+
+class ExecutorCache(object):
+    """A bounded cache of built artifacts, the least recently used are evicted.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of entries, 0 disables the cache.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(kind, mod, *options):
+        """Compute the key of the artifact of a module.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of executor.
+
+        mod : tvm.IRModule
+            The module.
+
+        options : List[object]
+            The other inputs of the build, e.g. the target, as strings.
+
+        Returns
+        -------
+        key : tuple
+            The key, including the current target, the options of the current
+            PassContext and the dispatch contexts in effect.
+        """
+        ctx = PassContext.current()
+        pass_options = (
+            int(ctx.opt_level),
+            tuple(str(name) for name in ctx.required_pass),
+            tuple(str(name) for name in ctx.disabled_pass),
+            str(ctx.config),
+        )
+        # the executors created without a target build for the current one
+        context = (str(Target.current(allow_none=True)), dispatch_context_key())
+        return (
+            (kind, tvm.ir.structural_hash(mod))
+            + tuple(str(o) for o in options)
+            + pass_options
+            + context
+        )
+
+    def get(self, key, mod):
+        """Get the artifact of a module.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the artifact.
+
+        mod : tvm.IRModule
+            The module, checked against the module of the entry.
+
+        Returns
+        -------
+        artifact : Optional[object]
+            The artifact, or None when it is not cached.
+        """
+        entry = self._entries.get(key, None)
+        if entry is None or not tvm.ir.structural_equal(entry[0], mod):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, mod, artifact):
+        """Store the artifact of a module.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the artifact.
+
+        mod : tvm.IRModule
+            The module.
+
+        artifact : object
+            The artifact built from the module.
+        """
+        if self.capacity <= 0:
+            return
+        # copy the module, the executors set its main function
+        mod = tvm.IRModule(mod.functions, mod.type_definitions)
+        self._entries[key] = (mod, artifact)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+executor_cache = ExecutorCache(int(os.environ.get("TVM_EXECUTOR_CACHE_SIZE", "0")))
@@ -32,7 +32,14 @@ This "little language" represents programs in TVM's graph format.
 To connect to the graph runtime, we use a printer that converts our graph format
 into TVM's JSON format. The resulting string can be loaded by
 contrib.graph_runtime or any other TVM runtime compatible systems.
+
+The storage of the intermediate tensors is planned by GraphPlanMemory, the planner
+is selected with the ``relay.GraphPlanMemory.planner`` PassContext config and the
+resulting plan can be inspected with :py:func:`memory_plan_report`.
 """
+import json
+
+from tvm.runtime import DataType
 from tvm.runtime.ndarray import empty
 from tvm.relay import _build_module
 from tvm.target import Target
@@ -91,3 +98,95 @@ class GraphRuntimeCodegen(object):
             arr.copyto(param)
             params[key] = param
         return graph_json, lowered_func, params
+
+
+def memory_plan_report(graph_json):
+    """Report the storage plan of a graph produced by the graph runtime codegen.
+
+    The graph runtime allocates one buffer per storage id, large enough for the
+    largest tensor assigned to it. The report lays these buffers out one after
+    the other in a single arena.
+
+    Parameters
+    ----------
+    graph_json : str
+        The graph json, e.g. returned by relay.build.
+
+    Returns
+    -------
+    report : dict
+        ``tensors`` lists each tensor of the graph in execution order, with its
+        node ``name``, ``output_index``, ``storage_id``, ``size`` in bytes,
+        ``offset`` in the arena and ``lifetime``, the pair of the first and the
+        last node index during which it is alive. ``storage_sizes`` maps each
+        storage id to its size and ``total_bytes`` is the size of the arena.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        with tvm.transform.PassContext(
+            opt_level=3, config={"relay.GraphPlanMemory.planner": "best_fit"}
+        ):
+            graph_json, lib, params = relay.build(mod, "llvm")
+        print(memory_plan_report(graph_json)["total_bytes"])
+    """
+    graph = json.loads(graph_json)
+    nodes = graph["nodes"]
+    row_ptr = graph["node_row_ptr"]
+    attrs = graph["attrs"]
+    shapes = attrs["shape"][1]
+    dtypes = attrs["dltype"][1]
+    storage_ids = attrs["storage_id"][1]
+    last_node = len(nodes) - 1
+
+    def entry_id(node_entry):
+        return row_ptr[node_entry[0]] + node_entry[1]
+
+    # inputs and parameters are set before the run, outputs are read after it.
+    lifetimes = []
+    for nid, node in enumerate(nodes):
+        for _ in range(row_ptr[nid], row_ptr[nid + 1]):
+            if node["op"] == "null":
+                lifetimes.append([0, last_node])
+            else:
+                lifetimes.append([nid, nid])
+    for nid, node in enumerate(nodes):
+        for node_entry in node["inputs"]:
+            lifetime = lifetimes[entry_id(node_entry)]
+            lifetime[1] = max(lifetime[1], nid)
+    for node_entry in graph["heads"]:
+        lifetimes[entry_id(node_entry)][1] = last_node
+
+    sizes = []
+    storage_sizes = {}
+    for eid, (shape, dtype) in enumerate(zip(shapes, dtypes)):
+        dtype = DataType(dtype)
+        size = (dtype.bits * dtype.lanes + 7) // 8
+        for dim in shape:
+            size *= dim
+        sizes.append(size)
+        sid = storage_ids[eid]
+        storage_sizes[sid] = max(storage_sizes.get(sid, 0), size)
+
+    offsets = {}
+    total_bytes = 0
+    for sid in sorted(storage_sizes):
+        offsets[sid] = total_bytes
+        total_bytes += storage_sizes[sid]
+
+    tensors = []
+    for nid, node in enumerate(nodes):
+        for eid in range(row_ptr[nid], row_ptr[nid + 1]):
+            tensors.append(
+                {
+                    "name": node["name"],
+                    "output_index": eid - row_ptr[nid],
+                    "storage_id": storage_ids[eid],
+                    "size": sizes[eid],
+                    "offset": offsets[storage_ids[eid]],
+                    "lifetime": tuple(lifetimes[eid]),
+                }
+            )
+    return {"tensors": tensors, "storage_sizes": storage_sizes, "total_bytes": total_bytes}
@@ -25,6 +25,7 @@ from tvm.runtime import container, Object
 from tvm.ir import IRModule
 
 from . import _backend
+from .executor_cache import executor_cache
 from .. import _make, analysis, transform
 from ... import nd
 from ..expr import Tuple, RefCreate, Call, Constant, GlobalVar, const
@@ -251,9 +252,15 @@ class Interpreter(Executor):
                 else:
                     self.mod = IRModule.from_expr(func)
 
-            mod = self.optimize()
+            # The arguments bound into the entry function are part of the key.
+            key = executor_cache.key("debug", self.mod, self.target, self.ctx)
+            entry = executor_cache.get(key, self.mod)
+            if entry is None:
+                mod = self.optimize()
+                entry = (mod, _backend.CreateInterpreter(mod, self.ctx, self.target))
+                executor_cache.put(key, self.mod, entry)
+            mod, _intrp = entry
             opt_expr = Call(mod["main"], relay_args)
-            _intrp = _backend.CreateInterpreter(mod, self.ctx, self.target)
             return _intrp(opt_expr)
 
         return _interp_wrapper
@@ -0,0 +1,327 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent, content-addressed cache of compiled kernels.
+
+The in-memory cache of the CompileEngine lives only as long as the process.
+A KernelCache stores the compiled code of each fused function in a directory
+so that later processes lowering the same function, in ``relay.build``, the
+VM compiler or ``CompileEngine.jit``, load the kernel instead of scheduling,
+lowering and compiling it again.
+
+The CompileEngine looks the kernel of a fused function up before it schedules
+the function. The cache serves the functions compiled for llvm targets and
+stores each kernel as LLVM IR, which loads back into a module that
+``export_library`` links like a freshly built one. The kernel modules reach
+the built library together with the modules of the external codegens.
+
+Entries are keyed on the structural hash of the fused function, the target,
+the PassContext, the libtvm build and the tuning records of the AutoTVM and
+auto-scheduler dispatch contexts.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import tvm._ffi
+import tvm.driver
+from tvm.ir.transform import PassContext
+from tvm.support import libinfo
+
+CONFIG_KEY = "relay.backend.kernel_cache_dir"
+
+# The attributes of the dispatch contexts holding the configs they apply
+_CONTEXT_RECORDS = [
+    "best_by_targetkey",
+    "best_by_model",
+    "_best_user_defined",
+    "_config",
+    "_records",
+]
+
+
+def _context_key(context):
+    hasher = hashlib.sha256(type(context).__name__.encode("utf-8"))
+    for name in _CONTEXT_RECORDS:
+        records = getattr(context, name, None)
+        if isinstance(records, dict):
+            records = sorted((repr(k), repr(v)) for k, v in records.items())
+        if records is not None:
+            hasher.update(("%s=%r;" % (name, records)).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def dispatch_context_key():
+    """Compute a key of the AutoTVM and auto-scheduler dispatch contexts in effect.
+
+    The kernels built under different tuning logs differ, so the key hashes
+    the type and the tuning records of each context of the two dispatch
+    stacks. The key is computed on every call, so it covers the records
+    loaded into a context after it was entered.
+
+    Returns
+    -------
+    key : str
+        Hex digest identifying the dispatch contexts.
+    """
+    # pylint: disable=import-outside-toplevel
+    from tvm import autotvm, auto_scheduler
+
+    hasher = hashlib.sha256()
+    for context in [autotvm.DispatchContext.current, auto_scheduler.DispatchContext.current]:
+        while context is not None:
+            hasher.update(_context_key(context).encode("utf-8"))
+            context = getattr(context, "_old_ctx", None)
+    return hasher.hexdigest()
+
+
+def _pass_context_key():
+    ctx = PassContext.current()
+    config = sorted((str(k), str(v)) for k, v in ctx.config.items() if str(k) != CONFIG_KEY)
+    return repr(
+        (
+            int(ctx.opt_level),
+            sorted(str(name) for name in ctx.required_pass),
+            sorted(str(name) for name in ctx.disabled_pass),
+            config,
+        )
+    )
+
+
+class KernelCache(object):
+    """A directory of compiled kernels keyed by content hash.
+
+    Each entry consists of the LLVM IR ``<digest>.ll`` of the kernel and a
+    ``<digest>.json`` metadata file recording the symbol name of the kernel.
+    The kernels looked up or stored by a process are kept in memory until
+    the CompileEngine is cleared.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory to store the kernels in. Created when missing.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.loaded = {}
+
+    @staticmethod
+    def current():
+        """Get the kernel cache configured in the current PassContext.
+
+        Returns
+        -------
+        cache : Optional[KernelCache]
+            The cache, or None when ``relay.backend.kernel_cache_dir`` is not set.
+        """
+        cache_dir = PassContext.current().config.get(CONFIG_KEY, None)
+        if not cache_dir:
+            return None
+        cache_dir = str(cache_dir)
+        cache = _OPEN_CACHES.get(cache_dir, None)
+        if cache is None:
+            cache = KernelCache(cache_dir)
+            _OPEN_CACHES[cache_dir] = cache
+        return cache
+
+    @staticmethod
+    def supports(target):
+        """Check whether the kernels of a target can be cached.
+
+        Parameters
+        ----------
+        target : tvm.target.Target
+            The target the kernel is compiled for.
+
+        Returns
+        -------
+        supported : bool
+            True for llvm targets that neither build a system library
+            nor link the parameters into the library.
+        """
+        if target.kind.name != "llvm":
+            return False
+        return not any(
+            bool(target.attrs.get(name, False)) for name in ["system-lib", "link-params"]
+        )
+
+    @staticmethod
+    def digest(source_func, target):
+        """Compute the content address of a kernel.
+
+        Parameters
+        ----------
+        source_func : tvm.relay.Function
+            The fused primitive function.
+
+        target : tvm.target.Target
+            The target the kernel is compiled for.
+
+        The options of the current PassContext, the libtvm build and the
+        tuning records of the current dispatch contexts are part of the
+        digest, see :py:func:`dispatch_context_key`.
+
+        Returns
+        -------
+        digest : str
+            Hex digest identifying the kernel.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(str(tvm.ir.structural_hash(source_func)).encode("utf-8"))
+        hasher.update(str(target).encode("utf-8"))
+        hasher.update(_pass_context_key().encode("utf-8"))
+        hasher.update(str(sorted(libinfo().items())).encode("utf-8"))
+        hasher.update(dispatch_context_key().encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _paths(self, digest):
+        base = os.path.join(self.cache_dir, digest)
+        return base + ".ll", base + ".json"
+
+    def load(self, digest):
+        """Load a kernel from the cache directory.
+
+        Parameters
+        ----------
+        digest : str
+            The content address of the kernel.
+
+        Returns
+        -------
+        entry : Optional[Tuple[str, tvm.runtime.Module]]
+            The symbol of the kernel and the module holding it,
+            or None when the kernel is not cached.
+        """
+        ir_path, meta_path = self._paths(digest)
+        if not (os.path.isfile(ir_path) and os.path.isfile(meta_path)):
+            return None
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        return meta["func_name"], tvm.runtime.load_module(ir_path)
+
+    def lookup(self, digest):
+        """Look a kernel up in memory, then in the cache directory.
+
+        Parameters
+        ----------
+        digest : str
+            The content address of the kernel.
+
+        Returns
+        -------
+        entry : Optional[Tuple[str, tvm.runtime.Module]]
+            The symbol of the kernel and the module holding it,
+            or None when the kernel is not cached.
+        """
+        entry = self.loaded.get(digest, None)
+        if entry is None:
+            entry = self.load(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.loaded[digest] = entry
+        self.hits += 1
+        return entry
+
+    def save(self, digest, mod, func_name):
+        """Store a compiled kernel in the cache.
+
+        Files are written under a temporary name and renamed into place,
+        so concurrent writers of the same entry never expose a partial file.
+
+        Parameters
+        ----------
+        digest : str
+            The content address of the kernel.
+
+        mod : tvm.runtime.Module
+            The llvm module holding the compiled kernel.
+
+        func_name : str
+            The symbol of the kernel inside ``mod``.
+        """
+        ir_path, meta_path = self._paths(digest)
+        fd, tmp_ir = tempfile.mkstemp(suffix=".ll", dir=self.cache_dir)
+        os.close(fd)
+        mod.save(tmp_ir)
+        os.replace(tmp_ir, ir_path)
+        fd, tmp_meta = tempfile.mkstemp(suffix=".json", dir=self.cache_dir)
+        with os.fdopen(fd, "w") as meta_file:
+            json.dump({"func_name": func_name}, meta_file)
+        os.replace(tmp_meta, meta_path)
+        self.loaded[digest] = (func_name, mod)
+
+    def entries(self):
+        """List the digests of all kernels in the cache.
+
+        Returns
+        -------
+        digests : List[str]
+            The cached digests.
+        """
+        return sorted(
+            name[: -len(".json")] for name in os.listdir(self.cache_dir) if name.endswith(".json")
+        )
+
+
+_OPEN_CACHES = {}
+
+
+def clear_loaded():
+    """Drop the kernels the open caches keep in memory."""
+    for cache in _OPEN_CACHES.values():
+        cache.loaded.clear()
+
+
+@tvm._ffi.register_func("relay.backend.kernel_cache_lookup")
+def _lookup(key):
+    """Look the kernel of a CCacheKey up in the kernel cache of the current PassContext.
+
+    Returns
+    -------
+    entry : List
+        Empty when no kernel cache applies, ``[digest]`` when the kernel is
+        not cached and ``[digest, func_name, module]`` when it is.
+    """
+    cache = KernelCache.current()
+    if cache is None or not KernelCache.supports(key.target):
+        return []
+    digest = KernelCache.digest(key.source_func, key.target)
+    entry = cache.lookup(digest)
+    if entry is None:
+        return [digest]
+    return [digest, entry[0], entry[1]]
+
+
+@tvm._ffi.register_func("relay.backend.kernel_cache_store")
+def _store(digest, cached_func):
+    """Compile a lowered kernel and store it in the kernel cache of the current PassContext.
+
+    Returns
+    -------
+    mod : tvm.runtime.Module
+        The module holding the kernel.
+    """
+    mod = tvm.driver.build(cached_func.funcs, target=cached_func.target)
+    # a host module partitioned into imports is not saved as a single file
+    if mod.type_key == "llvm" and not mod.imported_modules:
+        KernelCache.current().save(digest, mod, cached_func.func_name)
+    return mod
@@ -0,0 +1,793 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=no-else-return, unused-argument, invalid-name
+"""A reference executor compiling Relay to a Python program over NumPy arrays.
+
+The functions of the module reachable from main are converted to Python
+functions, with one statement per let binding in A-normal form and Python
+control flow for if, match and recursion. The calls of the operators in
+NUMPY_OPS run vectorized NumPy code, the other operators run kernels compiled
+by TVM for the target, with their inputs and outputs copied from and to NumPy.
+
+The executor is created by ``relay.create_executor("numpy", mod)``, it is a
+fast reference to compare the other executors against.
+"""
+import re
+
+import numpy as np
+
+import tvm
+from tvm.ir import IRModule
+from tvm.runtime import container
+
+from . import compile_engine
+from .executor_cache import executor_cache
+from .interpreter import ConstructorValue, Executor, RefValue
+from .. import transform
+from .. import ty as _ty
+from ..adt import Constructor, PatternConstructor, PatternTuple, PatternVar, PatternWildcard
+from ..expr import Call, GlobalVar, Let, Var
+from ..expr_functor import ExprFunctor
+from ..function import Function
+
+# The NumPy implementations of the operators, by name.
+NUMPY_OPS = {}
+
+
+def register_numpy_op(op_name):
+    """Register the NumPy implementation of an operator.
+
+    The registered function takes the attributes of a call, the types of its
+    arguments and its type, and returns a function computing the call from
+    NumPy arrays, or None when the call is not supported and must run a TVM
+    kernel.
+
+    Parameters
+    ----------
+    op_name : str
+        The name of the operator.
+    """
+
+    def _register(make):
+        NUMPY_OPS[op_name] = make
+        return make
+
+    return _register
+
+
+class _ADT(object):
+    """A value of an algebraic data type in the Python program."""
+
+    __slots__ = ["constructor", "tag", "fields"]
+
+    def __init__(self, constructor, fields):
+        self.constructor = constructor
+        self.tag = constructor.tag
+        self.fields = fields
+
+
+class _Ref(object):
+    """A reference in the Python program."""
+
+    __slots__ = ["value"]
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _from_runtime(value):
+    """Convert an argument of the executor to a value of the Python program."""
+    if isinstance(value, tvm.nd.NDArray):
+        return value.asnumpy()
+    elif isinstance(value, np.ndarray):
+        return value
+    elif isinstance(value, (bool, np.bool_)):
+        return np.array(value, "bool")
+    elif isinstance(value, int):
+        return np.array(value, "int32")
+    elif isinstance(value, float):
+        return np.array(value, "float32")
+    elif isinstance(value, np.generic):
+        return np.array(value)
+    elif isinstance(value, (container.ADT, tuple, list)):
+        return tuple(_from_runtime(field) for field in value)
+    elif isinstance(value, ConstructorValue):
+        return _ADT(value.constructor, tuple(_from_runtime(field) for field in value.fields))
+    elif isinstance(value, RefValue):
+        return _Ref(_from_runtime(value.value))
+    raise TypeError("unsupported argument type: %s" % type(value))
+
+
+def _to_runtime(value):
+    """Convert a value of the Python program to a result of the executor."""
+    if isinstance(value, np.ndarray):
+        return tvm.nd.array(np.ascontiguousarray(value))
+    elif isinstance(value, tuple):
+        return container.tuple_object([_to_runtime(field) for field in value])
+    elif isinstance(value, _ADT):
+        fields = [_to_runtime(field) for field in value.fields]
+        return ConstructorValue(value.tag, fields, value.constructor)
+    elif isinstance(value, _Ref):
+        return RefValue(_to_runtime(value.value))
+    return value
+
+
+def _static_shape(ty):
+    """The shape of a tensor type as a tuple of ints, None if it is dynamic."""
+    if not isinstance(ty, _ty.TensorType):
+        return None
+    shape = []
+    for dim in ty.shape:
+        if not isinstance(dim, tvm.tir.IntImm):
+            return None
+        shape.append(int(dim))
+    return tuple(shape)
+
+
+def _ints(values):
+    """Convert an attribute to a list of ints, None stays None."""
+    if values is None:
+        return None
+    if isinstance(values, (int, tvm.tir.IntImm)):
+        return [int(values)]
+    return [int(value) for value in values]
+
+
+def _with_dtype(impl, dtype):
+    """Make the result of an implementation an array of the dtype of the call."""
+
+    def _kernel(*args):
+        return np.asarray(impl(*args), dtype=dtype)
+
+    return _kernel
+
+
+class _TVMKernel(object):
+    """A kernel compiled by TVM for a primitive function, called with NumPy arrays."""
+
+    def __init__(self, func, target, ctx):
+        self.param_types = [param.checked_type for param in func.params]
+        self.ret_type = func.checked_type.ret_type
+        self.out_types = self._flatten_types(self.ret_type)
+        for out_type in self.out_types:
+            if _static_shape(out_type) is None:
+                raise ValueError(
+                    "The NumPy executor only supports static output shapes, got", self.ret_type
+                )
+        self.func = compile_engine.get().jit(func, target)
+        self.ctx = ctx
+
+    @classmethod
+    def _flatten_types(cls, ty):
+        if isinstance(ty, _ty.TupleType):
+            return [t for field in ty.fields for t in cls._flatten_types(field)]
+        return [ty]
+
+    @classmethod
+    def _flatten(cls, value, ty):
+        if isinstance(ty, _ty.TupleType):
+            return [v for field, t in zip(value, ty.fields) for v in cls._flatten(field, t)]
+        return [value]
+
+    def _unflatten(self, outputs, ty):
+        if isinstance(ty, _ty.TupleType):
+            return tuple(self._unflatten(outputs, field) for field in ty.fields)
+        return outputs.pop(0).asnumpy()
+
+    def __call__(self, *args):
+        inputs = []
+        for arg, ty in zip(args, self.param_types):
+            for value in self._flatten(arg, ty):
+                inputs.append(tvm.nd.array(np.ascontiguousarray(value), self.ctx))
+        outputs = [tvm.nd.empty(_static_shape(t), t.dtype, self.ctx) for t in self.out_types]
+        self.func(*(inputs + outputs))
+        return self._unflatten(outputs, self.ret_type)
+
+
+class NumPyConverter(ExprFunctor):
+    """Convert the functions of a module to a Python program over NumPy arrays.
+
+    The module must be in A-normal form and type checked.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module.
+
+    target : tvm.Target
+        The target of the kernels of the operators without NumPy implementation.
+
+    ctx : tvmContext
+        The context to run these kernels on.
+    """
+
+    def __init__(self, mod, target, ctx):
+        super().__init__()
+        self.mod = mod
+        self.target = target
+        self.ctx = ctx
+        self.lines = []
+        self.indent = 0
+        # the objects the program refers to, kernels, constants and constructors
+        self.namespace = {"_ADT": _ADT, "_Ref": _Ref}
+        self.var_names = {}
+        self.global_names = {}
+        self.pending = []
+        self.num_names = 0
+
+    def convert(self):
+        """Convert the main function and the functions it calls.
+
+        Returns
+        -------
+        main : function
+            The Python function of main, over NumPy arrays.
+
+        source : str
+            The source of the program.
+        """
+        main = self.visit(self.mod.get_global_var("main"))
+        while self.pending:
+            gvar = self.pending.pop()
+            self.memo_map = {}
+            self.convert_function(self.global_names[gvar], self.mod[gvar])
+        source = "\n".join(self.lines) + "\n"
+        code = compile(source, "<relay numpy program>", "exec")
+        exec(code, self.namespace)  # pylint: disable=exec-used
+        return self.namespace[main], source
+
+    def fresh_name(self, hint):
+        name = "%s_%d" % (re.sub(r"\W", "_", hint) or "v", self.num_names)
+        self.num_names += 1
+        return name
+
+    def bind_object(self, value, hint):
+        """Add an object to the namespace of the program, return its name."""
+        name = self.fresh_name("_" + hint)
+        self.namespace[name] = value
+        return name
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def bind_var(self, var):
+        name = self.fresh_name(var.name_hint)
+        self.var_names[var] = name
+        return name
+
+    def convert_function(self, name, func):
+        """Emit the definition of a Python function with the name."""
+        if func.attrs and "Compiler" in func.attrs:
+            raise ValueError("The NumPy executor does not support external functions")
+        params = [self.bind_var(param) for param in func.params]
+        self.emit("def %s(%s):" % (name, ", ".join(params)))
+        self.indent += 1
+        self.emit("return %s" % self.visit(func.body))
+        self.indent -= 1
+
+    def op_kernel(self, call):
+        """The kernel of an operator or primitive function call."""
+        if isinstance(call.op, tvm.ir.Op):
+            make = NUMPY_OPS.get(call.op.name, None)
+            arg_types = [arg.checked_type for arg in call.args]
+            impl = make(call.attrs, arg_types, call.checked_type) if make else None
+            if impl is not None:
+                if isinstance(call.checked_type, _ty.TensorType):
+                    impl = _with_dtype(impl, call.checked_type.dtype)
+                return self.bind_object(impl, call.op.name)
+            params = [Var("p%d" % i, ty) for i, ty in enumerate(arg_types)]
+            func = Function(params, Call(call.op, params, call.attrs, call.type_args))
+            func = func.with_attr("Primitive", tvm.tir.IntImm("int32", 1))
+            func = transform.InferType()(IRModule.from_expr(func))["main"]
+            hint = call.op.name
+        else:
+            func, hint = call.op, "primitive"
+        return self.bind_object(_TVMKernel(func, self.target, self.ctx), hint)
+
+    # Each visitor emits the statements computing an expression and returns a
+    # Python expression of its value, which has no side effects.
+
+    def visit_function(self, func):
+        if func.attrs and "Primitive" in func.attrs:
+            raise ValueError("primitive functions can only be called")
+        name = self.fresh_name("fn")
+        self.convert_function(name, func)
+        return name
+
+    def visit_let(self, let):
+        expr = let
+        while isinstance(expr, Let):
+            name = self.bind_var(expr.var)
+            if isinstance(expr.value, Function):
+                # bound before the function is converted, it may be recursive
+                self.convert_function(name, expr.value)
+            else:
+                self.emit("%s = %s" % (name, self.visit(expr.value)))
+            expr = expr.body
+        return self.visit(expr)
+
+    def visit_call(self, call):
+        args = ", ".join(self.visit(arg) for arg in call.args)
+        if isinstance(call.op, tvm.ir.Op) or (
+            isinstance(call.op, Function) and call.op.attrs and "Primitive" in call.op.attrs
+        ):
+            return "%s(%s)" % (self.op_kernel(call), args)
+        if isinstance(call.op, Constructor):
+            constructor = self.bind_object(call.op, call.op.name_hint)
+            return "_ADT(%s, (%s))" % (constructor, args + "," if args else "")
+        return "%s(%s)" % (self.visit(call.op), args)
+
+    def visit_var(self, var):
+        if var not in self.var_names:
+            raise ValueError("free variable %s" % var.name_hint)
+        return self.var_names[var]
+
+    def visit_global_var(self, gvar):
+        if gvar not in self.global_names:
+            self.global_names[gvar] = self.fresh_name(gvar.name_hint)
+            self.pending.append(gvar)
+        return self.global_names[gvar]
+
+    def visit_if(self, ite):
+        result = self.fresh_name("if")
+        self.emit("if %s:" % self.visit(ite.cond))
+        self.indent += 1
+        self.emit("%s = %s" % (result, self.visit(ite.true_branch)))
+        self.indent -= 1
+        self.emit("else:")
+        self.indent += 1
+        self.emit("%s = %s" % (result, self.visit(ite.false_branch)))
+        self.indent -= 1
+        return result
+
+    def visit_tuple(self, tup):
+        fields = [self.visit(field) for field in tup.fields]
+        return "(%s)" % "".join(field + ", " for field in fields)
+
+    def visit_tuple_getitem(self, op):
+        return "%s[%d]" % (self.visit(op.tuple_value), op.index)
+
+    def visit_constant(self, const):
+        return self.bind_object(const.data.asnumpy(), "const")
+
+    def visit_op(self, op):
+        raise ValueError("operator %s can only be called" % op.name)
+
+    def visit_constructor(self, con):
+        constructor = self.bind_object(con, con.name_hint)
+        return "(lambda *fields: _ADT(%s, fields))" % constructor
+
+    def visit_ref_create(self, r):
+        return "_Ref(%s)" % self.visit(r.value)
+
+    def visit_ref_read(self, r):
+        return "%s.value" % self.visit(r.ref)
+
+    def visit_ref_write(self, r):
+        self.emit("%s.value = %s" % (self.visit(r.ref), self.visit(r.value)))
+        return "()"
+
+    def visit_match(self, match):
+        data = self.fresh_name("match")
+        result = self.fresh_name("match_result")
+        self.emit("%s = %s" % (data, self.visit(match.data)))
+        for i, clause in enumerate(match.clauses):
+            self.emit("%s %s:" % ("elif" if i else "if", self.match_check(clause.lhs, data)))
+            self.indent += 1
+            self.match_bind(clause.lhs, data)
+            self.emit("%s = %s" % (result, self.visit(clause.rhs)))
+            self.indent -= 1
+        self.emit("else:")
+        self.emit("    raise RuntimeError('no clause matched %s')" % data)
+        return result
+
+    def match_check(self, pattern, data):
+        """A Python condition checking that a value matches a pattern."""
+        if isinstance(pattern, (PatternWildcard, PatternVar)):
+            return "True"
+        conds = []
+        if isinstance(pattern, PatternConstructor):
+            conds.append("%s.tag == %d" % (data, pattern.constructor.tag))
+            fields = "%s.fields" % data
+        else:
+            assert isinstance(pattern, PatternTuple)
+            fields = data
+        for i, sub_pattern in enumerate(pattern.patterns):
+            if isinstance(sub_pattern, (PatternConstructor, PatternTuple)):
+                conds.append(self.match_check(sub_pattern, "%s[%d]" % (fields, i)))
+        return " and ".join("(%s)" % cond for cond in conds) if conds else "True"
+
+    def match_bind(self, pattern, data):
+        """Emit the bindings of the variables of a pattern matching a value."""
+        if isinstance(pattern, PatternVar):
+            self.emit("%s = %s" % (self.bind_var(pattern.var), data))
+        elif isinstance(pattern, (PatternConstructor, PatternTuple)):
+            fields = "%s.fields" % data if isinstance(pattern, PatternConstructor) else data
+            for i, sub_pattern in enumerate(pattern.patterns):
+                self.match_bind(sub_pattern, "%s[%d]" % (fields, i))
+
+
+class NumPyExecutor(Executor):
+    """Reference executor running a Relay module as a Python program over NumPy.
+
+    Parameters
+    ----------
+    mod : tvm.IRModule
+        The module to support the execution.
+
+    ctx : tvmContext
+        The runtime context of the kernels of the operators without NumPy
+        implementation.
+
+    target : tvm.Target
+        The target to build these kernels for.
+    """
+
+    def __init__(self, mod, ctx, target):
+        self.mod = mod
+        self.ctx = ctx
+        self.target = target
+
+    def optimize(self):
+        """Prepare the module for the conversion to Python.
+
+        Returns
+        -------
+        opt_mod : tvm.IRModule
+            The module in A-normal form, type checked.
+        """
+        seq = tvm.transform.Sequential(
+            [
+                transform.SimplifyInference(),
+                transform.ToANormalForm(),
+                transform.InferType(),
+            ]
+        )
+        return seq(self.mod)
+
+    def compile(self):
+        """Convert the main function of the module to Python.
+
+        Returns
+        -------
+        main : function
+            The Python function of main, over NumPy arrays.
+
+        source : str
+            The source of the program.
+        """
+        key = executor_cache.key("numpy", self.mod, self.target, self.ctx)
+        entry = executor_cache.get(key, self.mod)
+        if entry is None:
+            entry = NumPyConverter(self.optimize(), self.target, self.ctx).convert()
+            executor_cache.put(key, self.mod, entry)
+        return entry
+
+    def _make_executor(self, expr=None):
+        if expr is None or isinstance(expr, GlobalVar):
+            assert self.mod is not None
+        if isinstance(expr, GlobalVar):
+            self.mod["main"] = self.mod[expr]
+        elif expr is not None:
+            assert isinstance(expr, Function)
+            if self.mod:
+                self.mod["main"] = expr
+            else:
+                self.mod = IRModule.from_expr(expr)
+        main, _ = self.compile()
+        main_func = self.mod["main"]
+
+        def _numpy_wrapper(*args, **kwargs):
+            args = self._convert_args(main_func, args, kwargs)
+            return _to_runtime(main(*[_from_runtime(arg) for arg in args]))
+
+        return _numpy_wrapper
+
+
+def _elementwise(func):
+    """An implementation valid for arguments of any dtype."""
+    return lambda attrs, arg_types, out_type: func
+
+
+def _float_only(func):
+    """An implementation valid for floating point arguments only."""
+
+    def _make(attrs, arg_types, out_type):
+        if all(isinstance(t, _ty.TensorType) and t.dtype.startswith("float") for t in arg_types):
+            return func
+        return None
+
+    return _make
+
+
+for _name, _func in [
+    ("add", np.add),
+    ("subtract", np.subtract),
+    ("multiply", np.multiply),
+    ("maximum", np.maximum),
+    ("minimum", np.minimum),
+    ("floor_divide", np.floor_divide),
+    ("floor_mod", np.mod),
+    ("equal", np.equal),
+    ("not_equal", np.not_equal),
+    ("less", np.less),
+    ("less_equal", np.less_equal),
+    ("greater", np.greater),
+    ("greater_equal", np.greater_equal),
+    ("logical_and", np.logical_and),
+    ("logical_or", np.logical_or),
+    ("logical_xor", np.logical_xor),
+    ("logical_not", np.logical_not),
+    ("bitwise_and", np.bitwise_and),
+    ("bitwise_or", np.bitwise_or),
+    ("bitwise_xor", np.bitwise_xor),
+    ("bitwise_not", np.invert),
+    ("negative", np.negative),
+    ("abs", np.abs),
+    ("sign", np.sign),
+    ("copy", np.copy),
+    ("isnan", np.isnan),
+    ("isinf", np.isinf),
+    ("isfinite", np.isfinite),
+    ("where", np.where),
+    ("nn.relu", lambda x: np.maximum(x, x.dtype.type(0))),
+    ("zeros_like", np.zeros_like),
+    ("ones_like", np.ones_like),
+    ("full_like", lambda x, fill_value: np.full_like(x, fill_value)),
+]:
+    register_numpy_op(_name)(_elementwise(_func))
+
+# integer division and power round differently in NumPy
+for _name, _func in [
+    ("divide", np.true_divide),
+    ("power", np.power),
+    ("exp", np.exp),
+    ("log", np.log),
+    ("sqrt", np.sqrt),
+    ("rsqrt", lambda x: 1 / np.sqrt(x)),
+    ("tanh", np.tanh),
+    ("sigmoid", lambda x: 1 / (1 + np.exp(-x))),
+    ("sin", np.sin),
+    ("cos", np.cos),
+    ("tan", np.tan),
+    ("floor", np.floor),
+    ("ceil", np.ceil),
+    ("trunc", np.trunc),
+]:
+    register_numpy_op(_name)(_float_only(_func))
+
+
+@register_numpy_op("cast")
+def _cast(attrs, arg_types, out_type):
+    return lambda x: x.astype(out_type.dtype)
+
+
+@register_numpy_op("clip")
+def _clip(attrs, arg_types, out_type):
+    return lambda x: np.clip(x, attrs.a_min, attrs.a_max)
+
+
+@register_numpy_op("reshape")
+@register_numpy_op("reshape_like")
+@register_numpy_op("squeeze")
+@register_numpy_op("expand_dims")
+@register_numpy_op("nn.batch_flatten")
+def _reshape(attrs, arg_types, out_type):
+    shape = _static_shape(out_type)
+    if shape is None:
+        return None
+    return lambda x, *_: np.reshape(x, shape)
+
+
+@register_numpy_op("broadcast_to")
+@register_numpy_op("broadcast_to_like")
+def _broadcast_to(attrs, arg_types, out_type):
+    shape = _static_shape(out_type)
+    if shape is None:
+        return None
+    return lambda x, *_: np.broadcast_to(x, shape)
+
+
+def _make_full(fill_value):
+    def _make(attrs, arg_types, out_type):
+        shape = _static_shape(out_type)
+        if shape is None:
+            return None
+        if fill_value is None:
+            return lambda fill: np.full(shape, fill, out_type.dtype)
+        return lambda: np.full(shape, fill_value, out_type.dtype)
+
+    return _make
+
+
+register_numpy_op("zeros")(_make_full(0))
+register_numpy_op("ones")(_make_full(1))
+register_numpy_op("full")(_make_full(None))
+
+
+@register_numpy_op("transpose")
+def _transpose(attrs, arg_types, out_type):
+    axes = _ints(attrs.axes)
+    return lambda x: np.transpose(x, axes or None)
+
+
+@register_numpy_op("concatenate")
+def _concatenate(attrs, arg_types, out_type):
+    return lambda tup: np.concatenate(tup, int(attrs.axis))
+
+
+@register_numpy_op("stack")
+def _stack(attrs, arg_types, out_type):
+    return lambda tup: np.stack(tup, int(attrs.axis))
+
+
+@register_numpy_op("split")
+def _split(attrs, arg_types, out_type):
+    sections = attrs.indices_or_sections
+    sections = int(sections) if isinstance(sections, tvm.tir.IntImm) else _ints(sections)
+    return lambda x: tuple(np.split(x, sections, int(attrs.axis)))
+
+
+@register_numpy_op("take")
+def _take(attrs, arg_types, out_type):
+    mode = {"clip": "clip", "wrap": "wrap", "fast": "raise"}[attrs.mode]
+    axis = None if attrs.axis is None else int(attrs.axis)
+    return lambda x, indices: np.take(x, indices, axis, mode=mode)
+
+
+def _reduce_axes(attrs, ndim):
+    """The axes reduced by a reduction, as a tuple of non negative ints."""
+    axes = _ints(attrs.axis)
+    if axes is None:
+        return tuple(range(ndim))
+    axes = [axis + ndim if axis < 0 else axis for axis in axes]
+    if attrs.exclude:
+        axes = [axis for axis in range(ndim) if axis not in axes]
+    return tuple(axes)
+
+
+def _make_reduce(func):
+    def _make(attrs, arg_types, out_type):
+        axes = _reduce_axes(attrs, len(arg_types[0].shape))
+        return lambda x: func(x, axis=axes, keepdims=bool(attrs.keepdims))
+
+    return _make
+
+
+for _name, _func in [
+    ("sum", np.sum),
+    ("prod", np.prod),
+    ("max", np.max),
+    ("min", np.min),
+    ("all", np.all),
+    ("any", np.any),
+]:
+    register_numpy_op(_name)(_make_reduce(_func))
+
+
+@register_numpy_op("mean")
+def _mean(attrs, arg_types, out_type):
+    if not arg_types[0].dtype.startswith("float"):
+        return None
+    axes = _reduce_axes(attrs, len(arg_types[0].shape))
+    return lambda x: np.mean(x, axis=axes, keepdims=bool(attrs.keepdims))
+
+
+def _make_arg_reduce(func):
+    def _make(attrs, arg_types, out_type):
+        ndim = len(arg_types[0].shape)
+        axes = _reduce_axes(attrs, ndim)
+        if len(axes) != 1:
+            return None
+        axis = axes[0]
+        if attrs.keepdims:
+            return lambda x: np.expand_dims(func(x, axis=axis), axis)
+        return lambda x: func(x, axis=axis)
+
+    return _make
+
+
+register_numpy_op("argmax")(_make_arg_reduce(np.argmax))
+register_numpy_op("argmin")(_make_arg_reduce(np.argmin))
+
+
+def _softmax(x, axis):
+    exp = np.exp(x - np.max(x, axis=axis, keepdims=True))
+    return exp / np.sum(exp, axis=axis, keepdims=True)
+
+
+def _log_softmax(x, axis):
+    shifted = x - np.max(x, axis=axis, keepdims=True)
+    return shifted - np.log(np.sum(np.exp(shifted), axis=axis, keepdims=True))
+
+
+@register_numpy_op("nn.softmax")
+def _make_softmax(attrs, arg_types, out_type):
+    return lambda x: _softmax(x, int(attrs.axis))
+
+
+@register_numpy_op("nn.log_softmax")
+def _make_log_softmax(attrs, arg_types, out_type):
+    return lambda x: _log_softmax(x, int(attrs.axis))
+
+
+@register_numpy_op("nn.leaky_relu")
+def _leaky_relu(attrs, arg_types, out_type):
+    return lambda x: np.where(x > 0, x, x * x.dtype.type(attrs.alpha))
+
+
+@register_numpy_op("nn.bias_add")
+def _bias_add(attrs, arg_types, out_type):
+    ndim = len(arg_types[0].shape)
+    axis = int(attrs.axis) % ndim
+    shape = [-1] + [1] * (ndim - axis - 1)
+    return lambda x, bias: x + np.reshape(bias, shape)
+
+
+@register_numpy_op("nn.dense")
+def _dense(attrs, arg_types, out_type):
+    # accumulate in the output dtype, e.g. int32 for int8 inputs
+    dtype = out_type.dtype
+    return lambda x, w: np.matmul(x.astype(dtype), w.astype(dtype).T)
+
+
+@register_numpy_op("nn.batch_matmul")
+def _batch_matmul(attrs, arg_types, out_type):
+    dtype = out_type.dtype
+    return lambda x, y: np.matmul(x.astype(dtype), np.swapaxes(y.astype(dtype), 1, 2))
+
+
+def _make_conv(ndim, data_layout, kernel_layout):
+    def _make(attrs, arg_types, out_type):
+        # pylint: disable=import-outside-toplevel
+        from tvm.topi.testing.im2col import conv_nchw
+
+        if (
+            attrs.data_layout != data_layout
+            or attrs.kernel_layout != kernel_layout
+            or attrs.out_layout not in ("", data_layout)
+            or int(attrs.groups) != 1
+        ):
+            return None
+        strides, dilation = _ints(attrs.strides), _ints(attrs.dilation)
+        padding = _ints(attrs.padding)
+        if len(padding) == 1:
+            padding = padding * ndim
+        if len(padding) == ndim:
+            padding = padding * 2
+        pads = list(zip(padding[:ndim], padding[ndim:]))
+        return lambda x, w: conv_nchw(x, w, strides, pads, dilation)
+
+    return _make
+
+
+register_numpy_op("nn.conv1d")(_make_conv(1, "NCW", "OIW"))
+register_numpy_op("nn.conv2d")(_make_conv(2, "NCHW", "OIHW"))
+register_numpy_op("nn.conv3d")(_make_conv(3, "NCDHW", "OIDHW"))
+
+
+def _make_global_pool(func):
+    def _make(attrs, arg_types, out_type):
+        if attrs.layout != "NCHW":
+            return None
+        return lambda x: func(x, axis=(2, 3), keepdims=True)
+
+    return _make
+
+
+register_numpy_op("nn.global_avg_pool2d")(_make_global_pool(np.mean))
+register_numpy_op("nn.global_max_pool2d")(_make_global_pool(np.max))
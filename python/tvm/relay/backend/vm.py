@@ -28,6 +28,7 @@ import tvm.runtime.vm as vm_rt
 from tvm import autotvm
 from tvm.relay import expr as _expr
 from tvm.relay.backend.interpreter import Executor
+from tvm.relay.backend.executor_cache import executor_cache
 from . import _vm
 
 
@@ -254,7 +255,11 @@ class VMExecutor(Executor):
         self.mod = mod
         self.ctx = ctx
         self.target = target
-        self.executable = compile(mod, target)
+        key = executor_cache.key("vm", mod, target)
+        self.executable = executor_cache.get(key, mod)
+        if self.executable is None:
+            self.executable = compile(mod, target)
+            executor_cache.put(key, mod, self.executable)
         self.vm = vm_rt.VirtualMachine(self.executable, ctx)
 
     def _make_executor(self, expr=None):
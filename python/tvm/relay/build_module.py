@@ -35,6 +35,8 @@ from . import function as _function
 from .transform import InferType
 from .backend import graph_runtime_factory as _graph_runtime_factory
 from .backend import interpreter as _interpreter
+from .backend.executor_cache import executor_cache
+from .backend.numpy_executor import NumPyExecutor
 from .backend.vm import VMExecutor
 
 
@@ -384,7 +386,11 @@ class GraphExecutor(_interpreter.Executor):
         if _ty.is_dynamic(ret_type):
             raise ValueError("Graph Runtime only supports static graphs, got output type", ret_type)
         num_outputs = len(ret_type.fields) if isinstance(ret_type, _ty.TupleType) else 1
-        mod = build(self.mod, target=self.target)
+        key = executor_cache.key("graph", self.mod, self.target)
+        mod = executor_cache.get(key, self.mod)
+        if mod is None:
+            mod = build(self.mod, target=self.target)
+            executor_cache.put(key, self.mod, mod)
         gmodule = _graph_rt.GraphModule(mod["default"](self.ctx))
 
         def _graph_wrapper(*args, **kwargs):
@@ -426,8 +432,9 @@ def create_executor(kind="debug", mod=None, ctx=None, target="llvm"):
     ----------
     kind : str
         The type of executor. Avaliable options are `debug` for the
-        interpreter, `graph` for the graph runtime, and `vm` for the virtual
-        machine.
+        interpreter, `graph` for the graph runtime, `vm` for the virtual
+        machine, and `numpy` for the reference executor running the module
+        as a Python program over NumPy arrays.
 
     mod : :py:class:`~tvm.IRModule`
         The Relay module containing collection of functions
@@ -441,6 +448,12 @@ def create_executor(kind="debug", mod=None, ctx=None, target="llvm"):
     Returns
     -------
     executor : :py:class:`~tvm.relay.backend.interpreter.Executor`
+
+    Note
+    ----
+    When TVM_EXECUTOR_CACHE_SIZE is set, the optimized modules, libraries and
+    executables of the executors are cached and reused by the executors of
+    structurally equal modules, see :py:mod:`tvm.relay.backend.executor_cache`.
     """
     if mod is None:
         mod = IRModule()
@@ -457,4 +470,6 @@ def create_executor(kind="debug", mod=None, ctx=None, target="llvm"):
         return GraphExecutor(mod, ctx, target)
     if kind == "vm":
         return VMExecutor(mod, ctx, target)
+    if kind == "numpy":
+        return NumPyExecutor(mod, ctx, target)
     raise RuntimeError("unknown execution strategy: {0}".format(kind))
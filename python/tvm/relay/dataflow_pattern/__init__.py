@@ -16,6 +16,7 @@
 # under the License.
 """The Relay Pattern Language and tooling."""
 # pylint: disable=no-member
+import time
 from typing import Callable, Dict, List, Optional
 
 import tvm._ffi
@@ -756,10 +757,61 @@ class _DFPatternCallback(Object):
         self.__init_handle_by_constructor__(ffi.DFPatternCallback, pattern, callback, require_type)
 
 
-def rewrite(callbacks, expr: Expr, mod: Optional[_ir.IRModule] = None) -> Expr:
+class RewriteStats:
+    """The calls of a callback by :py:func:`rewrite`.
+
+    Attributes
+    ----------
+    calls : int
+        The number of matches the callback was called on.
+    rewrites : int
+        The number of calls that returned a new expression.
+    seconds : float
+        The time spent in the callback.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.rewrites = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return "RewriteStats(calls=%d, rewrites=%d, seconds=%.6f)" % (
+            self.calls,
+            self.rewrites,
+            self.seconds,
+        )
+
+
+def _profile_callback(callback, stats):
+    """Wrap the callback function to record its calls in stats."""
+
+    def _callback(pre, post, node_map):
+        start = time.perf_counter()
+        result = callback.callback(pre, post, node_map)
+        stats.seconds += time.perf_counter() - start
+        stats.calls += 1
+        if not post.same_as(result):
+            stats.rewrites += 1
+        return result
+
+    return _callback
+
+
+def rewrite(
+    callbacks,
+    expr: Expr,
+    mod: Optional[_ir.IRModule] = None,
+    stats: Optional[Dict[DFPatternCallback, RewriteStats]] = None,
+) -> Expr:
     """
     Rewrite expression with the given callbacks.
 
+    The callbacks are applied in order, repeatedly, until the expression stops
+    changing. A callback only tries the calls of the ops its pattern can be
+    rooted at, and after its first pass only the expressions created since,
+    unless its pattern contains a dominator pattern.
+
     Parameters
     ----------
     callbacks: tvm.relay.dataflow_pattern.DFPatternCallback
@@ -768,6 +820,10 @@ def rewrite(callbacks, expr: Expr, mod: Optional[_ir.IRModule] = None) -> Expr:
         The expression to rewrite.
     mod : Optional[tvm.ir.IRModule]
         The module that associates with the expression.
+    stats : Optional[Dict[DFPatternCallback, RewriteStats]]
+        When given, the calls of each callback are added to its RewriteStats
+        in the dict, which is created when missing. The same dict can be used
+        to accumulate the calls of several rewrites.
 
     Returns
     -------
@@ -780,7 +836,10 @@ def rewrite(callbacks, expr: Expr, mod: Optional[_ir.IRModule] = None) -> Expr:
     tmp = []
     for callback in callbacks:
         assert callback.pattern is not None
-        tmp.append(_DFPatternCallback(callback.pattern, callback.callback, callback.require_type))
+        function = callback.callback
+        if stats is not None:
+            function = _profile_callback(callback, stats.setdefault(callback, RewriteStats()))
+        tmp.append(_DFPatternCallback(callback.pattern, function, callback.require_type))
 
     return ffi.rewrite(tmp, expr, mod)
 
@@ -617,3 +617,28 @@ def to_int_list(np_array):
     cause problems in relay/TOPI.
     """
     return [int(x) for x in np_array]
+
+
+def to_nd_array(value):
+    """Convert a weight of a model to an NDArray on the CPU.
+
+    The NDArray shares the memory of the weight when it is a numpy array, or
+    an object exposing the buffer protocol, that is C contiguous and aligned
+    as the arrays of the runtime. The weight is copied once otherwise.
+
+    Parameters
+    ----------
+    value : Union[numpy.ndarray, tvm.nd.NDArray, object]
+        The weight.
+
+    Returns
+    -------
+    arr : tvm.nd.NDArray
+        The weight as an NDArray.
+    """
+    if isinstance(value, tvm.nd.NDArray):
+        return value
+    value = np.asarray(value)
+    if tvm.nd.can_share(value):
+        return tvm.nd.share(value)
+    return tvm.nd.array(value)
@@ -17,13 +17,13 @@
 # pylint: disable=invalid-name, import-self, len-as-condition, unused-argument, too-many-lines
 # pylint: disable=import-outside-toplevel
 """ONNX: Open Neural Network Exchange frontend for Relay."""
+import os
 import warnings
 import numpy as np
 import tvm
 from tvm.ir import IRModule
 from tvm.topi.utils import get_const_tuple
 
-from ... import nd as _nd
 from .. import analysis
 from .. import expr as _expr
 from .. import function as _function
@@ -34,7 +34,7 @@ from .. import ty as _ty
 
 from .common import AttrCvt, Renamer
 from .common import get_relay_op, new_var, infer_shape, infer_channels
-from .common import infer_type, get_name
+from .common import infer_type, get_name, to_nd_array
 
 
 __all__ = ["from_onnx"]
@@ -90,12 +90,32 @@ class onnx_input:
         raise StopIteration
 
 
-def get_numpy(tensor_proto):
-    """Grab data in TensorProto and convert to numpy array."""
+def get_numpy(tensor_proto, external_data_dir=None):
+    """Grab data in TensorProto and convert to numpy array.
+
+    The data of a tensor stored in an external file is mapped copy on write
+    from the file instead of being read.
+    """
     try:
+        from onnx import TensorProto
+        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE
         from onnx.numpy_helper import to_array
     except ImportError as e:
         raise ImportError("Unable to import onnx which is required {}".format(e))
+    if (
+        tensor_proto.HasField("data_location")
+        and tensor_proto.data_location == TensorProto.EXTERNAL
+        and tensor_proto.data_type != TensorProto.STRING
+    ):
+        info = {entry.key: entry.value for entry in tensor_proto.external_data}
+        path = os.path.join(external_data_dir or "", info["location"])
+        return np.memmap(
+            path,
+            dtype=TENSOR_TYPE_TO_NP_TYPE[tensor_proto.data_type],
+            mode="c",
+            offset=int(info.get("offset", 0)),
+            shape=tuple(tensor_proto.dims),
+        )
     return to_array(tensor_proto)
 
 
@@ -2137,7 +2157,9 @@ class Loop(OnnxOpConverter):
 
         # Get the current graph proto and create a clone for the subgraph
         graph_scope = GraphProto.current
-        subgraph_scope = GraphProto(graph_scope._shape, graph_scope._dtype)
+        subgraph_scope = GraphProto(
+            graph_scope._shape, graph_scope._dtype, graph_scope._external_data_dir
+        )
         # Load nodes from outer graph into inner graph.
         subgraph_scope._nodes = graph_scope._nodes.copy()
 
@@ -2275,9 +2297,13 @@ class If(OnnxOpConverter):
 
         # Create graph converters for both branches.
         graph_scope = GraphProto.current
-        then_graph = GraphProto(graph_scope._shape, graph_scope._dtype)
+        then_graph = GraphProto(
+            graph_scope._shape, graph_scope._dtype, graph_scope._external_data_dir
+        )
         then_graph._nodes = graph_scope._nodes.copy()
-        else_graph = GraphProto(graph_scope._shape, graph_scope._dtype)
+        else_graph = GraphProto(
+            graph_scope._shape, graph_scope._dtype, graph_scope._external_data_dir
+        )
         else_graph._nodes = graph_scope._nodes.copy()
 
         # Convert each branch to a relay expression.
@@ -2743,11 +2769,14 @@ class GraphProto:
 
     dtype : str or dict of str to str
         The input types to the graph
+
+    external_data_dir : str, optional
+        The directory of the files of the tensors stored as external data
     """
 
     current = None
 
-    def __init__(self, shape, dtype):
+    def __init__(self, shape, dtype, external_data_dir=None):
         self._nodes = {}
         self._params = {}
         self._inputs = {}
@@ -2756,6 +2785,7 @@ class GraphProto:
         self._num_param = 0
         self._shape = shape if shape else {}
         self._dtype = dtype
+        self._external_data_dir = external_data_dir
         self.opset = None
 
     def __enter__(self):
@@ -2938,8 +2968,8 @@ class GraphProto:
         return name
 
     def _parse_array(self, tensor_proto):
-        np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
-        return _nd.array(np_array)
+        np_array = get_numpy(tensor_proto, self._external_data_dir)
+        return to_nd_array(np_array.reshape(tuple(tensor_proto.dims)))
 
     def _parse_attr(self, attr_proto):
         """Convert a list of AttributeProto to a dict, with names as keys."""
@@ -3008,7 +3038,9 @@ class GraphProto:
         return outputs
 
 
-def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=False):
+def from_onnx(
+    model, shape=None, dtype="float32", opset=None, freeze_params=False, external_data_dir=None
+):
     """Convert a ONNX model into an equivalent Relay Function.
 
     ONNX graphs are represented as Python Protobuf objects.
@@ -3047,6 +3079,13 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
         at compile time and helps in making models static if certain inputs represent
         attributes relay would traditionally consider compile-time constants.
 
+    external_data_dir : str, optional
+        The directory of the external data files of a model loaded with
+        ``onnx.load(path, load_external_data=False)``, usually the directory of
+        the model. The weights are then mapped from the files instead of being
+        read into the model, and the parameters share their memory when they
+        are aligned. Defaults to the current directory.
+
     Returns
     -------
     mod : tvm.IRModule
@@ -3067,7 +3106,7 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
                 warnings.warn(str(e))
     except ImportError:
         pass
-    g = GraphProto(shape, dtype)
+    g = GraphProto(shape, dtype, external_data_dir)
     graph = model.graph
     if opset is None:
         try:
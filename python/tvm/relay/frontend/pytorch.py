@@ -39,7 +39,7 @@ from ..loops import while_loop
 from .. import transform
 from .common import AttrCvt, get_relay_op
 from .common import infer_value as _infer_value
-from .common import try_infer_value
+from .common import try_infer_value, to_nd_array
 from .common import infer_value_simulated as _infer_value_simulated
 from ..prelude import Prelude, StaticTensorArrayOps
 from ..expr_functor import ExprMutator
@@ -2645,8 +2645,23 @@ def _run_jit_passes(graph):
         torch._C._jit_pass_inline(graph)
 
 
+def _to_nd_array(torch_tensor):
+    """Convert a weight to an NDArray sharing the storage of the tensor through
+    DLPack when the storage is contiguous and aligned as the runtime arrays."""
+    from torch.utils import dlpack
+
+    torch_tensor = torch_tensor.detach().cpu()
+    if torch_tensor.is_contiguous() and torch_tensor.data_ptr() % 64 == 0:
+        try:
+            return tvm.nd.from_dlpack(dlpack.to_dlpack(torch_tensor))
+        except (RuntimeError, ValueError, tvm.TVMError):
+            # dtypes without a DLPack conversion, e.g. quantized tensors
+            pass
+    return to_nd_array(torch_tensor.numpy())
+
+
 def _get_tensor_and_var(torch_tensor, name):
-    tensor = tvm.nd.array(torch_tensor.cpu().numpy())
+    tensor = _to_nd_array(torch_tensor)
     var = _expr.var(name, shape=tensor.shape, dtype=tensor.dtype)
     return tensor, var
 
@@ -3050,7 +3065,7 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
         graph, input_infos, prelude, default_dtype=default_dtype, is_module=is_module
     )
     param_vars, tensors, packed_param_map = convert_params(graph, params)
-    tvm_params = {k: tvm.nd.array(v) for k, v in tensors.items()}
+    tvm_params = dict(tensors)
 
     outputs.update(param_vars)
     ret_name = _get_input_names(graph.return_node())
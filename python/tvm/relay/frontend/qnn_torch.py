@@ -24,7 +24,7 @@ import tvm
 from tvm import relay
 from tvm.relay import expr as _expr
 from tvm.relay import op as _op
-from tvm.relay.frontend.common import infer_shape
+from tvm.relay.frontend.common import infer_shape, to_nd_array
 
 from .pytorch_utils import is_version_greater_than
 
@@ -401,9 +401,9 @@ def add_input_quant_params_to_op_inputs(graph):
 def add_quant_params(params, quant_params):
     """ Add quant parameters to TVM param map """
     for qparam in quant_params.values():
-        params[qparam.weight_var.name_hint] = tvm.nd.array(qparam.weight)
+        params[qparam.weight_var.name_hint] = to_nd_array(qparam.weight)
         if qparam.bias is not None:
-            params[qparam.bias_var.name_hint] = tvm.nd.array(qparam.bias)
+            params[qparam.bias_var.name_hint] = to_nd_array(qparam.bias)
 
 
 def apply_with_upcast(data, func):
@@ -28,9 +28,8 @@ from .. import expr as _expr
 from .. import function as _function
 from .. import op as _op
 from .. import qnn as _qnn
-from ... import nd as _nd
 from .common import ExprTable
-from .common import infer_shape as _infer_shape, to_int_list
+from .common import infer_shape as _infer_shape, to_int_list, to_nd_array
 from .tflite_flexbuffer import FlexBufferDecoder
 
 
@@ -3358,7 +3357,7 @@ def from_tflite(model, shape_dict, dtype_dict):
     op_converter.convert_op_to_relay()
 
     # params and outputs
-    params = {k: _nd.array(np.array(v)) for k, v in exp_tab.params.items()}
+    params = {k: to_nd_array(v) for k, v in exp_tab.params.items()}
     outputs = [exp_tab.get_expr(get_tensor_name(subgraph, i)) for i in model_outputs]
     outputs = outputs[0] if len(outputs) == 1 else _expr.Tuple(outputs)
     func = _function.Function(analysis.free_vars(outputs), outputs)
@@ -28,6 +28,8 @@ from .op import (
     OpStrategy,
     debug,
     register_external_compiler,
+    register_mixed_precision_conversion,
+    MixedPrecisionCategory,
 )
 from . import strategy
 
@@ -52,6 +54,7 @@ from . import _tensor_grad
 from . import _transform
 from . import _reduce
 from . import _algorithm
+from . import _mixed_precision
 
 
 def _register_op_make():
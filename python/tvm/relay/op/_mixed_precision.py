@@ -0,0 +1,128 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Default conversion of the operators by the mixed precision pass."""
+# pylint: disable=unused-argument
+from .op import MixedPrecisionCategory, register_mixed_precision_conversion
+
+# Compute bound operators that gain the most from the lower precision, they
+# accumulate in float32 when they have an out_dtype.
+DEFAULT_ALLOW_LIST = [
+    "nn.conv1d",
+    "nn.conv2d",
+    "nn.conv3d",
+    "nn.conv1d_transpose",
+    "nn.conv2d_transpose",
+    "nn.conv3d_transpose",
+    "nn.contrib_conv2d_winograd_without_weight_transform",
+    "nn.dense",
+    "nn.batch_matmul",
+]
+
+# Operators that are as accurate in the lower precision, they run in it when
+# their inputs do.
+DEFAULT_FOLLOW_LIST = [
+    "add",
+    "subtract",
+    "multiply",
+    "divide",
+    "negative",
+    "abs",
+    "maximum",
+    "minimum",
+    "clip",
+    "where",
+    "nn.relu",
+    "nn.leaky_relu",
+    "nn.prelu",
+    "nn.bias_add",
+    "sigmoid",
+    "tanh",
+    "nn.max_pool1d",
+    "nn.max_pool2d",
+    "nn.max_pool3d",
+    "nn.avg_pool1d",
+    "nn.avg_pool2d",
+    "nn.avg_pool3d",
+    "nn.global_max_pool2d",
+    "nn.global_avg_pool2d",
+    "nn.adaptive_avg_pool2d",
+    "nn.pad",
+    "nn.dropout",
+    "nn.batch_flatten",
+    "nn.upsampling",
+    "nn.depth_to_space",
+    "nn.space_to_depth",
+    "image.resize",
+    "reshape",
+    "transpose",
+    "squeeze",
+    "expand_dims",
+    "concatenate",
+    "split",
+    "strided_slice",
+    "take",
+    "layout_transform",
+    "copy",
+    "zeros_like",
+    "ones_like",
+]
+
+# Operators whose range or accumulation needs float32.
+DEFAULT_DENY_LIST = [
+    "exp",
+    "log",
+    "sqrt",
+    "rsqrt",
+    "power",
+    "erf",
+    "sum",
+    "mean",
+    "variance",
+    "prod",
+    "nn.softmax",
+    "nn.log_softmax",
+    "nn.batch_norm",
+    "nn.layer_norm",
+    "nn.instance_norm",
+    "nn.group_norm",
+    "nn.l2_normalize",
+    "nn.lrn",
+    "nn.cross_entropy",
+    "nn.cross_entropy_with_logits",
+]
+
+
+def _allow(call, mixed_precision_type):
+    if call.attrs is not None and "out_dtype" in call.attrs.keys():
+        return [MixedPrecisionCategory.ALLOW, "float32", mixed_precision_type]
+    return [MixedPrecisionCategory.ALLOW, mixed_precision_type, mixed_precision_type]
+
+
+def _follow(call, mixed_precision_type):
+    return [MixedPrecisionCategory.FOLLOW, mixed_precision_type, mixed_precision_type]
+
+
+def _deny(call, mixed_precision_type):
+    return [MixedPrecisionCategory.DENY, mixed_precision_type, mixed_precision_type]
+
+
+for _op_name in DEFAULT_ALLOW_LIST:
+    register_mixed_precision_conversion(_op_name, _allow)
+for _op_name in DEFAULT_FOLLOW_LIST:
+    register_mixed_precision_conversion(_op_name, _follow)
+for _op_name in DEFAULT_DENY_LIST:
+    register_mixed_precision_conversion(_op_name, _deny)
@@ -397,6 +397,42 @@ def register_external_compiler(op_name, fexternal=None, level=10):
     return tvm.ir.register_op_attr(op_name, "FTVMExternalCompiler", fexternal, level)
 
 
+class MixedPrecisionCategory(object):
+    """How the mixed precision pass converts an operator
+
+    See Also
+    --------
+    relay.transform.ToMixedPrecision
+    """
+
+    # Always run in the mixed precision type, e.g. convolutions and dense
+    ALLOW = 0
+    # Run in the mixed precision type when an input already is
+    FOLLOW = 1
+    # Never run in the mixed precision type, e.g. exp or softmax
+    DENY = 2
+
+
+def register_mixed_precision_conversion(op_name, fconvert=None, level=10):
+    """Register how an op is converted by the mixed precision pass.
+
+    Parameters
+    ----------
+    op_name : str
+        The name of the operator.
+
+    fconvert : function (call: Call, mixed_precision_type: str)
+             -> [category: int, accumulation_dtype: str, output_dtype: str]
+        The function returning the MixedPrecisionCategory of a call, the dtype
+        it should accumulate in and the dtype of its output when it runs in
+        the mixed precision type. The dtypes are ignored for the other categories.
+
+    level : int
+        The priority level
+    """
+    return tvm.ir.register_op_attr(op_name, "FTVMMixedPrecisionConversionType", fconvert, level)
+
+
 @tvm._ffi.register_func("relay.op.compiler._lower")
 def _lower(name, schedule, inputs, outputs):
     return lower(schedule, list(inputs) + list(outputs), name=name)
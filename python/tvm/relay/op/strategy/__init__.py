@@ -19,12 +19,48 @@
 """Relay op strategies."""
 from __future__ import absolute_import as _abs
 
+import importlib
+
 from .generic import *
-from . import x86
-from . import arm_cpu
-from . import cuda
-from . import hls
-from . import mali
-from . import bifrost
-from . import rocm
-from . import intel_graphics
+from ...._lazy import is_enabled as _lazy_import_enabled
+
+# The modules specializing the strategies for each target key.
+_TARGET_STRATEGIES = {
+    "cpu": ["x86"],
+    "arm_cpu": ["arm_cpu"],
+    "micro_dev": ["arm_cpu"],
+    "cuda": ["cuda"],
+    "gpu": ["cuda"],
+    "hls": ["hls"],
+    "mali": ["mali"],
+    "bifrost": ["bifrost"],
+    "rocm": ["rocm"],
+    "intel_graphics": ["intel_graphics"],
+}
+
+
+def load_target_strategies(target):
+    """Import the strategies specialized for the keys of a target.
+
+    All of them are imported with the package, unless the lazy import mode
+    is enabled, in which case the compile engine loads them on first use.
+
+    Parameters
+    ----------
+    target : tvm.target.Target
+        The target.
+    """
+    for key in target.keys:
+        for name in _TARGET_STRATEGIES.get(key, []):
+            importlib.import_module("." + name, __name__)
+
+
+if not _lazy_import_enabled():
+    from . import x86
+    from . import arm_cpu
+    from . import cuda
+    from . import hls
+    from . import mali
+    from . import bifrost
+    from . import rocm
+    from . import intel_graphics
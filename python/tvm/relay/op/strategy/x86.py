@@ -480,6 +480,18 @@ def roi_align_strategy_cpu(attrs, inputs, out_type, target):
     return strategy
 
 
+@nms_strategy.register("cpu")
+def nms_strategy_cpu(attrs, inputs, out_type, target):
+    """nms x86 strategy"""
+    strategy = _op.OpStrategy()
+    strategy.add_implementation(
+        wrap_compute_nms(topi.x86.non_max_suppression),
+        wrap_topi_schedule(topi.generic.schedule_nms),
+        name="nms.x86",
+    )
+    return strategy
+
+
 @bitserial_conv2d_strategy.register("cpu")
 def bitserial_conv2d_strategy_cpu(attrs, inputs, out_type, target):
     """bitserial_conv2d x86 strategy"""
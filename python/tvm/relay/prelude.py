@@ -14,9 +14,14 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-# pylint: disable=no-else-return, unidiomatic-typecheck, invalid-name
+# pylint: disable=no-else-return, unidiomatic-typecheck, invalid-name, global-statement
 """A prelude containing useful global functions and ADT definitions."""
-from tvm.ir import IRModule, TypeCall
+import hashlib
+import os
+
+import tvm
+from tvm.ir import IRModule, TypeCall, load_binary, save_binary
+from tvm.support import libinfo
 from tvm.tir import Any
 from tvm.relay.transform import ToANormalFormExpr
 
@@ -92,6 +97,15 @@ def _get_name_static(canonical, dtype, shape):
     return "{}_{}_{}".format(canonical, dtype, shape_str)
 
 
+# The tensor ADTs of static shapes by name, shared by all the modules so that
+# the definitions memoized in _STATIC_TENSOR_ARRAY_DEFS agree with each other.
+_STATIC_TENSOR_ADTS = {}
+
+# The definitions added by StaticTensorArrayOps.register by the name of the tensor ADT,
+# as the new type definitions, functions and prelude attributes.
+_STATIC_TENSOR_ARRAY_DEFS = {}
+
+
 class StaticTensorArrayOps(object):
     """Contains tensor array related ops for fixed rank tensor array"""
 
@@ -136,18 +150,21 @@ class StaticTensorArrayOps(object):
             self.tensor_type_var = self.get_type("tensor_t")
             return
 
-        self.tensor_type_var = GlobalTypeVar(tensor_type_name)
-
-        tensor_type = TensorType(self.shape, self.dtype)
-        tensor_constructor_name = self.get_name("tensor_constructor")
+        if tensor_type_name not in _STATIC_TENSOR_ADTS:
+            tensor_type_var = GlobalTypeVar(tensor_type_name)
+            tensor_type = TensorType(self.shape, self.dtype)
+            tensor_constructor_name = self.get_name("tensor_constructor")
 
-        tensor_nil_name = self.get_name("tensor_nil")
-        tensor_nil_case = Constructor(tensor_nil_name, [], self.tensor_type_var)
-        tensor_case = Constructor(tensor_constructor_name, [tensor_type], self.tensor_type_var)
+            tensor_nil_name = self.get_name("tensor_nil")
+            tensor_nil_case = Constructor(tensor_nil_name, [], tensor_type_var)
+            tensor_case = Constructor(tensor_constructor_name, [tensor_type], tensor_type_var)
+            _STATIC_TENSOR_ADTS[tensor_type_name] = (
+                tensor_type_var,
+                TypeData(tensor_type_var, [], [tensor_nil_case, tensor_case]),
+            )
 
-        self.prelude.mod[self.tensor_type_var] = TypeData(
-            self.tensor_type_var, [], [tensor_nil_case, tensor_case]
-        )
+        self.tensor_type_var, type_data = _STATIC_TENSOR_ADTS[tensor_type_name]
+        self.prelude.mod[self.tensor_type_var] = type_data
 
     def define_tensor_array(self):
         """Defines a function to create a tensor array with size n.
@@ -650,7 +667,67 @@ class StaticTensorArrayOps(object):
         )
 
     def register(self):
-        """Register all tensor array ops in Prelude"""
+        """Register all tensor array ops in Prelude.
+
+        The definitions of a dtype and shape are generated once per process, and
+        added to the other modules using the base prelude as they are.
+        """
+        key = self.get_name("tensor_t")
+        if key not in _STATIC_TENSOR_ARRAY_DEFS:
+            _STATIC_TENSOR_ARRAY_DEFS[key] = self._trace_register()
+        if self._add_definitions(*_STATIC_TENSOR_ARRAY_DEFS[key]):
+            self.tensor_type_var = self.get_type("tensor_t")
+        else:
+            self._register()
+
+    def _trace_register(self):
+        """Register the ops in a new prelude, and return what they added to it."""
+        prelude = Prelude()
+
+        def _defs():
+            return (
+                dict(prelude.mod.type_definitions.items()),
+                dict(prelude.mod.functions.items()),
+                {name: var for name, var in vars(prelude).items() if isinstance(var, GlobalVar)},
+            )
+
+        def _added(before, after):
+            return {
+                key: value
+                for key, value in after.items()
+                if key not in before or not value.same_as(before[key])
+            }
+
+        before = _defs()
+        StaticTensorArrayOps(prelude, self.dtype, self.shape)._register()
+        types, funcs, attrs = [_added(*defs) for defs in zip(before, _defs())]
+        return types, funcs, [(name, var.name_hint) for name, var in attrs.items()]
+
+    def _add_definitions(self, types, funcs, attrs):
+        """Add the definitions registered in another prelude, return whether they
+        agree with the definitions of the module."""
+        mod = self.prelude.mod
+        if not _shares_base_prelude(mod):
+            return False
+        type_vars = {var.name_hint: var for var in mod.get_global_type_vars()}
+        global_vars = {var.name_hint: var for var in mod.get_global_vars()}
+        new_types, new_funcs = {}, {}
+        for defs, names, new_defs in [
+            (types, type_vars, new_types),
+            (funcs, global_vars, new_funcs),
+        ]:
+            for var, value in defs.items():
+                if var.name_hint not in names:
+                    new_defs[var] = value
+                elif not mod[names[var.name_hint]].same_as(value):
+                    return False
+        if new_types or new_funcs:
+            mod.update(IRModule(new_funcs, new_types))
+        for name, var_name in attrs:
+            setattr(self.prelude, name, mod.get_global_var(var_name))
+        return True
+
+    def _register(self):
         self.define_tensor_adt()
         self.define_tensor_take()
         self.define_tensor_concatenate()
@@ -1511,10 +1588,43 @@ class Prelude:
         return self.get_ctor_static("tensor_t", name, dtype, shape)
 
     def load_prelude(self):
+        """Loads the Prelude into the module.
+
+        A module without the Prelude gets the definitions of the base prelude,
+        which is parsed and type checked once and cached on disk. A module that
+        already has them, e.g. from another Prelude, is left unchanged.
+        """
+        if _shares_base_prelude(self.mod):
+            self._bind_base_defs()
+            return
+        type_names = [var.name_hint for var in self.mod.get_global_type_vars()]
+        if "List" in type_names:
+            self.parse_prelude()
+        else:
+            self.mod.update(_base_prelude())
+            self._bind_base_defs()
+
+    def parse_prelude(self):
         """Parses the Prelude from Relay's text format into a module."""
         # TODO(@jroesch): we should remove this helper when we port over prelude
         self.mod.import_from_std("prelude.rly")
+        self._bind_global_defs()
 
+        for dtype in _TENSOR_ARRAY_DTYPES:
+            tensor_array_ops = TensorArrayOps(self, dtype)
+            tensor_array_ops.register()
+
+        # Renamer doesn't properly deal with constructors, etc
+        # self.mod = AnnotateSpans()(self.mod)
+
+    def _bind_base_defs(self):
+        self._bind_global_defs()
+        # the tensor array ops are attributes of the prelude, as when they are registered
+        for var in _base_prelude().get_global_vars():
+            if not hasattr(self, var.name_hint):
+                setattr(self, var.name_hint, self.mod.get_global_var(var.name_hint))
+
+    def _bind_global_defs(self):
         GLOBAL_DEFS = [
             "id",
             "compose",
@@ -1545,19 +1655,85 @@ class Prelude:
         for global_def in GLOBAL_DEFS:
             setattr(self, global_def, self.mod.get_global_var(global_def))
 
-        for dtype in [
-            "float32",
-            "float16",
-            "float64",
-            "int32",
-            "uint8",
-            "int8",
-            "int16",
-            "uint16",
-            "int64",
-        ]:
-            tensor_array_ops = TensorArrayOps(self, dtype)
-            tensor_array_ops.register()
 
-        # Renamer doesn't properly deal with constructors, etc
-        # self.mod = AnnotateSpans()(self.mod)
+# The dtypes of the tensor arrays defined by the Prelude.
+_TENSOR_ARRAY_DTYPES = [
+    "float32",
+    "float16",
+    "float64",
+    "int32",
+    "uint8",
+    "int8",
+    "int16",
+    "uint16",
+    "int64",
+]
+
+_BASE_PRELUDE = None
+
+
+def _base_prelude_path():
+    """The file caching the base prelude, None if the cache on disk is disabled.
+
+    The cache directory is given by the environment variable TVM_PRELUDE_CACHE_DIR,
+    an empty value disables it. The name of the file depends on the version and the
+    build of TVM, and the sources of the prelude.
+    """
+    directory = os.environ.get(
+        "TVM_PRELUDE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".tvm", "relay")
+    )
+    if not directory:
+        return None
+    digest = hashlib.sha1(tvm.__version__.encode())
+    # the build of libtvm: its git commit and cmake options
+    digest.update(str(sorted(libinfo().items())).encode())
+    std_path = tvm.get_global_func("tvm.relay.std_path")()
+    for path in [os.path.join(std_path, "prelude.rly"), __file__]:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return os.path.join(directory, "prelude-%s.bin" % digest.hexdigest())
+
+
+def _load_base_prelude():
+    """Load the base prelude from the disk cache, or parse and save it."""
+    path = _base_prelude_path()
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return load_binary(bytearray(f.read()))
+        except (OSError, tvm.TVMError):
+            pass
+
+    prelude = Prelude.__new__(Prelude)
+    prelude.mod = IRModule()
+    prelude.parse_prelude()
+    mod = transform.InferType()(prelude.mod)
+    if path:
+        # write to a file private to the process, and rename it in place
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(save_binary(mod))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return mod
+
+
+def _base_prelude():
+    """The module of the base prelude, the text prelude and the tensor arrays of
+    every dtype, shared by the modules of the process."""
+    global _BASE_PRELUDE
+    if _BASE_PRELUDE is None:
+        _BASE_PRELUDE = _load_base_prelude()
+    return _BASE_PRELUDE
+
+
+def _shares_base_prelude(mod):
+    """Whether the module has the definitions of the base prelude."""
+    list_var = _base_prelude().get_global_type_var("List")
+    type_vars = mod.get_global_type_vars()
+    return any(var.same_as(list_var) for var in type_vars) and mod[list_var].same_as(
+        _base_prelude()[list_var]
+    )
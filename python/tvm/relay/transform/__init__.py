@@ -19,4 +19,5 @@
 # transformation passes
 from .transform import *
 from .recast import recast
+from .mixed_precision import ToMixedPrecision
 from . import memory_alloc
@@ -18,19 +18,30 @@
 """
 A pass for manifesting explicit memory allocations.
 """
+import logging
 from typing import Optional, Dict, List, Tuple
 from collections import defaultdict
 import attr
 
-from ..expr_functor import ExprMutator
-from .. import op, expr
+from ..expr_functor import ExprMutator, ExprVisitor
+from .. import op, expr, adt
+from ..analysis import free_vars
 from ..function import Function
-from ... import register_func, ir, cpu
+from ... import register_func, ir, cpu, tir
 from ..._ffi.runtime_ctypes import TVMContext
 from ... import IRModule
 from .. import transform
 from . import function_pass
 
+logger = logging.getLogger("memory_plan")
+
+# The planners of the static allocations of a region, selected with the
+# "relay.MemoryPlan.planner" PassContext config.
+PLANNERS = ["greedy_by_size", "best_fit", "naive"]
+
+# The end of the live range of storage that outlives the function.
+_FOREVER = float("inf")
+
 
 def is_primitive(call):
     return (
@@ -41,6 +52,153 @@ def is_primitive(call):
     )
 
 
+def const_value(exp):
+    """The value of a scalar constant, None if exp is not one."""
+    if isinstance(exp, expr.Constant) and len(exp.data.shape) == 0:
+        return int(exp.data.asnumpy().item())
+    return None
+
+
+def plan_offsets(allocations, planner):
+    """Assign offsets to allocations so that the ones alive at the same time do not overlap.
+
+    Parameters
+    ----------
+    allocations : List[Tuple[object, int, Tuple[int, float]]]
+        The key, aligned size and live range (first and last position,
+        inclusive) of each allocation.
+
+    planner : str
+        "greedy_by_size" places the largest allocations first, each at the
+        lowest offset where it fits. "best_fit" places the allocations in
+        program order, each in the smallest free gap where it fits.
+
+    Returns
+    -------
+    offsets : Dict[object, int]
+        The offset of each allocation.
+
+    total : int
+        The size of the arena holding all the allocations.
+    """
+    if planner == "greedy_by_size":
+        order = sorted(allocations, key=lambda a: (-a[1], a[2][0]))
+    elif planner == "best_fit":
+        order = sorted(allocations, key=lambda a: (a[2][0], -a[1]))
+    else:
+        raise ValueError("unknown memory planner %s, expected one of %s" % (planner, PLANNERS))
+
+    placed = []
+    offsets = {}
+    total = 0
+    for key, size, (start, end) in order:
+        conflicts = sorted(
+            (offset, other_size)
+            for offset, other_size, other_start, other_end in placed
+            if other_start <= end and start <= other_end
+        )
+        # The free gaps between the allocations alive at the same time.
+        gaps = []
+        cursor = 0
+        for offset, other_size in conflicts:
+            if offset - cursor >= size:
+                gaps.append((offset - cursor, cursor))
+            cursor = max(cursor, offset + other_size)
+        if not gaps:
+            offset = cursor
+        elif planner == "best_fit":
+            offset = min(gaps)[1]
+        else:
+            offset = gaps[0][1]
+        placed.append((offset, size, start, end))
+        offsets[key] = offset
+        total = max(total, offset + size)
+    return offsets, total
+
+
+class StorageLiveness(ExprVisitor):
+    """Compute the live range of each storage allocated by alloc_storage.
+
+    The let bindings are numbered in program order, nested scopes included, and
+    the live range of a storage spans from its allocation to the last use of a
+    value which may refer to it: the tensors allocated in it, and any value
+    computed from them (tuples, reshapes, closures, ...). Storage that may be
+    stored in a reference, passed to a function or returned from a function is
+    alive until the end of the program.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.position = 0
+        self.live_ranges = {}
+        # The storages a variable may refer to.
+        self.aliases = {}
+
+    def analyze(self, func):
+        """Compute the live ranges of the storages allocated in func.
+
+        Returns
+        -------
+        live_ranges : Dict[relay.Var, Tuple[int, float]]
+            The first and last position at which each storage is alive.
+        """
+        self.visit(func)
+        return {storage: tuple(live) for storage, live in self.live_ranges.items()}
+
+    def _storages(self, exp):
+        storages = set()
+        for var in free_vars(exp):
+            storages.update(self.aliases.get(var, ()))
+        return storages
+
+    def _use(self, storages, position):
+        for storage in storages:
+            live = self.live_ranges[storage]
+            live[1] = max(live[1], position)
+
+    @staticmethod
+    def _may_escape(value):
+        if isinstance(value, (expr.RefCreate, expr.RefWrite)):
+            return True
+        if isinstance(value, expr.Call):
+            callee = value.op
+            return not (
+                isinstance(callee, (ir.Op, adt.Constructor))
+                or (isinstance(callee, Function) and is_primitive(value))
+            )
+        return False
+
+    def visit_function(self, fn):
+        if int(getattr(fn.attrs, "Primitive", 0)) == 1:
+            return
+        self.visit(fn.body)
+        body = fn.body
+        while isinstance(body, expr.Let):
+            body = body.body
+        self._use(self._storages(body), _FOREVER)
+
+    def visit_let(self, let):
+        while isinstance(let, expr.Let):
+            self.position += 1
+            value = let.value
+            if isinstance(value, expr.Call) and value.op == op.op.get("memory.alloc_storage"):
+                self.live_ranges[let.var] = [self.position, self.position]
+                self.aliases[let.var] = {let.var}
+            else:
+                # Nested scopes are numbered before the uses of the binding.
+                self.visit(value)
+                storages = self._storages(value)
+                self._use(storages, self.position)
+                if self._may_escape(value):
+                    self._use(storages, _FOREVER)
+                if not (isinstance(value, expr.Call) and value.op == op.op.get("vm.invoke_tvm_op")):
+                    self.aliases[let.var] = storages
+            let = let.body
+        self.visit(let)
+        self.position += 1
+        self._use(self._storages(let), self.position)
+
+
 @attr.s(auto_attribs=True)
 class Region:
     """
@@ -56,6 +214,7 @@ class Region:
     dtype: Optional[str]
     ctx: TVMContext
     offsets: Dict[expr.Var, Tuple[expr.Expr, expr.Expr]]
+    sizes: Dict[expr.Var, expr.Expr] = attr.Factory(dict)
 
     @staticmethod
     def empty(region_no):
@@ -102,9 +261,40 @@ class Region:
         # Record the offset at which we allocate the storage.
         offset_var: expr.RelayExpr = expr.var(f"offset{len(self.offsets)}")
         self.offsets[old_storage] = (offset_var, self.size)
+        self.sizes[old_storage] = size
 
         self.size = self.size + new_size
 
+    def plan(self, live_ranges, planner):
+        """Overlap the allocations of the region whose live ranges are disjoint.
+
+        Only regions whose allocations all have a constant size can be planned,
+        the other ones keep packing the allocations one after the other.
+
+        Returns
+        -------
+        sizes : Optional[Tuple[int, int]]
+            The size of the region without and with planning, None if it was not planned.
+        """
+        alignment = const_value(self.alignment)
+        if alignment is None:
+            return None
+        allocations = []
+        for storage, size in self.sizes.items():
+            size = const_value(size)
+            if size is None or storage not in live_ranges:
+                return None
+            size = (size + alignment - 1) // alignment * alignment
+            allocations.append((storage, size, live_ranges[storage]))
+        naive = sum(size for _, size, _ in allocations)
+
+        offsets, total = plan_offsets(allocations, planner)
+        for storage, offset in offsets.items():
+            offset_var, _ = self.offsets[storage]
+            self.offsets[storage] = (offset_var, expr.const(offset, dtype="int64"))
+        self.size = expr.const(total, dtype="int64")
+        return naive, total
+
     def offset_for(self, alloc: expr.Expr) -> expr.Expr:
         return self.offsets.get(alloc, [None])[0]
 
@@ -185,9 +375,14 @@ class StorageCoalesce(ExprMutator):
     to reuse its slot.
     """
 
-    def __init__(self):
+    def __init__(self, live_ranges=None, planner="naive"):
         super().__init__()
         self.regions = []
+        self.live_ranges = live_ranges
+        self.planner = planner
+        # The size in bytes of the planned regions, without and with planning.
+        self.naive_bytes = 0
+        self.planned_bytes = 0
 
     def enter_scope(self) -> None:
         region_no = len(self.regions)
@@ -196,8 +391,21 @@ class StorageCoalesce(ExprMutator):
     def exit_scope(self, body: expr.Expr) -> expr.Expr:
         """When leaving a scope build a region allocation for the scope."""
         dtype_region = self.regions.pop()
-        for _, region in reversed(list(dtype_region.items())):
+        for dtype, region in reversed(list(dtype_region.items())):
             if len(region.offsets) != 0:
+                if self.planner != "naive" and self.live_ranges is not None:
+                    sizes = region.plan(self.live_ranges, self.planner)
+                    if sizes is not None:
+                        logger.debug(
+                            "region %s (%s, %d allocations): %d bytes planned, %d naive",
+                            region.var.name_hint,
+                            dtype,
+                            len(region.offsets),
+                            sizes[1],
+                            sizes[0],
+                        )
+                        self.naive_bytes += sizes[0]
+                        self.planned_bytes += sizes[1]
                 body = region.to_expr(body)
 
         return body
@@ -350,12 +558,34 @@ class LiftConst(ExprMutator):
 
 @function_pass(opt_level=0)
 class MemoryPlan:
-    """An explicit pass wrapper around StorageCoalesce."""
+    """An explicit pass wrapper around StorageCoalesce.
+
+    The static allocations of a region whose live ranges do not overlap share
+    memory, as placed by the planner set in the "relay.MemoryPlan.planner"
+    PassContext config (one of PLANNERS, "greedy_by_size" by default, "naive"
+    disables the reuse). The planned functions carry the total size of their
+    static regions without and with reuse in the "MemoryPlanNaiveBytes" and
+    "MemoryPlanPlannedBytes" attributes.
+    """
 
-    def transform_function(self, func, mod, _):
+    def transform_function(self, func, mod, ctx):
         mod.import_from_std("core.rly")
-        sc = StorageCoalesce()
+        planner = str(ctx.config.get("relay.MemoryPlan.planner", "greedy_by_size"))
+        if planner not in PLANNERS:
+            raise ValueError("unknown memory planner %s, expected one of %s" % (planner, PLANNERS))
+        live_ranges = None
+        if planner != "naive":
+            live_ranges = StorageLiveness().analyze(func)
+        sc = StorageCoalesce(live_ranges, planner)
         func = sc.visit(func)
+        if sc.naive_bytes and isinstance(func, Function):
+            # Report the effect of the planning on the static allocations.
+            func = func.with_attr(
+                {
+                    "MemoryPlanNaiveBytes": tir.IntImm("int64", sc.naive_bytes),
+                    "MemoryPlanPlannedBytes": tir.IntImm("int64", sc.planned_bytes),
+                }
+            )
         return func
 
 
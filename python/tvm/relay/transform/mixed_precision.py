@@ -0,0 +1,290 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Automatic mixed precision conversion of relay functions."""
+import tvm
+from tvm import relay
+
+from ..expr_functor import ExprMutator
+from ..op import MixedPrecisionCategory
+from . import transform as _transform
+
+_MISSING_OP_MODES = ("deny", "follow", "error")
+
+
+def _retype(ty, src, dst):
+    """Replace the src dtype of the tensors of a type by dst."""
+    if isinstance(ty, relay.TupleType):
+        return relay.TupleType([_retype(field, src, dst) for field in ty.fields])
+    if isinstance(ty, relay.TensorType) and ty.dtype == src:
+        return relay.TensorType(ty.shape, dst)
+    return ty
+
+
+def _has_dtype(ty, dtype):
+    if isinstance(ty, relay.TupleType):
+        return any(_has_dtype(field, dtype) for field in ty.fields)
+    return isinstance(ty, relay.TensorType) and ty.dtype == dtype
+
+
+def _float_dtypes(*types):
+    """The floating point dtypes of the tensors of the types."""
+    dtypes = set()
+    for ty in types:
+        if isinstance(ty, relay.TupleType):
+            dtypes.update(_float_dtypes(*ty.fields))
+        elif isinstance(ty, relay.TensorType) and "float" in ty.dtype:
+            dtypes.add(ty.dtype)
+    return dtypes
+
+
+def _same_dtypes(lhs, rhs):
+    if isinstance(lhs, relay.TupleType) and isinstance(rhs, relay.TupleType):
+        return len(lhs.fields) == len(rhs.fields) and all(
+            _same_dtypes(a, b) for a, b in zip(lhs.fields, rhs.fields)
+        )
+    if isinstance(lhs, relay.TensorType) and isinstance(rhs, relay.TensorType):
+        return lhs.dtype == rhs.dtype
+    return True
+
+
+def _with_out_dtype(attrs, dtype):
+    values = {}
+    for key in attrs.keys():
+        value = attrs[key]
+        if isinstance(value, tvm.ir.container.Array):
+            value = tuple(value)
+        values[str(key)] = value
+    values["out_dtype"] = dtype
+    return tvm.ir.make_node(str(attrs).split("(")[0], **values)
+
+
+class MixedPrecisionMutator(ExprMutator):
+    """Convert the float32 operators of a type checked function to a lower precision.
+
+    Only the calls whose floating point inputs and outputs are all float32 are
+    converted, the others keep their dtypes. The category of each operator is
+    given by its FTVMMixedPrecisionConversionType attribute. The float32 inputs
+    of the converted operators are cast to the mixed precision type and the
+    inputs of the others are cast back to float32.
+    A cast that undoes a widening cast or a cast inserted by the pass is
+    removed, and a value is cast once to each dtype. The functions keep their
+    signatures.
+    """
+
+    def __init__(self, mixed_precision_type="float16", missing_op_mode="deny"):
+        super().__init__()
+        if missing_op_mode not in _MISSING_OP_MODES:
+            raise ValueError(
+                "missing_op_mode must be one of %s, got %s" % (_MISSING_OP_MODES, missing_op_mode)
+            )
+        self.mixed = mixed_precision_type
+        self.missing_op_mode = missing_op_mode
+        self._cast_op = relay.op.get("cast")
+        # the types of the expressions created by the mutator
+        self._types = {}
+        self._casts = {}
+        self._inserted = set()
+
+    def _type_of(self, expr):
+        if expr in self._types:
+            return self._types[expr]
+        return expr.checked_type
+
+    def _new(self, expr, ty):
+        self._types[expr] = ty
+        return expr
+
+    def _cast(self, expr, target):
+        """Cast the tensors of expr to the dtypes of the target type."""
+        current = self._type_of(expr)
+        if _same_dtypes(current, target):
+            return expr
+        if isinstance(target, relay.TupleType):
+            if isinstance(expr, relay.Tuple):
+                fields = list(expr.fields)
+            else:
+                fields = [
+                    self._new(relay.TupleGetItem(expr, i), field)
+                    for i, field in enumerate(current.fields)
+                ]
+            casted = [self._cast(field, ty) for field, ty in zip(fields, target.fields)]
+            return self._new(
+                relay.Tuple(casted), relay.TupleType([self._type_of(f) for f in casted])
+            )
+        key = (expr, target.dtype)
+        if key not in self._casts:
+            if (
+                isinstance(expr, relay.Call)
+                and expr.op == self._cast_op
+                and self._type_of(expr.args[0]).dtype == target.dtype
+                and (current.dtype == "float32" or expr in self._inserted)
+            ):
+                # Remove the round trip: a widening cast is exact, and a value the
+                # pass narrowed is used directly, e.g. a float32 accumulator.
+                self._casts[key] = expr.args[0]
+            else:
+                self._casts[key] = self._new(relay.cast(expr, target.dtype), target)
+                self._inserted.add(self._casts[key])
+        return self._casts[key]
+
+    def _category(self, call):
+        if call.attrs is not None and "dtype" in call.attrs.keys():
+            # the output dtype is set by the call, e.g. cast or full
+            return MixedPrecisionCategory.DENY, self.mixed, self.mixed
+        fconvert = call.op.get_attr("FTVMMixedPrecisionConversionType")
+        if fconvert is None:
+            if self.missing_op_mode == "error":
+                raise ValueError("%s has no mixed precision conversion registered" % call.op.name)
+            category = (
+                MixedPrecisionCategory.FOLLOW
+                if self.missing_op_mode == "follow"
+                else MixedPrecisionCategory.DENY
+            )
+            return category, self.mixed, self.mixed
+        category, accumulation_dtype, output_dtype = fconvert(call, self.mixed)
+        return int(category), str(accumulation_dtype), str(output_dtype)
+
+    def visit_call(self, call):
+        args = [self.visit(arg) for arg in call.args]
+        orig_types = [arg.checked_type for arg in call.args]
+        if not isinstance(call.op, tvm.ir.Op):
+            args = [self._cast(arg, ty) for arg, ty in zip(args, orig_types)]
+            new = relay.Call(self.visit(call.op), args, call.attrs, call.type_args, call.span)
+            return self._new(new, call.checked_type)
+
+        # Only the float32 calls are converted, e.g. an int8 convolution with an
+        # int32 out_dtype, or a call already in float16, is left as it is.
+        if _has_dtype(call.checked_type, "float32") and _float_dtypes(
+            call.checked_type, *orig_types
+        ) == {"float32"}:
+            category, accumulation_dtype, output_dtype = self._category(call)
+        else:
+            category = MixedPrecisionCategory.DENY
+        if category == MixedPrecisionCategory.FOLLOW:
+            if any(_has_dtype(self._type_of(arg), self.mixed) for arg in args):
+                category = MixedPrecisionCategory.ALLOW
+            else:
+                category = MixedPrecisionCategory.DENY
+        if category == MixedPrecisionCategory.DENY:
+            args = [self._cast(arg, ty) for arg, ty in zip(args, orig_types)]
+            return self._new(relay.Call(call.op, args, call.attrs), call.checked_type)
+
+        args = [
+            self._cast(arg, _retype(ty, "float32", self.mixed)) for arg, ty in zip(args, orig_types)
+        ]
+        attrs = call.attrs
+        if attrs is not None and "out_dtype" in attrs.keys():
+            attrs = _with_out_dtype(attrs, accumulation_dtype)
+        new = self._new(
+            relay.Call(call.op, args, attrs),
+            _retype(call.checked_type, "float32", accumulation_dtype),
+        )
+        return self._cast(new, _retype(call.checked_type, "float32", output_dtype))
+
+    def visit_tuple(self, tup):
+        fields = [self.visit(field) for field in tup.fields]
+        return self._new(
+            relay.Tuple(fields, tup.span), relay.TupleType([self._type_of(f) for f in fields])
+        )
+
+    def visit_tuple_getitem(self, op):
+        tuple_value = self.visit(op.tuple_value)
+        return self._new(
+            relay.TupleGetItem(tuple_value, op.index),
+            self._type_of(tuple_value).fields[op.index],
+        )
+
+    def visit_let(self, let):
+        value = self._cast(self.visit(let.value), let.var.checked_type)
+        body = self.visit(let.body)
+        return self._new(relay.Let(let.var, value, body), self._type_of(body))
+
+    def visit_if(self, ite):
+        cond = self._cast(self.visit(ite.cond), ite.cond.checked_type)
+        true_branch = self._cast(self.visit(ite.true_branch), ite.checked_type)
+        false_branch = self._cast(self.visit(ite.false_branch), ite.checked_type)
+        return self._new(relay.If(cond, true_branch, false_branch), ite.checked_type)
+
+    def visit_function(self, fn):
+        if fn.attrs and int(getattr(fn.attrs, "Primitive", 0)) == 1:
+            return fn
+        body = self._cast(self.visit(fn.body), fn.body.checked_type)
+        return self._new(
+            relay.Function(list(fn.params), body, fn.ret_type, fn.type_params, fn.attrs),
+            fn.checked_type,
+        )
+
+    # The conversion does not go through references and pattern matching.
+    def visit_ref_create(self, ref):
+        return ref
+
+    def visit_ref_read(self, ref):
+        return ref
+
+    def visit_ref_write(self, ref):
+        return ref
+
+    def visit_match(self, m):
+        return m
+
+
+def ToMixedPrecision(mixed_precision_type="float16", missing_op_mode="deny"):
+    """Automatic mixed precision rewriter.
+
+    Runs the operators in a lower precision floating point type where it is
+    safe, following the FTVMMixedPrecisionConversionType attribute registered
+    per operator with :py:func:`tvm.relay.op.register_mixed_precision_conversion`:
+
+    - ALLOW operators, e.g. convolutions and dense, always run in the mixed
+      precision type, and accumulate in float32 when they have an out_dtype.
+      Their integer versions, e.g. an int8 convolution, are left as they are.
+    - FOLLOW operators, e.g. elementwise and pooling operators, run in the mixed
+      precision type when one of their inputs already is.
+    - DENY operators, e.g. exp, softmax or the normalizations, run in float32.
+
+    Casts are inserted between the operators of different precisions, and
+    the signatures of the functions are not changed. Running FoldConstant
+    afterwards stores the constants in the mixed precision type.
+
+    Parameters
+    ----------
+    mixed_precision_type : str
+        The lower precision type, "float16" or "bfloat16".
+
+    missing_op_mode : str
+        How the operators without a registered conversion are handled:
+        "deny" runs them in float32, "follow" treats them as FOLLOW and
+        "error" raises an error.
+
+    Returns
+    -------
+    ret : tvm.transform.Pass
+        The registered pass.
+    """
+
+    def _transform_module(mod, ctx):
+        mod = _transform.InferType()(mod)
+        updates = {}
+        for gvar, func in mod.functions.items():
+            if isinstance(func, relay.Function):
+                mutator = MixedPrecisionMutator(mixed_precision_type, missing_op_mode)
+                updates[gvar] = mutator.visit(func)
+        for gvar, func in updates.items():
+            mod[gvar] = func
+        return _transform.InferType()(mod)
+
+    return tvm.transform.module_pass(_transform_module, opt_level=0, name="ToMixedPrecision")
@@ -22,6 +22,7 @@ from .object import Object
 from .object_generic import ObjectGeneric, ObjectTypes
 from .ndarray import NDArray, DataType, DataTypeCode, TVMContext
 from .module import Module
+from .thread_pool import ThreadPoolGroup
 
 # function exposures
 from .object_generic import convert_to_object, convert, const
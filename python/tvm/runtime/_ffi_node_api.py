@@ -43,6 +43,14 @@ def LoadJSON(json_str):
     raise RuntimeError("Do not support object serialization in runtime only mode")
 
 
+def SaveBinary(obj):
+    raise RuntimeError("Do not support object serialization in runtime only mode")
+
+
+def LoadBinary(blob):
+    raise RuntimeError("Do not support object serialization in runtime only mode")
+
+
 # Exports functions registered via TVM_REGISTER_GLOBAL with the "node" prefix.
 # e.g. TVM_REGISTER_GLOBAL("node.AsRepr")
 tvm._ffi._init_api("node", __name__)
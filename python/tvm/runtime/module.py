@@ -21,6 +21,7 @@ import os
 import ctypes
 import struct
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import tvm._ffi
 from tvm._ffi.base import _LIB, check_call, c_str, string_types, _RUNTIME_ONLY
@@ -252,7 +253,9 @@ class Module(object):
     def _dso_exportable(self):
         return self.type_key == "llvm" or self.type_key == "c"
 
-    def export_library(self, file_name, fcompile=None, addons=None, workspace_dir=None, **kwargs):
+    def export_library(
+        self, file_name, fcompile=None, addons=None, workspace_dir=None, num_workers=None, **kwargs
+    ):
         """Export the module and its imported device code one library.
 
         This function only works on host llvm modules.
@@ -273,6 +276,11 @@ class Module(object):
             artifacts for the process exporting of the library.
             If this is not provided a temporary dir will be created.
 
+        num_workers : int, optional
+            The number of threads used to emit the object files of the DSO
+            modules, e.g. the partitions created by ``tir.host_module_num_partitions``.
+            Objects are emitted one after another when not provided.
+
         kwargs : dict, optional
             Additional arguments passed to fcompile
 
@@ -310,6 +318,7 @@ class Module(object):
         is_system_lib = False
         has_c_module = False
         llvm_target_triple = None
+        pending_saves = []
         for index, module in enumerate(modules):
             if fcompile is not None and hasattr(fcompile, "object_format"):
                 if module.type_key == "c":
@@ -325,7 +334,10 @@ class Module(object):
                     object_format = "c"
                     has_c_module = True
             path_obj = os.path.join(workspace_dir, f"lib{index}.{object_format}")
-            module.save(path_obj)
+            if num_workers is not None and num_workers > 1:
+                pending_saves.append((module, path_obj))
+            else:
+                module.save(path_obj)
             files.append(path_obj)
             is_system_lib = (
                 module.type_key == "llvm" and module.get_function("__tvm_is_system_module")()
@@ -333,6 +345,11 @@ class Module(object):
             llvm_target_triple = (
                 module.type_key == "llvm" and module.get_function("_get_target_triple")()
             )
+        if pending_saves:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                for _ in executor.map(lambda item: item[0].save(item[1]), pending_saves):
+                    pass
+
         if not fcompile:
             if file_name.endswith(".tar"):
                 fcompile = _tar.tar
@@ -310,6 +310,94 @@ def from_dlpack(dltensor):
     return _from_dlpack(dltensor)
 
 
+# The alignment of the arrays allocated by the runtime, which compiled kernels
+# may assume for the constants of a model.
+_ALLOC_ALIGNMENT = 64
+
+
+class _DLManagedTensor(ctypes.Structure):
+    pass
+
+
+_DLManagedTensorDeleter = ctypes.CFUNCTYPE(None, ctypes.POINTER(_DLManagedTensor))
+_DLManagedTensor._fields_ = [
+    ("dl_tensor", TVMArray),
+    ("manager_ctx", ctypes.c_void_p),
+    ("deleter", _DLManagedTensorDeleter),
+]
+
+# The numpy arrays shared with NDArrays, with their DLManagedTensor and shape,
+# by the address of the DLManagedTensor. They are released by the deleter
+# called by the runtime when the last NDArray is freed.
+_SHARED_ARRAYS = {}
+
+
+@_DLManagedTensorDeleter
+def _shared_array_deleter(managed):
+    _SHARED_ARRAYS.pop(ctypes.addressof(managed.contents), None)
+
+
+def can_share(np_data):
+    """Check whether an NDArray can share the memory of a numpy array.
+
+    Parameters
+    ----------
+    np_data : numpy.ndarray
+        The array.
+
+    Returns
+    -------
+    result : bool
+        Whether the array is C contiguous, aligned as the arrays of the
+        runtime and of a dtype supported by the runtime.
+    """
+    if not isinstance(np_data, np.ndarray) or not np_data.flags["C_CONTIGUOUS"]:
+        return False
+    if np_data.ctypes.data % _ALLOC_ALIGNMENT != 0:
+        return False
+    try:
+        DataType(np.dtype(np_data.dtype).name)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def share(np_data):
+    """Create an NDArray on the CPU that shares the memory of a numpy array.
+
+    The numpy array is kept alive until the NDArray is freed. The memory
+    is neither copied nor protected: a write to either array is seen by
+    the other, and a read-only array, e.g. of a file mapped in read mode,
+    must not be written through the NDArray.
+
+    Parameters
+    ----------
+    np_data : numpy.ndarray
+        The array, see :py:func:`can_share`.
+
+    Returns
+    -------
+    arr : tvm.nd.NDArray
+        The array sharing the memory of np_data.
+    """
+    if not can_share(np_data):
+        raise ValueError(
+            "can only share the memory of a C contiguous numpy array aligned to %d bytes"
+            % _ALLOC_ALIGNMENT
+        )
+    managed = _DLManagedTensor()
+    managed.dl_tensor, shape = numpyasarray(np_data)
+    managed.deleter = _shared_array_deleter
+    _SHARED_ARRAYS[ctypes.addressof(managed)] = (np_data, managed, shape)
+    handle = TVMArrayHandle()
+    try:
+        check_call(_LIB.TVMArrayFromDLPack(ctypes.byref(managed), ctypes.byref(handle)))
+    except Exception:
+        _SHARED_ARRAYS.pop(ctypes.addressof(managed))
+        raise
+    return _make_array(handle, False, False)
+
+
 def cpu(dev_id=0):
     """Construct a CPU device
 
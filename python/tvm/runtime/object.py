@@ -85,7 +85,12 @@ class Object(ObjectBase):
         handle = state["handle"]
         self.handle = None
         if handle is not None:
-            self.__init_handle_by_constructor__(_ffi_node_api.LoadJSON, handle)
+            # Objects are pickled as json, the binary format is only accepted
+            # from processes of the same version.
+            if isinstance(handle, str):
+                self.__init_handle_by_constructor__(_ffi_node_api.LoadJSON, handle)
+            else:
+                self.__init_handle_by_constructor__(_ffi_node_api.LoadBinary, handle)
 
     def _move(self):
         """Create an RValue reference to the object and mark the object as moved.
@@ -39,6 +39,8 @@ class VirtualMachineProfiler(vm.VirtualMachine):
         self._invoke = self.module["invoke"]
         self._get_stat = self.module["get_stat"]
         self._set_input = self.module["set_input"]
+        self._set_shape_cache = self.module["set_shape_cache"]
+        self._get_shape_cache_stat = self.module["get_shape_cache_stat"]
         self._reset = self.module["reset"]
         self._setup_ctx(ctx, memory_cfg)
 
@@ -58,5 +60,27 @@ class VirtualMachineProfiler(vm.VirtualMachine):
         """
         return self._get_stat(sort_by_time)
 
+    def get_shape_cache_stats(self):
+        """Get the counters of the shape cache, see :py:meth:`set_shape_cache`.
+
+        Returns
+        -------
+        stats : Dict[str, int]
+            The invocations whose signature was found in the cache (``hits``)
+            or not (``misses``), the evicted signatures (``evictions``), the
+            shape function calls answered from the cache (``shape_func_hits``)
+            or run (``shape_func_misses``) and the reused storages
+            (``storage_reuses``).
+        """
+        keys = [
+            "hits",
+            "misses",
+            "evictions",
+            "shape_func_hits",
+            "shape_func_misses",
+            "storage_reuses",
+        ]
+        return {key: self._get_shape_cache_stat(key) for key in keys}
+
     def reset(self):
         self._reset()
@@ -0,0 +1,138 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Partitioning of the cores between the models of a process."""
+import os
+
+import tvm._ffi
+
+from .object import Object
+from .module import Module
+from .packed_func import PackedFunc
+from . import _ffi_api
+
+
+@tvm._ffi.register_object("runtime.ThreadPoolGroup")
+class ThreadPoolGroup(Object):
+    """A thread pool whose workers are bound to a set of cores.
+
+    By default the parallel kernels of a thread run on a thread local pool that
+    uses all the cores of the host, so models run concurrently from several
+    threads compete for the same cores. A thread that entered a group runs its
+    parallel kernels on the pool of the group instead, and the thread itself is
+    restricted to the cores of the group while it is in it. The parallel
+    kernels of several threads in the same group run one after the other.
+
+    The affinity is only set on Linux, and the group is not used when the
+    runtime is built with the OpenMP thread pool.
+
+    Parameters
+    ----------
+    cpus : List[int]
+        The ids of the cores of the group, one worker is used per core.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        group = tvm.runtime.ThreadPoolGroup([0, 1, 2, 3])
+        # run every call of a graph runtime module on cores 0-3
+        module = graph_runtime.GraphModule(group.bind(lib["default"](ctx)))
+        module.run()
+        # or run the calls of the current thread on the group
+        with group:
+            vm.invoke("main", data)
+    """
+
+    def __init__(self, cpus):
+        cpus = [int(core) for core in cpus]
+        if not cpus:
+            raise ValueError("a thread pool group needs at least one core")
+        self.__init_handle_by_constructor__(_ffi_api.ThreadPoolGroup, *cpus)
+        self.cpus = tuple(cpus)
+
+    def __enter__(self):
+        _ffi_api.ThreadPoolGroupEnter(self)
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        _ffi_api.ThreadPoolGroupExit()
+
+    def bind(self, obj):
+        """Run the functions of a module or of an executor on the group.
+
+        Parameters
+        ----------
+        obj : Union[Module, PackedFunc, GraphModule, VirtualMachine]
+            A runtime module or function, or an object holding them such as
+            a graph runtime or a virtual machine.
+
+        Returns
+        -------
+        bound : Union[Module, PackedFunc, GraphModule, VirtualMachine]
+            A new module or function for a module or function. Any other object
+            is bound in place: the modules and functions among its attributes
+            are replaced by bound ones, and the object is returned.
+        """
+        if isinstance(obj, Module):
+            return _ffi_api.ThreadPoolGroupBindModule(obj, self)
+        if isinstance(obj, PackedFunc):
+            return _ffi_api.ThreadPoolGroupBindFunc(obj, self)
+        bound = False
+        for name, value in list(vars(obj).items()):
+            if isinstance(value, (Module, PackedFunc)):
+                setattr(obj, name, self.bind(value))
+                bound = True
+        if not bound:
+            raise TypeError("%s holds no runtime module or function" % type(obj).__name__)
+        return obj
+
+
+def partition_cores(num_groups, cpus=None):
+    """Split cores into groups of consecutive cores of about the same size.
+
+    Parameters
+    ----------
+    num_groups : int
+        The number of groups.
+
+    cpus : Optional[List[int]]
+        The cores to split, defaults to the cores the process may run on, as
+        given by its affinity mask. Where the mask is not available, it
+        defaults to the cores counted by the runtime, ``0 .. max_concurrency - 1``.
+
+    Returns
+    -------
+    groups : List[ThreadPoolGroup]
+        The groups, the first ones get one more core when the cores do not
+        split evenly.
+    """
+    if cpus is None:
+        if hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(_ffi_api.MaxConcurrency()))
+    if num_groups < 1 or num_groups > len(cpus):
+        raise ValueError("cannot split %d cores into %d groups" % (len(cpus), num_groups))
+    size, extra = divmod(len(cpus), num_groups)
+    groups = []
+    begin = 0
+    for i in range(num_groups):
+        end = begin + size + (1 if i < extra else 0)
+        groups.append(ThreadPoolGroup(cpus[begin:end]))
+        begin = end
+    return groups
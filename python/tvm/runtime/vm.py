@@ -20,6 +20,8 @@ The Relay Virtual Machine runtime.
 
 Implements a Python interface to executing the compiled VM object.
 """
+import json
+
 import numpy as np
 
 import tvm
@@ -286,17 +288,33 @@ class VirtualMachine(object):
     ctx : tvm.runtime.TVMContext or List[tvm.runtime.TVMContext]
         The context to deploy the module
 
-    memory_cfg : str or Dict[tvm.runtime.TVMContext, str], optional
+    memory_cfg : str or dict or Dict[tvm.runtime.TVMContext, str or dict], optional
         Config the type of memory allocator. The allocator type can be ["naive",
-        "pooled"]. If memory_cfg is None, all contexts will use pooled allocator
-        by default. If memory_cfg is string, all contexts will use the specified
-        allocator type. If memory_cfg is a dict, each context uses the allocator
-        type specified in the dict, or pooled allocator if not specified in the
-        dict.
+        "pooled", "size_class"]. If memory_cfg is None, all contexts will use
+        pooled allocator by default. If memory_cfg is string, all contexts will
+        use the specified allocator type. If memory_cfg is a dict keyed by
+        context, each context uses the allocator type specified in the dict, or
+        pooled allocator if not specified in the dict.
+
+        The size class allocator takes options given as a dict in place of the type, e.g.
+        ``{"type": "size_class", "high_water_mark": 1 << 30, "classes_per_doubling": 4}``.
+        Its buffers are rounded up to one of ``classes_per_doubling`` size classes per
+        power of two (1 for power of two buckets, 4 by default) and, when the memory
+        allocated from the device exceeds ``high_water_mark`` bytes (0 for no limit, the
+        default), the cached free buffers are released to the device.
+
+        The allocators are shared by all the VMs of the process, the first VM to use a
+        context decides the type of its allocator.
     """
 
     NAIVE_ALLOCATOR = 1
     POOLED_ALLOCATOR = 2
+    SIZE_CLASS_ALLOCATOR = 3
+    _ALLOCATOR_TYPES = {
+        "naive": NAIVE_ALLOCATOR,
+        "pooled": POOLED_ALLOCATOR,
+        "size_class": SIZE_CLASS_ALLOCATOR,
+    }
 
     def __init__(self, exe, ctx, memory_cfg=None):
         if not isinstance(exe, Executable):
@@ -309,6 +327,7 @@ class VirtualMachine(object):
         self._init = self.module["init"]
         self._invoke = self.module["invoke"]
         self._set_input = self.module["set_input"]
+        self._set_shape_cache = self.module["set_shape_cache"]
         self._setup_ctx(ctx, memory_cfg)
 
     def _setup_ctx(self, ctx, memory_cfg):
@@ -326,13 +345,11 @@ class VirtualMachine(object):
         if not any(c.device_type == tvm.cpu().device_type for c in ctxs):
             ctxs.append(tvm.cpu())
 
-        default_alloc_type = VirtualMachine.POOLED_ALLOCATOR
+        default_alloc_cfg = "pooled"
         if memory_cfg is None:
             memory_cfg = {}
-        elif isinstance(memory_cfg, str):
-            assert memory_cfg in ["naive", "pooled"]
-            if memory_cfg == "naive":
-                default_alloc_type = VirtualMachine.NAIVE_ALLOCATOR
+        elif isinstance(memory_cfg, str) or (isinstance(memory_cfg, dict) and "type" in memory_cfg):
+            default_alloc_cfg = memory_cfg
             memory_cfg = {}
         elif not isinstance(memory_cfg, dict):
             raise TypeError(
@@ -340,12 +357,89 @@ class VirtualMachine(object):
                 + "but received {}".format(type(memory_cfg))
             )
         init_args = []
+        alloc_options = []
         for context in ctxs:
+            alloc_type, options = self._parse_alloc_cfg(memory_cfg.get(context, default_alloc_cfg))
             init_args.append(context.device_type)
             init_args.append(context.device_id)
-            alloc_type = memory_cfg[context] if context in memory_cfg else default_alloc_type
             init_args.append(alloc_type)
+            if options is not None:
+                alloc_options.append((context, options))
         self._init(*init_args)
+        for context, options in alloc_options:
+            _ffi_api._VMConfigureAllocator(
+                context.device_type,
+                context.device_id,
+                options.get("high_water_mark", 0),
+                options.get("classes_per_doubling", 4),
+            )
+        self._ctxs = ctxs
+
+    @staticmethod
+    def _parse_alloc_cfg(cfg):
+        """Get the allocator type and the size class allocator options of a context."""
+        if isinstance(cfg, int):
+            return cfg, None
+        options = None
+        if isinstance(cfg, dict):
+            options = dict(cfg)
+            cfg = options.pop("type")
+            unknown = set(options) - {"high_water_mark", "classes_per_doubling"}
+            if cfg != "size_class" and not options:
+                options = None
+            elif cfg != "size_class" or unknown:
+                raise ValueError(
+                    "Unsupported options {} for the {} allocator, only the size_class allocator "
+                    "takes high_water_mark and classes_per_doubling".format(
+                        sorted(unknown or options), cfg
+                    )
+                )
+        if cfg not in VirtualMachine._ALLOCATOR_TYPES:
+            raise ValueError(
+                "Unknown allocator type {}, expected one of {}".format(
+                    cfg, list(VirtualMachine._ALLOCATOR_TYPES)
+                )
+            )
+        return VirtualMachine._ALLOCATOR_TYPES[cfg], options
+
+    def get_memory_stats(self):
+        """Get the statistics of the memory allocators of the VM contexts.
+
+        Returns
+        -------
+        stats : Dict[tvm.runtime.TVMContext, Dict[str, object]]
+            The allocator ``type`` and ``used_bytes`` of each context. The size class
+            allocator also reports its ``cached_bytes``, ``peak_bytes``,
+            ``high_water_mark``, ``classes_per_doubling``, the number of allocations
+            ``num_allocs``, of those served from the cache ``num_hits`` and of the
+            buffers released to the device ``num_released``.
+        """
+        return {
+            ctx: json.loads(_ffi_api._VMGetAllocatorStats(ctx.device_type, ctx.device_id))
+            for ctx in self._ctxs
+        }
+
+    def set_shape_cache(self, capacity):
+        """Memoize the execution state per input signature.
+
+        For models with dynamic shapes, the VM runs the shape functions and
+        allocates the storage of every invocation. With the shape cache, the
+        results of the shape functions and the allocated storage are kept for
+        the last ``capacity`` signatures, i.e. the invoked function and the
+        shapes, dtypes and contexts of its inputs, and reused by the later
+        invocations with the same signature. The least recently used signature
+        is evicted when the cache is full.
+
+        The cached storage stays allocated until its signature is evicted, and
+        a storage is only reused once the tensors allocated from it by the
+        previous invocation, including the outputs, are no longer referenced.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of signatures to memoize, 0 disables and clears the cache.
+        """
+        self._set_shape_cache(capacity)
 
     def set_input(self, func_name, *args, **kwargs):
         """Set the input to a function.
@@ -16,4 +16,4 @@
 # under the License.
 """TVM Script APIs of TVM Python Package, aimed to support TIR"""
 
-from .parser import from_source, create_module, asscript, tir, module
+from .parser import from_source, create_module, asscript, tir, module, ParseProfile
@@ -0,0 +1,185 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Cache of the functions and modules parsed from TVM script.
+
+Parsing a large script visits every node of its AST in python and builds the
+TIR with many calls into the runtime. The result only depends on the source of
+the script, its location and the parser, so it is cached in memory and, when a
+directory is given, on disk as JSON.
+
+Entries are keyed on the hash of the source, the file and line it starts at,
+the version of TVM, the sources of the parser and the registered intrinsics.
+The size of the cache in memory is given by the environment variable
+TVM_SCRIPT_PARSE_CACHE_SIZE, 0 disables it. The directory of the cache on disk
+is given by TVM_SCRIPT_CACHE_DIR, it is disabled when the variable is not set.
+"""
+import glob
+import hashlib
+import os
+from collections import OrderedDict
+
+import tvm
+from tvm._ffi.base import TVMError
+
+from .registry import Registry
+
+
+def _parser_digest():
+    """The hash of the version of TVM and the sources of the parser."""
+    digest = hashlib.sha1(tvm.__version__.encode())
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ParseCache(object):
+    """A bounded cache of parsed scripts, the least recently used are evicted.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of entries in memory, 0 disables the cache in memory.
+
+    directory : Optional[str]
+        The directory of the cache on disk, None disables it.
+    """
+
+    def __init__(self, capacity, directory=None):
+        self.capacity = capacity
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._digest = None
+
+    def key(self, source_name, start_line, source):
+        """Compute the key of a script.
+
+        Parameters
+        ----------
+        source_name : str
+            The file of the script.
+
+        start_line : int
+            The line the script starts at.
+
+        source : str
+            The source of the script.
+
+        Returns
+        -------
+        key : str
+            The hex digest of the inputs of the parser.
+        """
+        if self._digest is None:
+            self._digest = _parser_digest()
+        digest = hashlib.sha1(self._digest.encode())
+        digest.update(",".join(sorted(Registry.registrations)).encode())
+        digest.update(("%s:%d\n" % (source_name, start_line)).encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    @property
+    def enabled(self):
+        return self.capacity > 0 or bool(self.directory)
+
+    def get(self, key):
+        """Get a parsed script, from memory or from disk.
+
+        Parameters
+        ----------
+        key : str
+            The key of the script.
+
+        Returns
+        -------
+        result : Optional[Union[PrimFunc, IRModule]]
+            The function or module, or None when it is not cached.
+        """
+        result = self._entries.get(key, None)
+        if result is not None:
+            self._entries.move_to_end(key)
+        elif self.directory:
+            result = self._load(key)
+            if result is not None:
+                self._remember(key, result)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Store a parsed script.
+
+        Parameters
+        ----------
+        key : str
+            The key of the script.
+
+        result : Union[PrimFunc, IRModule]
+            The function or module parsed from the script.
+        """
+        self._remember(key, result)
+        if self.directory:
+            self._save(key, result)
+
+    def clear(self):
+        """Remove all the entries in memory and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key, result):
+        if self.capacity <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key):
+        try:
+            with open(self._path(key)) as f:
+                return tvm.ir.load_json(f.read())
+        except (OSError, TVMError):
+            return None
+
+    def _save(self, key, result):
+        # write to a file private to the process, and rename it in place
+        path = self._path(key)
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                f.write(tvm.ir.save_json(result))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self._entries)
+
+
+parse_cache = ParseCache(
+    int(os.environ.get("TVM_SCRIPT_PARSE_CACHE_SIZE", "128")),
+    os.environ.get("TVM_SCRIPT_CACHE_DIR", None) or None,
+)
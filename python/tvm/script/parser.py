@@ -24,6 +24,7 @@ use for error reporting.
 import json
 import operator
 import inspect
+import time
 from synr import ast, Transformer, to_ast
 
 import tvm
@@ -40,6 +41,61 @@ from .scope_handler import ScopeHandler, WithScopeHandler, ForScopeHandler
 from . import _ffi_api
 from .diagnostics import TVMDiagnosticCtx
 from .utils import from_synr_span
+from .parse_cache import parse_cache
+
+
+class ParseProfile(object):
+    """The time spent in each phase of parsing TVM script.
+
+    The phases are the conversion of the python AST by synr, the visitor of
+    each kind of AST node, excluding the time spent in its children, and the
+    lookups and stores of the parse cache.
+
+    Example
+    -------
+    .. code-block:: python
+
+        profile = tvm.script.ParseProfile()
+        func = tvm.script.from_source(script, profile=profile)
+        print(profile)
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._children = []
+
+    def measure(self, phase, func, *args):
+        """Call a function and add its time, excluding the phases it measures,
+        to a phase."""
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(phase, elapsed - self._children.pop())
+            if self._children:
+                self._children[-1] += elapsed
+
+    def add(self, phase, seconds):
+        """Add the time of one call to a phase."""
+        count, total = self.timings.get(phase, (0, 0.0))
+        self.timings[phase] = (count + 1, total + seconds)
+
+    @property
+    def total(self):
+        """The total time in seconds."""
+        return sum(seconds for _, seconds in self.timings.values())
+
+    def __str__(self):
+        total = self.total or 1.0
+        lines = ["%-28s %10s %12s %8s" % ("phase", "calls", "time (ms)", "share")]
+        for phase, (count, seconds) in sorted(self.timings.items(), key=lambda item: -item[1][1]):
+            lines.append(
+                "%-28s %10d %12.2f %7.1f%%" % (phase, count, seconds * 1e3, 100 * seconds / total)
+            )
+        lines.append("%-28s %10s %12.2f" % ("total", "", self.total * 1e3))
+        return "\n".join(lines)
 
 
 class CallArgumentReader(object):
@@ -148,13 +204,16 @@ class TVMScriptParser(Transformer):
         ast.BuiltinOp.Not: tvm.tir.Not,
     }
 
-    def __init__(self, base_lienno):
+    def __init__(self, base_lienno, profile=None):
         self.context = None
 
         self.base_lineno = base_lienno
         self.current_lineno = 0
         self.current_col_offset = 0
         self.meta = None
+        self.profile = profile
+        # the visitor method of each class of AST node
+        self._visitors = {}
 
     def init_function_parsing_env(self):
         """Initialize function parsing environment"""
@@ -174,9 +233,14 @@ class TVMScriptParser(Transformer):
         if hasattr(node, "col_offset"):
             self.current_col_offset = node.col_offset
 
-        method = "transform_" + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        transform_res = visitor(node)
+        visitor = self._visitors.get(node.__class__, None)
+        if visitor is None:
+            method = "transform_" + node.__class__.__name__
+            visitor = self._visitors[node.__class__] = getattr(self, method, self.generic_visit)
+        if self.profile is None:
+            transform_res = visitor(node)
+        else:
+            transform_res = self.profile.measure(visitor.__name__, visitor, node)
 
         self.current_lineno, self.current_col_offset = old_lineno, old_col_offset
 
@@ -892,29 +956,59 @@ class TVMScriptParser(Transformer):
         )
 
 
-def from_source(src):
+def from_source(src, profile=None):
     """Parse function or string into TIR.
 
     If possible, pass the TVM script in as a function so that line numbers and
-    filename will be accurate.
+    filename will be accurate. The results are cached on the source of the
+    script, see tvm.script.parse_cache.
 
     Parameters
     ----------
     src : [str, function, class]
         Pruned source of original script
-    func_lineno : Optional[int]
-        The line number of the first line of the script to be parsed
+    profile : Optional[ParseProfile]
+        The profile to add the time spent in each phase of parsing to
     Returns
     -------
     functions : PrimFunc or IRModule
         The PrimFunc or IRModule in IR.
     """
     if isinstance(src, str):
-        start_line = 0
+        source_name, start_line, source = "<string input>", 0, src
     else:
-        _, start_line = inspect.getsourcelines(src)
-    parser = TVMScriptParser(start_line)
-    return to_ast(src, TVMDiagnosticCtx(), parser)
+        lines, start_line = inspect.getsourcelines(src)
+        source_name, source = inspect.getsourcefile(src), "".join(lines)
+
+    key = None
+    if parse_cache.enabled:
+        key = parse_cache.key(source_name, start_line, source)
+        if profile is None:
+            result = parse_cache.get(key)
+        else:
+            result = profile.measure("cache_lookup", parse_cache.get, key)
+        if result is not None:
+            return _own_copy(result)
+
+    parser = TVMScriptParser(start_line, profile)
+    if profile is None:
+        result = to_ast(src, TVMDiagnosticCtx(), parser)
+    else:
+        result = profile.measure("synr", to_ast, src, TVMDiagnosticCtx(), parser)
+    if key is not None and isinstance(result, (tvm.tir.PrimFunc, IRModule)):
+        if profile is None:
+            parse_cache.put(key, result)
+        else:
+            profile.measure("cache_store", parse_cache.put, key, result)
+        return _own_copy(result)
+    return result
+
+
+def _own_copy(result):
+    """A module of its own for the caller, as the cached module is shared."""
+    if isinstance(result, IRModule):
+        return IRModule(result.functions, result.type_definitions)
+    return result
 
 
 def create_module(functions=None):
@@ -48,10 +48,21 @@ def get_param_list(func):
     return pos_only, kwargs, full_arg_spec.varargs
 
 
+# The SourceName of each file, created once for all the spans of the file
+_SOURCE_NAMES = {}
+
+
+def _source_name(filename):
+    name = _SOURCE_NAMES.get(filename, None)
+    if name is None:
+        name = _SOURCE_NAMES[filename] = SourceName(filename)
+    return name
+
+
 def from_synr_span(span):
     """Convert a synr span to a TVM span"""
     return Span(
-        SourceName(span.filename),
+        _source_name(span.filename),
         span.start_line,
         span.end_line,
         span.start_column,
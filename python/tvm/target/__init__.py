@@ -62,3 +62,6 @@ from .generic_func import generic_func, get_native_generic_func, override_native
 from . import datatype
 from . import codegen
 from .intrin import register_intrin_rule
+
+# Codegen callbacks of the external toolchains
+from ..contrib import rocm as _rocm, nvcc as _nvcc, sdaccel as _sdaccel
@@ -60,9 +60,10 @@ def script(pyfunc):
             return source_to_op(src, args, func.__globals__, closure_vars)
 
         from .runtime import _enter_hybrid_runtime, _restore_runtime
+        from .vectorizer import vectorize
 
         intersect = _enter_hybrid_runtime(func)
-        value = func(*args, **kwargs)
+        value = vectorize(func)(*args, **kwargs)
         _restore_runtime(func, intersect)
         return value
 
@@ -106,6 +106,21 @@ def sigmoid(x):
     return 1 / (1 + numpy.exp(-x))
 
 
+# below this number of iterations the loop is faster than the numpy calls
+_VECTORIZE_MIN_ITERATIONS = 32
+
+
+def _vectorizable(ranges, *arrays):
+    """Whether a loop nest rewritten in vectorizer.py should run vectorized,
+    given the arguments of the ranges of its loops and the arrays it indexes."""
+    iterations = 1
+    for args in ranges:
+        iterations *= len(range(*args))
+    if iterations < _VECTORIZE_MIN_ITERATIONS:
+        return False
+    return all(isinstance(array, numpy.ndarray) for array in arrays)
+
+
 def max_num_threads(allow_none=True):
     """Get max number of threads for GPU targets."""
     return Target.current(allow_none).max_num_threads
@@ -142,6 +157,9 @@ HYBRID_GLOBALS = {
     "float64": numpy.float64,
     "ceil_div": lambda a, b: (a + b - 1) // b,
     "max_num_threads": max_num_threads,
+    # used by the loop nests rewritten in vectorizer.py
+    "__hybrid_numpy__": numpy,
+    "__hybrid_vectorizable__": _vectorizable,
 }
 
 
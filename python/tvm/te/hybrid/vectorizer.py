@@ -0,0 +1,427 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Vectorized Python emulation of Hybrid Script.
+
+In the emulation mode a hybrid script runs as Python over NumPy arrays, one
+iteration of its loops at a time. The loop nests whose iterations are
+independent are rewritten to run all their iterations at once: the loop
+variables become broadcast NumPy aranges, and the arrays are indexed with them.
+
+A loop nest is rewritten when
+1. it is a perfect nest of range, const_range, unroll, parallel or vectorize
+   loops, with extents invariant in the nest, and its innermost body only
+   assigns to arrays and to temporaries;
+2. every store indexes each loop variable of the nest in one dimension, as an
+   affine function with a constant coefficient, and its other dimensions are
+   invariant in the nest, so that the iterations store distinct elements;
+3. the arrays stored to are only loaded at the indices they are stored at;
+4. the temporaries are assigned in the body before they are used, and neither
+   they nor the loop variables are used outside the nest;
+5. the values only use arithmetic, comparisons and elementwise intrinsics.
+The other loops run in Python as before. The rewritten nest keeps the loop as
+a fallback, which runs when one of the indexed names is not a NumPy array, or
+when the nest has too few iterations to amortize the NumPy calls.
+Setting the environment variable TVM_HYBRID_VECTORIZE to 0 disables it.
+"""
+import ast
+import copy
+import inspect
+import os
+import types
+
+from .utils import _pruned_source
+
+# The loops which can be vectorized, bind loops are kept.
+_LOOPS = ["range", "const_range", "unroll", "parallel", "vectorize"]
+
+# The intrinsics applying elementwise to NumPy arrays.
+_ELEMENTWISE = [
+    "sqrt",
+    "rsqrt",
+    "log",
+    "tanh",
+    "power",
+    "exp",
+    "sigmoid",
+    "likely",
+    "uint8",
+    "uint16",
+    "uint32",
+    "uint64",
+    "int8",
+    "int16",
+    "int32",
+    "int64",
+    "float16",
+    "float32",
+    "float64",
+]
+
+# The Python builtins replaced by their NumPy counterpart, with their arity.
+_BUILTINS = {"max": ("maximum", 2), "min": ("minimum", 2), "abs": ("abs", 1)}
+
+_ARITHMETIC = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.BitXor,
+    ast.LShift,
+    ast.RShift,
+)
+
+_COMPARISONS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+# The names of the runtime helpers in the globals of the emulation, see runtime.py
+NUMPY_NAME = "__hybrid_numpy__"
+GUARD_NAME = "__hybrid_vectorizable__"
+
+_VECTORIZED = {}
+
+
+def _names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _indices(subscript):
+    """The index expressions of a subscript, None if it has slices."""
+    index = subscript.slice
+    if type(index).__name__ == "Index":  # python < 3.9
+        index = index.value
+    elements = index.elts if isinstance(index, ast.Tuple) else [index]
+    if any(type(e).__name__ in ("Slice", "ExtSlice") for e in elements + [index]):
+        return None
+    return elements
+
+
+def _int_constant(node):
+    value = getattr(node, "value", getattr(node, "n", None))
+    if type(node).__name__ in ("Constant", "Num") and isinstance(value, int):
+        return value
+    return None
+
+
+class _NestChecker(object):
+    """Check that the body of a loop nest can run vectorized."""
+
+    def __init__(self, loop_vars, body):
+        self.loop_vars = set(loop_vars)
+        self.temps = set()
+        self.stores = {}
+        for stmt in body:
+            target = stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt.target
+            if isinstance(target, ast.Name):
+                self.temps.add(target.id)
+            else:
+                key = ast.dump(ast.Tuple(_indices(target), ast.Load()))
+                self.stores.setdefault(target.value.id, set()).add(key)
+        self.variant = self.loop_vars | self.temps | set(self.stores)
+        self.defined = set()
+
+    def invariant(self, node):
+        """Whether an expression has the same value in every iteration."""
+        if self.variant & _names(node):
+            return False
+        for call in ast.walk(node):
+            if isinstance(call, ast.Call):
+                if not isinstance(call.func, ast.Name) or call.func.id not in _ELEMENTWISE:
+                    return False
+        return True
+
+    def affine(self, node, var):
+        """Whether an expression is an affine function of a loop variable."""
+        if isinstance(node, ast.Name):
+            return node.id == var
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return self.affine(node.operand, var)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+            return (self.affine(node.left, var) and self.invariant(node.right)) or (
+                self.invariant(node.left) and self.affine(node.right, var)
+            )
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            return (self.affine(node.left, var) and _int_constant(node.right)) or (
+                _int_constant(node.left) and self.affine(node.right, var)
+            )
+        return False
+
+    def check_store(self, target):
+        """Whether the iterations store to distinct elements."""
+        indexed = []
+        for index in _indices(target):
+            loop_vars = self.loop_vars & _names(index)
+            if not loop_vars:
+                if not self.invariant(index):
+                    return False
+            elif len(loop_vars) > 1 or not self.affine(index, loop_vars.pop()):
+                return False
+            else:
+                indexed.extend(self.loop_vars & _names(index))
+        return sorted(indexed) == sorted(self.loop_vars)
+
+    def check_value(self, node):
+        """Whether an expression can be evaluated over all the iterations."""
+        if isinstance(node, ast.Name):
+            return node.id not in self.temps or node.id in self.defined
+        if type(node).__name__ in ("Constant", "Num", "NameConstant"):
+            return True
+        if isinstance(node, ast.BinOp):
+            return (
+                isinstance(node.op, _ARITHMETIC)
+                and self.check_value(node.left)
+                and self.check_value(node.right)
+            )
+        if isinstance(node, ast.UnaryOp):
+            return isinstance(node.op, (ast.USub, ast.UAdd, ast.Invert)) and self.check_value(
+                node.operand
+            )
+        if isinstance(node, ast.Compare):
+            return (
+                len(node.ops) == 1
+                and isinstance(node.ops[0], _COMPARISONS)
+                and self.check_value(node.left)
+                and self.check_value(node.comparators[0])
+            )
+        if isinstance(node, ast.Subscript):
+            if not isinstance(node.value, ast.Name):
+                return self.invariant(node)
+            indices = _indices(node)
+            if indices is None or node.value.id in self.temps:
+                return False
+            if node.value.id in self.stores:
+                key = ast.dump(ast.Tuple(indices, ast.Load()))
+                if self.stores[node.value.id] != {key}:
+                    return False
+            return all(self.check_value(index) for index in indices)
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                return False
+            name = node.func.id
+            if name in _BUILTINS:
+                if len(node.args) != _BUILTINS[name][1]:
+                    return False
+            elif name not in _ELEMENTWISE:
+                return False
+            return all(self.check_value(arg) for arg in node.args)
+        if isinstance(node, ast.Attribute):
+            return self.invariant(node)
+        return False
+
+    def check(self, body):
+        for stmt in body:
+            target = stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt.target
+            if not self.check_value(stmt.value):
+                return False
+            if isinstance(target, ast.Name):
+                if isinstance(stmt, ast.AugAssign) and target.id not in self.defined:
+                    return False
+                self.defined.add(target.id)
+            elif not self.check_store(target) or not all(
+                self.check_value(index) for index in _indices(target)
+            ):
+                return False
+        for array, keys in self.stores.items():
+            if len(keys) != 1 or array in self.loop_vars | self.temps:
+                return False
+        return not self.loop_vars & self.temps
+
+
+def _match_nest(loop):
+    """The loop variables, extents and innermost body of a perfect loop nest,
+    None if the nest can not be vectorized."""
+    loops = []
+    node = loop
+    while True:
+        if not (
+            isinstance(node.target, ast.Name)
+            and isinstance(node.iter, ast.Call)
+            and isinstance(node.iter.func, ast.Name)
+            and node.iter.func.id in _LOOPS
+            and 1 <= len(node.iter.args) <= 2
+            and not node.iter.keywords
+            and not node.orelse
+        ):
+            return None
+        loops.append((node.target.id, node.iter.args))
+        if len(node.body) == 1 and isinstance(node.body[0], ast.For):
+            node = node.body[0]
+            continue
+        break
+    body = node.body
+    for stmt in body:
+        if isinstance(stmt, ast.Assign):
+            if len(stmt.targets) != 1:
+                return None
+            target = stmt.targets[0]
+        elif isinstance(stmt, ast.AugAssign):
+            target = stmt.target
+        else:
+            return None
+        if isinstance(target, ast.Subscript):
+            if not isinstance(target.value, ast.Name) or _indices(target) is None:
+                return None
+        elif not isinstance(target, ast.Name):
+            return None
+    loop_vars = [var for var, _ in loops]
+    if len(set(loop_vars)) != len(loop_vars):
+        return None
+    checker = _NestChecker(loop_vars, body)
+    if not all(checker.invariant(arg) for _, args in loops for arg in args):
+        return None
+    if not checker.check(body):
+        return None
+    return loops, body, checker
+
+
+def _loaded_outside(func_def, nest, names):
+    """Whether one of the names is loaded outside a loop nest, except in the
+    loops which bind it again."""
+
+    def visit(node, names):
+        if node is nest:
+            return False
+        if isinstance(node, ast.For) and isinstance(node.target, ast.Name):
+            if node.target.id in names:
+                body_names = names - {node.target.id}
+                return visit(node.iter, names) or any(
+                    visit(stmt, body_names) for stmt in node.body + node.orelse
+                )
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            if node.id in names:
+                return True
+        return any(visit(child, names) for child in ast.iter_child_nodes(node))
+
+    return visit(func_def, names)
+
+
+class _BuiltinRewriter(ast.NodeTransformer):
+    """Replace the builtins of the values by their NumPy counterpart."""
+
+    def visit_Call(self, node):  # pylint: disable=invalid-name
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name) and node.func.id in _BUILTINS:
+            node.func = ast.Attribute(
+                ast.Name(NUMPY_NAME, ast.Load()), _BUILTINS[node.func.id][0], ast.Load()
+            )
+        return node
+
+
+class _LoopVectorizer(ast.NodeTransformer):
+    """Rewrite the loop nests of a function which can run vectorized."""
+
+    def __init__(self, func_def):
+        self.func_def = func_def
+        self.num_vectorized = 0
+
+    def visit_For(self, node):  # pylint: disable=invalid-name
+        match = _match_nest(node)
+        if match is None:
+            self.generic_visit(node)
+            return node
+        loops, body, checker = match
+        if _loaded_outside(self.func_def, node, checker.loop_vars | checker.temps):
+            self.generic_visit(node)
+            return node
+
+        arrays = sorted(
+            {
+                n.value.id
+                for stmt in body
+                for n in ast.walk(stmt)
+                if isinstance(n, ast.Subscript) and isinstance(n.value, ast.Name)
+            }
+        )
+        ranges = ast.Tuple(
+            [ast.Tuple([copy.deepcopy(arg) for arg in args], ast.Load()) for _, args in loops],
+            ast.Load(),
+        )
+        guard = ast.If(
+            ast.Call(
+                ast.Name(GUARD_NAME, ast.Load()),
+                [ranges] + [ast.Name(array, ast.Load()) for array in arrays],
+                [],
+            ),
+            [],
+            [node],
+        )
+        for axis, (var, args) in enumerate(loops):
+            shape = ["1"] * len(loops)
+            shape[axis] = "-1"
+            arange = ast.Call(
+                ast.Attribute(ast.Name(NUMPY_NAME, ast.Load()), "arange", ast.Load()),
+                [copy.deepcopy(arg) for arg in args],
+                [],
+            )
+            reshape = ast.Call(
+                ast.Attribute(arange, "reshape", ast.Load()),
+                [ast.parse("(%s,)" % ", ".join(shape), mode="eval").body],
+                [],
+            )
+            guard.body.append(ast.Assign([ast.Name(var, ast.Store())], reshape))
+        guard.body.extend(_BuiltinRewriter().visit(copy.deepcopy(stmt)) for stmt in body)
+        self.num_vectorized += 1
+        return ast.fix_missing_locations(ast.copy_location(guard, node))
+
+
+def vectorize(func):
+    """Rewrite the loop nests of a hybrid script which can run vectorized.
+
+    Parameters
+    ----------
+    func : function
+        The Python function of the hybrid script.
+
+    Returns
+    -------
+    vectorized_func : function
+        The function with its loop nests rewritten, sharing the globals of
+        func, or func itself when no loop nest can be rewritten.
+    """
+    if os.environ.get("TVM_HYBRID_VECTORIZE", "1") == "0":
+        return func
+    if func.__code__ in _VECTORIZED:
+        return _VECTORIZED[func.__code__]
+
+    vectorized_func = func
+    # the closures of the function can not be rebuilt from its source
+    if not func.__closure__:
+        try:
+            source = _pruned_source(func)
+            filename = inspect.getsourcefile(func)
+            first_line = inspect.getsourcelines(func)[1]
+        except (OSError, TypeError):
+            source = None
+        tree = ast.parse(source) if source is not None else None
+        if tree is not None and isinstance(tree.body[0], ast.FunctionDef):
+            func_def = tree.body[0]
+            func_def.decorator_list = []
+            vectorizer = _LoopVectorizer(func_def)
+            func_def.body = [vectorizer.visit(stmt) for stmt in func_def.body]
+            if vectorizer.num_vectorized:
+                ast.increment_lineno(tree, first_line - 1)
+                namespace = {}
+                exec(compile(tree, filename, "exec"), namespace)  # pylint: disable=exec-used
+                code = namespace[func_def.name].__code__
+                vectorized_func = types.FunctionType(
+                    code, func.__globals__, func.__name__, func.__defaults__
+                )
+    _VECTORIZED[func.__code__] = vectorized_func
+    return vectorized_func
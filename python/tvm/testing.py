@@ -53,7 +53,22 @@ If in the future we want to add a new type of testing node (for example
 fpgas), we need to add a new marker in `tests/python/pytest.ini` and a new
 function in this module. Then targets using this node should be added to the
 `TVM_TEST_TARGETS` environment variable in the CI.
+
+Parallel Test Runs
+******************
+
+Many tests and parametrizations build the same small kernels. With
+`pytest --build-cache`, :py:func:`tvm.build` goes through a
+:py:class:`BuildCache` for the session, which reuses the module built for a
+structurally equal kernel and target. With pytest-xdist, e.g.
+`pytest -n 8 --build-cache`, the workers share the modules they build through
+a directory created for the session.
+
+A run can also be split across machines with `--shard i/n` or the
+`TVM_TEST_SHARD` environment variable, see :py:func:`shard_items`.
 """
+import contextlib
+import hashlib
 import logging
 import os
 import sys
@@ -716,6 +731,174 @@ def parametrize_targets(*args):
     return wrap(args)
 
 
+class BuildCache(object):
+    """A cache of the modules built by :py:func:`tvm.build` in tests.
+
+    Tests and their parametrizations often build the same kernels. The cache
+    lowers the inputs, and returns the module built before for a structurally
+    equal lowered module, target and PassContext, skipping the code generation.
+
+    Given a directory, the built modules are also exported to it with their
+    lowered module, so that the pytest-xdist workers of a session share them.
+
+    Parameters
+    ----------
+    directory : Optional[str]
+        The directory shared by the processes, the cache stays in memory if None.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._modules = {}
+
+    @staticmethod
+    def key(input_mod, target, target_host):
+        """The key of the module built from a lowered module."""
+        ctx = tvm.transform.PassContext.current()
+        return (
+            tvm.ir.structural_hash(input_mod),
+            str(tvm.target.Target(target)),
+            str(target_host),
+            int(ctx.opt_level),
+            tuple(str(name) for name in ctx.required_pass),
+            tuple(str(name) for name in ctx.disabled_pass),
+            str(ctx.config),
+        )
+
+    def build(
+        self, inputs, args=None, target=None, target_host=None, name="default_function", binds=None
+    ):
+        """Cached :py:func:`tvm.build`, with the same arguments."""
+        if isinstance(inputs, tvm.te.Schedule):
+            if args is None:
+                raise ValueError("args must be given for build from schedule")
+            input_mod = tvm.driver.lower(inputs, args, name=name, binds=binds)
+        elif isinstance(inputs, tvm.IRModule):
+            input_mod = inputs
+        else:
+            # lists of functions and dicts of targets are not cached
+            return _uncached_build(inputs, args, target, target_host, name, binds)
+        target = tvm.target.Target.current() if target is None else target
+        target = target if target else "llvm"
+
+        key = self.key(input_mod, target, target_host)
+        entry = self._modules.get(key, None)
+        if entry is None and self.directory:
+            entry = self._load(key, input_mod)
+        if entry is not None and tvm.ir.structural_equal(entry[0], input_mod):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        rt_mod = _uncached_build(input_mod, target=target, target_host=target_host)
+        self._modules[key] = (input_mod, rt_mod)
+        if self.directory:
+            self._save(key, input_mod, rt_mod)
+        return rt_mod
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def _load(self, key, input_mod):
+        path = self._path(key)
+        if not (os.path.exists(path + ".json") and os.path.exists(path + ".so")):
+            return None
+        with open(path + ".json") as f:
+            cached_mod = tvm.ir.load_json(f.read())
+        if not tvm.ir.structural_equal(cached_mod, input_mod):
+            return None
+        entry = (cached_mod, tvm.runtime.load_module(path + ".so"))
+        self._modules[key] = entry
+        return entry
+
+    def _save(self, key, input_mod, rt_mod):
+        path = self._path(key)
+        # write to files private to the process, and rename them in place
+        suffix = ".%d.tmp" % os.getpid()
+        try:
+            rt_mod.export_library(path + suffix + ".so")
+        except RuntimeError:
+            # the module cannot be exported, e.g. it has no host code
+            return
+        with open(path + suffix + ".json", "w") as f:
+            f.write(tvm.ir.save_json(input_mod))
+        os.replace(path + suffix + ".so", path + ".so")
+        os.replace(path + suffix + ".json", path + ".json")
+
+
+_uncached_build = tvm.driver.build
+
+
+@contextlib.contextmanager
+def build_cache(directory=None):
+    """Route :py:func:`tvm.build` through a :py:class:`BuildCache`.
+
+    Parameters
+    ----------
+    directory : Optional[str]
+        The directory shared by the processes, defaults to the environment
+        variable TVM_TEST_BUILD_CACHE_DIR, the cache stays in memory if unset.
+
+    Example
+    -------
+    >>> with tvm.testing.build_cache() as cache:
+    >>>     f = tvm.build(s, [A, B], "llvm")
+    >>>     g = tvm.build(s, [A, B], "llvm")  # the module built for f
+    >>> print(cache.hits, cache.misses)
+    """
+    if directory is None:
+        directory = os.environ.get("TVM_TEST_BUILD_CACHE_DIR", None)
+    cache = BuildCache(directory)
+    previous = tvm.build
+    tvm.build = tvm.driver.build = cache.build
+    try:
+        yield cache
+    finally:
+        tvm.build = tvm.driver.build = previous
+
+
+def _shard_of(nodeid, num_shards):
+    """The shard of a test, stable across processes and runs."""
+    # all the parametrizations of a test go to the same shard, which builds
+    # the kernels they share once
+    base = nodeid.split("[")[0]
+    return int(hashlib.sha1(base.encode()).hexdigest(), 16) % num_shards
+
+
+def shard_items(items, shard, num_shards):
+    """Select the tests of a shard, for splitting a test run across machines.
+
+    The parametrizations of a test stay in the same shard.
+
+    Parameters
+    ----------
+    items : List[pytest.Item]
+        The collected tests.
+
+    shard : int
+        The index of the shard, in [0, num_shards).
+
+    num_shards : int
+        The number of shards.
+
+    Returns
+    -------
+    selected, deselected : Tuple[List[pytest.Item], List[pytest.Item]]
+        The tests of the shard and the others.
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError("shard must be in [0, %d), got %d" % (num_shards, shard))
+    selected, deselected = [], []
+    for item in items:
+        if _shard_of(item.nodeid, num_shards) == shard:
+            selected.append(item)
+        else:
+            deselected.append(item)
+    return selected, deselected
+
+
 def identity_after(x, sleep):
     """Testing function to return identity after sleep
 
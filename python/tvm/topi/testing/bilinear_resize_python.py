@@ -16,7 +16,6 @@
 # under the License.
 # pylint: disable=invalid-name, line-too-long, unused-variable, too-many-locals
 """Bilinear Scale in python"""
-import math
 import numpy as np
 from tvm.topi.utils import nchw_pack_layout
 
@@ -24,18 +23,17 @@ from tvm.topi.utils import nchw_pack_layout
 def bilinear_resize_python(image, out_size, layout, coordinate_transformation_mode="align_corners"):
     """ Bilinear scaling using python"""
     (new_h, new_w) = out_size
-    (ib, ic) = (1, 1)
 
     if layout == "NHWC":
         (batch, h, w, channel) = image.shape
-        scaled_image = np.ones((batch, new_h, new_w, channel))
+        h_axis, w_axis = 1, 2
     # NCHWinic
     elif nchw_pack_layout(layout):
         (batch, channel, h, w, ib, ic) = image.shape
-        scaled_image = np.ones((batch, channel, new_h, new_w, ib, ic))
+        h_axis, w_axis = 2, 3
     else:
         (batch, channel, h, w) = image.shape
-        scaled_image = np.ones((batch, channel, new_h, new_w))
+        h_axis, w_axis = 2, 3
 
     if coordinate_transformation_mode == "align_corners":
         height_scale = np.float32(h - 1) / np.float32(out_size[0] - 1)
@@ -47,59 +45,27 @@ def bilinear_resize_python(image, out_size, layout, coordinate_transformation_mo
     def _lerp(A, B, t):
         return A * (1.0 - t) + B * t
 
-    def _img_scale(b, m, i, n):
-        for j in range(new_h):
-            for k in range(new_w):
-                if coordinate_transformation_mode == "half_pixel":
-                    in_y = (j + 0.5) * height_scale - 0.5
-                else:
-                    in_y = j * height_scale
-                y0 = int(math.floor(in_y))
-                y1 = max(min(y0 + 1, h - 1), 0)
-                y0 = max(y0, 0)
-                y_lerp = in_y - math.floor(in_y)
+    def _coords(out_len, in_len, scale, axis):
+        """The input indices and weights of the outputs along an axis"""
+        out = np.arange(out_len, dtype="float32")
+        if coordinate_transformation_mode == "half_pixel":
+            in_x = (out + 0.5) * scale - 0.5
+        else:
+            in_x = out * scale
+        x0 = np.floor(in_x).astype("int64")
+        x1 = np.maximum(np.minimum(x0 + 1, in_len - 1), 0)
+        x0 = np.maximum(x0, 0)
+        shape = [1] * image.ndim
+        shape[axis] = out_len
+        return x0, x1, (in_x - np.floor(in_x)).reshape(shape)
 
-                if coordinate_transformation_mode == "half_pixel":
-                    in_x = (k + 0.5) * width_scale - 0.5
-                else:
-                    in_x = k * width_scale
-                x0 = int(math.floor(in_x))
-                x1 = max(min(x0 + 1, w - 1), 0)
-                x0 = max(x0, 0)
-                x_lerp = in_x - math.floor(in_x)
+    y0, y1, y_lerp = _coords(new_h, h, height_scale, h_axis)
+    x0, x1, x_lerp = _coords(new_w, w, width_scale, w_axis)
 
-                if layout == "NHWC":
-                    A = image[b][y0][x0][i]
-                    B = image[b][y0][x1][i]
-                    C = image[b][y1][x0][i]
-                    D = image[b][y1][x1][i]
-                elif nchw_pack_layout(layout):
-                    A = image[b][i][y0][x0][m][n]
-                    B = image[b][i][y0][x1][m][n]
-                    C = image[b][i][y1][x0][m][n]
-                    D = image[b][i][y1][x1][m][n]
-                else:
-                    A = image[b][i][y0][x0]
-                    B = image[b][i][y0][x1]
-                    C = image[b][i][y1][x0]
-                    D = image[b][i][y1][x1]
-
-                top = _lerp(A, B, x_lerp)
-                bottom = _lerp(C, D, x_lerp)
-
-                pixel = np.float32(_lerp(top, bottom, y_lerp))
-
-                if layout == "NHWC":
-                    scaled_image[b][j][k][i] = pixel
-                elif nchw_pack_layout(layout):
-                    scaled_image[b][i][j][k][m][n] = pixel
-                else:
-                    scaled_image[b][i][j][k] = pixel
-
-    for b in range(batch):
-        for m in range(ib):
-            for i in range(channel):
-                for n in range(ic):
-                    _img_scale(b, m, i, n)
+    row0 = np.take(image, y0, axis=h_axis)
+    row1 = np.take(image, y1, axis=h_axis)
+    top = _lerp(np.take(row0, x0, axis=w_axis), np.take(row0, x1, axis=w_axis), x_lerp)
+    bottom = _lerp(np.take(row1, x0, axis=w_axis), np.take(row1, x1, axis=w_axis), x_lerp)
 
+    scaled_image = _lerp(top, bottom, y_lerp).astype("float32").astype("float64")
     return scaled_image
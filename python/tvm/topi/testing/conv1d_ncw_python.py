@@ -18,6 +18,7 @@
 """1D convolution in python"""
 import numpy as np
 from tvm.topi.nn.utils import get_pad_tuple1d
+from .im2col import conv_nchw
 
 
 def dilate_np(x, dilation):
@@ -78,17 +79,4 @@ def conv1d_ncw_python(a_np, w_np, stride, padding, dilation):
 
     dilated_filter_w = (filter_w - 1) * dilation + 1
     pad_left, pad_right = get_pad_tuple1d(padding, (dilated_filter_w,))
-    out_w = ((in_w - dilated_filter_w + pad_left + pad_right) // stride) + 1
-
-    padded_a_np = np.zeros((batch, in_c, in_w + pad_left + pad_right))
-    padded_a_np[:, :, pad_left : (in_w + pad_left)] = a_np
-
-    b_np = np.zeros((batch, out_c, out_w))
-    for n in range(batch):
-        for f in range(out_c):
-            for c in range(in_c):
-                out = np.convolve(
-                    padded_a_np[n, c], np.flip(dilate_np(w_np[f, c], dilation)), mode="valid"
-                )
-                b_np[n, f] += out[::stride]
-    return b_np
+    return conv_nchw(a_np, w_np, (stride,), ((pad_left, pad_right),), (dilation,))
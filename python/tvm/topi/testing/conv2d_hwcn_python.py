@@ -17,8 +17,8 @@
 # pylint: disable=invalid-name, line-too-long, unused-variable, too-many-locals
 """Convolution in python"""
 import numpy as np
-import scipy.signal
 from tvm.topi.nn.utils import get_pad_tuple
+from .im2col import conv_nchw
 
 
 def conv2d_hwcn_python(a_np, w_np, stride, padding):
@@ -53,25 +53,8 @@ def conv2d_hwcn_python(a_np, w_np, stride, padding):
         stride_h, stride_w = stride
 
     pad_top, pad_left, pad_bottom, pad_right = get_pad_tuple(padding, (kernel_h, kernel_w))
-    pad_h = pad_top + pad_bottom
-    pad_w = pad_left + pad_right
-    # compute the output shape
-    out_channel = num_filter
-    out_height = (in_height - kernel_h + pad_h) // stride_h + 1
-    out_width = (in_width - kernel_w + pad_w) // stride_w + 1
     # change the layout from HWCN to NCHW
     at = a_np.transpose((3, 2, 0, 1))
     wt = w_np.transpose((3, 2, 0, 1))
-    bt = np.zeros((batch, out_channel, out_height, out_width))
-    # computation
-    for n in range(batch):
-        for f in range(out_channel):
-            for c in range(in_channel):
-                if pad_h > 0 or pad_w > 0:
-                    apad = np.zeros((in_height + pad_h, in_width + pad_w))
-                    apad[pad_top : pad_top + in_height, pad_left : pad_left + in_width] = at[n, c]
-                else:
-                    apad = at[n, c]
-                out = scipy.signal.convolve2d(apad, np.rot90(np.rot90(wt[f, c])), mode="valid")
-                bt[n, f] += out[::stride, ::stride]
+    bt = conv_nchw(at, wt, (stride_h, stride_w), ((pad_top, pad_bottom), (pad_left, pad_right)))
     return bt.transpose((2, 3, 1, 0))
@@ -17,8 +17,8 @@
 # pylint: disable=invalid-name, line-too-long, unused-variable, too-many-locals, too-many-branches
 """Convolution 3D in python"""
 import numpy as np
-import scipy.signal
 from tvm.topi.nn.utils import get_pad_tuple3d
+from .im2col import conv_nchw
 
 
 def _conv3d_ncdhw_python(a_np, w_np, stride, padding):
@@ -32,32 +32,12 @@ def _conv3d_ncdhw_python(a_np, w_np, stride, padding):
     pad_front, pad_top, pad_left, pad_back, pad_bottom, pad_right = get_pad_tuple3d(
         padding, (kernel_d, kernel_h, kernel_w)
     )
-    pad_d = pad_front + pad_back
-    pad_h = pad_top + pad_bottom
-    pad_w = pad_left + pad_right
-
-    # compute the output shape
-    out_channel = num_filter
-    out_depth = (in_depth - kernel_d + pad_d) // stride_d + 1
-    out_height = (in_height - kernel_h + pad_h) // stride_h + 1
-    out_width = (in_width - kernel_w + pad_w) // stride_w + 1
-    b_np = np.zeros((batch, out_channel, out_depth, out_height, out_width))
-    # computation
-    for n in range(batch):
-        for f in range(out_channel):
-            for c in range(in_channel):
-                if pad_d > 0 or pad_h > 0 or pad_w > 0:
-                    apad = np.zeros((in_depth + pad_d, in_height + pad_h, in_width + pad_w))
-                    apad[
-                        pad_front : pad_front + in_depth,
-                        pad_top : pad_top + in_height,
-                        pad_left : pad_left + in_width,
-                    ] = a_np[n, c]
-                else:
-                    apad = a_np[n, c]
-                out = scipy.signal.convolve(apad, np.flip(w_np[f, c]), mode="valid")
-                b_np[n, f] += out[::stride_d, ::stride_h, ::stride_w]
-    return b_np
+    return conv_nchw(
+        a_np,
+        w_np,
+        (stride_d, stride_h, stride_w),
+        ((pad_front, pad_back), (pad_top, pad_bottom), (pad_left, pad_right)),
+    )
 
 
 def conv3d_ncdhw_python(a_np, w_np, stride, padding, groups=1):
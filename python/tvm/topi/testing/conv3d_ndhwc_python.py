@@ -17,8 +17,8 @@
 # pylint: disable=invalid-name, line-too-long, unused-variable, too-many-locals
 """Convolution 3D in python"""
 import numpy as np
-import scipy.signal
 from tvm.topi.nn.utils import get_pad_tuple3d
+from .im2col import conv_nchw
 
 
 def conv3d_ndhwc_python(a_np, w_np, stride, padding):
@@ -55,31 +55,13 @@ def conv3d_ndhwc_python(a_np, w_np, stride, padding):
     pad_front, pad_top, pad_left, pad_back, pad_bottom, pad_right = get_pad_tuple3d(
         padding, (kernel_d, kernel_h, kernel_w)
     )
-    pad_d = pad_front + pad_back
-    pad_h = pad_top + pad_bottom
-    pad_w = pad_left + pad_right
-    # compute the output shape
-    out_channel = num_filter
-    out_depth = (in_depth - kernel_d + pad_d) // stride_d + 1
-    out_height = (in_height - kernel_h + pad_h) // stride_h + 1
-    out_width = (in_width - kernel_w + pad_w) // stride_w + 1
-    # change the layout from NHWC to NCHW
+    # change the layout from NDHWC to NCDHW
     at = a_np.transpose((0, 4, 1, 2, 3))
     wt = w_np.transpose((4, 3, 0, 1, 2))
-    bt = np.zeros((batch, out_channel, out_depth, out_height, out_width))
-    # computation
-    for n in range(batch):
-        for f in range(out_channel):
-            for c in range(in_channel):
-                if pad_d > 0 or pad_h > 0 or pad_w > 0:
-                    apad = np.zeros((in_depth + pad_d, in_height + pad_h, in_width + pad_w))
-                    apad[
-                        pad_front : pad_front + in_depth,
-                        pad_top : pad_top + in_height,
-                        pad_left : pad_left + in_width,
-                    ] = at[n, c]
-                else:
-                    apad = at[n, c]
-                out = scipy.signal.convolve(apad, np.flip(wt[f, c]), mode="valid")
-                bt[n, f] += out[::stride_d, ::stride_h, ::stride_w]
+    bt = conv_nchw(
+        at,
+        wt,
+        (stride_d, stride_h, stride_w),
+        ((pad_front, pad_back), (pad_top, pad_bottom), (pad_left, pad_right)),
+    )
     return bt.transpose((0, 2, 3, 4, 1))
@@ -16,7 +16,6 @@
 # under the License.
 # pylint: disable=invalid-name, too-many-locals, too-many-arguments
 """Deformable convolution in python"""
-import itertools
 import numpy as np
 from tvm.topi.nn.utils import get_pad_tuple
 
@@ -79,46 +78,50 @@ def deformable_conv2d_nchw_python(
     else:
         dilation_h, dilation_w = dilation
 
-    def _bilinear(n, c, h, w):
-        low_h, low_w = int(h), int(w)
-        high_h = min(low_h + 1, in_height - 1)
-        high_w = min(low_w + 1, in_width - 1)
-        y_lerp = h - low_h
-        x_lerp = w - low_w
-
-        bottom = (1 - x_lerp) * a_np[n, c, low_h, low_w] + x_lerp * a_np[n, c, low_h, high_w]
-        top = (1 - x_lerp) * a_np[n, c, high_h, low_w] + x_lerp * a_np[n, c, high_h, high_w]
-        return (1 - y_lerp) * bottom + y_lerp * top
-
-    a_deform = np.zeros((batch, in_channel, out_height, out_width, kernel_h, kernel_w), dtype=dtype)
-    for n, h, w in itertools.product(range(batch), range(out_height), range(out_width)):
-        offset = offset_np[n, :, h, w].reshape(deformable_groups, kernel_h, kernel_w, 2)
-        in_h = h * stride_h - pad_top
-        in_w = w * stride_w - pad_left
-
-        index_h_base, index_w_base = np.meshgrid(
-            np.arange(in_h, in_h + kernel_h * dilation_h, dilation_h, dtype=offset_np.dtype),
-            np.arange(in_w, in_w + kernel_w * dilation_w, dilation_w, dtype=offset_np.dtype),
-            indexing="ij",
-        )
-
-        for c, kh, kw in itertools.product(range(in_channel), range(kernel_h), range(kernel_w)):
-            dg = c // ic_per_dgroup
-            index_h = index_h_base + offset[dg, ..., 0]
-            index_w = index_w_base + offset[dg, ..., 1]
-
-            y, x = index_h[kh, kw], index_w[kh, kw]
-            if y < 0 or y >= in_height or x < 0 or x >= in_width:
-                continue
-            a_deform[n, c, h, w, kh, kw] = _bilinear(n, c, y, x)
-
-    b_np = np.zeros((batch, out_channel, out_height, out_width), dtype=dtype)
-    for n, c, f, h, w in itertools.product(
-        range(batch), range(in_channel), range(out_channel), range(out_height), range(out_width)
-    ):
-        b_np[n, f, h, w] += np.tensordot(a_deform[n, c, h, w], w_np[f, c])
-
-    return b_np
+    # the sampling positions of the deformable groups and kernel taps, with
+    # shape [batch, deformable_groups, kernel_h, kernel_w, out_height, out_width]
+    offset = offset_np.reshape(
+        batch, deformable_groups, kernel_h, kernel_w, 2, out_height, out_width
+    )
+    index_h = np.add.outer(
+        np.arange(kernel_h) * dilation_h, np.arange(out_height) * stride_h - pad_top
+    ).astype(offset_np.dtype)
+    index_w = np.add.outer(
+        np.arange(kernel_w) * dilation_w, np.arange(out_width) * stride_w - pad_left
+    ).astype(offset_np.dtype)
+    y = index_h[:, None, :, None] + offset[:, :, :, :, 0]
+    x = index_w[None, :, None, :] + offset[:, :, :, :, 1]
+    valid = (y >= 0) & (y < in_height) & (x >= 0) & (x < in_width)
+    y = np.where(valid, y, 0)
+    x = np.where(valid, x, 0)
+    low_y, low_x = np.floor(y), np.floor(x)
+    y_lerp = (y - low_y)[..., None]
+    x_lerp = (x - low_x)[..., None]
+    low_h, low_w = low_y.astype("int64"), low_x.astype("int64")
+    high_h = np.minimum(low_h + 1, in_height - 1)
+    high_w = np.minimum(low_w + 1, in_width - 1)
+
+    # gather the channels of each deformable group, the sampled values have shape
+    # [batch, deformable_groups, kernel_h, kernel_w, out_height, out_width, ic_per_dgroup]
+    a_group = a_np.reshape(batch, deformable_groups, ic_per_dgroup, in_height, in_width)
+    n_idx = np.arange(batch)[:, None, None, None, None, None]
+    dg_idx = np.arange(deformable_groups)[None, :, None, None, None, None]
+
+    def _sample(h, w):
+        return a_group[n_idx, dg_idx, :, h, w]
+
+    bottom = (1 - x_lerp) * _sample(low_h, low_w) + x_lerp * _sample(low_h, high_w)
+    top = (1 - x_lerp) * _sample(high_h, low_w) + x_lerp * _sample(high_h, high_w)
+    sampled = np.where(valid[..., None], (1 - y_lerp) * bottom + y_lerp * top, 0)
+
+    # [batch, in_channel, out_height, out_width, kernel_h, kernel_w]
+    a_deform = (
+        sampled.transpose((0, 1, 6, 4, 5, 2, 3))
+        .reshape(batch, in_channel, out_height, out_width, kernel_h, kernel_w)
+        .astype(dtype)
+    )
+    b_np = np.tensordot(a_deform, w_np, axes=([1, 4, 5], [1, 2, 3]))
+    return b_np.transpose((0, 3, 1, 2)).astype(dtype)
 
 
 def deformable_conv2d_nhwc_python(
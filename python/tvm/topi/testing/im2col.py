@@ -0,0 +1,152 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Sliding windows and im2col convolution for the reference kernels"""
+import numpy as np
+
+
+def sliding_windows(data, window, strides, axes, dilation=None):
+    """View the windows of an array along some of its axes, without copy.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The array.
+
+    window : list of int
+        The size of the windows along each axis.
+
+    strides : list of int
+        The distance between two windows along each axis.
+
+    axes : list of int
+        The axes the windows slide along.
+
+    dilation : list of int, optional
+        The distance between two elements of a window along each axis.
+
+    Returns
+    -------
+    windows : numpy.ndarray
+        A read only view with the number of windows along each of the axes,
+        followed by the window offsets as trailing axes.
+    """
+    axes = list(axes)
+    dilation = dilation or [1] * len(axes)
+    shape = list(data.shape)
+    steps = list(data.strides)
+    for axis, size, stride, dilate in zip(axes, window, strides, dilation):
+        extent = (size - 1) * dilate + 1
+        shape[axis] = (data.shape[axis] - extent) // stride + 1
+        steps[axis] = data.strides[axis] * stride
+    shape += list(window)
+    steps += [data.strides[axis] * dilate for axis, dilate in zip(axes, dilation)]
+    return np.lib.stride_tricks.as_strided(data, shape, steps, writeable=False)
+
+
+def conv_nchw(a_np, w_np, strides, pads, dilation=None):
+    """Convolution of channel first data of any rank as a matrix product of the
+    im2col windows of the data with the filters.
+
+    Parameters
+    ----------
+    a_np : numpy.ndarray
+        (2+N)-D with shape [batch, in_channel, in_spatial...]
+
+    w_np : numpy.ndarray
+        (2+N)-D with shape [num_filter, in_channel, filter_spatial...]
+
+    strides : list of N ints
+        The stride along each spatial axis
+
+    pads : list of N (int, int)
+        The padding before and after each spatial axis
+
+    dilation : list of N ints, optional
+        The dilation along each spatial axis
+
+    Returns
+    -------
+    b_np : np.ndarray
+        (2+N)-D float64 with shape [batch, num_filter, out_spatial...]
+    """
+    ndim = a_np.ndim - 2
+    padded = np.pad(a_np.astype("float64"), [(0, 0), (0, 0)] + [tuple(pad) for pad in pads])
+    windows = sliding_windows(padded, w_np.shape[2:], strides, range(2, 2 + ndim), dilation)
+    # [batch, out_spatial..., num_filter]
+    out = np.tensordot(
+        windows,
+        w_np.astype("float64"),
+        axes=([1] + list(range(2 + ndim, 2 + 2 * ndim)), [1] + list(range(2, 2 + ndim))),
+    )
+    return np.moveaxis(out, -1, 1)
+
+
+def pooling_windows(padded, kernel, strides, out_spatial, pad_value):
+    """Windows of padded channel first data for pooling.
+
+    In ceil mode the last windows can go past the end of the padded data,
+    they are filled with pad_value, which must not change the pooled value.
+
+    Parameters
+    ----------
+    padded : numpy.ndarray
+        (2+N)-D with shape [batch, channel, padded_spatial...]
+
+    kernel : list of N ints
+        The size of the windows
+
+    strides : list of N ints
+        The stride along each spatial axis
+
+    out_spatial : list of N ints
+        The number of windows along each spatial axis
+
+    pad_value : scalar
+        The value past the end of the padded data
+
+    Returns
+    -------
+    windows : numpy.ndarray
+        (2+2N)-D with shape [batch, channel, out_spatial..., kernel...]
+
+    counts : numpy.ndarray
+        N-D with shape [out_spatial...], the number of elements of each window
+        inside the padded data
+    """
+    spatial = padded.shape[2:]
+    extra = [
+        max(0, (o - 1) * s + k - d) for o, s, k, d in zip(out_spatial, strides, kernel, spatial)
+    ]
+    if any(extra):
+        padded = np.pad(
+            padded, [(0, 0), (0, 0)] + [(0, e) for e in extra], constant_values=pad_value
+        )
+    windows = sliding_windows(padded, kernel, strides, range(2, 2 + len(kernel)))
+    windows = windows[(slice(None), slice(None)) + tuple(slice(0, o) for o in out_spatial)]
+    counts = np.ones(())
+    for o, s, k, d in zip(out_spatial, strides, kernel, spatial):
+        start = np.arange(o) * s
+        counts = np.multiply.outer(counts, np.minimum(start + k, d) - start)
+    return windows, counts
+
+
+def lowest_value(dtype):
+    """The lowest value of a numpy dtype."""
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.floating):
+        return -np.inf
+    return np.iinfo(dtype).min
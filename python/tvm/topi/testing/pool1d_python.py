@@ -18,6 +18,7 @@
 """max_pool1d and avg_pool1d in python"""
 import math
 import numpy as np
+from .im2col import lowest_value, pooling_windows
 
 
 def pool1d_ncw_python(
@@ -46,24 +47,22 @@ def pool1d_ncw_python(
 
     no_zero = (range(in_n), range(in_c), range(pl, in_w + pl))
     pad_np[np.ix_(*no_zero)] = np_data
-    ret_np = np.zeros(shape=out_shape).astype(dtype)
+    pad_value = 0 if pool_type == "avg" else lowest_value(dtype)
+    windows, counts = pooling_windows(pad_np, (k_w,), (s_w,), out_shape[2:], pad_value)
 
     if pool_type == "avg":
-        for k in range(out_shape[2]):
-            if count_include_pad:
-                ret_np[:, :, k] = np.mean(pad_np[:, :, k * s_w : k * s_w + k_w], axis=(2,))
-            else:
-                pad_count = np.sum(pad_np[:, :, k * s_w : k * s_w + k_w] > 0, axis=(2,))
-                ret_np[:, :, k] = np.sum(
-                    pad_np[:, :, k * s_w : k * s_w + k_w], axis=(2,)
-                ) / np.maximum(pad_count, 1)
+        if count_include_pad:
+            ret_np = np.sum(windows, axis=-1) / counts
+        else:
+            pad_count = np.sum(windows > 0, axis=-1)
+            ret_np = np.sum(windows, axis=-1) / np.maximum(pad_count, 1)
 
     elif pool_type == "max":
-        for k in range(out_shape[2]):
-            ret_np[:, :, k] = np.max(pad_np[:, :, k * s_w : k * s_w + k_w], axis=(2,))
+        ret_np = np.max(windows, axis=-1)
 
     else:
         raise ValueError("Pool type {} is not supported".format(pool_type))
 
+    ret_np = ret_np.astype(dtype)
     ret_np = np.maximum(ret_np, 0.0)
     return ret_np
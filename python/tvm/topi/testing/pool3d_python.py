@@ -19,6 +19,7 @@
 import math
 import numpy as np
 import tvm
+from .im2col import lowest_value, pooling_windows
 
 
 def pool3d_ncdhw_python(
@@ -74,38 +75,23 @@ def pool3d_ncdhw_python(
                (range(pt, in_h + pt)),
                (range(pl, in_w + pl)))
     pad_np[np.ix_(*no_zero)] = np_data
-    ret_np = np.zeros(shape=out_shape).astype(dtype)
+    pad_value = 0 if pool_type == 'avg' else lowest_value(dtype)
+    windows, counts = pooling_windows(pad_np, (k_d, k_h, k_w), (s_d, s_h, s_w),
+                                      out_shape[2:], pad_value)
+    axes = (-3, -2, -1)
 
     if pool_type == 'avg':
-        for k in range(out_shape[2]):
-            for i in range(out_shape[3]):
-                for j in range(out_shape[4]):
-                    if count_include_pad:
-                        ret_np[:, :, k, i, j] = \
-                            np.mean(pad_np[:, :, k * s_d: k * s_d + k_d,
-                                           i * s_h: i * s_h + k_h,
-                                           j * s_w: j * s_w + k_w], axis=(2, 3, 4))
-                    else:
-                        pad_count = np.sum(pad_np[:, :,
-                                                  k * s_d: k * s_d + k_d,
-                                                  i * s_h: i * s_h + k_h,
-                                                  j * s_w: j * s_w + k_w] > 0, axis=(2, 3, 4))
-                        ret_np[:, :, k, i, j] = np.sum(pad_np[:, :,
-                                                              k * s_d: k * s_d + k_d,
-                                                              i * s_h: i * s_h + k_h,
-                                                              j * s_w: j * s_w + k_w],
-                                                       axis=(2, 3, 4)) / np.maximum(pad_count, 1)
+        if count_include_pad:
+            ret_np = np.sum(windows, axis=axes) / counts
+        else:
+            pad_count = np.sum(windows > 0, axis=axes)
+            ret_np = np.sum(windows, axis=axes) / np.maximum(pad_count, 1)
     elif pool_type == 'max':
-        for k in range(out_shape[2]):
-            for i in range(out_shape[3]):
-                for j in range(out_shape[4]):
-                    ret_np[:, :, k, i, j] = np.max(
-                        pad_np[:, :, k * s_d: k * s_d + k_d,
-                               i * s_h: i * s_h + k_h,
-                               j * s_w: j * s_w + k_w], axis=(2, 3, 4))
+        ret_np = np.max(windows, axis=axes)
     else:
         raise ValueError("pool type {} is not supported".format(pool_type))
 
+    ret_np = ret_np.astype(dtype)
     ret_np = np.maximum(ret_np, fill_value)
     # fmt: on
     return ret_np
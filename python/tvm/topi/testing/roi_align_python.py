@@ -14,7 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-# pylint: disable=invalid-name, too-many-nested-blocks
+# pylint: disable=invalid-name, too-many-locals
 "Roi align in python"
 import math
 import numpy as np
@@ -24,32 +24,34 @@ def roi_align_nchw_python(a_np, rois_np, pooled_size, spatial_scale, sample_rati
     """Roi align in python"""
     _, channel, height, width = a_np.shape
     num_roi = rois_np.shape[0]
-    b_np = np.zeros((num_roi, channel, pooled_size, pooled_size), dtype=a_np.dtype)
 
     if isinstance(pooled_size, int):
         pooled_size_h = pooled_size_w = pooled_size
     else:
         pooled_size_h, pooled_size_w = pooled_size
+    b_np = np.zeros((num_roi, channel, pooled_size_h, pooled_size_w), dtype=a_np.dtype)
 
-    def _bilinear(b, c, y, x):
-        if y < -1 or y > height or x < -1 or x > width:
-            return 0
-        y = max(y, 0.0)
-        x = max(x, 0.0)
-        y_low = int(y)
-        x_low = int(x)
+    def _bilinear(b, y, x):
+        """Sample all the channels of a_np[b] at the broadcast positions (y, x)"""
+        outside = (y < -1) | (y > height) | (x < -1) | (x > width)
+        y = np.maximum(y, 0.0)
+        x = np.maximum(x, 0.0)
+        y_low = np.minimum(y.astype("int64"), height - 1)
+        x_low = np.minimum(x.astype("int64"), width - 1)
 
-        y_high = min(y_low + 1, height - 1)
-        x_high = min(x_low + 1, width - 1)
+        y_high = np.minimum(y_low + 1, height - 1)
+        x_high = np.minimum(x_low + 1, width - 1)
 
-        ly = y - y_low
-        lx = x - x_low
-        return (
-            (1 - ly) * (1 - lx) * a_np[b, c, y_low, x_low]
-            + (1 - ly) * lx * a_np[b, c, y_low, x_high]
-            + ly * (1 - lx) * a_np[b, c, y_high, x_low]
-            + ly * lx * a_np[b, c, y_high, x_high]
+        ly = y - np.floor(y)
+        lx = x - np.floor(x)
+        data = a_np[b]
+        value = (
+            (1 - ly) * (1 - lx) * data[:, y_low, x_low]
+            + (1 - ly) * lx * data[:, y_low, x_high]
+            + ly * (1 - lx) * data[:, y_high, x_low]
+            + ly * lx * data[:, y_high, x_high]
         )
+        return np.where(outside, 0, value)
 
     for i in range(num_roi):
         roi = rois_np[i]
@@ -64,19 +66,18 @@ def roi_align_nchw_python(a_np, rois_np, pooled_size, spatial_scale, sample_rati
         if sample_ratio > 0:
             roi_bin_grid_h = roi_bin_grid_w = int(sample_ratio)
         else:
-            roi_bin_grid_h = int(math.ceil(roi_h / pooled_size))
-            roi_bin_grid_w = int(math.ceil(roi_w / pooled_size))
+            roi_bin_grid_h = int(math.ceil(roi_h / pooled_size_h))
+            roi_bin_grid_w = int(math.ceil(roi_w / pooled_size_w))
 
         count = roi_bin_grid_h * roi_bin_grid_w
 
-        for c in range(channel):
-            for ph in range(pooled_size_h):
-                for pw in range(pooled_size_w):
-                    total = 0.0
-                    for iy in range(roi_bin_grid_h):
-                        for ix in range(roi_bin_grid_w):
-                            y = roi_start_h + ph * bin_h + (iy + 0.5) * bin_h / roi_bin_grid_h
-                            x = roi_start_w + pw * bin_w + (ix + 0.5) * bin_w / roi_bin_grid_w
-                            total += _bilinear(batch_index, c, y, x)
-                    b_np[i, c, ph, pw] = total / count
+        # the samples of all the bins, with shape [ph, pw, iy, ix]
+        dtype = rois_np.dtype
+        ph = np.arange(pooled_size_h, dtype=dtype)[:, None, None, None]
+        pw = np.arange(pooled_size_w, dtype=dtype)[None, :, None, None]
+        iy = np.arange(roi_bin_grid_h, dtype=dtype)[None, None, :, None]
+        ix = np.arange(roi_bin_grid_w, dtype=dtype)[None, None, None, :]
+        y = roi_start_h + ph * bin_h + (iy + 0.5) * bin_h / roi_bin_grid_h
+        x = roi_start_w + pw * bin_w + (ix + 0.5) * bin_w / roi_bin_grid_w
+        b_np[i] = np.sum(_bilinear(batch_index, y, x), axis=(3, 4)) / count
     return b_np
@@ -35,6 +35,7 @@ from .depthwise_conv2d import *
 from .dense import *
 from .batch_matmul import *
 from .roi_align import roi_align_nchw
+from .nms import non_max_suppression
 from .conv2d_transpose import *
 from .conv3d_transpose import *
 from .sparse import *
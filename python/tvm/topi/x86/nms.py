@@ -0,0 +1,320 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, no-member, too-many-locals, too-many-arguments, undefined-variable, too-many-nested-blocks, too-many-branches, too-many-statements
+"""Non-maximum suppression operator for intel cpu"""
+import tvm
+from tvm import te
+
+from tvm.te import hybrid
+from ..sort import argsort
+from ..vision.nms import hybrid_rearrange_box_out, hybrid_rearrange_indices_out
+
+
+@hybrid.script
+def hybrid_nms_cpu(
+    data,
+    sorted_index,
+    valid_count,
+    indices,
+    batch_size,
+    num_anchors,
+    max_output_size,
+    iou_threshold,
+    force_suppress,
+    top_k,
+    coord_start,
+    score_index,
+    id_index,
+    return_indices,
+    zero,
+    one,
+):
+    """Hybrid routing for non-maximum suppression on cpu.
+
+    The batches are suppressed in parallel. In a batch, a box is only compared
+    with the boxes kept so far, which are gathered in a list, and the
+    comparisons are skipped once the box is suppressed. The result is the same as
+    topi.vision.nms.hybrid_nms, see it for the parameters.
+
+    Returns
+    -------
+    output : tvm.te.Tensor
+        3-D tensor with shape [batch_size, num_anchors, 6]
+        or [batch_size, num_anchors, 5].
+
+    box_indices: tvm.te.Tensor
+        2-D tensor with shape [batch_size, num_anchors].
+    """
+
+    box_data_length = data.shape[2]
+
+    # box_indices is the expected indices of boxes
+    box_indices = output_tensor((batch_size, num_anchors), sorted_index.dtype)
+    output = output_tensor(
+        (
+            batch_size,
+            num_anchors,
+            box_data_length,
+        ),
+        data.dtype,
+    )
+
+    for i in parallel(batch_size):
+        if iou_threshold > 0:
+            if valid_count[i] > 0:
+                # Reorder output
+                nkeep = valid_count[i]
+                if 0 < top_k < nkeep:
+                    nkeep = top_k
+                for j in range(nkeep):
+                    for k in range(box_data_length):
+                        output[i, j, k] = data[i, sorted_index[i, j], k]
+                    box_indices[i, j] = sorted_index[i, j]
+                if 0 < top_k < valid_count[i]:
+                    for j in range(valid_count[i] - nkeep):
+                        for k in range(box_data_length):
+                            output[i, j + nkeep, k] = -one
+                        box_indices[i, j + nkeep] = -1
+
+            # Apply nms
+            box_start_idx = coord_start
+            num_valid_boxes = 0
+            # the positions of the boxes kept so far, private to the batch
+            kept = allocate((num_anchors,), "int32")
+
+            for j in range(valid_count[i]):
+                if num_valid_boxes == max_output_size:
+                    for k in range(box_data_length):
+                        output[i, j, k] = -one
+                    box_indices[i, j] = -1
+
+                elif output[i, j, score_index] > 0:
+                    is_valid_box = 1
+
+                    # a_l: left, a_t: top, a_r: right, a_b: bottom
+                    a_l = min(
+                        output[i, j, box_start_idx],
+                        output[i, j, box_start_idx + 2],
+                    )
+                    a_t = min(
+                        output[i, j, box_start_idx + 1],
+                        output[i, j, box_start_idx + 3],
+                    )
+                    a_r = max(
+                        output[i, j, box_start_idx],
+                        output[i, j, box_start_idx + 2],
+                    )
+                    a_b = max(
+                        output[i, j, box_start_idx + 1],
+                        output[i, j, box_start_idx + 3],
+                    )
+
+                    # the boxes before j with a positive score are the kept ones
+                    for k in range(num_valid_boxes):
+                        box_b_idx = kept[k]
+                        check_iou = 0
+                        if is_valid_box == 1 and (
+                            id_index < 0 or output[i, box_b_idx, id_index] >= 0
+                        ):
+                            if force_suppress:
+                                check_iou = 1
+                            elif (
+                                id_index < 0
+                                or output[i, j, id_index] == output[i, box_b_idx, id_index]
+                            ):
+                                check_iou = 1
+
+                        if check_iou > 0:
+                            # b_l: left, b_t: top, b_r: right, b_b: bottom
+                            b_l = min(
+                                output[i, box_b_idx, box_start_idx],
+                                output[i, box_b_idx, box_start_idx + 2],
+                            )
+                            b_t = min(
+                                output[i, box_b_idx, box_start_idx + 1],
+                                output[i, box_b_idx, box_start_idx + 3],
+                            )
+                            b_r = max(
+                                output[i, box_b_idx, box_start_idx],
+                                output[i, box_b_idx, box_start_idx + 2],
+                            )
+                            b_b = max(
+                                output[i, box_b_idx, box_start_idx + 1],
+                                output[i, box_b_idx, box_start_idx + 3],
+                            )
+
+                            # Overlapping width and height
+                            w = max(zero, min(a_r, b_r) - max(a_l, b_l))
+                            h = max(zero, min(a_b, b_b) - max(a_t, b_t))
+
+                            # boxes which do not overlap are not suppressed
+                            if w > zero and h > zero:
+                                # Overlapping area
+                                area = h * w
+
+                                # total area of the figure formed by box a and box b
+                                # except for overlapping area
+                                u = (a_r - a_l) * (a_b - a_t) + (b_r - b_l) * (b_b - b_t) - area
+
+                                # get the iou
+                                iou = zero if u <= zero else area / u
+
+                                if iou >= iou_threshold:
+                                    is_valid_box = 0
+
+                    if is_valid_box == 0:
+                        for k in range(box_data_length):
+                            output[i, j, k] = -one
+                        box_indices[i, j] = -1
+                    else:
+                        kept[num_valid_boxes] = j
+                        num_valid_boxes += 1
+
+        else:
+            for j in range(valid_count[i]):
+                for k in range(box_data_length):
+                    output[i, j, k] = data[i, j, k]
+                box_indices[i, j] = j
+
+        # Set invalid entry to be -1
+        for j in range(num_anchors - valid_count[i]):
+            for k in range(box_data_length):
+                output[i, j + valid_count[i], k] = -one
+            box_indices[i, j + valid_count[i]] = -1
+
+        if return_indices:
+            for j in range(valid_count[i]):
+                idx = box_indices[i, j]
+                if box_indices[i, j] >= 0:
+                    box_indices[i, j] = indices[i, idx]
+
+    return output, box_indices
+
+
+def non_max_suppression(
+    data,
+    valid_count,
+    indices,
+    max_output_size=-1,
+    iou_threshold=0.5,
+    force_suppress=False,
+    top_k=-1,
+    coord_start=2,
+    score_index=1,
+    id_index=0,
+    return_indices=True,
+    invalid_to_bottom=False,
+):
+    """Non-maximum suppression operator for object detection on cpu.
+
+    The scores of each batch are sorted by the threads of the runtime, and the
+    batches are suppressed in parallel.
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        3-D tensor with shape [batch_size, num_anchors, 6] or [batch_size, num_anchors, 5].
+
+    valid_count : tvm.te.Tensor
+        1-D tensor for valid number of boxes.
+
+    indices : tvm.te.Tensor
+        2-D tensor with shape [batch_size, num_anchors].
+
+    max_output_size : optional, int or tvm.te.Tensor
+        Max number of output valid boxes for each instance.
+        Return all valid boxes if the value of max_output_size is less than 0.
+
+    iou_threshold : optional, float or tvm.te.Tensor
+        Non-maximum suppression threshold.
+
+    force_suppress : optional, boolean
+        Whether to suppress all detections regardless of class_id.
+
+    top_k : optional, int
+        Keep maximum top k detections before nms, -1 for no limit.
+
+    coord_start : required, int
+        Start index of the consecutive 4 coordinates.
+
+    score_index: optional, int
+        Index of the scores/confidence of boxes.
+
+    id_index : optional, int
+        index of the class categories, -1 to disable.
+
+    return_indices : optional, boolean
+        Whether to return box indices in input data.
+
+    invalid_to_bottom : optional, boolean
+        Whether to move all valid bounding boxes to the top.
+
+    Returns
+    -------
+    out : tvm.te.Tensor or tuple of tvm.te.Tensor
+        3-D tensor with shape [batch_size, num_anchors, 6]
+        or [batch_size, num_anchors, 5]. Out is a tuple of tvm.te.Tensor
+        if return_indices is True, the Tensor in the tuple is 2-D tensor
+        with shape [batch_size, num_anchors] and shape
+        [batch_size, num_valid_anchors] respectively.
+    """
+    batch_size = data.shape[0]
+    num_anchors = data.shape[1]
+    if isinstance(max_output_size, int):
+        max_output_size = tvm.tir.const(max_output_size, dtype="int32")
+    if isinstance(iou_threshold, float):
+        iou_threshold = tvm.tir.const(iou_threshold, dtype=data.dtype)
+    score_axis = score_index
+    score_shape = (batch_size, num_anchors)
+    score_tensor = te.compute(score_shape, lambda i, j: data[i, j, score_axis])
+    sort_tensor = argsort(score_tensor, valid_count=valid_count, axis=1, is_ascend=False)
+
+    out, box_indices = hybrid_nms_cpu(
+        data,
+        sort_tensor,
+        valid_count,
+        indices,
+        batch_size,
+        num_anchors,
+        max_output_size,
+        iou_threshold,
+        tvm.tir.const(force_suppress, dtype="bool"),
+        tvm.tir.const(top_k, dtype="int32"),
+        tvm.tir.const(coord_start, dtype="int32"),
+        tvm.tir.const(score_index, dtype="int32"),
+        tvm.tir.const(id_index, dtype="int32"),
+        tvm.tir.const(return_indices, dtype="bool"),
+        zero=tvm.tir.const(0, dtype=data.dtype),
+        one=tvm.tir.const(1, dtype=data.dtype),
+    )
+
+    if return_indices:
+        return hybrid_rearrange_indices_out(
+            box_indices,
+            one=tvm.tir.const(1, dtype="int32"),
+            batch_size=batch_size,
+            num_anchors=num_anchors,
+        )
+
+    if invalid_to_bottom:
+        out = hybrid_rearrange_box_out(
+            out,
+            one=tvm.tir.const(1, dtype=data.dtype),
+            batch_size=batch_size,
+            num_anchors=num_anchors,
+        )
+    return out
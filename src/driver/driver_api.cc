@@ -26,6 +26,7 @@
 #include <tvm/ir/transform.h>
 #include <tvm/runtime/container.h>
 #include <tvm/runtime/registry.h>
+#include <tvm/support/parallel_for.h>
 #include <tvm/target/codegen.h>
 #include <tvm/te/operation.h>
 #include <tvm/tir/analysis.h>
@@ -44,6 +45,7 @@ TVM_REGISTER_PASS_CONFIG_OPTION("tir.instrument_bound_checkers", Bool);
 TVM_REGISTER_PASS_CONFIG_OPTION("tir.disable_assert", Bool);
 TVM_REGISTER_PASS_CONFIG_OPTION("tir.disable_vectorize", Bool);
 TVM_REGISTER_PASS_CONFIG_OPTION("tir.add_lower_pass", Array<Array<ObjectRef>>);
+TVM_REGISTER_PASS_CONFIG_OPTION("tir.host_module_num_partitions", Integer);
 
 using runtime::PackedFunc;
 using runtime::TVMArgs;
@@ -252,6 +254,56 @@ std::pair<IRModule, IRModule> SplitDevHostFuncs(IRModule mod_mixed, const Target
   return {mhost, mdevice};
 }
 
+/*!
+ * \brief Generate code for the host functions.
+ *
+ *  When tir.host_module_num_partitions is greater than one and the host is an llvm
+ *  target, the functions are split into that many modules by name, generated in
+ *  parallel, and imported into the first one. Each partition is saved as its own
+ *  object file by export_library, so the host compiler work is split as well.
+ *  Only used when there are no device modules, as kernel launches look up the
+ *  device functions in the imports of the calling module.
+ *
+ * \param mhost The host functions.
+ * \param target_host The host target.
+ * \param pass_ctx The pass context of the build.
+ * \return The host runtime module.
+ */
+runtime::Module BuildHostModule(const IRModule& mhost, const Target& target_host,
+                                const transform::PassContext& pass_ctx) {
+  int num_partitions =
+      pass_ctx->GetConfig<Integer>("tir.host_module_num_partitions", Integer(1)).value();
+  // Instruments may call back into the frontend, keep their notifications on this thread.
+  if (num_partitions <= 1 || target_host->kind->name != "llvm" || mhost->functions.size() <= 1 ||
+      !pass_ctx->instruments.empty()) {
+    return codegen::Build(mhost, target_host);
+  }
+  // Sort by name so that the partitioning is deterministic.
+  std::vector<std::pair<GlobalVar, BaseFunc>> funcs(mhost->functions.begin(),
+                                                    mhost->functions.end());
+  std::sort(funcs.begin(), funcs.end(), [](const auto& lhs, const auto& rhs) {
+    return lhs.first->name_hint < rhs.first->name_hint;
+  });
+  num_partitions = std::min(num_partitions, static_cast<int>(funcs.size()));
+  std::vector<IRModule> parts;
+  for (int i = 0; i < num_partitions; ++i) {
+    parts.push_back(IRModule(Map<GlobalVar, BaseFunc>()));
+  }
+  for (size_t i = 0; i < funcs.size(); ++i) {
+    parts[i % num_partitions]->Add(funcs[i].first, funcs[i].second);
+  }
+  std::vector<runtime::Module> built(num_partitions);
+  support::parallel_for(0, num_partitions, [&](int i) {
+    // The pass context stack is thread local, re-enter it for the codegen options.
+    With<transform::PassContext> scope(pass_ctx);
+    built[i] = codegen::Build(parts[i], target_host);
+  });
+  for (int i = 1; i < num_partitions; ++i) {
+    built[0].Import(built[i]);
+  }
+  return built[0];
+}
+
 // Build for heterogeneous execution.
 runtime::Module build(const Map<Target, IRModule>& inputs, const Target& target_host) {
   auto pass_ctx = transform::PassContext::Current();
@@ -293,7 +345,9 @@ runtime::Module build(const Map<Target, IRModule>& inputs, const Target& target_
     }
   }
 
-  runtime::Module mhost = codegen::Build(mhost_all, target_host_val);
+  runtime::Module mhost = device_modules.empty()
+                              ? BuildHostModule(mhost_all, target_host_val, pass_ctx)
+                              : codegen::Build(mhost_all, target_host_val);
   // Import all modules
   for (const auto& it : device_modules) {
     if (it.operator->()) {
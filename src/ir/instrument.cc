@@ -0,0 +1,157 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file src/ir/instrument.cc
+ * \brief Infrastructure for instrumentation of the passes.
+ */
+#include <tvm/ir/instrument.h>
+#include <tvm/ir/transform.h>
+#include <tvm/node/repr_printer.h>
+#include <tvm/runtime/registry.h>
+
+#include <unordered_set>
+#include <vector>
+
+namespace tvm {
+namespace instrument {
+
+PassInstrument::PassInstrument(String name, runtime::PackedFunc f_enter_pass_ctx,
+                               runtime::PackedFunc f_exit_pass_ctx,
+                               runtime::PackedFunc f_run_before_pass,
+                               runtime::PackedFunc f_run_after_pass,
+                               runtime::PackedFunc f_run_on_exception) {
+  auto n = make_object<PassInstrumentNode>();
+  n->name = std::move(name);
+  n->f_enter_pass_ctx = std::move(f_enter_pass_ctx);
+  n->f_exit_pass_ctx = std::move(f_exit_pass_ctx);
+  n->f_run_before_pass = std::move(f_run_before_pass);
+  n->f_run_after_pass = std::move(f_run_after_pass);
+  n->f_run_on_exception = std::move(f_run_on_exception);
+  data_ = std::move(n);
+}
+
+void PassInstrumentNode::EnterPassContext() const {
+  if (f_enter_pass_ctx != nullptr) {
+    f_enter_pass_ctx();
+  }
+}
+
+void PassInstrumentNode::ExitPassContext() const {
+  if (f_exit_pass_ctx != nullptr) {
+    f_exit_pass_ctx();
+  }
+}
+
+void PassInstrumentNode::RunBeforePass(const IRModule& mod,
+                                       const transform::PassInfo& info) const {
+  if (f_run_before_pass != nullptr) {
+    f_run_before_pass(mod, info);
+  }
+}
+
+void PassInstrumentNode::RunAfterPass(const IRModule& mod, const transform::PassInfo& info) const {
+  if (f_run_after_pass != nullptr) {
+    f_run_after_pass(mod, info);
+  }
+}
+
+void PassInstrumentNode::RunOnException(const transform::PassInfo& info,
+                                        const std::string& what) const {
+  if (f_run_on_exception != nullptr) {
+    f_run_on_exception(info, what);
+  }
+}
+
+/*!
+ * \brief Count the distinct IR nodes reachable from an object through reflection.
+ *  Containers are traversed but not counted, constants count as a single node.
+ */
+class IRNodeCounter : public AttrVisitor {
+ public:
+  size_t Count(const ObjectRef& root) {
+    Push(root);
+    while (!stack_.empty()) {
+      ObjectRef node = stack_.back();
+      stack_.pop_back();
+      if (const auto* arr = node.as<ArrayNode>()) {
+        for (const ObjectRef& elem : *arr) Push(elem);
+      } else if (const auto* map = node.as<MapNode>()) {
+        for (const auto& kv : *map) {
+          Push(kv.first);
+          Push(kv.second);
+        }
+      } else {
+        ++count_;
+        try {
+          ReflectionVTable::Global()->VisitAttrs(const_cast<Object*>(node.get()), this);
+        } catch (const dmlc::Error& e) {
+          // Runtime objects such as modules have no reflection, count them as leaves.
+        }
+      }
+    }
+    return count_;
+  }
+
+  void Visit(const char* key, double* value) final {}
+  void Visit(const char* key, int64_t* value) final {}
+  void Visit(const char* key, uint64_t* value) final {}
+  void Visit(const char* key, int* value) final {}
+  void Visit(const char* key, bool* value) final {}
+  void Visit(const char* key, std::string* value) final {}
+  void Visit(const char* key, void** value) final {}
+  void Visit(const char* key, DataType* value) final {}
+  void Visit(const char* key, runtime::NDArray* value) final {}
+  void Visit(const char* key, ObjectRef* value) final { Push(*value); }
+
+ private:
+  void Push(const ObjectRef& node) {
+    if (node.defined() && visited_.insert(node.get()).second) {
+      stack_.push_back(node);
+    }
+  }
+
+  size_t count_{0};
+  std::vector<ObjectRef> stack_;
+  std::unordered_set<const Object*> visited_;
+};
+
+TVM_REGISTER_NODE_TYPE(PassInstrumentNode);
+
+TVM_REGISTER_GLOBAL("instrument.PassInstrument")
+    .set_body_typed([](String name, runtime::PackedFunc f_enter_pass_ctx,
+                       runtime::PackedFunc f_exit_pass_ctx, runtime::PackedFunc f_run_before_pass,
+                       runtime::PackedFunc f_run_after_pass,
+                       runtime::PackedFunc f_run_on_exception) {
+      return PassInstrument(name, f_enter_pass_ctx, f_exit_pass_ctx, f_run_before_pass,
+                            f_run_after_pass, f_run_on_exception);
+    });
+
+TVM_REGISTER_GLOBAL("instrument.CountIRNodes").set_body_typed([](ObjectRef root) {
+  return static_cast<int64_t>(IRNodeCounter().Count(root));
+});
+
+TVM_STATIC_IR_FUNCTOR(ReprPrinter, vtable)
+    .set_dispatch<PassInstrumentNode>([](const ObjectRef& ref, ReprPrinter* p) {
+      auto* node = static_cast<const PassInstrumentNode*>(ref.get());
+      p->stream << "PassInstrument(" << node->name << ")";
+    });
+
+}  // namespace instrument
+}  // namespace tvm
@@ -56,12 +56,18 @@ typedef dmlc::ThreadLocalStore<PassContextThreadLocalEntry> RelayPassContextThre
 void PassContext::EnterWithScope() {
   PassContextThreadLocalEntry* entry = RelayPassContextThreadLocalStore::Get();
   entry->context_stack.push(*this);
+  for (const instrument::PassInstrument& pi : (*this)->instruments) {
+    pi->EnterPassContext();
+  }
 }
 
 void PassContext::ExitWithScope() {
   PassContextThreadLocalEntry* entry = RelayPassContextThreadLocalStore::Get();
   ICHECK(!entry->context_stack.empty());
   ICHECK(entry->context_stack.top().same_as(*this));
+  for (const instrument::PassInstrument& pi : (*this)->instruments) {
+    pi->ExitPassContext();
+  }
   entry->context_stack.pop();
 }
 
@@ -167,6 +173,24 @@ void PassContext::Trace(const IRModule& module, const PassInfo& info, bool is_be
   }
 }
 
+void PassContext::InstrumentBeforePass(const IRModule& module, const PassInfo& info) const {
+  for (const instrument::PassInstrument& pi : (*this)->instruments) {
+    pi->RunBeforePass(module, info);
+  }
+}
+
+void PassContext::InstrumentAfterPass(const IRModule& module, const PassInfo& info) const {
+  for (const instrument::PassInstrument& pi : (*this)->instruments) {
+    pi->RunAfterPass(module, info);
+  }
+}
+
+void PassContext::InstrumentOnException(const PassInfo& info, const std::string& what) const {
+  for (const instrument::PassInstrument& pi : (*this)->instruments) {
+    pi->RunOnException(info, what);
+  }
+}
+
 class ModulePass;
 
 /*!
@@ -313,7 +337,13 @@ IRModule ModulePassNode::operator()(IRModule mod, const PassContext& pass_ctx) c
   ICHECK(mod.defined()) << "The input module must be set.";
 
   pass_ctx.Trace(mod, pass_info, true);
-  mod = pass_func(std::move(mod), pass_ctx);
+  pass_ctx.InstrumentBeforePass(mod, pass_info);
+  try {
+    mod = pass_func(std::move(mod), pass_ctx);
+  } catch (const std::exception& e) {
+    pass_ctx.InstrumentOnException(pass_info, e.what());
+    throw;
+  }
 
   ICHECK(mod.defined()) << "The return value of a module pass must be set.";
 
@@ -324,6 +354,7 @@ IRModule ModulePassNode::operator()(IRModule mod, const PassContext& pass_ctx) c
   pass_ctx->diag_ctx = previous;
 
   pass_ctx.Trace(mod, pass_info, false);
+  pass_ctx.InstrumentAfterPass(mod, pass_info);
   return mod;
 }
 
@@ -372,16 +403,23 @@ Pass GetPass(const String& pass_name) {
 // a Sequential without the consideration of their orders. The phase
 // ordering problem needs to be handled in the future.
 IRModule SequentialNode::operator()(IRModule mod, const PassContext& pass_ctx) const {
-  for (const Pass& pass : passes) {
-    ICHECK(pass.defined()) << "Found undefined pass for optimization.";
-    const PassInfo& pass_info = pass->Info();
-    if (!pass_ctx.PassEnabled(pass_info)) continue;
-    // resolve dependencies
-    for (const auto& it : pass_info->required) {
-      mod = GetPass(it)(std::move(mod), pass_ctx);
+  pass_ctx.InstrumentBeforePass(mod, pass_info);
+  try {
+    for (const Pass& pass : passes) {
+      ICHECK(pass.defined()) << "Found undefined pass for optimization.";
+      const PassInfo& pass_info = pass->Info();
+      if (!pass_ctx.PassEnabled(pass_info)) continue;
+      // resolve dependencies
+      for (const auto& it : pass_info->required) {
+        mod = GetPass(it)(std::move(mod), pass_ctx);
+      }
+      mod = pass(std::move(mod), pass_ctx);
     }
-    mod = pass(std::move(mod), pass_ctx);
+  } catch (const std::exception& e) {
+    pass_ctx.InstrumentOnException(pass_info, e.what());
+    throw;
   }
+  pass_ctx.InstrumentAfterPass(mod, pass_info);
   return mod;
 }
 
@@ -464,13 +502,17 @@ TVM_REGISTER_NODE_TYPE(PassContextNode);
 
 TVM_REGISTER_GLOBAL("transform.PassContext")
     .set_body_typed([](int opt_level, Array<String> required, Array<String> disabled,
-                       TraceFunc trace_func, Optional<Map<String, ObjectRef>> config) {
+                       TraceFunc trace_func, Optional<Map<String, ObjectRef>> config,
+                       Optional<Array<instrument::PassInstrument>> instruments) {
       auto pctx = PassContext::Create();
       pctx->opt_level = opt_level;
 
       pctx->required_pass = std::move(required);
       pctx->disabled_pass = std::move(disabled);
       pctx->trace_func = std::move(trace_func);
+      if (instruments.defined()) {
+        pctx->instruments = instruments.value();
+      }
       if (config.defined()) {
         pctx->config = config.value();
       }
@@ -496,7 +538,13 @@ TVM_STATIC_IR_FUNCTOR(ReprPrinter, vtable)
         p->stream << it << " ";
       }
       p->stream << "]\n";
-      p->stream << "\tconfig: " << node->config;
+      p->stream << "\tconfig: " << node->config << "\n";
+
+      p->stream << "\tinstruments: [";
+      for (const auto& it : node->instruments) {
+        p->stream << it->name << " ";
+      }
+      p->stream << "]";
     });
 
 class PassContext::Internal {
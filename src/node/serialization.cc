@@ -34,6 +34,8 @@
 #include <cctype>
 #include <map>
 #include <string>
+#include <unordered_map>
+#include <vector>
 
 #include "../runtime/object_internal.h"
 #include "../support/base64.h"
@@ -474,20 +476,8 @@ struct JSONGraph {
   }
 
   static JSONGraph Create(const ObjectRef& root) {
-    JSONGraph g;
     NodeIndexer indexer;
-    indexer.MakeIndex(const_cast<Object*>(root.get()));
-    JSONAttrGetter getter;
-    getter.node_index_ = &indexer.node_index_;
-    getter.tensor_index_ = &indexer.tensor_index_;
-    for (Object* n : indexer.node_list_) {
-      JSONNode jnode;
-      getter.node_ = &jnode;
-      getter.Get(n);
-      g.nodes.emplace_back(std::move(jnode));
-    }
-    g.attrs["tvm_version"] = TVM_VERSION;
-    g.root = indexer.node_index_.at(const_cast<Object*>(root.get()));
+    JSONGraph g = CreateNodes(root, &indexer);
     // serialize tensor
     for (DLTensor* tensor : indexer.tensor_list_) {
       std::string blob;
@@ -500,6 +490,29 @@ struct JSONGraph {
     return g;
   }
 
+  /*!
+   * \brief Create the nodes of the graph.
+   * \param root The root object.
+   * \param indexer The indexer, which holds the tensors to serialize afterwards.
+   * \return The graph without the tensors.
+   */
+  static JSONGraph CreateNodes(const ObjectRef& root, NodeIndexer* indexer) {
+    JSONGraph g;
+    indexer->MakeIndex(const_cast<Object*>(root.get()));
+    JSONAttrGetter getter;
+    getter.node_index_ = &indexer->node_index_;
+    getter.tensor_index_ = &indexer->tensor_index_;
+    for (Object* n : indexer->node_list_) {
+      JSONNode jnode;
+      getter.node_ = &jnode;
+      getter.Get(n);
+      g.nodes.emplace_back(std::move(jnode));
+    }
+    g.attrs["tvm_version"] = TVM_VERSION;
+    g.root = indexer->node_index_.at(const_cast<Object*>(root.get()));
+    return g;
+  }
+
   std::vector<size_t> TopoSort() const {
     size_t n_nodes = nodes.size();
     std::vector<size_t> topo_order;
@@ -544,8 +557,45 @@ std::string SaveJSON(const ObjectRef& n) {
   return os.str();
 }
 
-ObjectRef LoadJSON(std::string json_str) {
+/*!
+ * \brief Create the objects of a graph.
+ * \param jgraph The graph, as loaded from json or binary.
+ * \param tensors The tensors referred to by the nodes.
+ * \return The root object.
+ */
+ObjectRef LoadGraph(JSONGraph* jgraph, const std::vector<runtime::NDArray>& tensors) {
   ReflectionVTable* reflection = ReflectionVTable::Global();
+  size_t n_nodes = jgraph->nodes.size();
+  // Pass 1: create all non-container objects
+  std::vector<ObjectPtr<Object>> nodes(n_nodes, nullptr);
+  for (size_t i = 0; i < n_nodes; ++i) {
+    const JSONNode& jnode = jgraph->nodes[i];
+    if (jnode.type_key.length() != 0) {
+      nodes[i] = reflection->CreateInitObject(jnode.type_key, jnode.repr_bytes);
+    }
+  }
+  // Pass 2: figure out all field dependency
+  {
+    FieldDependencyFinder dep_finder;
+    for (size_t i = 0; i < n_nodes; ++i) {
+      dep_finder.Find(nodes[i].get(), &jgraph->nodes[i]);
+    }
+  }
+  // Pass 3: topo sort
+  std::vector<size_t> topo_order = jgraph->TopoSort();
+  // Pass 4: set all values
+  {
+    JSONAttrSetter setter;
+    setter.node_list_ = &nodes;
+    setter.tensor_list_ = &tensors;
+    for (size_t i : topo_order) {
+      setter.Set(&nodes[i], &jgraph->nodes[i]);
+    }
+  }
+  return ObjectRef(nodes.at(jgraph->root));
+}
+
+ObjectRef LoadJSON(std::string json_str) {
   JSONGraph jgraph;
   {
     // load in json graph.
@@ -553,7 +603,6 @@ ObjectRef LoadJSON(std::string json_str) {
     dmlc::JSONReader reader(&is);
     jgraph.Load(&reader);
   }
-  size_t n_nodes = jgraph.nodes.size();
   std::vector<runtime::NDArray> tensors;
   {
     // load in tensors
@@ -566,36 +615,150 @@ ObjectRef LoadJSON(std::string json_str) {
       tensors.emplace_back(std::move(temp));
     }
   }
-  // Pass 1: create all non-container objects
-  std::vector<ObjectPtr<Object>> nodes(n_nodes, nullptr);
-  for (size_t i = 0; i < n_nodes; ++i) {
-    const JSONNode& jnode = jgraph.nodes[i];
-    if (jnode.type_key.length() != 0) {
-      nodes[i] = reflection->CreateInitObject(jnode.type_key, jnode.repr_bytes);
+  return LoadGraph(&jgraph, tensors);
+}
+
+/*! \brief Magic number of the binary format of the object graphs. */
+constexpr uint64_t kTVMObjectGraphMagic = 0x7F4A5D10B3E2C6A9;
+
+/*!
+ * \brief Writer of the binary format of the graphs.
+ *
+ *  The format holds the same nodes as the json one, but all the strings (type keys,
+ *  attribute names and values, map keys) are interned in a table written once, and
+ *  the tensors are stored as raw bytes. Objects referred to several times are stored
+ *  once, as in the json format.
+ */
+class BinaryGraphWriter {
+ public:
+  std::string Write(const JSONGraph& jgraph, const std::vector<DLTensor*>& tensors) {
+    std::string body;
+    {
+      dmlc::MemoryStringStream mstrm(&body);
+      dmlc::Stream* strm = &mstrm;
+      uint64_t n_nodes = jgraph.nodes.size();
+      strm->Write(n_nodes);
+      for (const JSONNode& jnode : jgraph.nodes) {
+        strm->Write(Intern(jnode.type_key));
+        strm->Write(Intern(jnode.repr_bytes));
+        std::vector<uint32_t> attrs;
+        for (const auto& kv : jnode.attrs) {
+          attrs.push_back(Intern(kv.first));
+          attrs.push_back(Intern(kv.second));
+        }
+        strm->Write(attrs);
+        std::vector<uint32_t> keys;
+        for (const std::string& key : jnode.keys) {
+          keys.push_back(Intern(key));
+        }
+        strm->Write(keys);
+        strm->Write(std::vector<uint64_t>(jnode.data.begin(), jnode.data.end()));
+      }
+      uint64_t root = jgraph.root;
+      strm->Write(root);
+      uint64_t n_tensors = tensors.size();
+      strm->Write(n_tensors);
+      for (DLTensor* tensor : tensors) {
+        runtime::SaveDLTensor(strm, tensor);
+      }
     }
+    std::string blob;
+    dmlc::MemoryStringStream mstrm(&blob);
+    dmlc::Stream* strm = &mstrm;
+    uint64_t header = kTVMObjectGraphMagic;
+    strm->Write(header);
+    strm->Write(jgraph.attrs.at("tvm_version"));
+    strm->Write(strings_);
+    blob += body;
+    return blob;
   }
-  // Pass 2: figure out all field dependency
-  {
-    FieldDependencyFinder dep_finder;
-    for (size_t i = 0; i < n_nodes; ++i) {
-      dep_finder.Find(nodes[i].get(), &jgraph.nodes[i]);
-    }
+
+ private:
+  uint32_t Intern(const std::string& str) {
+    auto it = index_.find(str);
+    if (it != index_.end()) return it->second;
+    uint32_t index = static_cast<uint32_t>(strings_.size());
+    index_.emplace(str, index);
+    strings_.push_back(str);
+    return index;
   }
-  // Pass 3: topo sort
-  std::vector<size_t> topo_order = jgraph.TopoSort();
-  // Pass 4: set all values
-  {
-    JSONAttrSetter setter;
-    setter.node_list_ = &nodes;
-    setter.tensor_list_ = &tensors;
-    for (size_t i : topo_order) {
-      setter.Set(&nodes[i], &jgraph.nodes[i]);
+
+  std::unordered_map<std::string, uint32_t> index_;
+  std::vector<std::string> strings_;
+};
+
+std::string SaveBinary(const ObjectRef& n) {
+  NodeIndexer indexer;
+  JSONGraph jgraph = JSONGraph::CreateNodes(n, &indexer);
+  return BinaryGraphWriter().Write(jgraph, indexer.tensor_list_);
+}
+
+ObjectRef LoadBinary(std::string blob) {
+  dmlc::MemoryStringStream mstrm(&blob);
+  dmlc::Stream* strm = &mstrm;
+  uint64_t header;
+  std::string version;
+  std::vector<std::string> strings;
+  ICHECK(strm->Read(&header) && header == kTVMObjectGraphMagic)
+      << "Invalid binary object graph format";
+  ICHECK(strm->Read(&version)) << "Invalid binary object graph format";
+  ICHECK_EQ(version, TVM_VERSION) << "The binary object graph was saved by TVM " << version
+                                  << ", which differs from " << TVM_VERSION
+                                  << ". Use the json format to move objects across versions.";
+  ICHECK(strm->Read(&strings)) << "Invalid binary object graph format";
+  auto get_string = [&strings](uint32_t index) -> const std::string& {
+    ICHECK_LT(index, strings.size()) << "Invalid binary object graph format";
+    return strings[index];
+  };
+
+  JSONGraph jgraph;
+  uint64_t n_nodes;
+  ICHECK(strm->Read(&n_nodes)) << "Invalid binary object graph format";
+  jgraph.nodes.resize(n_nodes);
+  for (JSONNode& jnode : jgraph.nodes) {
+    uint32_t type_key, repr_bytes;
+    std::vector<uint32_t> attrs, keys;
+    std::vector<uint64_t> data;
+    ICHECK(strm->Read(&type_key) && strm->Read(&repr_bytes) && strm->Read(&attrs) &&
+           strm->Read(&keys) && strm->Read(&data))
+        << "Invalid binary object graph format";
+    ICHECK_EQ(attrs.size() % 2, 0U) << "Invalid binary object graph format";
+    jnode.type_key = get_string(type_key);
+    jnode.repr_bytes = get_string(repr_bytes);
+    for (size_t i = 0; i < attrs.size(); i += 2) {
+      jnode.attrs[get_string(attrs[i])] = get_string(attrs[i + 1]);
     }
+    for (uint32_t key : keys) {
+      jnode.keys.push_back(get_string(key));
+    }
+    for (uint64_t index : data) {
+      ICHECK_LT(index, n_nodes) << "Invalid binary object graph format";
+      jnode.data.push_back(static_cast<size_t>(index));
+    }
+  }
+  uint64_t root, n_tensors;
+  ICHECK(strm->Read(&root) && root < n_nodes) << "Invalid binary object graph format";
+  jgraph.root = static_cast<size_t>(root);
+  ICHECK(strm->Read(&n_tensors)) << "Invalid binary object graph format";
+  std::vector<runtime::NDArray> tensors(n_tensors);
+  for (runtime::NDArray& tensor : tensors) {
+    ICHECK(tensor.Load(strm)) << "Invalid binary object graph format";
   }
-  return ObjectRef(nodes.at(jgraph.root));
+  return LoadGraph(&jgraph, tensors);
 }
 
 TVM_REGISTER_GLOBAL("node.SaveJSON").set_body_typed(SaveJSON);
 
 TVM_REGISTER_GLOBAL("node.LoadJSON").set_body_typed(LoadJSON);
+
+TVM_REGISTER_GLOBAL("node.SaveBinary").set_body([](TVMArgs args, TVMRetValue* rv) {
+  ObjectRef node = args[0];
+  std::string blob = SaveBinary(node);
+  TVMByteArray arr;
+  arr.data = blob.c_str();
+  arr.size = blob.length();
+  *rv = arr;
+});
+
+TVM_REGISTER_GLOBAL("node.LoadBinary").set_body_typed(LoadBinary);
 }  // namespace tvm
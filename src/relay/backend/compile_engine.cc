@@ -40,6 +40,7 @@
 
 #include <functional>
 #include <limits>
+#include <map>
 #include <mutex>
 #include <unordered_map>
 #include <utility>
@@ -608,6 +609,12 @@ class CompileEngineImpl : public CompileEngineNode {
   PackedFunc JIT(const CCacheKey& key) final {
     CCacheValue value = LowerInternal(key);
     if (value->packed_func != nullptr) return value->packed_func;
+    // the kernels served by the kernel cache are compiled already.
+    auto it = kernel_mods_.find(value->cached_func->func_name);
+    if (it != kernel_mods_.end()) {
+      value->packed_func = it->second.GetFunction(value->cached_func->func_name);
+      return value->packed_func;
+    }
     // build the function.
     tvm::runtime::Module m;
     if (const auto* f = runtime::Registry::Get("relay.backend.build")) {
@@ -661,6 +668,19 @@ class CompileEngineImpl : public CompileEngineNode {
       }
     }
 
+    // The kernels served by the kernel cache are returned along with the
+    // external runtime modules, so their functions are dropped as well.
+    for (const auto& it : cache_) {
+      if (it.second->cached_func.defined() &&
+          kernel_mods_.count(it.second->cached_func->func_name)) {
+        cached_ext_funcs.push_back(it.first);
+      }
+    }
+    for (const auto& it : kernel_mods_) {
+      ret.push_back(it.second);
+    }
+    kernel_mods_.clear();
+
     // No need to cache external functions as we collected them all to create
     // external runtime modules.
     for (const auto& it : cached_ext_funcs) {
@@ -669,7 +689,10 @@ class CompileEngineImpl : public CompileEngineNode {
     return ret;
   }
 
-  void Clear() final { cache_.clear(); }
+  void Clear() final {
+    cache_.clear();
+    kernel_mods_.clear();
+  }
 
   // List all items in the cache.
   Array<ObjectRef> ListItems() {
@@ -723,19 +746,45 @@ class CompileEngineImpl : public CompileEngineNode {
     With<Target> target_scope(key->target);
 
     ICHECK(!value->cached_func.defined());
-    auto cfunc = CreateSchedule(key->source_func, key->target);
-    auto cache_node = make_object<CachedFuncNode>(*(cfunc.operator->()));
-
-    // Skip lowering for device copy node.
     const Expr body = (key->source_func)->body;
-    if (const CallNode* call_node = body.as<CallNode>()) {
-      if (call_node->attrs.as<DeviceCopyAttrs>()) {
+    const CallNode* call_node = body.as<CallNode>();
+    bool is_device_copy = call_node != nullptr && call_node->attrs.as<DeviceCopyAttrs>();
+
+    // Look the kernel up in the kernel cache before scheduling the function.
+    std::string kernel_digest;
+    const auto* kernel_lookup = runtime::Registry::Get("relay.backend.kernel_cache_lookup");
+    if (kernel_lookup != nullptr && !is_device_copy) {
+      Array<ObjectRef> entry = (*kernel_lookup)(key);
+      if (entry.size() == 3) {
+        auto cache_node = make_object<CachedFuncNode>();
+        cache_node->target = key->target;
+        cache_node->func_name = Downcast<String>(entry[1]);
+        kernel_mods_[cache_node->func_name] = Downcast<runtime::Module>(entry[2]);
         value->cached_func = CachedFunc(cache_node);
         return value;
       }
+      if (entry.size() == 1) {
+        kernel_digest = Downcast<String>(entry[0]);
+      }
     }
 
-    cache_node->func_name = GetUniqueName(cache_node->func_name);
+    auto cfunc = CreateSchedule(key->source_func, key->target);
+    auto cache_node = make_object<CachedFuncNode>(*(cfunc.operator->()));
+
+    // Skip lowering for device copy node.
+    if (is_device_copy) {
+      value->cached_func = CachedFunc(cache_node);
+      return value;
+    }
+
+    if (kernel_digest.empty()) {
+      cache_node->func_name = GetUniqueName(cache_node->func_name);
+    } else {
+      // Name the kernel after its digest, so it does not clash with the
+      // kernels of other processes it gets linked with.
+      cache_node->func_name =
+          GetUniqueName(cache_node->func_name + "_" + kernel_digest.substr(0, 16));
+    }
     // NOTE: array will copy on write.
     Array<te::Tensor> all_args = cache_node->inputs;
     for (te::Tensor arg : cache_node->outputs) {
@@ -751,6 +800,14 @@ class CompileEngineImpl : public CompileEngineNode {
       std::unordered_map<te::Tensor, tir::Buffer> binds;
       cache_node->funcs = tvm::lower(cfunc->schedule, all_args, cache_node->func_name, binds);
     }
+    if (!kernel_digest.empty()) {
+      // Compile and store the kernel, it is linked like the external modules.
+      const auto* kernel_store = runtime::Registry::Get("relay.backend.kernel_cache_store");
+      ICHECK(kernel_store != nullptr) << "relay.backend.kernel_cache_store is not registered";
+      runtime::Module kernel = (*kernel_store)(kernel_digest, CachedFunc(cache_node));
+      kernel_mods_[cache_node->func_name] = kernel;
+      cache_node->funcs = IRModule(Map<GlobalVar, BaseFunc>({}));
+    }
     value->cached_func = CachedFunc(cache_node);
     return value;
   }
@@ -821,6 +878,8 @@ class CompileEngineImpl : public CompileEngineNode {
   std::unordered_map<CCacheKey, CCacheValue> cache_;
   /*! \brief internal compiler cache for shape funcs */
   std::unordered_map<CCacheKey, CCacheValue> shape_func_cache_;
+  /*! \brief the modules of the kernels served by the kernel cache, by kernel name */
+  std::map<std::string, runtime::Module> kernel_mods_;
   /*! \brief the cache key of the function that is being lowered currently*/
   CCacheKey cur_ccache_key_;
 };
@@ -835,6 +894,7 @@ CompileEngine& CompileEngine::Global() {
 
 TVM_REGISTER_PASS_CONFIG_OPTION("relay.backend.use_auto_scheduler", Bool);
 TVM_REGISTER_PASS_CONFIG_OPTION("relay.backend.disable_compile_engine_cache", Bool);
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.backend.kernel_cache_dir", String);
 
 TVM_REGISTER_GLOBAL("relay.backend._make_LoweredOutput")
     .set_body_typed([](tvm::Array<te::Tensor> outputs, OpImplementation impl) {
@@ -21,12 +21,29 @@
  * \file relay/backend/graph_plan_memory.cc
  * \brief Memory index assignment pass for executing
  *   the program in the graph runtime.
+ *
+ *  The planner is selected with the "relay.GraphPlanMemory.planner" PassContext
+ *  config:
+ *
+ *  - "token_reuse" (default) hands the storage of dead tensors to the next
+ *    request of a roughly matching size, in execution order.
+ *  - "size_class" only reuses storage within the same power of two size class.
+ *  - "best_fit" computes the live range of every tensor first, then packs the
+ *    tensors in decreasing size into the smallest storage that is free for
+ *    their whole live range.
  */
+#include <tvm/ir/transform.h>
 #include <tvm/relay/analysis.h>
 #include <tvm/relay/expr.h>
 #include <tvm/relay/expr_functor.h>
 #include <tvm/tir/op.h>
 
+#include <algorithm>
+#include <limits>
+#include <string>
+#include <utility>
+#include <vector>
+
 #include "../../support/arena.h"
 
 namespace tvm {
@@ -34,6 +51,8 @@ namespace relay {
 
 using IntegerArray = Array<Integer>;
 
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.GraphPlanMemory.planner", String);
+
 struct StorageToken {
   /*! \brief Reference counter */
   int ref_counter{0};
@@ -123,8 +142,70 @@ class StorageAllocaBaseVisitor : public ExprVisitor {
    * \param can_realloc Whether we can re-allocate the memory.
    */
   virtual void CreateToken(const ExprNode* op, bool can_realloc) = 0;
+  /*!
+   * \brief ceil(size/word_size) to get number of words.
+   * \param size The original size.
+   * \param word_size The element size.
+   */
+  static size_t DivRoundUp(size_t size, size_t word_size) {
+    return (size + word_size - 1) / word_size;
+  }
+  /*!
+   * \brief Get the memory requirement.
+   * \param prototype The prototype token.
+   * \return The required memory size.
+   */
+  static size_t GetMemorySize(StorageToken* prototype) {
+    const TensorTypeNode* ttype = prototype->ttype;
+    ICHECK(ttype != nullptr);
+    size_t size = 1;
+    for (IndexExpr dim : ttype->shape) {
+      const int64_t* pval = tir::as_const_int(dim);
+      ICHECK(pval != nullptr) << "Cannot allocate memory symbolic tensor shape " << ttype->shape;
+      ICHECK_GE(*pval, 0) << "Cannot allocate memory for tensor with negative shape" << *pval;
+      size *= static_cast<size_t>(pval[0]);
+    }
+    size *= DivRoundUp(ttype->dtype.bits() * ttype->dtype.lanes(), 8);
+    return size;
+  }
 };
 
+/*!
+ * \brief Convert the planned tokens of each expression to the storage map
+ *  returned by GraphPlanMemory.
+ * \param token_map The planned tokens of each expression.
+ * \return The storage ids and the device types of each expression.
+ */
+Map<Expr, Array<IntegerArray> > MakeStorageMap(
+    const std::unordered_map<const ExprNode*, std::vector<StorageToken*> >& token_map) {
+  // The value of smap contains two integer arrays where the first array
+  // contains the planned storage ids and the second holds the device types.
+  Map<Expr, Array<IntegerArray> > smap;
+  int num_annotated_nodes = 0;
+  int num_nodes = 0;
+
+  for (const auto& kv : token_map) {
+    std::vector<Integer> storage_ids;
+    std::vector<Integer> device_types;
+    for (StorageToken* tok : kv.second) {
+      if (tok->device_type) {
+        num_annotated_nodes++;
+      }
+      num_nodes++;
+      storage_ids.push_back(tok->storage_id);
+      device_types.push_back(tok->device_type);
+    }
+    smap.Set(GetRef<Expr>(kv.first), Array<IntegerArray>({storage_ids, device_types}));
+  }
+  // Either all or none of the nodes should be annotated.
+  if (num_annotated_nodes != 0 && num_annotated_nodes != num_nodes) {
+    LOG(FATAL) << num_annotated_nodes << " out of " << num_nodes
+               << "expressions are assigned with virtual device types. Either all "
+                  "or none of the expressions are expected to be annotated.";
+  }
+  return smap;
+}
+
 class StorageAllocaInit : protected StorageAllocaBaseVisitor {
  public:
   explicit StorageAllocaInit(support::Arena* arena) : arena_(arena) {}
@@ -184,6 +265,11 @@ class StorageAllocaInit : protected StorageAllocaBaseVisitor {
 
 class StorageAllocator : public StorageAllocaBaseVisitor {
  public:
+  /*!
+   * \param size_class Whether storage is only reused within a power of two size class.
+   */
+  explicit StorageAllocator(bool size_class = false) : size_class_(size_class) {}
+
   /*!
    * \return totoal number of bytes allocated
    */
@@ -199,33 +285,7 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
   Map<Expr, Array<IntegerArray> > Plan(const Function& func) {
     prototype_ = StorageAllocaInit(&arena_).GetInitTokenMap(func);
     this->Run(func);
-
-    // The value of smap contains two integer arrays where the first array
-    // contains the planned storage ids and the second holds the device types.
-    Map<Expr, Array<IntegerArray> > smap;
-    int num_annotated_nodes = 0;
-    int num_nodes = 0;
-
-    for (const auto& kv : token_map_) {
-      std::vector<Integer> storage_ids;
-      std::vector<Integer> device_types;
-      for (StorageToken* tok : kv.second) {
-        if (tok->device_type) {
-          num_annotated_nodes++;
-        }
-        num_nodes++;
-        storage_ids.push_back(tok->storage_id);
-        device_types.push_back(tok->device_type);
-      }
-      smap.Set(GetRef<Expr>(kv.first), Array<IntegerArray>({storage_ids, device_types}));
-    }
-    // Either all or none of the nodes should be annotated.
-    if (num_annotated_nodes != 0 && num_annotated_nodes != num_nodes) {
-      LOG(FATAL) << num_annotated_nodes << " out of " << num_nodes
-                 << "expressions are assigned with virtual device types. Either all "
-                    "or none of the expressions are expected to be annotated.";
-    }
-    return smap;
+    return MakeStorageMap(token_map_);
   }
 
  protected:
@@ -270,32 +330,6 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
       CheckForRelease(tok);
     }
   }
-  /*!
-   * \brief ceil(size/word_size) to get number of words.
-   * \param size The original size.
-   * \param word_size The element size.
-   */
-  static size_t DivRoundUp(size_t size, size_t word_size) {
-    return (size + word_size - 1) / word_size;
-  }
-  /*!
-   * \brief Get the memory requirement.
-   * \param prototype The prototype token.
-   * \return The required memory size.
-   */
-  size_t GetMemorySize(StorageToken* prototype) {
-    const TensorTypeNode* ttype = prototype->ttype;
-    ICHECK(ttype != nullptr);
-    size_t size = 1;
-    for (IndexExpr dim : ttype->shape) {
-      const int64_t* pval = tir::as_const_int(dim);
-      ICHECK(pval != nullptr) << "Cannot allocate memory symbolic tensor shape " << ttype->shape;
-      ICHECK_GE(*pval, 0) << "Cannot allocate memory for tensor with negative shape" << *pval;
-      size *= static_cast<size_t>(pval[0]);
-    }
-    size *= DivRoundUp(ttype->dtype.bits() * ttype->dtype.lanes(), 8);
-    return size;
-  }
   /*!
    * \brief Request a storage token for a given prototype.
    * \param prototype. The prototype storage token.
@@ -304,6 +338,9 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
   StorageToken* Request(StorageToken* prototype) {
     // calculate the size;
     size_t size = GetMemorySize(prototype);
+    if (size_class_) {
+      return RequestSizeClass(prototype, size);
+    }
     // search memory block in [size / match_range_, size * match_range_)
     if (match_range_ == 0) {
       return this->Alloc(prototype, size);
@@ -339,6 +376,30 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
     // cannot find anything return a new one.
     return this->Alloc(prototype, size);
   }
+  /*!
+   * \brief Request a storage token from the size class of the requested size.
+   * \param prototype. The prototype storage token.
+   * \param size The size of memory being requested.
+   * \return The result token.
+   */
+  StorageToken* RequestSizeClass(StorageToken* prototype, size_t size) {
+    // the size class is the smallest power of two that holds size.
+    size_t size_class = 1;
+    while (size_class < size) size_class <<= 1;
+    // free blocks of the class have at most size_class bytes, as they only grow within it.
+    auto begin = free_.lower_bound(size_class / 2 + 1);
+    auto end = free_.upper_bound(size_class);
+    for (auto it = begin; it != end; ++it) {
+      StorageToken* tok = it->second;
+      if (tok->device_type != prototype->device_type) continue;
+      ICHECK_EQ(tok->ref_counter, 0);
+      tok->max_bytes = std::max(size, tok->max_bytes);
+      tok->ref_counter = prototype->ref_counter;
+      free_.erase(it);
+      return tok;
+    }
+    return this->Alloc(prototype, size);
+  }
   /*!
    * \brief Allocate a storage token by consuming prototype
    * \param prototype The prototype token.
@@ -367,6 +428,8 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
   support::Arena arena_;
   // scale used for rough match
   size_t match_range_{16};
+  // whether storage is only reused within a size class
+  bool size_class_;
   // free list of storage entry
   std::multimap<size_t, StorageToken*> free_;
   // all the storage resources available
@@ -375,8 +438,130 @@ class StorageAllocator : public StorageAllocaBaseVisitor {
   std::unordered_map<const ExprNode*, std::vector<StorageToken*> > prototype_;
 };
 
+/*!
+ * \brief Plan the storage of the function offline from the live ranges of its tensors.
+ *
+ *  The calls are numbered in execution order. A tensor is live from the call that
+ *  produces it to the last call that reads it, parameters, constants and outputs
+ *  are live throughout and never share storage. The tensors are placed by
+ *  decreasing size into the smallest existing storage whose tensors are all dead
+ *  during its live range, or into a new storage.
+ */
+class StorageIntervalAllocator : public StorageAllocaBaseVisitor {
+ public:
+  // Run storage allocation for a function.
+  Map<Expr, Array<IntegerArray> > Plan(const Function& func) {
+    prototype_ = StorageAllocaInit(&arena_).GetInitTokenMap(func);
+    this->Run(func);
+    // the outputs must stay alive after the last call.
+    for (StorageToken* tok : token_map_.at(func->body.operator->())) {
+      last_use_[tok] = std::numeric_limits<int>::max();
+    }
+
+    std::vector<StorageToken*> order = temporaries_;
+    std::stable_sort(order.begin(), order.end(), [](StorageToken* lhs, StorageToken* rhs) {
+      return lhs->max_bytes > rhs->max_bytes;
+    });
+    std::vector<Storage> storages;
+    for (StorageToken* tok : order) {
+      std::pair<int, int> range(def_.at(tok), last_use_.at(tok));
+      Storage* best = nullptr;
+      for (Storage& storage : storages) {
+        // storages are created in decreasing size, so each of them is large enough.
+        if (storage.device_type != tok->device_type || !storage.IsFree(range)) continue;
+        if (best == nullptr || storage.max_bytes < best->max_bytes) {
+          best = &storage;
+        }
+      }
+      if (best == nullptr) {
+        storages.push_back(Storage{next_storage_id_++, tok->max_bytes, tok->device_type, {}});
+        best = &storages.back();
+      }
+      best->ranges.push_back(range);
+      tok->storage_id = best->storage_id;
+    }
+    return MakeStorageMap(token_map_);
+  }
+
+ protected:
+  using StorageAllocaBaseVisitor::VisitExpr_;
+
+  /*! \brief A storage and the live ranges of the tensors placed in it. */
+  struct Storage {
+    int64_t storage_id;
+    size_t max_bytes;
+    int device_type;
+    std::vector<std::pair<int, int> > ranges;
+
+    bool IsFree(const std::pair<int, int>& range) const {
+      for (const auto& used : ranges) {
+        if (used.first <= range.second && range.first <= used.second) return false;
+      }
+      return true;
+    }
+  };
+
+  void CreateToken(const ExprNode* op, bool can_realloc) final {
+    ICHECK(!token_map_.count(op));
+    auto it = prototype_.find(op);
+    ICHECK(it != prototype_.end());
+    for (StorageToken* tok : it->second) {
+      tok->max_bytes = GetMemorySize(tok);
+      if (can_realloc) {
+        def_[tok] = time_;
+        last_use_[tok] = time_;
+        temporaries_.push_back(tok);
+      } else {
+        tok->storage_id = next_storage_id_++;
+      }
+    }
+    token_map_[op] = it->second;
+  }
+
+  void VisitExpr_(const CallNode* op) final {
+    std::vector<StorageToken*> args;
+    for (Expr arg : op->args) {
+      for (StorageToken* tok : GetToken(arg)) {
+        args.push_back(tok);
+      }
+    }
+    CreateToken(op, true);
+    for (StorageToken* tok : args) {
+      if (last_use_.count(tok)) {
+        last_use_[tok] = time_;
+      }
+    }
+    ++time_;
+  }
+
+ private:
+  // allocator
+  support::Arena arena_;
+  // index of the call being visited
+  int time_{0};
+  // the next storage id
+  int64_t next_storage_id_{0};
+  // the tokens produced by calls, in execution order
+  std::vector<StorageToken*> temporaries_;
+  // the call producing each temporary
+  std::unordered_map<StorageToken*, int> def_;
+  // the last call reading each temporary
+  std::unordered_map<StorageToken*, int> last_use_;
+  /*! \brief internal prototype token map */
+  std::unordered_map<const ExprNode*, std::vector<StorageToken*> > prototype_;
+};
+
 Map<Expr, Array<IntegerArray> > GraphPlanMemory(const Function& func) {
-  return StorageAllocator().Plan(func);
+  String planner = transform::PassContext::Current()
+                       ->GetConfig("relay.GraphPlanMemory.planner", String("token_reuse"))
+                       .value();
+  if (planner == "best_fit") {
+    return StorageIntervalAllocator().Plan(func);
+  }
+  ICHECK(planner == "token_reuse" || planner == "size_class")
+      << "Unknown graph memory planner " << planner
+      << ", expected one of token_reuse, size_class, best_fit";
+  return StorageAllocator(planner == "size_class").Plan(func);
 }
 
 TVM_REGISTER_GLOBAL("relay.backend.GraphPlanMemory").set_body_typed(GraphPlanMemory);
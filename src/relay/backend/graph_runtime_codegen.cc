@@ -403,10 +403,14 @@ class GraphRuntimeCodegen : public backend::MemoizedExprTranslator<std::vector<G
     }
     CCacheKey key = (*pf0)(func, target);
     CachedFunc lowered_func = (*pf1)(compile_engine_, key);
-    if (!lowered_funcs_.count(target->str())) {
-      lowered_funcs_[target->str()] = IRModule(Map<GlobalVar, BaseFunc>({}));
+    // The kernels served by the kernel cache are compiled already and come
+    // with the external modules.
+    if (!lowered_func->funcs->functions.empty()) {
+      if (!lowered_funcs_.count(target->str())) {
+        lowered_funcs_[target->str()] = IRModule(Map<GlobalVar, BaseFunc>({}));
+      }
+      lowered_funcs_[target->str()]->Update(lowered_func->funcs);
     }
-    lowered_funcs_[target->str()]->Update(lowered_func->funcs);
     return GraphAddCallNode(op, _GetUniqueName(lowered_func->func_name), lowered_func->func_name);
   }
 
@@ -722,8 +722,8 @@ TypedPackedFunc<ObjectRef(Expr)> CreateInterpreter(IRModule mod, DLContext conte
                                    /* expand_constructor */ true, /* expand_global_var */ false),
                                transform::InferType()});
 
-    transform::PassContext pass_ctx = transform::PassContext::Current();
-    tvm::With<transform::PassContext> ctx(pass_ctx);
+    // the passes run in the current context, entering it again would notify
+    // its instruments a second time
     mod = seq(mod);
   }
 
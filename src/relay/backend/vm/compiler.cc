@@ -64,6 +64,8 @@ Pass ManifestAlloc(Target target_host, vm::TargetsMap targets) {
   return (*f)(target_host, targets);
 }
 
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.MemoryPlan.planner", String);
+
 Pass MemoryPlan() {
   auto f = tvm::runtime::Registry::Get("relay.transform.MemoryPlan");
   ICHECK(f != nullptr) << "unable to load the memory planning pass";
@@ -543,6 +545,16 @@ class VMFunctionCompiler : ExprFunctor<void(const Expr& expr)> {
     if (func->GetAttr<String>(attr::kCompiler).defined()) {
       op_index = context_->cached_funcs.size();
       context_->cached_funcs.push_back(cfunc);
+    } else if (cfunc->funcs->functions.empty()) {
+      // The kernels served by the kernel cache are compiled already.
+      auto it = context_->seen_kernels.find(cfunc->func_name);
+      if (it == context_->seen_kernels.end()) {
+        op_index = context_->cached_funcs.size();
+        context_->cached_funcs.push_back(cfunc);
+        context_->seen_kernels[cfunc->func_name] = op_index;
+      } else {
+        op_index = it->second;
+      }
     } else {
       // TODO(jroesch): support lowered funcs for multiple targets
       ICHECK_EQ(cfunc->funcs->functions.size(), 1);
@@ -1128,6 +1140,9 @@ void VMCompiler::Codegen() {
       Function func = Downcast<Function>(mod->Lookup(cfunc->func_name));
       backend::UpdateConstants(func, &params_);
       continue;
+    } else if (mod->functions.empty()) {
+      // The kernels served by the kernel cache come with the external modules.
+      continue;
     } else if (funcs.count(target_str) == 0) {
       funcs.emplace(target_str, mod);
     } else {
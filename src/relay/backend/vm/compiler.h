@@ -83,6 +83,8 @@ struct VMCompilerContext {
   std::vector<CachedFunc> cached_funcs;
   // The functions that have been lowered.
   std::unordered_map<tir::PrimFunc, size_t, ObjectPtrHash, ObjectPtrEqual> seen_funcs;
+  // The kernels served by the kernel cache, by name.
+  std::unordered_map<std::string, size_t> seen_kernels;
 };
 
 class VMCompiler : public runtime::ModuleNode {
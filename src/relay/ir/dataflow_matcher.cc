@@ -27,6 +27,8 @@
 #include <tvm/relay/expr_functor.h>
 #include <tvm/relay/transform.h>
 
+#include <functional>
+#include <memory>
 #include <stack>
 
 #include "indexed_graph.h"
@@ -518,13 +520,30 @@ class PatternGrouper {
   }
   /*! \brief Group expressions that match the pattern */
   const std::unordered_map<int, Group>& GroupMatches(const DFPattern& pattern, const Expr& pre) {
+    auto matcher = DFPatternMatcher(pre);
+    return GroupMatches(pattern, &matcher, nullptr, nullptr);
+  }
+  /*!
+   * \brief Group the expressions of the graph of the matcher that match the pattern
+   *
+   * \param pattern The pattern.
+   * \param matcher The matcher of the expression.
+   * \param is_candidate When defined, only the expressions it accepts are matched.
+   * \param tried When not null, the matched expressions that do not need to be matched again are
+   *  inserted in it: those that do not match the pattern and the roots of the groups.
+   */
+  const std::unordered_map<int, Group>& GroupMatches(
+      const DFPattern& pattern, DFPatternMatcher* matcher,
+      const std::function<bool(const Expr&)>& is_candidate,
+      std::unordered_set<Expr, ObjectPtrHash, ObjectPtrEqual>* tried) {
     groups_.clear();
     gid_assignments_.clear();
 
     pattern_ = pattern;
     pattern_graph_ = CreateIndexedGraph(pattern_);
-    auto matcher = DFPatternMatcher(pre);
-    matcher_ = &matcher;
+    matcher_ = matcher;
+    is_candidate_ = is_candidate;
+    tried_ = tried;
     this->VisitExprs();
     return this->groups_;
   }
@@ -551,8 +570,16 @@ class PatternGrouper {
                            [&pre_partitioned](const Expr& expr) { pre_partitioned.insert(expr); });
           }
         }
-        if (pre_partitioned.count(current) == 0 && matcher_->Match(pattern_, current)) {
-          CreateGroup(current);
+        if (pre_partitioned.count(current) == 0 && (!is_candidate_ || is_candidate_(current))) {
+          if (matcher_->Match(pattern_, current)) {
+            CreateGroup(current);
+            // a match rejected by the overlap checks may be grouped after other rewrites
+            if (tried_ && gid_assignments_.count(current)) {
+              tried_->insert(current);
+            }
+          } else if (tried_) {
+            tried_->insert(current);
+          }
         }
       }
     }
@@ -759,6 +786,8 @@ class PatternGrouper {
   std::unordered_map<int, Group> groups_;
   std::unordered_map<Expr, int, ObjectPtrHash, ObjectPtrEqual> gid_assignments_;
   DFPatternMatcher* matcher_ = nullptr;
+  std::function<bool(const Expr&)> is_candidate_;
+  std::unordered_set<Expr, ObjectPtrHash, ObjectPtrEqual>* tried_ = nullptr;
   IndexedGraph<DFPattern> pattern_graph_;
   int gid_ = 0;
   int graph_number_ = 0;
@@ -781,11 +810,58 @@ TVM_REGISTER_GLOBAL("relay.dataflow_pattern.DFPatternCallback")
       return DFPatternCallback(pattern, function, require_type);
     });
 
+/*!
+ * \brief Collect the ops a pattern matching the op of a call can match.
+ * \return false when the pattern can match other expressions than these ops.
+ */
+bool CollectOps(const DFPattern& pattern, std::unordered_set<const Object*>* ops) {
+  if (auto* expr_pattern = pattern.as<ExprPatternNode>()) {
+    if (auto* op = expr_pattern->expr.as<OpNode>()) {
+      ops->insert(op);
+      // the matcher associates divide and multiply
+      if (op->name == "divide" || op->name == "multiply") {
+        ops->insert(Op::Get("divide").get());
+        ops->insert(Op::Get("multiply").get());
+      }
+      return true;
+    }
+  } else if (auto* alt = pattern.as<AltPatternNode>()) {
+    return CollectOps(alt->left, ops) && CollectOps(alt->right, ops);
+  }
+  return false;
+}
+
+/*!
+ * \brief Collect the ops of the calls the root of a match of the pattern can be.
+ * \return false when the root can be another expression than a call of these ops.
+ */
+bool CollectRootOps(const DFPattern& pattern, std::unordered_set<const Object*>* ops) {
+  if (auto* call = pattern.as<CallPatternNode>()) {
+    return CollectOps(call->op, ops);
+  } else if (auto* alt = pattern.as<AltPatternNode>()) {
+    return CollectRootOps(alt->left, ops) && CollectRootOps(alt->right, ops);
+  } else if (auto* attr = pattern.as<AttrPatternNode>()) {
+    return CollectRootOps(attr->pattern, ops);
+  } else if (auto* type = pattern.as<TypePatternNode>()) {
+    return CollectRootOps(type->pattern, ops);
+  } else if (auto* dtype = pattern.as<DataTypePatternNode>()) {
+    return CollectRootOps(dtype->pattern, ops);
+  } else if (auto* shape = pattern.as<ShapePatternNode>()) {
+    return CollectRootOps(shape->pattern, ops);
+  }
+  return false;
+}
+
 /*!
  * \brief PatternRewriter rewrites the expression by finding matches and allowing user callback
  * function to rewrite those matches
  *
  * The class uses PatternGrouper to support the dominator pattern.
+ *
+ * A callback only tries the calls of the ops its pattern can be rooted at, and after its first
+ * pass over the graph, only the expressions created since: the match of an expression only
+ * depends on the expression and its inputs, except for the dominator patterns whose callbacks
+ * try every expression in every pass.
  */
 class PatternRewriter : protected MixedModeMutator {
  public:
@@ -793,8 +869,33 @@ class PatternRewriter : protected MixedModeMutator {
   /*! \brief Rewrite can take a number of callbacks and will repeatedly rewrite the graph with the
    * callbacks until it stops changing */
   Expr Rewrite(const Array<DFPatternCallback>& callbacks, const Expr& pre) {
+    using ExprSet = std::unordered_set<Expr, ObjectPtrHash, ObjectPtrEqual>;
+    std::vector<std::function<bool(const Expr&)>> root_filters;
+    std::vector<bool> incremental;
+    for (auto callback : callbacks) {
+      auto ops = std::make_shared<std::unordered_set<const Object*>>();
+      if (CollectRootOps(callback->pattern, ops.get())) {
+        root_filters.push_back([ops](const Expr& expr) {
+          auto* call = expr.as<CallNode>();
+          return call != nullptr && ops->count(call->op.get()) != 0;
+        });
+      } else {
+        root_filters.push_back(nullptr);
+      }
+      bool has_dominator = false;
+      for (auto node : CreateIndexedGraph(callback->pattern).topological_order_) {
+        has_dominator |= node->ref_.as<DominatorPatternNode>() != nullptr;
+      }
+      incremental.push_back(!has_dominator);
+    }
+    // The expressions each callback does not need to match again.
+    std::vector<ExprSet> tried(callbacks.size());
+
     auto post = pre;
     auto last = post;
+    // The matcher of post, its indexed graph is only built again when post changes.
+    std::unique_ptr<DFPatternMatcher> matcher;
+    Expr matcher_expr;
     // rewrite the graph until it stops changing to make sure all rewrites are complete
     int count = 0;
     bool equal = true;
@@ -802,21 +903,34 @@ class PatternRewriter : protected MixedModeMutator {
     ICHECK(structural_equal) << "node.StructuralEqual is not registered.";
     do {
       last = post;
-      for (auto callback : callbacks) {
-        callback_ = callback;
+      for (size_t i = 0; i < callbacks.size(); ++i) {
+        callback_ = callbacks[i];
         if (callback_->require_type) {
           post = InferTypeWithModule(post, mod_);
         }
+        if (!matcher || !matcher_expr.same_as(post)) {
+          matcher.reset(new DFPatternMatcher(post));
+          matcher_expr = post;
+        }
+        ExprSet* callback_tried = incremental[i] ? &tried[i] : nullptr;
+        const auto& root_filter = root_filters[i];
+        auto is_candidate = [&root_filter, callback_tried](const Expr& expr) {
+          return (!root_filter || root_filter(expr)) &&
+                 (callback_tried == nullptr || callback_tried->count(expr) == 0);
+        };
         auto grouper = PatternGrouper();
-        groups_ = grouper.GroupMatches(callback_->pattern, post);
+        groups_ = grouper.GroupMatches(callback_->pattern, matcher.get(), is_candidate,
+                                       callback_tried);
         gid_assignments_ = grouper.GetGIDAssignments();
-        memo_.clear();
-        post = this->VisitExpr(post);
-        count++;
+        if (!groups_.empty()) {
+          memo_.clear();
+          post = this->VisitExpr(post);
+        }
       }
-      equal = (*structural_equal)(last, post, false, true);
+      count++;
+      equal = last.same_as(post) || (*structural_equal)(last, post, false, true);
     } while (!equal && count < 100);
-    if (count >= 100) {
+    if (!equal) {
       LOG(FATAL) << "Observed 100 rewrite passes, possible conflicting passes?";
     }
     return post;
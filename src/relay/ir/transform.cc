@@ -134,19 +134,25 @@ IRModule FunctionPassNode::operator()(IRModule mod, const PassContext& pass_ctx)
              << " with opt level: " << pass_info->opt_level;
 
   pass_ctx.Trace(mod, pass_info, true);
+  pass_ctx.InstrumentBeforePass(mod, pass_info);
 
   // Execute the pass function and return a new module.
   IRModule updated_mod =
       IRModule(mod->functions, mod->type_definitions, mod->Imports(), mod->source_map);
 
   std::vector<std::pair<GlobalVar, Function> > updates;
-  for (const auto& it : updated_mod->functions) {
-    // only picks up relay::Function
-    if (auto* n = it.second.as<FunctionNode>()) {
-      Function func = GetRef<Function>(n);
-      auto updated_func = SkipFunction(func) ? func : pass_func(func, updated_mod, pass_ctx);
-      updates.push_back({it.first, updated_func});
+  try {
+    for (const auto& it : updated_mod->functions) {
+      // only picks up relay::Function
+      if (auto* n = it.second.as<FunctionNode>()) {
+        Function func = GetRef<Function>(n);
+        auto updated_func = SkipFunction(func) ? func : pass_func(func, updated_mod, pass_ctx);
+        updates.push_back({it.first, updated_func});
+      }
     }
+  } catch (const std::exception& e) {
+    pass_ctx.InstrumentOnException(pass_info, e.what());
+    throw;
   }
 
   for (const auto& pair : updates) {
@@ -160,6 +166,7 @@ IRModule FunctionPassNode::operator()(IRModule mod, const PassContext& pass_ctx)
   pass_ctx->diag_ctx = previous;
 
   pass_ctx.Trace(updated_mod, pass_info, false);
+  pass_ctx.InstrumentAfterPass(updated_mod, pass_info);
 
   // TODO(@jroesch): move away from eager type checking for performance reasons
   // make issue.
@@ -22,7 +22,9 @@
  */
 
 #include <dlpack/dlpack.h>
+#include <tvm/runtime/c_backend_api.h>
 #include <tvm/runtime/registry.h>
+#include <tvm/runtime/threading_backend.h>
 
 #include <algorithm>
 #include <vector>
@@ -42,6 +44,65 @@ bool CompareDescend(const std::pair<int64_t, DType>& lhs, const std::pair<int64_
   return lhs.second > rhs.second;
 }
 
+// Ties are broken by the position, so that a partial sort gives the same
+// first elements as a stable sort.
+template <typename DType>
+bool CompareAscendStable(const std::pair<int64_t, DType>& lhs,
+                         const std::pair<int64_t, DType>& rhs) {
+  return lhs.second < rhs.second || (lhs.second == rhs.second && lhs.first < rhs.first);
+}
+
+template <typename DType>
+bool CompareDescendStable(const std::pair<int64_t, DType>& lhs,
+                          const std::pair<int64_t, DType>& rhs) {
+  return lhs.second > rhs.second || (lhs.second == rhs.second && lhs.first < rhs.first);
+}
+
+template <typename FRow>
+struct RowTask {
+  const FRow* frow;
+  int64_t num_rows;
+
+  static int Run(int task_id, TVMParallelGroupEnv* penv, void* cdata) {
+    const RowTask* task = static_cast<const RowTask*>(cdata);
+    int64_t chunk = (task->num_rows + penv->num_task - 1) / penv->num_task;
+    int64_t end = std::min(task->num_rows, (task_id + 1) * chunk);
+    // Errors are reported through the return value, they must not leave a worker thread.
+    try {
+      for (int64_t row = task_id * chunk; row < end; ++row) {
+        (*task->frow)(row);
+      }
+    } catch (const std::exception& e) {
+      TVMAPISetLastError(e.what());
+      return -1;
+    }
+    return 0;
+  }
+};
+
+// Below this number of elements to sort, launching a parallel job costs more
+// than it saves.
+constexpr int64_t kMinParallelSortSize = 16384;
+
+// Call frow on each row to sort, the rows are split among the threads of the
+// runtime thread pool. The rows are independent, so the result does not
+// depend on the number of threads. The rows are sorted by the calling thread
+// when there is little to sort, or when it is itself a task of a parallel job,
+// e.g. when the sort is called from a parallel loop.
+template <typename FRow>
+void ParallelForRows(int64_t num_rows, int64_t row_size, const FRow& frow) {
+  if (num_rows <= 1 || num_rows * row_size < kMinParallelSortSize ||
+      threading::IsInParallelJob()) {
+    for (int64_t row = 0; row < num_rows; ++row) {
+      frow(row);
+    }
+    return;
+  }
+  RowTask<FRow> task{&frow, num_rows};
+  int ret = TVMBackendParallelLaunch(RowTask<FRow>::Run, &task, 0);
+  ICHECK_EQ(ret, 0) << "Sorting the rows in parallel failed: " << TVMGetLastError();
+}
+
 // Argsort implemented C library sort for nms.
 // Return indices of sorted tensor.
 // By default, the last axis will be used to sort.
@@ -59,7 +120,6 @@ TVM_REGISTER_GLOBAL("tvm.contrib.sort.argsort_nms").set_body([](TVMArgs args, TV
   auto dtype = input->dtype;
   auto data_ptr = static_cast<float*>(input->data);
   auto sort_num_ptr = static_cast<int32_t*>(sort_num->data);
-  std::vector<std::pair<int32_t, float>> sorter;
   int64_t axis_mul_before = 1;
   int64_t axis_mul_after = 1;
 
@@ -86,49 +146,48 @@ TVM_REGISTER_GLOBAL("tvm.contrib.sort.argsort_nms").set_body([](TVMArgs args, TV
     }
   }
 
-  for (int64_t i = 0; i < axis_mul_before; ++i) {
-    for (int64_t j = 0; j < axis_mul_after; ++j) {
-      sorter.clear();
-      int32_t current_sort_num = *(sort_num_ptr + i * axis_mul_after + j);
-      int64_t base_idx = i * input->shape[axis] * axis_mul_after + j;
-      for (int64_t k = 0; k < current_sort_num; ++k) {
-        int64_t full_idx = base_idx + k * axis_mul_after;
-        sorter.emplace_back(std::make_pair(k, *(data_ptr + full_idx)));
-      }
-      if (is_ascend) {
+  ParallelForRows(axis_mul_before * axis_mul_after, input->shape[axis], [&](int64_t row) {
+    int64_t i = row / axis_mul_after;
+    int64_t j = row % axis_mul_after;
+    std::vector<std::pair<int32_t, float>> sorter;
+    int32_t current_sort_num = *(sort_num_ptr + i * axis_mul_after + j);
+    int64_t base_idx = i * input->shape[axis] * axis_mul_after + j;
+    for (int64_t k = 0; k < current_sort_num; ++k) {
+      int64_t full_idx = base_idx + k * axis_mul_after;
+      sorter.emplace_back(std::make_pair(k, *(data_ptr + full_idx)));
+    }
+    if (is_ascend) {
 #if (__ARM_FEATURE_FP16_SCALAR_ARITHMETIC == 1)
-        if (dtype.bits == 16) {
-          std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<__fp16>);
-        } else {
+      if (dtype.bits == 16) {
+        std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<__fp16>);
+      } else {
 #endif
-          std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<float>);
+        std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<float>);
 #if (__ARM_FEATURE_FP16_SCALAR_ARITHMETIC == 1)
-        }
+      }
 #endif
-      } else {
+    } else {
 #if (__ARM_FEATURE_FP16_SCALAR_ARITHMETIC == 1)
-        if (dtype.bits == 16) {
-          std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<__fp16>);
-        } else {
+      if (dtype.bits == 16) {
+        std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<__fp16>);
+      } else {
 #endif
-          std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<float>);
+        std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<float>);
 #if (__ARM_FEATURE_FP16_SCALAR_ARITHMETIC == 1)
-        }
-#endif
-      }
-      for (int32_t k = 0; k < input->shape[axis]; ++k) {
-        *(static_cast<int32_t*>(output->data) + base_idx + k * axis_mul_after) =
-            k < static_cast<int32_t>(sorter.size()) ? sorter[k].first : k;
       }
+#endif
     }
-  }
+    for (int32_t k = 0; k < input->shape[axis]; ++k) {
+      *(static_cast<int32_t*>(output->data) + base_idx + k * axis_mul_after) =
+          k < static_cast<int32_t>(sorter.size()) ? sorter[k].first : k;
+    }
+  });
 });
 
 template <typename DataType, typename OutType>
 void sort_impl(DLTensor* input, DLTensor* output, int32_t axis, bool is_ascend, bool is_argsort) {
   auto data_ptr = static_cast<DataType*>(input->data);
   auto out_ptr = static_cast<OutType*>(output->data);
-  std::vector<std::pair<int64_t, DataType>> sorter;
 
   int axis_mul_before = 1;
   int axis_mul_after = 1;
@@ -140,30 +199,31 @@ void sort_impl(DLTensor* input, DLTensor* output, int32_t axis, bool is_ascend,
     }
   }
 
-  for (int i = 0; i < axis_mul_before; ++i) {
-    for (int j = 0; j < axis_mul_after; ++j) {
-      sorter.clear();
-      int64_t base_idx = i * input->shape[axis] * axis_mul_after + j;
+  int64_t num_rows = static_cast<int64_t>(axis_mul_before) * axis_mul_after;
+  ParallelForRows(num_rows, input->shape[axis], [&](int64_t row) {
+    int64_t i = row / axis_mul_after;
+    int64_t j = row % axis_mul_after;
+    std::vector<std::pair<int64_t, DataType>> sorter;
+    int64_t base_idx = i * input->shape[axis] * axis_mul_after + j;
+    for (int64_t k = 0; k < input->shape[axis]; ++k) {
+      int64_t full_idx = base_idx + k * axis_mul_after;
+      sorter.emplace_back(std::make_pair(k, data_ptr[full_idx]));
+    }
+    if (is_ascend) {
+      std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<DataType>);
+    } else {
+      std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<DataType>);
+    }
+    if (is_argsort) {
       for (int64_t k = 0; k < input->shape[axis]; ++k) {
-        int64_t full_idx = base_idx + k * axis_mul_after;
-        sorter.emplace_back(std::make_pair(k, data_ptr[full_idx]));
-      }
-      if (is_ascend) {
-        std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<DataType>);
-      } else {
-        std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<DataType>);
+        out_ptr[base_idx + k * axis_mul_after] = static_cast<OutType>(sorter[k].first);
       }
-      if (is_argsort) {
-        for (int64_t k = 0; k < input->shape[axis]; ++k) {
-          out_ptr[base_idx + k * axis_mul_after] = static_cast<OutType>(sorter[k].first);
-        }
-      } else {
-        for (int64_t k = 0; k < input->shape[axis]; ++k) {
-          out_ptr[base_idx + k * axis_mul_after] = static_cast<OutType>(sorter[k].second);
-        }
+    } else {
+      for (int64_t k = 0; k < input->shape[axis]; ++k) {
+        out_ptr[base_idx + k * axis_mul_after] = static_cast<OutType>(sorter[k].second);
       }
     }
-  }
+  });
 }
 
 template <typename DataType, typename OutType>
@@ -308,7 +368,6 @@ void topk(DLTensor* input, DLTensor* out_values, DLTensor* out_indices, int k, i
       (out_values == nullptr) ? nullptr : static_cast<DataType*>(out_values->data);
   IndicesType* indices_ptr =
       (out_indices == nullptr) ? nullptr : static_cast<IndicesType*>(out_indices->data);
-  std::vector<std::pair<int64_t, DataType>> sorter;
 
   int axis_mul_before = 1;
   int axis_mul_after = 1;
@@ -323,32 +382,42 @@ void topk(DLTensor* input, DLTensor* out_values, DLTensor* out_indices, int k, i
     k = input->shape[axis];
   }
 
-  for (int i = 0; i < axis_mul_before; ++i) {
-    for (int j = 0; j < axis_mul_after; ++j) {
-      sorter.clear();
-      int64_t src_base_idx = i * input->shape[axis] * axis_mul_after + j;
-      int64_t dst_base_idx = i * k * axis_mul_after + j;
-      for (int64_t kk = 0; kk < input->shape[axis]; ++kk) {
-        int64_t full_idx = src_base_idx + kk * axis_mul_after;
-        sorter.emplace_back(std::make_pair(kk, data_ptr[full_idx]));
-      }
+  int64_t num_rows = static_cast<int64_t>(axis_mul_before) * axis_mul_after;
+  ParallelForRows(num_rows, input->shape[axis], [&](int64_t row) {
+    int64_t i = row / axis_mul_after;
+    int64_t j = row % axis_mul_after;
+    std::vector<std::pair<int64_t, DataType>> sorter;
+    int64_t src_base_idx = i * input->shape[axis] * axis_mul_after + j;
+    int64_t dst_base_idx = i * k * axis_mul_after + j;
+    for (int64_t kk = 0; kk < input->shape[axis]; ++kk) {
+      int64_t full_idx = src_base_idx + kk * axis_mul_after;
+      sorter.emplace_back(std::make_pair(kk, data_ptr[full_idx]));
+    }
+    int64_t cnt = k > 0 ? k : input->shape[axis];
+    // only the first cnt elements are needed
+    if (cnt < input->shape[axis]) {
       if (is_ascend) {
-        std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<DataType>);
+        std::partial_sort(sorter.begin(), sorter.begin() + cnt, sorter.end(),
+                          CompareAscendStable<DataType>);
       } else {
-        std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<DataType>);
+        std::partial_sort(sorter.begin(), sorter.begin() + cnt, sorter.end(),
+                          CompareDescendStable<DataType>);
       }
-      int64_t cnt = k > 0 ? k : input->shape[axis];
-      for (int64_t kk = 0; kk < cnt; ++kk) {
-        if (indices_ptr != nullptr) {
-          indices_ptr[dst_base_idx + kk * axis_mul_after] =
-              static_cast<IndicesType>(sorter[kk].first);
-        }
-        if (values_ptr != nullptr) {
-          values_ptr[dst_base_idx + kk * axis_mul_after] = static_cast<DataType>(sorter[kk].second);
-        }
+    } else if (is_ascend) {
+      std::stable_sort(sorter.begin(), sorter.end(), CompareAscend<DataType>);
+    } else {
+      std::stable_sort(sorter.begin(), sorter.end(), CompareDescend<DataType>);
+    }
+    for (int64_t kk = 0; kk < cnt; ++kk) {
+      if (indices_ptr != nullptr) {
+        indices_ptr[dst_base_idx + kk * axis_mul_after] =
+            static_cast<IndicesType>(sorter[kk].first);
+      }
+      if (values_ptr != nullptr) {
+        values_ptr[dst_base_idx + kk * axis_mul_after] = static_cast<DataType>(sorter[kk].second);
       }
     }
-  }
+  });
 }
 
 // Argsort implemented C library sort.
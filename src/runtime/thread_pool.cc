@@ -24,6 +24,8 @@
 #include <dmlc/thread_local.h>
 #include <tvm/runtime/c_backend_api.h>
 #include <tvm/runtime/c_runtime_api.h>
+#include <tvm/runtime/module.h>
+#include <tvm/runtime/object.h>
 #include <tvm/runtime/packed_func.h>
 #include <tvm/runtime/registry.h>
 #include <tvm/runtime/threading_backend.h>
@@ -258,20 +260,19 @@ class SpscTaskQueue {
 class ThreadPool {
  public:
   ThreadPool() : num_workers_(tvm::runtime::threading::MaxConcurrency()) {
-    for (int i = 0; i < num_workers_; ++i) {
-      // The SpscTaskQueue only hosts ONE item at a time
-      queues_.emplace_back(std::unique_ptr<SpscTaskQueue>(new SpscTaskQueue()));
-    }
-    const char* exclude_worker0 = getenv("TVM_EXCLUDE_WORKER0");
-    if (exclude_worker0 && atoi(exclude_worker0) == 0) {
-      exclude_worker0_ = false;
-    }
-    threads_ = std::unique_ptr<tvm::runtime::threading::ThreadGroup>(
-        new tvm::runtime::threading::ThreadGroup(
-            num_workers_, [this](int worker_id) { this->RunWorker(worker_id); },
-            exclude_worker0_ /* include_main_thread */));
+    Init();
     num_workers_used_ = threads_->Configure(threading::ThreadGroup::kBig, 0, exclude_worker0_);
   }
+  /*!
+   * \brief Create a pool whose workers are bound to a list of cores. The pool can be
+   *  shared by several threads, their parallel jobs are run one at a time.
+   * \param cpus The cores of the pool, task i runs on cpus[i].
+   */
+  explicit ThreadPool(const std::vector<unsigned int>& cpus)
+      : num_workers_(static_cast<int>(cpus.size())), shared_(true) {
+    Init();
+    num_workers_used_ = threads_->Configure(cpus, exclude_worker0_);
+  }
   ~ThreadPool() {
     for (std::unique_ptr<SpscTaskQueue>& q : queues_) {
       q->SignalForKill();
@@ -282,6 +283,9 @@ class ThreadPool {
     ParallelLauncher* launcher = ParallelLauncher::ThreadLocal();
     ICHECK(!launcher->is_worker)
         << "Cannot launch parallel job inside worker, consider fuse then parallel";
+    // the task queues have a single producer
+    std::unique_lock<std::mutex> lock(launch_mutex_, std::defer_lock);
+    if (shared_) lock.lock();
     if (num_task == 0) {
       num_task = num_workers_used_;
     }
@@ -301,11 +305,14 @@ class ThreadPool {
     // use the main thread to run task 0
     if (exclude_worker0_) {
       TVMParallelGroupEnv* penv = &(tsk.launcher->env);
+      // the launcher of the main thread is in use until the job finishes
+      launcher->is_worker = true;
       if ((*tsk.launcher->flambda)(0, penv, cdata) == 0) {
         tsk.launcher->SignalJobFinish();
       } else {
         tsk.launcher->SignalJobError(tsk.task_id);
       }
+      launcher->is_worker = false;
     }
     int res = launcher->WaitForJobs();
     return res;
@@ -323,6 +330,20 @@ class ThreadPool {
   }
 
  private:
+  void Init() {
+    for (int i = 0; i < num_workers_; ++i) {
+      // The SpscTaskQueue only hosts ONE item at a time
+      queues_.emplace_back(std::unique_ptr<SpscTaskQueue>(new SpscTaskQueue()));
+    }
+    const char* exclude_worker0 = getenv("TVM_EXCLUDE_WORKER0");
+    if (exclude_worker0 && atoi(exclude_worker0) == 0) {
+      exclude_worker0_ = false;
+    }
+    threads_ = std::unique_ptr<tvm::runtime::threading::ThreadGroup>(
+        new tvm::runtime::threading::ThreadGroup(
+            num_workers_, [this](int worker_id) { this->RunWorker(worker_id); },
+            exclude_worker0_ /* include_main_thread */));
+  }
   // Internal worker function.
   void RunWorker(int worker_id) {
     SpscTaskQueue* queue = queues_[worker_id].get();
@@ -348,10 +369,25 @@ class ThreadPool {
   int num_workers_used_;
   // if or not to exclude worker 0 and use main to run task 0
   bool exclude_worker0_{true};
+  // whether the pool is shared by several threads
+  bool shared_{false};
+  std::mutex launch_mutex_;
   std::vector<std::unique_ptr<SpscTaskQueue> > queues_;
   std::unique_ptr<tvm::runtime::threading::ThreadGroup> threads_;
 };
 
+namespace threading {
+
+bool IsInParallelJob() {
+#if TVM_THREADPOOL_USE_OPENMP
+  return omp_in_parallel();
+#else
+  return ParallelLauncher::ThreadLocal()->is_worker;
+#endif
+}
+
+}  // namespace threading
+
 TVM_REGISTER_GLOBAL("runtime.config_threadpool").set_body([](TVMArgs args, TVMRetValue* rv) {
   threading::ThreadGroup::AffinityMode mode =
       static_cast<threading::ThreadGroup::AffinityMode>(static_cast<int>(args[0]));
@@ -359,12 +395,138 @@ TVM_REGISTER_GLOBAL("runtime.config_threadpool").set_body([](TVMArgs args, TVMRe
   ThreadPool::ThreadLocal()->UpdateWorkerConfiguration(mode, nthreads);
 });
 
+/*!
+ * \brief A thread pool bound to a set of cores. The parallel jobs of the threads
+ *  that entered the group run on its pool instead of their thread local pool, so
+ *  that models colocated in one process can be given disjoint cores.
+ */
+class ThreadPoolGroupObj : public Object {
+ public:
+  /*! \brief The cores of the group. */
+  std::vector<unsigned int> cpus;
+  /*! \brief The pool, its workers are bound to the cores. */
+  std::unique_ptr<ThreadPool> pool;
+
+  static constexpr const char* _type_key = "runtime.ThreadPoolGroup";
+  TVM_DECLARE_FINAL_OBJECT_INFO(ThreadPoolGroupObj, Object);
+};
+
+class ThreadPoolGroup : public ObjectRef {
+ public:
+  explicit ThreadPoolGroup(std::vector<unsigned int> cpus) {
+    auto n = make_object<ThreadPoolGroupObj>();
+    n->pool.reset(new ThreadPool(cpus));
+    n->cpus = std::move(cpus);
+    data_ = std::move(n);
+  }
+  TVM_DEFINE_OBJECT_REF_METHODS(ThreadPoolGroup, ObjectRef, ThreadPoolGroupObj);
+};
+
+TVM_REGISTER_OBJECT_TYPE(ThreadPoolGroupObj);
+
+/*! \brief The groups entered by a thread, innermost last. */
+struct ThreadPoolGroupThreadLocalEntry {
+  struct Frame {
+    ThreadPoolGroup group;
+    // the affinity of the thread before it entered the group
+    std::vector<unsigned int> affinity;
+  };
+  std::vector<Frame> stack;
+};
+
+typedef dmlc::ThreadLocalStore<ThreadPoolGroupThreadLocalEntry> ThreadPoolGroupThreadLocalStore;
+
+void EnterThreadPoolGroup(ThreadPoolGroup group) {
+  std::vector<unsigned int> affinity = threading::GetThreadAffinity();
+  // the calling thread runs task 0, keep it on the cores of the group
+  threading::SetThreadAffinity(group->cpus);
+  ThreadPoolGroupThreadLocalStore::Get()->stack.push_back({std::move(group), affinity});
+}
+
+void ExitThreadPoolGroup() {
+  auto* entry = ThreadPoolGroupThreadLocalStore::Get();
+  ICHECK(!entry->stack.empty()) << "The thread is not in a thread pool group";
+  threading::SetThreadAffinity(entry->stack.back().affinity);
+  entry->stack.pop_back();
+}
+
+/*! \brief The pool that runs the parallel jobs of the calling thread. */
+ThreadPool* CurrentThreadPool() {
+  auto* entry = ThreadPoolGroupThreadLocalStore::Get();
+  if (!entry->stack.empty()) {
+    return entry->stack.back().group->pool.get();
+  }
+  return ThreadPool::ThreadLocal();
+}
+
+/*! \brief RAII scope of a thread pool group. */
+class ThreadPoolGroupScope {
+ public:
+  explicit ThreadPoolGroupScope(ThreadPoolGroup group) { EnterThreadPoolGroup(std::move(group)); }
+  ~ThreadPoolGroupScope() { ExitThreadPoolGroup(); }
+};
+
+/*!
+ * \brief A module whose functions run in a thread pool group, used to bind a
+ *  graph runtime or a virtual machine to the group.
+ */
+class ThreadPoolGroupModuleNode : public ModuleNode {
+ public:
+  ThreadPoolGroupModuleNode(Module mod, ThreadPoolGroup group)
+      : mod_(std::move(mod)), group_(std::move(group)) {}
+
+  const char* type_key() const final { return "ThreadPoolGroupModule"; }
+
+  PackedFunc GetFunction(const std::string& name, const ObjectPtr<Object>& sptr_to_self) final {
+    PackedFunc pf = mod_.GetFunction(name);
+    if (pf == nullptr) return pf;
+    ThreadPoolGroup group = group_;
+    return PackedFunc([pf, group, sptr_to_self](TVMArgs args, TVMRetValue* rv) {
+      ThreadPoolGroupScope scope(group);
+      pf.CallPacked(args, rv);
+    });
+  }
+
+ private:
+  Module mod_;
+  ThreadPoolGroup group_;
+};
+
+TVM_REGISTER_GLOBAL("runtime.ThreadPoolGroup").set_body([](TVMArgs args, TVMRetValue* rv) {
+  std::vector<unsigned int> cpus;
+  for (int i = 0; i < args.num_args; ++i) {
+    int core_id = args[i];
+    ICHECK_GE(core_id, 0) << "Invalid core id " << core_id;
+    cpus.push_back(static_cast<unsigned int>(core_id));
+  }
+  *rv = ThreadPoolGroup(cpus);
+});
+
+TVM_REGISTER_GLOBAL("runtime.MaxConcurrency").set_body_typed(threading::MaxConcurrency);
+
+TVM_REGISTER_GLOBAL("runtime.ThreadPoolGroupEnter").set_body_typed(EnterThreadPoolGroup);
+
+TVM_REGISTER_GLOBAL("runtime.ThreadPoolGroupExit").set_body_typed(ExitThreadPoolGroup);
+
+TVM_REGISTER_GLOBAL("runtime.ThreadPoolGroupBindModule")
+    .set_body_typed([](Module mod, ThreadPoolGroup group) {
+      return Module(make_object<ThreadPoolGroupModuleNode>(mod, group));
+    });
+
+TVM_REGISTER_GLOBAL("runtime.ThreadPoolGroupBindFunc")
+    .set_body_typed([](PackedFunc func, ThreadPoolGroup group) {
+      return PackedFunc([func, group](TVMArgs args, TVMRetValue* rv) {
+        ThreadPoolGroupScope scope(group);
+        func.CallPacked(args, rv);
+      });
+    });
+
 }  // namespace runtime
 }  // namespace tvm
 
 int TVMBackendParallelLaunch(FTVMParallelLambda flambda, void* cdata, int num_task) {
 #if !TVM_THREADPOOL_USE_OPENMP
-  int res = tvm::runtime::ThreadPool::ThreadLocal()->Launch(flambda, cdata, num_task, 1);
+  int res = tvm::runtime::CurrentThreadPool()->Launch(flambda, cdata, num_task, 1);
   return res;
 #else
   int num_workers = tvm::runtime::threading::MaxConcurrency();
@@ -32,11 +32,25 @@
 #else
 #endif
 #if defined(__linux__)
+#include <pthread.h>
 #include <sched.h>
 #endif
 #if defined(__hexagon__)
 #include <dlfcn.h>
 #endif
+#if defined(__ANDROID__)
+#ifndef CPU_SET
+#define CPU_SETSIZE 1024
+#define __NCPUBITS (8 * sizeof(uint64_t))
+typedef struct {
+  uint64_t __bits[CPU_SETSIZE / __NCPUBITS];
+} cpu_set_t;
+
+#define CPU_SET(cpu, cpusetp) \
+  ((cpusetp)->__bits[(cpu) / __NCPUBITS] |= (1UL << ((cpu) % __NCPUBITS)))
+#define CPU_ZERO(cpusetp) memset((cpusetp), 0, sizeof(cpu_set_t))
+#endif
+#endif
 
 namespace tvm {
 namespace runtime {
@@ -93,24 +107,27 @@ class ThreadGroup::Impl {
     return num_workers_used;
   }
 
+  int Configure(const std::vector<unsigned int>& cpus, bool exclude_worker0) {
+    ICHECK(!cpus.empty()) << "The list of cores is empty.";
+    for (unsigned int core_id : cpus) {
+      ICHECK_LT(core_id, sorted_order_.size())
+          << "Core " << core_id << " does not exist, the system has " << sorted_order_.size();
+    }
+    int num_workers_used = std::min(num_workers_, static_cast<int>(cpus.size()));
+    const char* val = getenv("TVM_BIND_THREADS");
+    if (val == nullptr || atoi(val) == 1) {
+      for (unsigned i = 0; i < threads_.size() && i + exclude_worker0 < cpus.size(); ++i) {
+        BindThread(i, cpus[i + exclude_worker0]);
+      }
+    }
+    return num_workers_used;
+  }
+
  private:
   // bind worker threads to disjoint cores
   // if worker 0 is offloaded to main, i.e. exclude_worker0 is true,
   // the main thread is bound to core 0.
   void SetAffinity(bool exclude_worker0, bool reverse = false) {
-#if defined(__ANDROID__)
-#ifndef CPU_SET
-#define CPU_SETSIZE 1024
-#define __NCPUBITS (8 * sizeof(uint64_t))
-    typedef struct {
-      uint64_t __bits[CPU_SETSIZE / __NCPUBITS];
-    } cpu_set_t;
-
-#define CPU_SET(cpu, cpusetp) \
-  ((cpusetp)->__bits[(cpu) / __NCPUBITS] |= (1UL << ((cpu) % __NCPUBITS)))
-#define CPU_ZERO(cpusetp) memset((cpusetp), 0, sizeof(cpu_set_t))
-#endif
-#endif
 #if defined(__linux__) || defined(__ANDROID__)
     ICHECK_GE(sorted_order_.size(), num_workers_);
 
@@ -121,14 +138,7 @@ class ThreadGroup::Impl {
       } else {
         core_id = sorted_order_[i + exclude_worker0];
       }
-      cpu_set_t cpuset;
-      CPU_ZERO(&cpuset);
-      CPU_SET(core_id, &cpuset);
-#if defined(__ANDROID__)
-      sched_setaffinity(threads_[i].native_handle(), sizeof(cpu_set_t), &cpuset);
-#else
-      pthread_setaffinity_np(threads_[i].native_handle(), sizeof(cpu_set_t), &cpuset);
-#endif
+      BindThread(i, core_id);
     }
     if (exclude_worker0) {  // main thread run task
       // Master thread will have free migration on needed cores.
@@ -140,6 +150,20 @@ class ThreadGroup::Impl {
 #endif
   }
 
+  // bind the i-th launched thread to a single core
+  void BindThread(unsigned i, unsigned core_id) {
+#if defined(__linux__) || defined(__ANDROID__)
+    cpu_set_t cpuset;
+    CPU_ZERO(&cpuset);
+    CPU_SET(core_id, &cpuset);
+#if defined(__ANDROID__)
+    sched_setaffinity(threads_[i].native_handle(), sizeof(cpu_set_t), &cpuset);
+#else
+    pthread_setaffinity_np(threads_[i].native_handle(), sizeof(cpu_set_t), &cpuset);
+#endif
+#endif
+  }
+
   void SetMasterThreadFullCpuAffinity(bool reverse) {
 #if defined(__linux__) || defined(__ANDROID__)
     cpu_set_t cpuset;
@@ -235,6 +259,10 @@ int ThreadGroup::Configure(AffinityMode mode, int nthreads, bool exclude_worker0
   return impl_->Configure(mode, nthreads, exclude_worker0);
 }
 
+int ThreadGroup::Configure(const std::vector<unsigned int>& cpus, bool exclude_worker0) {
+  return impl_->Configure(cpus, exclude_worker0);
+}
+
 void Yield() { std::this_thread::yield(); }
 
 int MaxConcurrency() {
@@ -265,6 +293,32 @@ int MaxConcurrency() {
   return std::max(max_concurrency, 1);
 }
 
+std::vector<unsigned int> GetThreadAffinity() {
+  std::vector<unsigned int> cpus;
+#if defined(__linux__) && !defined(__ANDROID__)
+  cpu_set_t cpuset;
+  CPU_ZERO(&cpuset);
+  if (pthread_getaffinity_np(pthread_self(), sizeof(cpu_set_t), &cpuset) == 0) {
+    for (unsigned int i = 0; i < CPU_SETSIZE; ++i) {
+      if (CPU_ISSET(i, &cpuset)) cpus.push_back(i);
+    }
+  }
+#endif
+  return cpus;
+}
+
+void SetThreadAffinity(const std::vector<unsigned int>& cpus) {
+#if defined(__linux__) && !defined(__ANDROID__)
+  if (cpus.empty()) return;
+  cpu_set_t cpuset;
+  CPU_ZERO(&cpuset);
+  for (unsigned int core_id : cpus) {
+    CPU_SET(core_id, &cpuset);
+  }
+  pthread_setaffinity_np(pthread_self(), sizeof(cpu_set_t), &cpuset);
+#endif
+}
+
 }  // namespace threading
 }  // namespace runtime
 }  // namespace tvm
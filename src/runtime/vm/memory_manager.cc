@@ -21,13 +21,17 @@
  * \file tvm/runtime/vm/memory_manager.cc
  * \brief Allocate and manage memory for the runtime.
  */
+#include <tvm/runtime/registry.h>
 #include <tvm/runtime/vm/memory_manager.h>
 
 #include <memory>
+#include <sstream>
+#include <string>
 #include <utility>
 
 #include "naive_allocator.h"
 #include "pooled_allocator.h"
+#include "size_class_allocator.h"
 
 namespace tvm {
 namespace runtime {
@@ -134,6 +138,12 @@ Allocator* MemoryManager::GetOrCreateAllocator(TVMContext ctx, AllocatorType typ
         alloc.reset(new PooledAllocator(ctx));
         break;
       }
+      case kSizeClass: {
+        DLOG(INFO) << "New size class allocator for " << DeviceName(ctx.device_type) << "("
+                   << ctx.device_id << ")";
+        alloc.reset(new SizeClassAllocator(ctx));
+        break;
+      }
       default:
         LOG(FATAL) << "Unknown allocator type: " << type;
     }
@@ -161,6 +171,10 @@ Allocator* MemoryManager::GetAllocator(TVMContext ctx) {
   return it->second.get();
 }
 
+std::unordered_map<std::string, int64_t> Allocator::Stats() const {
+  return {{"used_bytes", static_cast<int64_t>(UsedMemory())}};
+}
+
 NDArray Allocator::Empty(std::vector<int64_t> shape, DLDataType dtype, DLContext ctx) {
   VerifyDataType(dtype);
   NDArray::Container* container = new NDArray::Container(nullptr, shape, dtype, ctx);
@@ -174,6 +188,35 @@ NDArray Allocator::Empty(std::vector<int64_t> shape, DLDataType dtype, DLContext
   return NDArray(GetObjectPtr<Object>(container));
 }
 
+TVM_REGISTER_GLOBAL("runtime._VMConfigureAllocator")
+    .set_body_typed([](int device_type, int device_id, int64_t high_water_mark,
+                       int classes_per_doubling) {
+      TVMContext ctx{static_cast<DLDeviceType>(device_type), device_id};
+      auto* alloc = dynamic_cast<SizeClassAllocator*>(MemoryManager::GetAllocator(ctx));
+      if (alloc == nullptr) {
+        LOG(WARNING) << "The allocator for " << DeviceName(ctx.device_type) << "("
+                     << ctx.device_id << ") is not a size class allocator, ignoring its config";
+        return;
+      }
+      ICHECK_GE(high_water_mark, 0) << "The high water mark must be non-negative";
+      alloc->Configure(static_cast<size_t>(high_water_mark), classes_per_doubling);
+    });
+
+TVM_REGISTER_GLOBAL("runtime._VMGetAllocatorStats")
+    .set_body_typed([](int device_type, int device_id) {
+      TVMContext ctx{static_cast<DLDeviceType>(device_type), device_id};
+      Allocator* alloc = MemoryManager::GetAllocator(ctx);
+      static const char* type_names[] = {"", "naive", "pooled", "size_class"};
+      // Return the stats as a JSON object, the runtime has no map container.
+      std::ostringstream os;
+      os << "{\"type\": \"" << type_names[alloc->type()] << "\"";
+      for (const auto& kv : alloc->Stats()) {
+        os << ", \"" << kv.first << "\": " << kv.second;
+      }
+      os << "}";
+      return os.str();
+    });
+
 }  // namespace vm
 }  // namespace runtime
 }  // namespace tvm
@@ -81,12 +81,20 @@ PackedFunc VirtualMachineDebug::GetFunction(const std::string& name,
       }
       os << "\nTotal Duration: " << total_duration << " us.\t"
          << "Total Packed Functions: " << total_packed_funcs << std::endl;
+      if (shape_cache_capacity_ > 0) {
+        os << "Shape Cache: " << shape_cache_stats_.hits << " hits, " << shape_cache_stats_.misses
+           << " misses, " << shape_cache_stats_.evictions << " evictions.\t"
+           << "Shape Functions Memoized: " << shape_cache_stats_.shape_func_hits << "/"
+           << shape_cache_stats_.shape_func_hits + shape_cache_stats_.shape_func_misses << "\t"
+           << "Storage Reused: " << shape_cache_stats_.storage_reuses << std::endl;
+      }
       *rv = os.str();
     });
   } else if (name == "reset") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       op_durations_.clear();
       op_invokes_.clear();
+      shape_cache_stats_ = ShapeCacheStats();
     });
   } else {
     return VirtualMachine::GetFunction(name, sptr_to_self);
@@ -0,0 +1,209 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file runtime/size_class_allocator.h
+ * \brief A pooled allocator with size class buckets and a high water mark.
+ *
+ *  Requests are rounded up to a size class, so that a freed buffer can serve any
+ *  later request of the same class. Each power of two range (base, 2 * base] is
+ *  divided into classes_per_doubling classes growing geometrically, the i-th
+ *  bounded by base * 2^(i / classes_per_doubling) rounded up to the allocation
+ *  alignment. With 1 every class is a power of two.
+ *
+ *  Freed buffers are cached in the free list of their class. When the memory
+ *  allocated from the device exceeds the high water mark, cached buffers are
+ *  released to the device, largest first, until it is back under the mark. The
+ *  buffers in use are never released, so the mark bounds the memory kept idle
+ *  in the cache rather than the peak memory of the models. A buffer freed after
+ *  the size classes changed is released unless its size is still a class.
+ */
+#ifndef TVM_RUNTIME_VM_SIZE_CLASS_ALLOCATOR_H_
+#define TVM_RUNTIME_VM_SIZE_CLASS_ALLOCATOR_H_
+
+#include <tvm/runtime/device_api.h>
+#include <tvm/runtime/vm/memory_manager.h>
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace tvm {
+namespace runtime {
+namespace vm {
+
+class SizeClassAllocator final : public Allocator {
+ public:
+  /*! \brief The smallest size class. */
+  static constexpr size_t kMinClassSize = 256;
+  static constexpr int kDefaultClassesPerDoubling = 4;
+
+  explicit SizeClassAllocator(TVMContext ctx) : Allocator(kSizeClass), ctx_(ctx) {}
+
+  ~SizeClassAllocator() {
+    std::lock_guard<std::mutex> lock(mu_);
+    TrimTo(0);
+  }
+
+  /*!
+   * \brief Configure the allocator, the cached buffers are released if the size classes change.
+   * \param high_water_mark The bytes above which cached buffers are released, 0 for no limit.
+   * \param classes_per_doubling The number of size classes per power of two.
+   */
+  void Configure(size_t high_water_mark, int classes_per_doubling) {
+    ICHECK(classes_per_doubling >= 1 && classes_per_doubling <= static_cast<int>(kMinClassSize))
+        << "classes_per_doubling must be in [1, " << kMinClassSize << "], got "
+        << classes_per_doubling;
+    std::lock_guard<std::mutex> lock(mu_);
+    if (classes_per_doubling != classes_per_doubling_) {
+      TrimTo(0);
+      classes_per_doubling_ = classes_per_doubling;
+    }
+    high_water_mark_ = high_water_mark;
+    if (high_water_mark_ != 0) {
+      TrimTo(high_water_mark_);
+    }
+  }
+
+  Buffer Alloc(size_t nbytes, size_t alignment, DLDataType type_hint) override {
+    std::lock_guard<std::mutex> lock(mu_);
+    size_t size = SizeClass(nbytes);
+    num_allocs_++;
+    auto it = free_.find(size);
+    if (it != free_.end() && !it->second.empty()) {
+      Buffer buf = it->second.back();
+      it->second.pop_back();
+      cached_bytes_ -= size;
+      num_hits_++;
+      return buf;
+    }
+    // Make room under the high water mark from the cache first.
+    if (high_water_mark_ != 0 && used_bytes_ + size > high_water_mark_) {
+      TrimTo(high_water_mark_ > size ? high_water_mark_ - size : 0);
+    }
+    Buffer buf;
+    buf.ctx = ctx_;
+    buf.size = size;
+    try {
+      buf.data = DeviceAPI::Get(ctx_)->AllocDataSpace(ctx_, size, alignment, type_hint);
+    } catch (const dmlc::Error& e) {
+      if (cached_bytes_ == 0) throw;
+      // The device may be out of memory, retry once the cache is released.
+      TrimTo(0);
+      buf.data = DeviceAPI::Get(ctx_)->AllocDataSpace(ctx_, size, alignment, type_hint);
+    }
+    used_bytes_ += size;
+    peak_bytes_ = std::max(peak_bytes_, used_bytes_);
+    DLOG(INFO) << "allocate " << size << " B, used memory " << used_bytes_ << " B";
+    return buf;
+  }
+
+  void Free(const Buffer& buffer) override {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (SizeClass(buffer.size) != buffer.size) {
+      // Allocated under other size classes, no request would be served by it.
+      DeviceAPI::Get(buffer.ctx)->FreeDataSpace(buffer.ctx, buffer.data);
+      used_bytes_ -= buffer.size;
+      num_released_++;
+      return;
+    }
+    free_[buffer.size].push_back(buffer);
+    cached_bytes_ += buffer.size;
+    if (high_water_mark_ != 0 && used_bytes_ > high_water_mark_) {
+      TrimTo(high_water_mark_);
+    }
+  }
+
+  size_t UsedMemory() const override {
+    std::lock_guard<std::mutex> lock(mu_);
+    return used_bytes_;
+  }
+
+  std::unordered_map<std::string, int64_t> Stats() const override {
+    std::lock_guard<std::mutex> lock(mu_);
+    return {{"used_bytes", static_cast<int64_t>(used_bytes_)},
+            {"cached_bytes", static_cast<int64_t>(cached_bytes_)},
+            {"peak_bytes", static_cast<int64_t>(peak_bytes_)},
+            {"high_water_mark", static_cast<int64_t>(high_water_mark_)},
+            {"classes_per_doubling", classes_per_doubling_},
+            {"num_allocs", num_allocs_},
+            {"num_hits", num_hits_},
+            {"num_released", num_released_}};
+  }
+
+  /*!
+   * \brief Round a request up to its size class.
+   * \param nbytes The requested size.
+   * \return The size of the class.
+   */
+  size_t SizeClass(size_t nbytes) const {
+    if (nbytes <= kMinClassSize) return kMinClassSize;
+    // nbytes is in (base, 2 * base], the last class of which is 2 * base itself.
+    size_t base = kMinClassSize;
+    while (base * 2 < nbytes) base *= 2;
+    for (int i = 1; i < classes_per_doubling_; ++i) {
+      double exponent = static_cast<double>(i) / classes_per_doubling_;
+      size_t bound = static_cast<size_t>(std::ceil(std::exp2(exponent) * base));
+      size_t size = (bound + kAllocAlignment - 1) / kAllocAlignment * kAllocAlignment;
+      if (size >= nbytes) return size;
+    }
+    return base * 2;
+  }
+
+ private:
+  /*! \brief Release cached buffers, largest first, until at most target bytes are used. */
+  void TrimTo(size_t target) {
+    for (auto it = free_.rbegin(); it != free_.rend() && used_bytes_ > target; ++it) {
+      auto& pool = it->second;
+      while (!pool.empty() && used_bytes_ > target) {
+        const Buffer& buf = pool.back();
+        DeviceAPI::Get(buf.ctx)->FreeDataSpace(buf.ctx, buf.data);
+        used_bytes_ -= buf.size;
+        cached_bytes_ -= buf.size;
+        num_released_++;
+        pool.pop_back();
+      }
+    }
+    DLOG(INFO) << "trim to " << target << " B, used memory " << used_bytes_ << " B";
+  }
+
+  TVMContext ctx_;
+  mutable std::mutex mu_;
+  /*! \brief The cached buffers of each size class. */
+  std::map<size_t, std::vector<Buffer>> free_;
+  size_t high_water_mark_{0};
+  int classes_per_doubling_{kDefaultClassesPerDoubling};
+  /*! \brief The bytes allocated from the device, including the cached buffers. */
+  size_t used_bytes_{0};
+  size_t cached_bytes_{0};
+  size_t peak_bytes_{0};
+  int64_t num_allocs_{0};
+  int64_t num_hits_{0};
+  int64_t num_released_{0};
+};
+
+}  // namespace vm
+}  // namespace runtime
+}  // namespace tvm
+
+#endif  // TVM_RUNTIME_VM_SIZE_CLASS_ALLOCATOR_H_
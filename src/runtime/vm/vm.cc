@@ -32,6 +32,7 @@
 #include <algorithm>
 #include <chrono>
 #include <iostream>
+#include <sstream>
 #include <stdexcept>
 #include <vector>
 
@@ -111,6 +112,49 @@ std::vector<int64_t> ToShape(NDArray shape_tensor) {
   return shape;
 }
 
+/*! \brief The maximum number of bytes of shape function inputs that are memoized. */
+constexpr size_t kMaxShapeFuncKeyBytes = 4096;
+/*! \brief The maximum number of shape function results memoized per signature. */
+constexpr size_t kMaxShapeFuncOutputs = 1024;
+/*! \brief The maximum number of storages memoized per instruction and signature. */
+constexpr size_t kMaxMemoizedStorages = 8;
+
+/*!
+ * \brief Append the dtypes, shapes and contexts of the tensors in an object to
+ *  a shape cache signature.
+ */
+void AppendSignature(const ObjectRef& obj, std::ostringstream* os) {
+  if (const auto* adt = obj.as<ADTObj>()) {
+    *os << "(" << adt->tag;
+    for (size_t i = 0; i < adt->size; ++i) {
+      *os << ",";
+      AppendSignature((*adt)[i], os);
+    }
+    *os << ")";
+  } else if (obj->IsInstance<NDArray::ContainerType>()) {
+    NDArray array = Downcast<NDArray>(obj);
+    *os << DLDataType2String(array->dtype) << "@" << array->ctx.device_type << ":"
+        << array->ctx.device_id << "[";
+    for (int i = 0; i < array->ndim; ++i) {
+      *os << array->shape[i] << ",";
+    }
+    *os << "]";
+  } else {
+    *os << obj->GetTypeKey();
+  }
+}
+
+/*! \brief Collect the tensors of an object, flattening the tuples. */
+void FlattenNDArrays(const ObjectRef& obj, std::vector<NDArray>* arrays) {
+  if (const auto* adt = obj.as<ADTObj>()) {
+    for (size_t i = 0; i < adt->size; ++i) {
+      FlattenNDArrays((*adt)[i], arrays);
+    }
+  } else {
+    arrays->push_back(Downcast<NDArray>(obj));
+  }
+}
+
 PackedFunc VirtualMachine::GetFunction(const std::string& name,
                                        const ObjectPtr<Object>& sptr_to_self) {
   if (name == "invoke") {
@@ -120,7 +164,7 @@ PackedFunc VirtualMachine::GetFunction(const std::string& name,
       auto git = exec_->global_map.find(func_name);
       ICHECK(git != exec_->global_map.end())
           << "Cannot find function " << func_name << " in the executable";
-      auto func = exec_->functions[git->second];
+      const auto& func = exec_->functions[git->second];
       if (func.params.empty()) {
         *rv = Invoke(func, {});
       } else {
@@ -169,6 +213,31 @@ PackedFunc VirtualMachine::GetFunction(const std::string& name,
       inputs_.erase(func_name);
       inputs_.emplace(func_name, func_args);
     });
+  } else if (name == "set_shape_cache") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      int64_t capacity = args[0];
+      ICHECK_GE(capacity, 0) << "The shape cache capacity must be non-negative";
+      this->SetShapeCache(static_cast<size_t>(capacity));
+    });
+  } else if (name == "get_shape_cache_stat") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      std::string key = args[0];
+      if (key == "hits") {
+        *rv = shape_cache_stats_.hits;
+      } else if (key == "misses") {
+        *rv = shape_cache_stats_.misses;
+      } else if (key == "evictions") {
+        *rv = shape_cache_stats_.evictions;
+      } else if (key == "shape_func_hits") {
+        *rv = shape_cache_stats_.shape_func_hits;
+      } else if (key == "shape_func_misses") {
+        *rv = shape_cache_stats_.shape_func_misses;
+      } else if (key == "storage_reuses") {
+        *rv = shape_cache_stats_.storage_reuses;
+      } else {
+        LOG(FATAL) << "Unknown shape cache stat: " << key;
+      }
+    });
   } else {
     LOG(FATAL) << "Unknown packed function: " << name;
     return PackedFunc([sptr_to_self, name](TVMArgs args, TVMRetValue* rv) {});
@@ -216,8 +285,10 @@ void VirtualMachine::InvokeGlobal(const VMFunction& func, const std::vector<Obje
 ObjectRef VirtualMachine::Invoke(const VMFunction& func, const std::vector<ObjectRef>& args) {
   DLOG(INFO) << "Executing Function: " << std::endl << func;
 
+  shape_cache_entry_ = shape_cache_capacity_ > 0 ? LookupShapeCache(func, args) : nullptr;
   InvokeGlobal(func, args);
   RunLoop();
+  shape_cache_entry_ = nullptr;
   return return_register_;
 }
 
@@ -275,6 +346,124 @@ void VirtualMachine::InvokePacked(Index packed_index, const PackedFunc& func, In
   }
 }
 
+void VirtualMachine::SetShapeCache(size_t capacity) {
+  shape_cache_capacity_ = capacity;
+  shape_cache_entry_ = nullptr;
+  while (shape_cache_.size() > capacity) {
+    shape_cache_index_.erase(shape_cache_.back().first);
+    shape_cache_.pop_back();
+    shape_cache_stats_.evictions++;
+  }
+}
+
+ShapeCacheEntry* VirtualMachine::LookupShapeCache(const VMFunction& func,
+                                                  const std::vector<ObjectRef>& args) {
+  std::ostringstream os;
+  os << func.name;
+  for (const auto& arg : args) {
+    os << ";";
+    AppendSignature(arg, &os);
+  }
+  std::string signature = os.str();
+
+  auto it = shape_cache_index_.find(signature);
+  if (it != shape_cache_index_.end()) {
+    shape_cache_stats_.hits++;
+    shape_cache_.splice(shape_cache_.begin(), shape_cache_, it->second);
+    return &it->second->second;
+  }
+  shape_cache_stats_.misses++;
+  shape_cache_.emplace_front(signature, ShapeCacheEntry());
+  shape_cache_index_[signature] = shape_cache_.begin();
+  while (shape_cache_.size() > shape_cache_capacity_) {
+    shape_cache_index_.erase(shape_cache_.back().first);
+    shape_cache_.pop_back();
+    shape_cache_stats_.evictions++;
+  }
+  return &shape_cache_.front().second;
+}
+
+void VirtualMachine::InvokeShapeFunc(Index packed_index, const PackedFunc& func, Index arg_count,
+                                     Index output_size, const std::vector<ObjectRef>& args) {
+  std::vector<NDArray> inputs;
+  std::vector<NDArray> outputs;
+  for (Index i = 0; i < arg_count; i++) {
+    FlattenNDArrays(args[i], i < arg_count - output_size ? &inputs : &outputs);
+  }
+  // Shape functions are pure and run on the host, so they are keyed by the
+  // values of their inputs. Large data dependent inputs are not memoized.
+  std::string key(reinterpret_cast<const char*>(&packed_index), sizeof(packed_index));
+  bool memoize = true;
+  for (const NDArray& input : inputs) {
+    size_t nbytes = GetDataSize(*input.operator->());
+    if (input->ctx.device_type != kDLCPU || !input.IsContiguous() ||
+        key.size() + nbytes > kMaxShapeFuncKeyBytes) {
+      memoize = false;
+      break;
+    }
+    key.append(reinterpret_cast<const char*>(&input->dtype), sizeof(DLDataType));
+    key.append(reinterpret_cast<const char*>(&input->ndim), sizeof(input->ndim));
+    key.append(reinterpret_cast<const char*>(input->shape), input->ndim * sizeof(int64_t));
+    key.append(static_cast<const char*>(input->data) + input->byte_offset, nbytes);
+  }
+
+  auto& memo = shape_cache_entry_->shape_func_outputs;
+  if (memoize) {
+    auto it = memo.find(key);
+    if (it != memo.end()) {
+      ICHECK_EQ(it->second.size(), outputs.size());
+      for (size_t i = 0; i < outputs.size(); ++i) {
+        outputs[i].CopyFrom(it->second[i]);
+      }
+      shape_cache_stats_.shape_func_hits++;
+      return;
+    }
+  }
+  shape_cache_stats_.shape_func_misses++;
+  InvokePacked(packed_index, func, arg_count, output_size, args);
+  if (memoize && memo.size() < kMaxShapeFuncOutputs) {
+    std::vector<NDArray> copies;
+    for (const NDArray& output : outputs) {
+      copies.push_back(output.CopyTo({kDLCPU, 0}));
+    }
+    memo.emplace(key, std::move(copies));
+  }
+}
+
+Storage VirtualMachine::AllocStorage(const Instruction& instr) {
+  auto size = LoadScalarInt(instr.alloc_storage.allocation_size);
+  auto alignment = instr.alloc_storage.alignment;
+
+  DLOG(INFO) << "AllocStorage: allocation_size=" << size << ", alignment=" << alignment
+             << ", dtype_hint=" << DLDataType2String(instr.alloc_storage.dtype_hint)
+             << ", device_type=" << instr.alloc_storage.device_type;
+
+  std::vector<std::pair<int64_t, Storage>>* memo = nullptr;
+  if (shape_cache_entry_ != nullptr) {
+    memo = &shape_cache_entry_->storages[&instr];
+    for (const auto& kv : *memo) {
+      // Only the cache refers to a storage once all the tensors allocated from it are dead.
+      if (kv.first == size && kv.second.use_count() == 1) {
+        shape_cache_stats_.storage_reuses++;
+        return kv.second;
+      }
+    }
+  }
+
+  auto storage_obj = SimpleObjAllocator().make_object<StorageObj>();
+  auto dev_type = instr.alloc_storage.device_type;
+  ICHECK_LT(static_cast<size_t>(dev_type), allocators_.size())
+      << "Memory allocator for device " << dev_type << " has not been initialized";
+  auto* alloc = allocators_[dev_type];
+  ICHECK(alloc) << "Did you forget to init the VirtualMachine with contexts?";
+  storage_obj->buffer = alloc->Alloc(size, alignment, instr.alloc_storage.dtype_hint);
+  Storage storage(storage_obj);
+  if (memo != nullptr && memo->size() < kMaxMemoizedStorages) {
+    memo->emplace_back(size, storage);
+  }
+  return storage;
+}
+
 void VirtualMachine::LoadExecutable(const Executable* exec) {
   ICHECK(exec) << "The executable is not created yet.";
   exec_ = exec;
@@ -293,6 +482,11 @@ void VirtualMachine::LoadExecutable(const Executable* exec) {
     tvm::runtime::PackedFunc pf = lib.GetFunction(packed_name, true);
     ICHECK(pf != nullptr) << "Cannot find function in module: " << packed_name;
     packed_funcs_[packed_index] = pf;
+    // The compile engine names the lowered shape functions shape_func_*.
+    if (is_shape_func_.size() <= packed_index) {
+      is_shape_func_.resize(packed_index + 1, false);
+    }
+    is_shape_func_[packed_index] = packed_name.rfind("shape_func", 0) == 0;
   }
   for (size_t i = 0; i < packed_funcs_.size(); ++i) {
     ICHECK(packed_funcs_[i] != nullptr) << "Packed function " << i << " is not initialized";
@@ -423,7 +617,11 @@ void VirtualMachine::RunLoop() {
 
         // We no longer need to write the registers back, we write directly
         // through the registers mutably.
-        InvokePacked(instr.packed_index, func, arity, instr.output_size, args);
+        if (shape_cache_entry_ != nullptr && is_shape_func_[instr.packed_index]) {
+          InvokeShapeFunc(instr.packed_index, func, arity, instr.output_size, args);
+        } else {
+          InvokePacked(instr.packed_index, func, arity, instr.output_size, args);
+        }
         pc_++;
         goto main_loop;
       }
@@ -528,22 +726,7 @@ void VirtualMachine::RunLoop() {
         goto main_loop;
       }
       case Opcode::AllocStorage: {
-        auto size = LoadScalarInt(instr.alloc_storage.allocation_size);
-        auto alignment = instr.alloc_storage.alignment;
-
-        DLOG(INFO) << "AllocStorage: allocation_size=" << size << ", alignment=" << alignment
-                   << ", dtype_hint=" << DLDataType2String(instr.alloc_storage.dtype_hint)
-                   << ", device_type=" << instr.alloc_storage.device_type;
-
-        auto storage_obj = SimpleObjAllocator().make_object<StorageObj>();
-        auto dev_type = instr.alloc_storage.device_type;
-        ICHECK_LT(static_cast<size_t>(dev_type), allocators_.size())
-            << "Memory allocator for device " << dev_type << " has not been initialized";
-        auto* alloc = allocators_[dev_type];
-        ICHECK(alloc) << "Did you forget to init the VirtualMachine with contexts?";
-        storage_obj->buffer = alloc->Alloc(size, alignment, instr.alloc_storage.dtype_hint);
-        Storage storage(storage_obj);
-        WriteRegister(instr.dst, storage);
+        WriteRegister(instr.dst, AllocStorage(instr));
         pc_++;
         goto main_loop;
       }
@@ -90,22 +90,28 @@ IRModule PrimFuncPassNode::operator()(IRModule mod, const PassContext& pass_ctx)
   const PassInfo& pass_info = Info();
   ICHECK(mod.defined());
   pass_ctx.Trace(mod, pass_info, true);
+  pass_ctx.InstrumentBeforePass(mod, pass_info);
   std::vector<ObjectRef> deleted_list;
   IRModuleNode* mod_ptr = mod.CopyOnWrite();
   auto* func_dict = mod_ptr->functions.CopyOnWrite();
-  // directly loop over the underlying dict
-  for (auto& kv : *func_dict) {
-    // only picks up tir::PrimFunc
-    if (kv.second->IsInstance<PrimFuncNode>()) {
-      // move out the function so that it is the only copy.
-      PrimFunc func = Downcast<PrimFunc>(std::move(kv.second));
-      func = pass_func(std::move(func), mod, pass_ctx);
-      kv.second = std::move(func);
-
-      if (!kv.second.defined()) {
-        deleted_list.push_back(kv.first);
+  try {
+    // directly loop over the underlying dict
+    for (auto& kv : *func_dict) {
+      // only picks up tir::PrimFunc
+      if (kv.second->IsInstance<PrimFuncNode>()) {
+        // move out the function so that it is the only copy.
+        PrimFunc func = Downcast<PrimFunc>(std::move(kv.second));
+        func = pass_func(std::move(func), mod, pass_ctx);
+        kv.second = std::move(func);
+
+        if (!kv.second.defined()) {
+          deleted_list.push_back(kv.first);
+        }
       }
     }
+  } catch (const std::exception& e) {
+    pass_ctx.InstrumentOnException(pass_info, e.what());
+    throw;
   }
 
   // automatic removal of None
@@ -113,6 +119,7 @@ IRModule PrimFuncPassNode::operator()(IRModule mod, const PassContext& pass_ctx)
     func_dict->erase(gv);
   }
   pass_ctx.Trace(mod, pass_info, false);
+  pass_ctx.InstrumentAfterPass(mod, pass_info);
   return mod;
 }
 
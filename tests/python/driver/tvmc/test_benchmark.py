@@ -0,0 +1,66 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pytest
+
+from tvm.driver import tvmc
+
+
+def test_compute_statistics():
+    sut = tvmc.benchmark.compute_statistics([0.001 * i for i in range(1, 101)])
+
+    assert sut["min"] == pytest.approx(1.0)
+    assert sut["max"] == pytest.approx(100.0)
+    assert sut["p50"] == pytest.approx(50.5)
+    assert sut["p99"] == pytest.approx(99.01)
+
+
+def test_compute_statistics__empty():
+    with pytest.raises(tvmc.common.TVMCException):
+        tvmc.benchmark.compute_statistics([])
+
+
+def test_format_report__contains_percentiles():
+    stats = tvmc.benchmark.compute_statistics([0.01, 0.02, 0.03])
+    report = {"concurrency": 1, "iterations": 3, "latency_ms": stats, "throughput": 50.0}
+    sut = tvmc.benchmark.format_report(report)
+
+    assert "p99 (ms)" in sut
+    assert "runs/s" in sut
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_benchmark_tflite_module(tflite_compiled_module_as_tarfile, concurrency):
+    # some CI environments wont offer TFLite, so skip in case it is not present
+    pytest.importorskip("tflite")
+
+    report = tvmc.benchmark.benchmark_module(
+        tflite_compiled_module_as_tarfile,
+        device="cpu",
+        warmup=1,
+        iterations=5,
+        concurrency=concurrency,
+    )
+
+    assert report["iterations"] == 5 * concurrency
+    assert len(report["instances"]) == concurrency
+    assert report["throughput"] > 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+
+
+def test_benchmark_module__invalid_concurrency():
+    with pytest.raises(tvmc.common.TVMCException):
+        tvmc.benchmark.benchmark_module("model.tar", concurrency=0)
@@ -3111,7 +3111,7 @@ def test_max_roi_pool():
 def verify_lppool(x_shape, kernel_shape, p, strides, pads, out_shape, auto_pad="NOTSET"):
     kwargs = {}
     if p is not None:
-        kwargs['p'] = p
+        kwargs["p"] = p
 
     if pads is None:
         pool_node = helper.make_node(
@@ -3219,7 +3219,7 @@ def test_lppool():
         out_shape=[1, 1, 16, 16, 16],
         auto_pad="SAME_UPPER",
     )
-    
+
     # Pool2D with empty p
     verify_lppool(
         x_shape=[1, 1, 32, 32],
@@ -4162,6 +4162,36 @@ def test_softplus():
     verify_softplus(input_data)
 
 
+def test_external_data():
+    import os
+    import tempfile
+
+    weight = np.random.uniform(size=(4, 16)).astype("float32")
+    node = helper.make_node("Add", inputs=["X", "W"], outputs=["Y"])
+    graph = helper.make_graph(
+        [node],
+        "external_data_test",
+        inputs=[helper.make_tensor_value_info("X", TensorProto.FLOAT, [4, 16])],
+        outputs=[helper.make_tensor_value_info("Y", TensorProto.FLOAT, [4, 16])],
+        initializer=[numpy_helper.from_array(weight, "W")],
+    )
+    model = helper.make_model(graph, producer_name="external_data_test")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.onnx")
+        onnx.save_model(
+            model, path, save_as_external_data=True, location="weights.bin", size_threshold=0
+        )
+        model = onnx.load(path, load_external_data=False)
+        assert model.graph.initializer[0].data_location == TensorProto.EXTERNAL
+        mod, params = relay.frontend.from_onnx(model, {"X": (4, 16)}, external_data_dir=tmp)
+        tvm.testing.assert_allclose(params["W"].asnumpy(), weight)
+
+        data = np.random.uniform(size=(4, 16)).astype("float32")
+        result = relay.create_executor("graph", mod=mod).evaluate()(data, **params)
+        tvm.testing.assert_allclose(result.asnumpy(), data + weight)
+
+
 if __name__ == "__main__":
     test_flatten()
     test_reshape()
@@ -4241,3 +4271,4 @@ if __name__ == "__main__":
     test_size()
     test_maxunpool()
     test_softplus()
+    test_external_data()
@@ -23,6 +23,7 @@ from tvm import autotvm
 from tvm import topi
 from tvm.relay.testing import run_infer_type
 from tvm.relay.testing.temp_op_attr import TempOpAttr
+from tvm.contrib import graph_runtime, utils
 import tvm.testing
 
 
@@ -194,6 +195,77 @@ def test_compile_engine():
     engine.dump()
 
 
+@tvm.testing.requires_llvm
+def test_compile_engine_kernel_cache():
+    engine = relay.backend.compile_engine.get()
+    x = relay.var("x", shape=(10,))
+    y = relay.nn.relu(relay.add(x, x))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.exp(y) + y))
+    temp = utils.tempdir()
+    config = {"relay.backend.kernel_cache_dir": temp.relpath("kernels")}
+
+    x_np = np.arange(-5, 5).astype("float32")
+    expected = np.maximum(x_np * 2, 0)
+    expected = np.exp(expected) + expected
+
+    def check(lib):
+        rt_mod = graph_runtime.GraphModule(lib["default"](tvm.cpu()))
+        rt_mod.set_input("x", x_np)
+        rt_mod.run()
+        tvm.testing.assert_allclose(rt_mod.get_output(0).asnumpy(), expected, rtol=1e-5)
+
+    with tvm.transform.PassContext(opt_level=3, config=config):
+        cache = relay.backend.kernel_cache.KernelCache.current()
+        for _ in range(2):
+            engine.clear()
+            lib = relay.build(mod, "llvm")
+            check(lib)
+        num_kernels = len(cache.entries())
+        assert num_kernels > 0
+        assert cache.misses == num_kernels
+        assert cache.hits == num_kernels
+        # the kernels kept in memory are not scheduled or lowered again
+        check(relay.build(mod, "llvm"))
+        assert cache.hits == 2 * num_kernels
+        vm_exec = relay.vm.compile(mod, "llvm")
+        res = relay.vm.VirtualMachine(vm_exec, tvm.cpu()).run(x_np)
+        tvm.testing.assert_allclose(res.asnumpy(), expected, rtol=1e-5)
+
+    # the cached kernels are linked into the exported library
+    path_lib = temp.relpath("deploy_lib.so")
+    lib.export_library(path_lib)
+    check(tvm.runtime.load_module(path_lib))
+
+    # a kernel built under other tuning records is not reused
+    misses = cache.misses
+    with tvm.transform.PassContext(opt_level=3, config=config):
+        with autotvm.apply_history_best([]):
+            engine.clear()
+            relay.build(mod, "llvm")
+    assert cache.misses == misses + num_kernels
+
+    f = relay.Function([x], y)
+    f = run_infer_type(f)
+    f = f.with_attr("Primitive", tvm.tir.IntImm("int32", 1))
+    with tvm.transform.PassContext(config=config):
+        engine.clear()
+        jited = engine.jit(f, "llvm")
+        misses = cache.misses
+        engine.clear()
+        assert engine.jit(f, "llvm")
+        assert cache.misses == misses
+    y_nd = tvm.nd.empty((10,))
+    jited(tvm.nd.array(x_np), y_nd)
+    tvm.testing.assert_allclose(y_nd.asnumpy(), np.maximum(x_np * 2, 0))
+
+    # nothing is looked up without a kernel cache
+    lookups = cache.hits + cache.misses
+    engine.clear()
+    relay.build(mod, "llvm")
+    assert cache.hits + cache.misses == lookups
+    engine.clear()
+
+
 def test_compile_placeholder_bypass():
     engine = relay.backend.compile_engine.get()
     x = relay.var("x", shape=(2, 3))
@@ -263,6 +335,7 @@ if __name__ == "__main__":
     test_get_valid_implementations()
     test_select_implementation()
     test_compile_engine()
+    test_compile_engine_kernel_cache()
     test_compile_placeholder_bypass()
     test_compile_injective_with_tuple()
     test_compile_tuple_dup()
@@ -20,6 +20,7 @@ import tvm
 from tvm import relay
 from tvm.contrib import graph_runtime
 from tvm.relay.op import add
+from tvm.relay.backend.graph_runtime_codegen import memory_plan_report
 import tvm.testing
 
 # @tq, @jr should we put this in testing ns?
@@ -146,6 +147,74 @@ def test_plan_memory():
     assert len(device_types) == 1
 
 
+def test_plan_memory_planners():
+    # the intermediate tensors shrink then grow again, so sizes can be mixed
+    x = relay.var("x", shape=(64, 64))
+    y = relay.nn.relu(x)
+    small = relay.sum(y, axis=1, keepdims=True)
+    small = relay.exp(small)
+    y = relay.exp(y * small)
+    y = relay.nn.relu(y)
+    y = relay.exp(y)
+    func = relay.Function([x], y)
+    x_data = np.random.uniform(-0.01, 0.01, size=(64, 64)).astype("float32")
+
+    totals = {}
+    for planner in ["token_reuse", "size_class", "best_fit"]:
+        with tvm.transform.PassContext(
+            opt_level=0, config={"relay.GraphPlanMemory.planner": planner}
+        ):
+            graph, lib, _ = relay.build(tvm.IRModule.from_expr(func), "llvm")
+        report = memory_plan_report(graph)
+        totals[planner] = report["total_bytes"]
+
+        # tensors sharing a storage are never alive at the same time
+        by_storage = {}
+        for tensor in report["tensors"]:
+            assert tensor["size"] <= report["storage_sizes"][tensor["storage_id"]]
+            by_storage.setdefault(tensor["storage_id"], []).append(tensor["lifetime"])
+        for lifetimes in by_storage.values():
+            lifetimes.sort()
+            for prev, cur in zip(lifetimes, lifetimes[1:]):
+                assert prev[1] < cur[0]
+        assert report["total_bytes"] == sum(report["storage_sizes"].values())
+
+        mod = graph_runtime.create(graph, lib, ctx=tvm.cpu(0))
+        mod.set_input(x=x_data)
+        mod.run()
+        y_data = np.maximum(x_data, 0)
+        y_data = np.exp(y_data * np.exp(np.sum(y_data, axis=1, keepdims=True)))
+        ref = np.exp(np.maximum(y_data, 0))
+        tvm.testing.assert_allclose(mod.get_output(0).asnumpy(), ref, rtol=1e-5, atol=1e-5)
+
+    # best fit shares the large buffers and packs a small temporary with them
+    assert totals["best_fit"] <= totals["token_reuse"]
+    assert totals["best_fit"] < 5 * 64 * 64 * 4
+
+
+def test_memory_plan_report():
+    x = relay.var("x", shape=(10,))
+    z = relay.exp(relay.exp(relay.exp(x)))
+    func = relay.Function([x], z)
+    with tvm.transform.PassContext(opt_level=0):
+        graph, _, _ = relay.build(tvm.IRModule.from_expr(func), "llvm")
+    report = memory_plan_report(graph)
+
+    names = [tensor["name"] for tensor in report["tensors"]]
+    assert names[0] == "x"
+    assert len(names) == 4
+    last_node = len(names) - 1
+    assert report["tensors"][0]["lifetime"] == (0, last_node)
+    assert report["tensors"][1]["lifetime"] == (1, 2)
+    assert report["tensors"][-1]["lifetime"] == (last_node, last_node)
+    assert all(tensor["size"] == 40 for tensor in report["tensors"])
+    # the input and two alternating temporaries, the output reuses the first one
+    assert len(report["storage_sizes"]) == 3
+    assert report["total_bytes"] == 120
+    offsets = sorted(set(tensor["offset"] for tensor in report["tensors"]))
+    assert offsets == [0, 40, 80]
+
+
 @tvm.testing.uses_gpu
 def test_gru_like():
     def unit(rnn_dim):
@@ -211,6 +280,8 @@ def test_compile_nested_tuples():
 
 if __name__ == "__main__":
     test_plan_memory()
+    test_plan_memory_planners()
+    test_memory_plan_report()
     test_with_params()
     test_add_op_scalar()
     test_add_op_tensor()
@@ -0,0 +1,129 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.relay import create_executor
+from tvm.relay.backend.numpy_executor import NumPyExecutor
+from tvm.relay.prelude import Prelude
+
+
+def check_against_debug(mod, *args, rtol=1e-5):
+    expected = create_executor("debug", mod=mod).evaluate()(*args)
+    result = create_executor("numpy", mod=mod).evaluate()(*args)
+    tvm.testing.assert_allclose(result.asnumpy(), expected.asnumpy(), rtol=rtol, atol=rtol)
+    return result
+
+
+def test_numpy_ops():
+    x = relay.var("x", shape=(2, 3, 8, 8))
+    w = relay.var("w", shape=(4, 3, 3, 3))
+    d = relay.var("d", shape=(4, 5, 8))
+    y = relay.nn.conv2d(x, w, padding=(1, 1), strides=(2, 2))
+    y = relay.nn.relu(relay.nn.bias_add(y, relay.const(np.ones(4, "float32"))))
+    y = relay.reshape(relay.nn.global_avg_pool2d(y), (2, 4))
+    y = relay.nn.softmax(relay.nn.dense(y, relay.transpose(relay.sum(d, axis=2))))
+    y = relay.cast(relay.argmax(y, axis=1), "float32") + relay.mean(y, axis=[1])
+    mod = tvm.IRModule.from_expr(relay.Function([x, w, d], y))
+    args = [np.random.uniform(size=v.type_annotation.concrete_shape) for v in [x, w, d]]
+    check_against_debug(mod, *[a.astype("float32") for a in args])
+
+
+def test_tvm_kernel_fallback():
+    x = relay.var("x", shape=(1, 2, 9, 9))
+    y = relay.nn.max_pool2d(relay.exp(x), pool_size=(3, 3), strides=(2, 2), ceil_mode=True)
+    z = relay.split(relay.divide(y, relay.const(2.0)), 2, axis=1)
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.Tuple([z[1], z[0] + z[1]])))
+    x_np = np.random.uniform(size=(1, 2, 9, 9)).astype("float32")
+    expected = create_executor("debug", mod=mod).evaluate()(x_np)
+    result = create_executor("numpy", mod=mod).evaluate()(x_np)
+    assert len(result) == 2
+    for res, exp in zip(result, expected):
+        tvm.testing.assert_allclose(res.asnumpy(), exp.asnumpy(), rtol=1e-5)
+
+    # integer division has no NumPy implementation and runs a TVM kernel
+    a = relay.var("a", shape=(5,), dtype="int32")
+    mod = tvm.IRModule.from_expr(relay.Function([a], relay.divide(a, relay.const(-2))))
+    a_np = np.array([-5, -3, 0, 3, 5], "int32")
+    check_against_debug(mod, a_np)
+
+
+def test_control_flow():
+    # sum of 0..n with a recursive local function
+    n = relay.var("n", shape=(), dtype="int32")
+    i = relay.var("i", shape=(), dtype="int32")
+    acc = relay.var("acc", shape=(), dtype="int32")
+    loop = relay.var("loop")
+    body = relay.If(
+        relay.greater(i, relay.const(0)),
+        loop(relay.subtract(i, relay.const(1)), relay.add(acc, i)),
+        acc,
+    )
+    func = relay.Function([i, acc], body, relay.TensorType((), "int32"))
+    sum_to = relay.Let(loop, func, loop(n, relay.const(0)))
+    mod = tvm.IRModule.from_expr(relay.Function([n], sum_to))
+    result = create_executor("numpy", mod=mod).evaluate()(np.array(100, "int32"))
+    assert result.asnumpy() == 5050
+
+    # references
+    r = relay.var("r")
+    sb = relay.ScopeBuilder()
+    sb.let(r, relay.RefCreate(relay.const(1.0)))
+    sb.let(relay.var("_"), relay.RefWrite(r, relay.add(relay.RefRead(r), relay.const(2.0))))
+    sb.ret(relay.RefRead(r))
+    result = create_executor("numpy").evaluate(sb.get())
+    assert result.asnumpy() == 3.0
+
+
+def test_adt():
+    mod = tvm.IRModule()
+    p = Prelude(mod)
+    _, cons, nil = mod.get_type("List")
+    x = relay.var("x", shape=(2,))
+    double = relay.Function([x], x * relay.const(2.0))
+    xs = cons(
+        relay.const(np.ones(2, "float32")),
+        cons(relay.const(np.arange(2.0, dtype="float32")), nil()),
+    )
+    mod["main"] = relay.Function([], relay.Tuple([p.length(p.map(double, xs)), p.map(double, xs)]))
+    length, doubled = create_executor("numpy", mod=mod).evaluate()()
+    assert length.asnumpy() == 2
+    assert doubled.constructor.name_hint == "Cons"
+    tvm.testing.assert_allclose(doubled.fields[0].asnumpy(), [2.0, 2.0])
+    tvm.testing.assert_allclose(doubled.fields[1].fields[0].asnumpy(), [0.0, 2.0])
+
+    # the closures returned by main are Python functions over NumPy arrays
+    mod["main"] = relay.Function([], p.iterate(double, relay.const(3)))
+    func = create_executor("numpy", mod=mod).evaluate()()
+    tvm.testing.assert_allclose(func(np.ones(2, "float32")), [8.0, 8.0])
+
+
+def test_program_source():
+    x = relay.var("x", shape=(3,))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.nn.relu(relay.log(x))))
+    main, source = NumPyExecutor(mod, tvm.cpu(0), tvm.target.Target("llvm")).compile()
+    assert "def main" in source and "_nn_relu" in source and "_log" in source
+    tvm.testing.assert_allclose(main(np.array([0.5, 1.0, 2.0], "float32")), [0, 0, np.log(2.0)])
+
+
+if __name__ == "__main__":
+    test_numpy_ops()
+    test_tvm_kernel_fallback()
+    test_control_flow()
+    test_adt()
+    test_program_source()
@@ -682,6 +682,60 @@ def test_rewrite_func():
     assert sub_pattern.match(out)
 
 
+def test_rewrite_stats():
+    x = relay.var("x")
+    y = relay.var("y")
+
+    class AddToSubtract(DFPatternCallback):
+        def __init__(self):
+            super(AddToSubtract, self).__init__()
+            self.pattern = is_op("add")(wildcard(), wildcard())
+
+        def callback(self, pre, post, node_map):
+            return post.args[0] - post.args[1]
+
+    class KeepMultiply(DFPatternCallback):
+        def __init__(self):
+            super(KeepMultiply, self).__init__()
+            self.pattern = is_op("multiply")(wildcard(), wildcard())
+
+        def callback(self, pre, post, node_map):
+            return post
+
+    add_to_subtract = AddToSubtract()
+    keep_multiply = KeepMultiply()
+    stats = {}
+    out = rewrite([add_to_subtract, keep_multiply], (x + y) * (x + x), stats=stats)
+    assert tvm.ir.structural_equal(out, (x - y) * (x - x))
+    assert stats[add_to_subtract].calls == 2
+    assert stats[add_to_subtract].rewrites == 2
+    # the multiply is matched once, after its inputs are rewritten
+    assert stats[keep_multiply].calls == 1
+    assert stats[keep_multiply].rewrites == 0
+    assert stats[keep_multiply].seconds >= 0
+
+
+def test_rewrite_many_callbacks():
+    x = relay.var("x")
+    y = relay.var("y")
+
+    class Rename(DFPatternCallback):
+        def __init__(self, src, dst):
+            super(Rename, self).__init__()
+            self.pattern = is_op(src)(wildcard(), wildcard())
+            self.dst = dst
+
+        def callback(self, pre, post, node_map):
+            return relay.Call(relay.op.get(self.dst), post.args)
+
+    # more than 100 callbacks, the last one enabling the first one
+    callbacks = [Rename("add", "subtract")]
+    callbacks += [Rename("power", "mod") for _ in range(100)]
+    callbacks += [Rename("multiply", "add")]
+    out = rewrite(callbacks, x * y)
+    assert tvm.ir.structural_equal(out, x - y)
+
+
 def test_nested_rewrite():
     class PatternCallback(DFPatternCallback):
         def __init__(self, pattern):
@@ -1512,3 +1566,5 @@ if __name__ == "__main__":
     test_partition_option()
     test_match_match()
     test_partition_constant_embedding()
+    test_rewrite_stats()
+    test_rewrite_many_callbacks()
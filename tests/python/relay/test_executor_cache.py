@@ -0,0 +1,116 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.relay.backend.executor_cache import ExecutorCache, executor_cache
+
+
+@pytest.fixture(autouse=True)
+def enable_cache():
+    """The cache is disabled by default."""
+    capacity = executor_cache.capacity
+    executor_cache.capacity = 16
+    executor_cache.clear()
+    yield
+    executor_cache.capacity = capacity
+    executor_cache.clear()
+
+
+def make_func(shape=(4, 8)):
+    """A new function each time, structurally equal for the same shape."""
+    x = relay.var("x", shape=shape)
+    y = relay.var("y", shape=shape)
+    return relay.Function([x, y], relay.nn.relu(x + y))
+
+
+@pytest.mark.parametrize("kind", ["debug", "graph", "vm"])
+def test_reuse_across_executors(kind):
+    x = np.random.uniform(-1, 1, size=(4, 8)).astype("float32")
+    y = np.random.uniform(-1, 1, size=(4, 8)).astype("float32")
+    for i in range(3):
+        mod = tvm.IRModule.from_expr(make_func())
+        result = relay.create_executor(kind, mod=mod).evaluate()(x, y)
+        tvm.testing.assert_allclose(result.asnumpy(), np.maximum(x + y, 0))
+        assert len(executor_cache) == 1
+        assert executor_cache.hits == i
+    # new arguments reuse the entry
+    result = relay.create_executor(kind, mod=tvm.IRModule.from_expr(make_func())).evaluate()(y, x)
+    tvm.testing.assert_allclose(result.asnumpy(), np.maximum(x + y, 0))
+    assert executor_cache.hits == 3
+
+
+def test_interpreter_bound_arguments():
+    x = np.ones((4, 8), "float32")
+    intrp = relay.create_executor("debug")
+    for _ in range(2):
+        result = intrp.evaluate(make_func())(x, x)
+        tvm.testing.assert_allclose(result.asnumpy(), 2 * x)
+    assert executor_cache.hits == 1
+    # the arguments of an evaluated function are bound into main and keyed on
+    result = intrp.evaluate(make_func())(x, 2 * x)
+    tvm.testing.assert_allclose(result.asnumpy(), 3 * x)
+    assert executor_cache.hits == 1 and len(executor_cache) == 2
+
+
+def test_key_options():
+    x = np.ones((2, 2), "float32")
+    for shape, opt_level in [((4, 8), 2), ((2, 2), 2), ((2, 2), 3)]:
+        with tvm.transform.PassContext(opt_level=opt_level):
+            relay.create_executor("graph").evaluate(make_func(shape))
+    assert executor_cache.hits == 0 and len(executor_cache) == 3
+
+    with tvm.transform.PassContext(opt_level=3):
+        func = relay.create_executor("graph").evaluate(make_func((2, 2)))
+    tvm.testing.assert_allclose(func(x, x).asnumpy(), 2 * x)
+    assert executor_cache.hits == 1
+
+
+def test_key_contexts():
+    mod = tvm.IRModule.from_expr(make_func())
+    key = ExecutorCache.key("graph", mod, None)
+    with tvm.target.Target("llvm -mcpu=core-avx2"):
+        assert ExecutorCache.key("graph", mod, None) != key
+    with tvm.autotvm.apply_history_best([]):
+        assert ExecutorCache.key("graph", mod, None) != key
+    with tvm.auto_scheduler.ApplyHistoryBest([]):
+        assert ExecutorCache.key("graph", mod, None) != key
+    assert ExecutorCache.key("graph", mod, None) == key
+
+
+def test_eviction():
+    cache = ExecutorCache(2)
+    mods = [tvm.IRModule.from_expr(make_func((i + 1, 2))) for i in range(3)]
+    keys = [cache.key("graph", mod, "llvm") for mod in mods]
+    for key, mod in zip(keys, mods):
+        cache.put(key, mod, str(key))
+    assert len(cache) == 2
+    assert cache.get(keys[0], mods[0]) is None
+    assert cache.get(keys[2], mods[2]) == str(keys[2])
+    # a module with the key of another one is not a hit
+    assert cache.get(keys[1], mods[2]) is None
+
+    disabled = ExecutorCache(0)
+    disabled.put(keys[0], mods[0], "lib")
+    assert len(disabled) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
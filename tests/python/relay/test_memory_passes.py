@@ -19,6 +19,7 @@ from tvm import te
 import numpy as np
 from tvm import relay
 from tvm.relay import memory_alloc
+from tvm.relay.transform import memory_plan
 
 
 def check_memory_plan(func, check_fn):
@@ -115,7 +116,61 @@ def test_no_fuse():
     check_memory_plan(func, check_no_fuse)
 
 
+def test_plan_offsets():
+    # a and c are never alive at the same time, b overlaps with both
+    allocations = [("a", 64, (0, 2)), ("b", 32, (1, 4)), ("c", 64, (3, 5))]
+    for planner in ["greedy_by_size", "best_fit"]:
+        offsets, total = memory_plan.plan_offsets(allocations, planner)
+        assert offsets["a"] == offsets["c"]
+        assert total == 96
+
+    # best fit takes the smallest gap that fits, greedy the lowest one
+    allocations = [
+        ("a", 64, (0, 4)),
+        ("b", 16, (1, 9)),
+        ("c", 32, (2, 4)),
+        ("d", 16, (3, 9)),
+        ("e", 32, (5, 6)),
+    ]
+    offsets, _ = memory_plan.plan_offsets(allocations, "best_fit")
+    assert offsets["e"] == offsets["c"]
+    offsets, _ = memory_plan.plan_offsets(allocations, "greedy_by_size")
+    assert offsets["e"] == offsets["a"]
+
+
+def check_dense_chain(x, w):
+    for _ in range(4):
+        x = np.matmul(x, np.transpose(w))
+    return x
+
+
+def test_liveness_planning():
+    x = relay.var("x", shape=(4, 16))
+    w = relay.var("w", shape=(16, 16))
+    out = x
+    for _ in range(4):
+        out = relay.nn.dense(out, w)
+    func = relay.Function([x, w], out)
+    mod = tvm.IRModule.from_expr(func)
+    args = [np.random.rand(4, 16).astype("float32"), np.random.rand(16, 16).astype("float32")]
+
+    for planner in memory_plan.PLANNERS:
+        with tvm.transform.PassContext(opt_level=3, config={"relay.MemoryPlan.planner": planner}):
+            opt_mod, _ = relay.vm.VMCompiler().optimize(mod, "llvm")
+            res = relay.create_executor("vm", mod).evaluate()(*args)
+        np.testing.assert_allclose(res.asnumpy(), check_dense_chain(*args), rtol=1e-5)
+
+        attrs = opt_mod["main"].attrs
+        if planner == "naive":
+            assert attrs is None or "MemoryPlanNaiveBytes" not in attrs
+        else:
+            # the intermediate results die early and are overlapped
+            assert attrs["MemoryPlanPlannedBytes"] < attrs["MemoryPlanNaiveBytes"]
+
+
 if __name__ == "__main__":
     test_tyck_alloc_tensor()
     test_add()
     test_add_sub()
+    test_plan_offsets()
+    test_liveness_planning()
@@ -0,0 +1,141 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import tvm
+import tvm.relay
+from tvm import relay
+from tvm.relay import op, testing
+from tvm.ir.instrument import (
+    PassInstrument,
+    PassTimingInstrument,
+    PassNodeCountInstrument,
+    PassMemoryInstrument,
+)
+
+
+def get_test_model():
+    x, y, z = [tvm.relay.var(c, shape=(3, 4), dtype="float32") for c in "xyz"]
+    e1 = op.add(x, y)
+    e2 = op.subtract(x, z)
+    e3 = op.multiply(e1, e1 / e2)
+    return tvm.IRModule.from_expr(e3 + e2)
+
+
+class RecordEvents(PassInstrument):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def enter_pass_ctx(self):
+        self.events.append("enter")
+
+    def exit_pass_ctx(self):
+        self.events.append("exit")
+
+    def run_before_pass(self, mod, info):
+        self.events.append("before " + info.name)
+
+    def run_after_pass(self, mod, info):
+        self.events.append("after " + info.name)
+
+    def run_on_exception(self, info, what):
+        self.events.append("exception " + info.name)
+
+
+def test_instrument_hooks_order():
+    events = RecordEvents()
+    mod = get_test_model()
+    seq = tvm.transform.Sequential(
+        [relay.transform.InferType(), relay.transform.FoldConstant()], name="seq"
+    )
+    with tvm.transform.PassContext(opt_level=3, instruments=[events]):
+        seq(mod)
+    assert events.events[0] == "enter"
+    assert events.events[1] == "before seq"
+    assert "before InferType" in events.events
+    assert "after FoldConstant" in events.events
+    assert events.events[-2] == "after seq"
+    assert events.events[-1] == "exit"
+
+
+def test_instrument_on_exception():
+    events = RecordEvents()
+
+    @tvm.transform.module_pass(opt_level=0, name="Failing")
+    def failing_pass(mod, ctx):
+        raise RuntimeError("failing pass")
+
+    with tvm.transform.PassContext(instruments=[events]):
+        with pytest.raises(RuntimeError):
+            failing_pass(get_test_model())
+    assert "before Failing" in events.events
+    assert "exception Failing" in events.events
+    assert "after Failing" not in events.events
+
+
+def test_builtin_instruments():
+    timing = PassTimingInstrument()
+    node_count = PassNodeCountInstrument()
+    memory = PassMemoryInstrument()
+    data = relay.var("data", shape=(1, 3, 8, 8))
+    net = relay.nn.conv2d(data, relay.var("weight"), channels=4, kernel_size=(3, 3))
+    net = relay.nn.batch_norm(net, *[relay.var(n) for n in ["gamma", "beta", "mean", "var"]])
+    net = relay.nn.relu(net[0])
+    mod, params = testing.create_workload(relay.Function(relay.analysis.free_vars(net), net))
+    with tvm.transform.PassContext(opt_level=3, instruments=[timing, node_count, memory]):
+        relay.optimize(mod, target="llvm", params=params)
+
+    names = [profile.name for profile in timing.root.children]
+    assert names
+    for profile in timing.root.children:
+        assert profile.metrics["time_ms"] >= 0
+    assert any(p.metrics["nodes_after"] > 0 for p in node_count.root.children)
+    assert all("peak_rss_mb" in p.metrics for p in memory.root.children)
+
+    summary = timing.render()
+    assert "Time(ms)" in summary
+    assert "InferType" in summary
+    # nested passes are indented below their parent
+    assert any(line.startswith("  ") for line in summary.splitlines()[1:])
+
+
+def test_profile_reentered_context():
+    timing = PassTimingInstrument()
+    mod = get_test_model()
+    pass_ctx = tvm.transform.PassContext(instruments=[timing])
+    with pass_ctx:
+        mod = relay.transform.InferType()(mod)
+        # entering the context again keeps the profile collected so far
+        with pass_ctx:
+            relay.transform.FoldConstant()(mod)
+        # the interpreter runs its passes in the context without entering it
+        args = [np.ones((3, 4), "float32")] * 3
+        relay.create_executor("debug", mod=mod).evaluate()(*args)
+    names = [profile.name for profile in timing.root.children]
+    assert names[:2] == ["InferType", "FoldConstant"]
+
+
+def test_count_ir_nodes():
+    mod = get_test_model()
+    count = tvm.instrument.count_ir_nodes(mod)
+    larger = tvm.IRModule.from_expr(relay.nn.relu(mod["main"].body))
+    assert tvm.instrument.count_ir_nodes(larger) > count
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
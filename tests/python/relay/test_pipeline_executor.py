@@ -0,0 +1,118 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.contrib import graph_runtime, pipeline_executor
+from tvm.relay import testing
+
+
+def get_model():
+    """A model whose last stage uses a value of the first one, and a tuple."""
+    x = relay.var("x", shape=(4, 16))
+    w = relay.var("w", shape=(16, 16))
+    a = relay.nn.dense(x, w)
+    b = relay.nn.relu(a)
+    parts = relay.split(b, 2, axis=1)
+    c = relay.add(parts[0], parts[1])
+    d = relay.nn.dense(relay.concatenate([c, c], axis=1), w)
+    out = relay.Tuple([relay.add(d, a), c])
+    mod = tvm.IRModule.from_expr(relay.Function([x, w], out))
+    return mod, {"w": np.random.uniform(-1, 1, size=(16, 16)).astype("float32")}
+
+
+def run_graph(mod, params, inputs):
+    with tvm.transform.PassContext(opt_level=3):
+        lib = relay.build(mod, "llvm", params=params)
+    module = graph_runtime.GraphModule(lib["default"](tvm.cpu()))
+    module.run(**inputs)
+    return [module.get_output(i).asnumpy() for i in range(module.get_num_outputs())]
+
+
+@pytest.mark.parametrize("num_stages", [1, 2, 3])
+def test_partition(num_stages):
+    mod, params = get_model()
+    stages = pipeline_executor.partition(mod, num_stages=num_stages, params=params)
+    assert len(stages) == num_stages
+    assert stages[0].input_names == ["x"]
+    assert stages[-1].output_names is None
+    for prev, stage in zip(stages[:-1], stages[1:]):
+        produced = set(prev.output_names)
+        assert produced
+        for name in stage.input_names:
+            assert name == "x" or name.startswith("pipeline_")
+
+
+def test_split_points():
+    x = relay.var("x", shape=(8,))
+    a = relay.exp(x)
+    b = relay.log(a)
+    c = relay.sqrt(b)
+    mod = tvm.IRModule.from_expr(relay.Function([x], c))
+    stages = pipeline_executor.partition(mod, split_points=[a, b])
+    assert len(stages) == 3
+    assert stages[1].input_names == stages[0].output_names
+    with pytest.raises(ValueError):
+        pipeline_executor.partition(mod, split_points=[b, a])
+    with pytest.raises(ValueError):
+        pipeline_executor.partition(mod, split_points=[c])
+    with pytest.raises(ValueError):
+        pipeline_executor.partition(mod)
+
+
+def test_pipeline_outputs():
+    mod, params = get_model()
+    inputs = [{"x": np.random.uniform(-1, 1, size=(4, 16)).astype("float32")} for _ in range(8)]
+    expected = [run_graph(mod, params, x) for x in inputs]
+    with tvm.transform.PassContext(opt_level=3):
+        stages = pipeline_executor.build(mod, "llvm", num_stages=3, params=params)
+    with pipeline_executor.PipelineModule(stages, queue_size=1) as pipeline:
+        outputs = pipeline.run(inputs)
+        seq = pipeline.submit(inputs[0])
+        assert seq == len(inputs)
+        last = pipeline.get()
+        stats = pipeline.stage_stats()
+    for out, ref in zip(outputs + [last], expected + [expected[0]]):
+        assert len(out) == len(ref)
+        for o, r in zip(out, ref):
+            tvm.testing.assert_allclose(o.asnumpy(), r, rtol=1e-5, atol=1e-5)
+    assert len(stats) == 3
+    for stat in stats:
+        assert stat["runs"] == len(inputs) + 1
+        assert 0 <= stat["utilization"] <= 1
+
+
+def test_estimate_cost():
+    mod, params = testing.mobilenet.get_workload(batch_size=1)
+    mod = relay.transform.InferType()(mod)
+    costs = []
+    relay.analysis.post_order_visit(
+        mod["main"].body,
+        lambda n: costs.append(pipeline_executor.estimate_cost(n))
+        if isinstance(n, relay.Call)
+        else None,
+    )
+    assert min(costs) > 0
+    stages = pipeline_executor.partition(mod, num_stages=4, params=params)
+    assert len(stages) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
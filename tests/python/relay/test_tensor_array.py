@@ -781,5 +781,71 @@ def test_static_tensor_get_data():
     run("int32", [2, 3])
 
 
+def test_prelude_shared_definitions():
+    p0 = Prelude(tvm.IRModule())
+    p1 = Prelude(tvm.IRModule())
+    for name in ["nth", "map", "tensor_array_read_float32", "tensor_array_stack_int64"]:
+        assert p0.mod[name].same_as(p1.mod[name])
+    assert p0.mod.get_global_type_var("List").same_as(p1.mod.get_global_type_var("List"))
+
+    # the definitions are the ones parsed from the text prelude
+    mod = tvm.IRModule()
+    mod.import_from_std("prelude.rly")
+    parsed = Prelude(mod)
+    for get_vars in ["get_global_vars", "get_global_type_vars"]:
+        parsed_names = sorted(var.name_hint for var in getattr(parsed.mod, get_vars)())
+        cached_names = sorted(var.name_hint for var in getattr(p0.mod, get_vars)())
+        assert parsed_names == cached_names
+    assert hasattr(p0, "tensor_array_write_float32") and hasattr(p0, "nth")
+
+    # a second prelude of a module only binds its definitions
+    again = Prelude(p0.mod)
+    assert again.mod.get_global_type_var("List").same_as(p1.mod.get_global_type_var("List"))
+    assert again.nth.same_as(p0.nth)
+    assert hasattr(again, "tensor_array_write_float32")
+
+
+def test_prelude_disk_cache(tmpdir, monkeypatch):
+    from tvm.relay import prelude
+
+    monkeypatch.setenv("TVM_PRELUDE_CACHE_DIR", str(tmpdir))
+    monkeypatch.setattr(prelude, "_BASE_PRELUDE", None)
+    parsed = Prelude(tvm.IRModule()).mod
+    assert len(tmpdir.listdir()) == 1
+
+    monkeypatch.setattr(prelude, "_BASE_PRELUDE", None)
+    loaded = Prelude(tvm.IRModule()).mod
+    assert tvm.ir.structural_equal(parsed, loaded, map_free_vars=True)
+
+
+def test_static_tensor_array_shared_register():
+    dtype, shape = "float32", [2, 3]
+    modules = []
+    for _ in range(2):
+        mod = tvm.IRModule()
+        p = Prelude(mod)
+        StaticTensorArrayOps(p, dtype, shape).register()
+        modules.append((mod, p))
+    for name in ["tensor_array", "tensor_array_write", "tensor_array_stack"]:
+        f0 = modules[0][0][modules[0][1].get_global_var_static(name, dtype, shape)]
+        f1 = modules[1][0][modules[1][1].get_global_var_static(name, dtype, shape)]
+        assert f0.same_as(f1)
+
+    # the registered definitions run in the second module
+    mod, p = modules[1]
+    v0 = relay.var("v0")
+    v1 = relay.var("v1")
+    tensor_array = p.get_global_var_static("tensor_array", dtype, shape)
+    write_func = p.get_global_var_static("tensor_array_write", dtype, shape)
+    stack_func = p.get_global_var_static("tensor_array_stack", dtype, shape)
+    tensor = p.get_tensor_ctor_static("tensor_constructor", dtype, shape)
+    tensor_array0 = write_func(tensor_array(relay.const(2)), relay.const(0), tensor(v0))
+    tensor_array1 = write_func(tensor_array0, relay.const(1), tensor(v1))
+    mod["main"] = relay.Function([v0, v1], stack_func(tensor_array1))
+    np_data_list = [np.random.uniform(0, 10, size=shape).astype(dtype) for _ in range(2)]
+    expected = [np.stack(np_data_list)]
+    check_tensor_array(mod, expected, *np_data_list, dtype=dtype)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
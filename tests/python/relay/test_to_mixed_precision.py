@@ -0,0 +1,193 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.relay import testing
+from tvm.relay.transform import ToMixedPrecision
+from tvm.relay.transform.mixed_precision import MixedPrecisionMutator
+
+
+def run_module(mod, params, inputs):
+    with tvm.transform.PassContext(opt_level=3):
+        ex = relay.create_executor("graph", mod=mod, target="llvm")
+        result = ex.evaluate()(*inputs, **params)
+    if isinstance(result, tvm.runtime.container.ADT):
+        return [r.asnumpy() for r in result]
+    return [result.asnumpy()]
+
+
+def collect_calls(func):
+    calls = []
+    relay.analysis.post_order_visit(
+        func, lambda n: calls.append(n) if isinstance(n, relay.Call) else None
+    )
+    return calls
+
+
+def get_conv_model():
+    x = relay.var("x", shape=(1, 4, 8, 8))
+    w = relay.var("w", shape=(8, 4, 3, 3))
+    y = relay.nn.relu(relay.nn.conv2d(x, w, padding=(1, 1)))
+    out = relay.Tuple([relay.exp(y), relay.sum(y, axis=[2, 3])])
+    mod = tvm.IRModule.from_expr(relay.Function([x, w], out))
+    return relay.transform.InferType()(mod)
+
+
+def test_conversion_types():
+    mod = get_conv_model()
+    amp_mod = ToMixedPrecision("float16")(mod)
+    func = amp_mod["main"]
+    # the signature is unchanged
+    assert tvm.ir.structural_equal(func.checked_type, mod["main"].checked_type)
+
+    calls = {c.op.name: c for c in collect_calls(func)}
+    conv = calls["nn.conv2d"]
+    assert conv.attrs.out_dtype == "float32"
+    assert all(arg.checked_type.dtype == "float16" for arg in conv.args)
+    assert calls["nn.relu"].checked_type.dtype == "float16"
+    assert calls["exp"].checked_type.dtype == "float32"
+    assert calls["sum"].checked_type.dtype == "float32"
+
+    # x, w, the accumulator and one cast of relu shared by exp and sum
+    casts = [c for c in collect_calls(func) if c.op.name == "cast"]
+    assert len(casts) == 4
+
+
+def test_remove_round_trip_casts():
+    x = relay.var("x", shape=(4, 16))
+    w = relay.var("w", shape=(16, 16))
+    y = relay.nn.dense(x, w)
+    out = relay.Tuple(
+        [relay.exp(y), relay.nn.relu(relay.cast(relay.cast(y, "float16"), "float32"))]
+    )
+    mod = relay.transform.InferType()(tvm.IRModule.from_expr(relay.Function([x, w], out)))
+    func = ToMixedPrecision("float16")(mod)["main"]
+    calls = collect_calls(func)
+    # exp reads the float32 accumulator of dense
+    exp = [c for c in calls if c.op.name == "exp"][0]
+    assert exp.args[0].op.name == "nn.dense"
+    for call in calls:
+        if call.op.name == "cast" and isinstance(call.args[0], relay.Call):
+            inner = call.args[0]
+            assert not (
+                inner.op.name == "cast"
+                and inner.checked_type.dtype == "float32"
+                and inner.args[0].checked_type.dtype == call.checked_type.dtype
+            )
+
+
+def test_missing_op_mode():
+    x = relay.var("x", shape=(4, 16))
+    w = relay.var("w", shape=(16, 16))
+    y = relay.floor(relay.nn.dense(x, w))
+    mod = relay.transform.InferType()(tvm.IRModule.from_expr(relay.Function([x, w], y)))
+    func = ToMixedPrecision("float16")(mod)["main"]
+    assert func.body.op.name == "floor" and func.body.checked_type.dtype == "float32"
+    func = ToMixedPrecision("float16", missing_op_mode="follow")(mod)["main"]
+    assert func.body.op.name == "cast"
+    assert func.body.args[0].checked_type.dtype == "float16"
+    with pytest.raises(ValueError):
+        MixedPrecisionMutator("float16", missing_op_mode="error").visit(mod["main"])
+
+
+def test_integer_ops():
+    data = relay.var("data", shape=(1, 4, 8, 8), dtype="int8")
+    weight = relay.var("weight", shape=(8, 4, 3, 3), dtype="int8")
+    conv = relay.nn.conv2d(data, weight, padding=(1, 1), out_dtype="int32")
+    qconv = relay.qnn.op.conv2d(
+        data,
+        weight,
+        relay.const(0),
+        relay.const(0),
+        relay.const(0.5),
+        relay.const(0.25),
+        kernel_size=(3, 3),
+        channels=8,
+        padding=(1, 1),
+    )
+    fweight = relay.var("fweight", shape=(8, 8, 1, 1))
+    out = relay.Tuple([conv, qconv, relay.nn.conv2d(relay.cast(conv, "float32"), fweight)])
+    mod = relay.transform.InferType()(
+        tvm.IRModule.from_expr(relay.Function([data, weight, fweight], out))
+    )
+    func = ToMixedPrecision("float16")(mod)["main"]
+    assert tvm.ir.structural_equal(func.checked_type, mod["main"].checked_type)
+
+    calls = collect_calls(func)
+    conv, fconv = [c for c in calls if c.op.name == "nn.conv2d"]
+    assert conv.attrs.out_dtype == "int32"
+    assert [arg.checked_type.dtype for arg in conv.args] == ["int8", "int8"]
+    # the float32 convolution of the integer result is still converted
+    assert [arg.checked_type.dtype for arg in fconv.args] == ["float16", "float16"]
+    qconv = [c for c in calls if c.op.name == "qnn.conv2d"][0]
+    assert qconv.checked_type.dtype == "int32"
+
+    inputs = [
+        np.random.randint(-2, 2, size=(1, 4, 8, 8)).astype("int8"),
+        np.random.randint(-2, 2, size=(8, 4, 3, 3)).astype("int8"),
+        np.random.uniform(-1, 1, size=(8, 8, 1, 1)).astype("float32"),
+    ]
+    expected = run_module(mod, {}, inputs)
+    actual = run_module(ToMixedPrecision("float16")(mod), {}, inputs)
+    tvm.testing.assert_allclose(actual[0], expected[0])
+    tvm.testing.assert_allclose(actual[1], expected[1])
+    tvm.testing.assert_allclose(actual[2], expected[2], rtol=0.02, atol=1)
+
+
+def test_bfloat16():
+    mod = get_conv_model()
+    func = ToMixedPrecision("bfloat16")(mod)["main"]
+    calls = {c.op.name: c for c in collect_calls(func)}
+    assert calls["nn.relu"].checked_type.dtype == "bfloat16"
+
+
+def test_accuracy_conv_model():
+    mod = get_conv_model()
+    inputs = [np.random.uniform(-1, 1, size=(1, 4, 8, 8)).astype("float32")]
+    params = {"w": np.random.uniform(-1, 1, size=(8, 4, 3, 3)).astype("float32")}
+    expected = run_module(mod, params, inputs)
+    actual = run_module(ToMixedPrecision("float16")(mod), params, inputs)
+    for out, ref in zip(actual, expected):
+        tvm.testing.assert_allclose(out, ref, rtol=0.02, atol=0.02)
+
+
+@pytest.mark.parametrize(
+    "workload",
+    [
+        lambda: testing.resnet.get_workload(num_layers=18, batch_size=1),
+        lambda: testing.mobilenet.get_workload(batch_size=1),
+    ],
+)
+def test_accuracy_testing_models(workload):
+    mod, params = workload()
+    shape = [int(d) for d in mod["main"].params[0].checked_type.shape]
+    inputs = [np.random.uniform(-1, 1, size=shape).astype("float32")]
+    expected = run_module(mod, params, inputs)
+    amp_mod = ToMixedPrecision("float16")(mod)
+    convs = [c for c in collect_calls(amp_mod["main"]) if c.op.name == "nn.conv2d"]
+    assert convs and all(c.args[0].checked_type.dtype == "float16" for c in convs)
+    actual = run_module(amp_mod, params, inputs)
+    # the outputs are class probabilities
+    tvm.testing.assert_allclose(actual[0], expected[0], rtol=0.05, atol=1e-4)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
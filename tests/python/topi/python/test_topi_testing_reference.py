@@ -0,0 +1,237 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, too-many-locals, too-many-arguments
+"""Test the vectorized reference kernels of topi.testing against direct loops"""
+import itertools
+import math
+
+import numpy as np
+
+import tvm.testing
+import tvm.topi.testing
+
+
+def _loop_conv_nchw(a_np, w_np, stride, pad, dilation=1):
+    """Convolution of channel first data by its definition, with symmetric padding"""
+    ndim = a_np.ndim - 2
+    a_pad = np.pad(a_np.astype("float64"), [(0, 0), (0, 0)] + [(pad, pad)] * ndim)
+    kernel = w_np.shape[2:]
+    out_shape = [
+        (i - (k - 1) * dilation - 1) // stride + 1 for i, k in zip(a_pad.shape[2:], kernel)
+    ]
+    b_np = np.zeros([a_np.shape[0], w_np.shape[0]] + out_shape)
+    for pos in itertools.product(*[range(o) for o in out_shape]):
+        window = tuple(
+            slice(p * stride, p * stride + (k - 1) * dilation + 1, dilation)
+            for p, k in zip(pos, kernel)
+        )
+        patch = a_pad[(slice(None), slice(None)) + window]
+        axes = list(range(1, 2 + ndim))
+        b_np[(slice(None), slice(None)) + pos] = np.tensordot(patch, w_np, axes=(axes, axes))
+    return b_np
+
+
+def test_conv_reference():
+    rng = np.random.RandomState(0)
+    for stride, pad in itertools.product([1, 2], [0, 1]):
+        a_np = rng.uniform(size=(2, 4, 9, 8)).astype("float32")
+        w_np = rng.uniform(size=(6, 2, 3, 3)).astype("float32")
+        ref = np.concatenate(
+            [
+                _loop_conv_nchw(a_np[:, 2 * g : 2 * g + 2], w_np[3 * g : 3 * g + 3], stride, pad)
+                for g in range(2)
+            ],
+            axis=1,
+        )
+        b_np = tvm.topi.testing.conv2d_nchw_python(a_np, w_np, stride, pad, groups=2)
+        tvm.testing.assert_allclose(b_np, ref, rtol=1e-5)
+        b_np = tvm.topi.testing.conv2d_nhwc_python(
+            a_np[:, :2].transpose(0, 2, 3, 1), w_np[:3].transpose(2, 3, 1, 0), stride, pad
+        )
+        tvm.testing.assert_allclose(b_np.transpose(0, 3, 1, 2), ref[:, :3], rtol=1e-5)
+
+        a_np = rng.uniform(size=(1, 3, 6, 7, 5)).astype("float32")
+        w_np = rng.uniform(size=(4, 3, 3, 2, 3)).astype("float32")
+        b_np = tvm.topi.testing.conv3d_ncdhw_python(a_np, w_np, stride, pad)
+        tvm.testing.assert_allclose(b_np, _loop_conv_nchw(a_np, w_np, stride, pad), rtol=1e-5)
+
+        for dilation in [1, 2]:
+            a_np = rng.uniform(size=(2, 3, 17)).astype("float32")
+            w_np = rng.uniform(size=(4, 3, 3)).astype("float32")
+            b_np = tvm.topi.testing.conv1d_ncw_python(a_np, w_np, stride, pad, dilation)
+            ref = _loop_conv_nchw(a_np, w_np, stride, pad, dilation)
+            tvm.testing.assert_allclose(b_np, ref, rtol=1e-5)
+
+
+def _loop_pool(a_pad, kernel, stride, out_shape, pool_type, count_include_pad):
+    """Pooling of padded channel first data by its definition"""
+    ndim = a_pad.ndim - 2
+    axes = tuple(range(2, 2 + ndim))
+    ret = np.zeros(out_shape, a_pad.dtype)
+    for pos in itertools.product(*[range(o) for o in out_shape[2:]]):
+        window = tuple(slice(p * stride, p * stride + kernel) for p in pos)
+        patch = a_pad[(slice(None), slice(None)) + window]
+        if pool_type == "max":
+            value = np.max(patch, axis=axes)
+        elif count_include_pad:
+            value = np.mean(patch, axis=axes)
+        else:
+            value = np.sum(patch, axis=axes) / np.maximum(np.sum(patch > 0, axis=axes), 1)
+        ret[(slice(None), slice(None)) + pos] = value
+    return ret
+
+
+def test_pool_reference():
+    rng = np.random.RandomState(0)
+    for kernel, stride, pad, pool_type, ceil_mode, count_include_pad in itertools.product(
+        [2, 3], [1, 2], [0, 1], ["avg", "max"], [True, False], [True, False]
+    ):
+        a_np = rng.uniform(-0.3, 1, size=(2, 3, 5, 7, 6)).astype("float32")
+        rounding = math.ceil if ceil_mode else math.floor
+        out_shape = [2, 3] + [int(rounding((i - kernel + 2 * pad) / stride)) + 1 for i in (5, 7, 6)]
+        # pool3d pads with the lowest value for max pooling without the padding
+        pad_value = 0
+        if pool_type == "max" and not count_include_pad:
+            pad_value = np.finfo("float32").min
+        a_pad = np.pad(a_np, [(0, 0), (0, 0)] + [(pad, pad)] * 3, constant_values=pad_value)
+        ref = _loop_pool(a_pad, kernel, stride, out_shape, pool_type, count_include_pad)
+        b_np = tvm.topi.testing.pool3d_ncdhw_python(
+            a_np, kernel, stride, pad, out_shape, pool_type, count_include_pad, ceil_mode
+        )
+        tvm.testing.assert_allclose(b_np, np.maximum(ref, pad_value), rtol=1e-5)
+
+        # pool1d pads with zeros
+        a_np = a_np[:, :, 0, 0]
+        a_pad = np.pad(a_np, [(0, 0), (0, 0), (pad, pad)])
+        out_shape = out_shape[:2] + out_shape[-1:]
+        ref = _loop_pool(a_pad, kernel, stride, out_shape, pool_type, count_include_pad)
+        b_np = tvm.topi.testing.pool1d_ncw_python(
+            a_np,
+            [kernel],
+            [stride],
+            [pad, pad],
+            out_shape,
+            pool_type,
+            count_include_pad,
+            ceil_mode,
+        )
+        tvm.testing.assert_allclose(b_np, np.maximum(ref, 0), rtol=1e-5)
+
+
+def _bilinear(data, y, x):
+    """Bilinear sample of a 2-D array, zero outside"""
+    height, width = data.shape
+    if y < 0 or y >= height or x < 0 or x >= width:
+        return 0.0
+    y0, x0 = int(y), int(x)
+    y1, x1 = min(y0 + 1, height - 1), min(x0 + 1, width - 1)
+    ly, lx = y - y0, x - x0
+    return (1 - ly) * ((1 - lx) * data[y0, x0] + lx * data[y0, x1]) + ly * (
+        (1 - lx) * data[y1, x0] + lx * data[y1, x1]
+    )
+
+
+def test_deformable_conv2d_reference():
+    rng = np.random.RandomState(0)
+    kernel = 3
+    for stride, pad, dilation, deformable_groups in itertools.product(
+        [1, 2], [0, 1], [1, 2], [1, 2]
+    ):
+        a_np = rng.uniform(size=(2, 4, 7, 6)).astype("float32")
+        w_np = rng.uniform(size=(3, 4, kernel, kernel)).astype("float32")
+        out_h = (7 + 2 * pad - (kernel - 1) * dilation - 1) // stride + 1
+        out_w = (6 + 2 * pad - (kernel - 1) * dilation - 1) // stride + 1
+        offset_np = rng.uniform(-2, 2, size=(2, deformable_groups * 18, out_h, out_w))
+        offset_np = offset_np.astype("float32")
+
+        ref = np.zeros((2, 3, out_h, out_w))
+        offsets = offset_np.reshape(2, deformable_groups, kernel, kernel, 2, out_h, out_w)
+        for n, c, h, w, kh, kw in itertools.product(
+            range(2), range(4), range(out_h), range(out_w), range(kernel), range(kernel)
+        ):
+            dg = c // (4 // deformable_groups)
+            y = h * stride - pad + kh * dilation + offsets[n, dg, kh, kw, 0, h, w]
+            x = w * stride - pad + kw * dilation + offsets[n, dg, kh, kw, 1, h, w]
+            ref[n, :, h, w] += _bilinear(a_np[n, c], y, x) * w_np[:, c, kh, kw]
+
+        b_np = tvm.topi.testing.deformable_conv2d_nchw_python(
+            a_np, offset_np, w_np, stride, pad, dilation, deformable_groups, 1
+        )
+        tvm.testing.assert_allclose(b_np, ref, rtol=1e-4, atol=1e-5)
+
+
+def test_roi_align_reference():
+    rng = np.random.RandomState(0)
+    a_np = rng.uniform(size=(2, 3, 12, 10)).astype("float32")
+    rois_np = np.array(
+        [[0, 1.0, 2.0, 7.5, 9.0], [1, -1.0, 0.5, 11.0, 6.0], [1, 3.0, 3.0, 3.5, 3.2]], "float32"
+    )
+    for pooled_size, spatial_scale, sample_ratio in itertools.product([2, 5], [1.0, 0.5], [1, 2]):
+        ref = np.zeros((3, 3, pooled_size, pooled_size))
+        for i, roi in enumerate(rois_np):
+            start_w, start_h, end_w, end_h = roi[1:] * spatial_scale
+            bin_h = max(end_h - start_h, 1.0) / pooled_size
+            bin_w = max(end_w - start_w, 1.0) / pooled_size
+            for c, ph, pw, iy, ix in itertools.product(
+                range(3),
+                range(pooled_size),
+                range(pooled_size),
+                range(sample_ratio),
+                range(sample_ratio),
+            ):
+                y = start_h + ph * bin_h + (iy + 0.5) * bin_h / sample_ratio
+                x = start_w + pw * bin_w + (ix + 0.5) * bin_w / sample_ratio
+                if -1 <= y <= 12 and -1 <= x <= 10:
+                    value = _bilinear(a_np[int(roi[0]), c], max(y, 0.0), max(x, 0.0))
+                    ref[i, c, ph, pw] += value / sample_ratio ** 2
+
+        b_np = tvm.topi.testing.roi_align_nchw_python(
+            a_np, rois_np, pooled_size, spatial_scale, sample_ratio
+        )
+        tvm.testing.assert_allclose(b_np, ref, rtol=1e-4, atol=1e-6)
+
+
+def test_bilinear_resize_reference():
+    rng = np.random.RandomState(0)
+    a_np = rng.uniform(size=(2, 3, 6, 8)).astype("float32")
+    for mode, (new_h, new_w) in itertools.product(
+        ["align_corners", "half_pixel", "asymmetric"], [(4, 5), (13, 16)]
+    ):
+        if mode == "align_corners":
+            scale_h, scale_w = (6 - 1) / (new_h - 1), (8 - 1) / (new_w - 1)
+        else:
+            scale_h, scale_w = 6 / new_h, 8 / new_w
+        ref = np.zeros((2, 3, new_h, new_w))
+        for n, c, j, k in itertools.product(range(2), range(3), range(new_h), range(new_w)):
+            y = (j + 0.5) * scale_h - 0.5 if mode == "half_pixel" else j * scale_h
+            x = (k + 0.5) * scale_w - 0.5 if mode == "half_pixel" else k * scale_w
+            ref[n, c, j, k] = _bilinear(a_np[n, c], min(max(y, 0), 5), min(max(x, 0), 7))
+
+        b_np = tvm.topi.testing.bilinear_resize_python(a_np, (new_h, new_w), "NCHW", mode)
+        tvm.testing.assert_allclose(b_np, ref, rtol=1e-5, atol=1e-6)
+        b_np = tvm.topi.testing.bilinear_resize_python(
+            a_np.transpose(0, 2, 3, 1), (new_h, new_w), "NHWC", mode
+        )
+        tvm.testing.assert_allclose(b_np.transpose(0, 3, 1, 2), ref, rtol=1e-5, atol=1e-6)
+
+
+if __name__ == "__main__":
+    test_conv_reference()
+    test_pool_reference()
+    test_deformable_conv2d_reference()
+    test_roi_align_reference()
+    test_bilinear_resize_reference()
@@ -36,6 +36,7 @@ _get_valid_counts_implement = {
 
 _nms_implement = {
     "generic": (topi.vision.non_max_suppression, topi.generic.schedule_nms),
+    "cpu": (topi.x86.non_max_suppression, topi.generic.schedule_nms),
     "gpu": (topi.cuda.non_max_suppression, topi.cuda.schedule_nms),
 }
 
@@ -287,6 +288,53 @@ def test_non_max_suppression():
     )
 
 
+@tvm.testing.requires_llvm
+def test_non_max_suppression_cpu():
+    # the x86 schedule suppresses the batches in parallel, it matches the generic one
+    batch, num_anchors = 4, 200
+    np_data = np.zeros((batch, num_anchors, 6), "float32")
+    np_data[:, :, 0] = np.random.randint(-1, 4, size=(batch, num_anchors))
+    np_data[:, :, 1] = np.random.uniform(-0.2, 1, size=(batch, num_anchors))
+    corners = np.random.uniform(0, 100, size=(batch, num_anchors, 2))
+    np_data[:, :, 2:4] = corners
+    np_data[:, :, 4:6] = corners + np.random.uniform(0, 30, size=(batch, num_anchors, 2))
+    np_valid_count = np.array([200, 150, 0, 73], "int32")
+    np_indices = np.tile(np.arange(num_anchors, dtype="int32"), (batch, 1))
+    data = te.placeholder(np_data.shape, name="data")
+    valid_count = te.placeholder((batch,), dtype="int32", name="valid_count")
+    indices = te.placeholder((batch, num_anchors), dtype="int32", name="indices")
+    ctx = tvm.cpu(0)
+
+    for force_suppress, top_k, max_output_size in [(False, -1, -1), (True, 100, 20)]:
+        results = []
+        for fcompute in [topi.vision.non_max_suppression, topi.x86.non_max_suppression]:
+            with tvm.target.Target("llvm"):
+                out = fcompute(
+                    data,
+                    valid_count,
+                    indices,
+                    max_output_size,
+                    0.5,
+                    force_suppress,
+                    top_k,
+                    return_indices=True,
+                )
+                s = topi.generic.schedule_nms(out)
+            f = tvm.build(s, [data, valid_count, indices, out[0], out[1]], "llvm")
+            tvm_out = tvm.nd.array(np.zeros((batch, num_anchors), "int32"), ctx)
+            tvm_num = tvm.nd.array(np.zeros((batch, 1), "int32"), ctx)
+            f(
+                tvm.nd.array(np_data, ctx),
+                tvm.nd.array(np_valid_count, ctx),
+                tvm.nd.array(np_indices, ctx),
+                tvm_out,
+                tvm_num,
+            )
+            results.append((tvm_out.asnumpy(), tvm_num.asnumpy()))
+        tvm.testing.assert_allclose(results[1][0], results[0][0])
+        tvm.testing.assert_allclose(results[1][1], results[0][1])
+
+
 def verify_multibox_prior(
     dshape, sizes=(1,), ratios=(1,), steps=(-1, -1), offsets=(0.5, 0.5), clip=False
 ):
@@ -624,3 +672,4 @@ if __name__ == "__main__":
     test_roi_pool()
     test_proposal()
     test_non_max_suppression()
+    test_non_max_suppression_cpu()
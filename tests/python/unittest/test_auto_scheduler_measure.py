@@ -200,6 +200,21 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_workload_registry_entry_serialization():
+    from tvm.auto_scheduler import workload_registry
+
+    A, B, C = matmul_auto_scheduler_test(64, 64, 64)
+    key = auto_scheduler.workload_registry.register_workload_tensors("matmul_tensors", [A, B, C])
+    data = workload_registry.serialize_workload_registry_entry(key)
+    # the tensors are sent to the measure processes in the binary format
+    assert isinstance(data[1], (bytes, bytearray))
+
+    del workload_registry.WORKLOAD_FUNC_REGISTRY["matmul_tensors"]
+    workload_registry.deserialize_workload_registry_entry(data)
+    tensors = workload_registry.workload_key_to_tensors(key)
+    assert str(auto_scheduler.ComputeDAG(tensors)) == str(auto_scheduler.ComputeDAG([A, B, C]))
+
+
 def test_measure_local_builder_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -289,6 +304,7 @@ if __name__ == "__main__":
     test_record_follow_split_follow_fused_split()
     test_record_pragma_storage_align_rfactor()
     test_recover_measure_input()
+    test_workload_registry_entry_serialization()
     test_measure_local_builder_runner()
     test_measure_local_builder_rpc_runner()
     test_measure_target_host()
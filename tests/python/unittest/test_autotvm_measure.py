@@ -17,6 +17,7 @@
 """Test builder and runner"""
 import logging
 import multiprocessing
+import pickle
 import time
 
 import numpy as np
@@ -60,6 +61,15 @@ def test_task_tuner_without_measurement_spawn():
     p.join()
 
 
+def test_task_pickle():
+    task, target = get_sample_task()
+    # the target is sent to the measure processes in the binary format
+    assert isinstance(task.__getstate__()["target"], (bytes, bytearray))
+    task_loaded = pickle.loads(pickle.dumps(task))
+    assert str(task_loaded.target) == str(target)
+    assert task_loaded.workload == task.workload
+
+
 def test_check_correctness():
     task, target = get_sample_task()
 
@@ -92,4 +102,5 @@ if __name__ == "__main__":
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
+    test_task_pickle()
     test_check_correctness()
@@ -0,0 +1,81 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the lazy import mode of the python package."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def run_lazy(script):
+    env = dict(os.environ)
+    env["TVM_LAZY_IMPORT"] = "1"
+    # import the same tvm package as the test process
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    subprocess.check_call([sys.executable, "-c", script], env=env)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires module __getattr__")
+def test_lazy_import_tvm():
+    run_lazy(
+        """
+import sys
+import tvm
+for name in ["tvm.tir", "tvm.te", "tvm.target", "tvm.driver", "tvm.parser", "tvm.arith"]:
+    assert name not in sys.modules, name
+assert tvm.get_global_func("tvm_callback_rocm_link", allow_missing=True) is None
+assert "tir" in dir(tvm)
+assert tvm.tir.IntImm("int32", 1).value == 1
+assert "tvm.tir" in sys.modules
+assert callable(tvm.build)
+tvm.target.Target("llvm")
+assert tvm.get_global_func("tvm_callback_rocm_link", allow_missing=True) is not None
+try:
+    tvm.not_a_submodule
+except AttributeError:
+    pass
+else:
+    assert False
+"""
+    )
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires module __getattr__")
+def test_lazy_import_relay():
+    run_lazy(
+        """
+import sys
+import tvm
+from tvm import relay
+assert "tvm.relay.frontend" not in sys.modules
+assert "tvm.relay.quantize" not in sys.modules
+assert "tvm.relay.op.strategy.x86" not in sys.modules
+assert callable(relay.frontend.from_onnx)
+
+x = relay.var("x", shape=(1, 16), dtype="float32")
+mod = tvm.IRModule.from_expr(relay.Function([x], relay.nn.relu(x)))
+relay.build(mod, target="llvm")
+assert "tvm.relay.op.strategy.x86" in sys.modules
+assert "tvm.relay.op.strategy.cuda" not in sys.modules
+"""
+    )
+
+
+if __name__ == "__main__":
+    test_lazy_import_tvm()
+    test_lazy_import_relay()
@@ -14,9 +14,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import pickle
+
+import numpy as np
 import tvm
 import pytest
 from tvm import te
+from tvm import relay
 
 
 def test_const_saveload_json():
@@ -30,6 +34,44 @@ def test_const_saveload_json():
     tvm.ir.assert_structural_equal(zz, z, map_free_vars=True)
 
 
+def test_saveload_binary():
+    x = tvm.tir.const(1, "int32")
+    y = tvm.tir.const(10, "int32")
+    z = tvm.tir.Add(x, y)
+    smap = tvm.runtime.convert({"z": z, "x": x})
+    blob = tvm.ir.save_binary(tvm.runtime.convert([smap]))
+    arr = tvm.ir.load_binary(blob)
+    assert len(arr) == 1
+    # objects referred to several times are shared after loading
+    assert arr[0]["z"].a.same_as(arr[0]["x"])
+    tvm.ir.assert_structural_equal(arr, [smap], map_free_vars=True)
+
+    data = relay.var("data", shape=(1, 16), dtype="float32")
+    weight = relay.const(np.random.uniform(size=(8, 16)).astype("float32"))
+    func = relay.Function([data], relay.nn.relu(relay.nn.dense(data, weight)))
+    mod = relay.transform.InferType()(tvm.IRModule.from_expr(func))
+    blob = tvm.ir.save_binary(mod)
+    assert len(blob) < len(tvm.ir.save_json(mod))
+    tvm.ir.assert_structural_equal(tvm.ir.load_binary(blob), mod)
+
+    with pytest.raises(tvm.error.TVMError):
+        tvm.ir.load_binary(bytearray(b"not an object graph"))
+
+
+def test_pickle():
+    x = te.var("x")
+    z = tvm.tir.Add(x, tvm.tir.const(1, "int32")) * x
+    zz = pickle.loads(pickle.dumps(z))
+    tvm.ir.assert_structural_equal(zz, z, map_free_vars=True)
+    assert zz.a.a.same_as(zz.b)
+
+    # objects are pickled as json, the binary format is loaded as well
+    assert isinstance(z.__getstate__()["handle"], str)
+    binary = tvm.tir.IntImm.__new__(tvm.tir.IntImm)
+    binary.__setstate__({"handle": tvm.ir.save_binary(tvm.tir.const(3, "int32"))})
+    assert binary.value == 3
+
+
 def _test_infinity_value(value, dtype):
     x = tvm.tir.const(value, dtype)
     json_str = tvm.ir.save_json(x)
@@ -156,6 +198,8 @@ if __name__ == "__main__":
     test_make_node()
     test_make_smap()
     test_const_saveload_json()
+    test_saveload_binary()
+    test_pickle()
     test_make_sum()
     test_pass_config()
     test_dict()
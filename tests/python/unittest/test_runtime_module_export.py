@@ -14,6 +14,8 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import numpy as np
+
 from tvm import relay
 from tvm.relay import testing
 import tvm
@@ -226,5 +228,31 @@ def test_mod_export():
     verify_multi_c_mod_export()
 
 
+@tvm.testing.requires_llvm
+def test_partitioned_host_module_export():
+    n = 64
+    A = te.placeholder((n,), name="A")
+    B = te.compute(A.shape, lambda i: A[i] + 1.0, name="B")
+    C = te.compute(A.shape, lambda i: A[i] * 2.0, name="C")
+    mod = tvm.lower(te.create_schedule(B.op), [A, B], name="add_one")
+    mod.update(tvm.lower(te.create_schedule(C.op), [A, C], name="mul_two"))
+    with tvm.transform.PassContext(config={"tir.host_module_num_partitions": 2}):
+        f = tvm.build(mod, target="llvm")
+    assert len(f._collect_dso_modules()) == 2
+
+    temp = utils.tempdir()
+    path_lib = temp.relpath("partitioned.so")
+    f.export_library(path_lib, num_workers=2)
+    loaded = tvm.runtime.load_module(path_lib)
+    a = tvm.nd.array(np.random.uniform(size=n).astype(A.dtype))
+    b = tvm.nd.empty((n,), B.dtype)
+    c = tvm.nd.empty((n,), C.dtype)
+    loaded["add_one"](a, b)
+    loaded["mul_two"](a, c)
+    tvm.testing.assert_allclose(b.asnumpy(), a.asnumpy() + 1.0)
+    tvm.testing.assert_allclose(c.asnumpy(), a.asnumpy() * 2.0)
+
+
 if __name__ == "__main__":
     test_mod_export()
+    test_partitioned_host_module_export()
@@ -0,0 +1,83 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gc
+
+import numpy as np
+import pytest
+
+import tvm
+from tvm.relay.frontend.common import to_nd_array
+
+
+def aligned_array(shape, dtype="float32", offset=0):
+    """A C contiguous array whose data starts offset bytes after a 64 byte boundary."""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    buf = np.empty(nbytes + 128, dtype="uint8")
+    begin = (-buf.ctypes.data) % 64 + offset
+    return buf[begin : begin + nbytes].view(dtype).reshape(shape)
+
+
+def test_share_memory():
+    np_data = aligned_array((4, 8))
+    np_data[:] = np.arange(32).reshape(4, 8)
+    assert tvm.nd.can_share(np_data)
+    arr = tvm.nd.share(np_data)
+    assert arr.shape == (4, 8) and arr.dtype == "float32"
+    np_data[1, 2] = -1.0
+    np.testing.assert_equal(arr.asnumpy(), np_data)
+
+
+def test_share_keeps_array_alive():
+    np_data = aligned_array((1024,), "int64")
+    np_data[:] = np.arange(1024)
+    arr = tvm.nd.share(np_data)
+    del np_data
+    gc.collect()
+    np.testing.assert_equal(arr.asnumpy(), np.arange(1024))
+    count = len(tvm.runtime.ndarray._SHARED_ARRAYS)
+    del arr
+    gc.collect()
+    assert len(tvm.runtime.ndarray._SHARED_ARRAYS) == count - 1
+
+
+def test_cannot_share():
+    assert not tvm.nd.can_share(aligned_array((16,), offset=4))
+    assert not tvm.nd.can_share(aligned_array((8, 8))[:, ::2])
+    assert not tvm.nd.can_share(aligned_array((4,), "complex64"))
+    with pytest.raises(ValueError):
+        tvm.nd.share(aligned_array((16,), offset=4))
+
+
+def test_to_nd_array():
+    shared = aligned_array((2, 3))
+    shared[:] = 1.0
+    arr = to_nd_array(shared)
+    shared[0, 0] = 2.0
+    assert arr.asnumpy()[0, 0] == 2.0
+
+    copied = aligned_array((2, 3), offset=4)
+    copied[:] = 1.0
+    arr = to_nd_array(copied)
+    copied[0, 0] = 2.0
+    assert arr.asnumpy()[0, 0] == 1.0
+
+    np.testing.assert_equal(to_nd_array(bytearray(b"\x01\x02")).asnumpy(), [1, 2])
+    assert to_nd_array(arr).same_as(arr)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
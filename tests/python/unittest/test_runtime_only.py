@@ -0,0 +1,79 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test that the runtime only package never loads the compiler."""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import te
+from tvm.contrib import utils
+
+# Run with libtvm_runtime, loads and runs the module passed as argument.
+RUNTIME_ONLY_SCRIPT = """
+import sys
+import numpy as np
+import tvm
+import tvm.runtime
+import tvm.runtime.vm
+from tvm.contrib import graph_runtime
+
+assert tvm._ffi.base._RUNTIME_ONLY
+compiler = ["tvm.ir", "tvm.tir", "tvm.te", "tvm.target", "tvm.driver", "tvm.relay",
+            "tvm.topi", "tvm.autotvm", "tvm.auto_scheduler", "tvm.parser", "tvm.arith"]
+loaded = [name for name in compiler if name in sys.modules]
+assert not loaded, loaded
+
+f = tvm.runtime.load_module(sys.argv[1])
+a = tvm.nd.array(np.arange(16, dtype="float32"))
+b = tvm.nd.empty((16,), "float32")
+f(a, b)
+np.testing.assert_equal(b.asnumpy(), np.arange(16, dtype="float32") + 1)
+loaded = [name for name in compiler if name in sys.modules]
+assert not loaded, loaded
+"""
+
+
+def runtime_lib_found():
+    # The libraries found next to libtvm, the runtime one is listed last if built.
+    return any("runtime" in os.path.basename(p) for p in tvm._ffi.libinfo.find_lib_path())
+
+
+@tvm.testing.requires_llvm
+def test_runtime_only_import():
+    if not runtime_lib_found():
+        pytest.skip("libtvm_runtime not found")
+    n = 16
+    A = te.placeholder((n,), name="A")
+    B = te.compute((n,), lambda i: A[i] + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    f = tvm.build(s, [A, B], "llvm", name="addone")
+    temp = utils.tempdir()
+    path = temp.relpath("addone.so")
+    f.export_library(path)
+
+    env = dict(os.environ)
+    env["TVM_USE_RUNTIME_LIB"] = "1"
+    subprocess.check_call([sys.executable, "-c", RUNTIME_ONLY_SCRIPT, path], env=env)
+
+
+if __name__ == "__main__":
+    test_runtime_only_import()
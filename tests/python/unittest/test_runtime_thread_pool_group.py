@@ -0,0 +1,129 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+import tvm
+from tvm import relay, te
+from tvm.contrib import graph_runtime
+from tvm.runtime.thread_pool import partition_cores
+
+
+def _parallel_add_one(n=1024):
+    A = te.placeholder((n,), name="A")
+    B = te.compute(A.shape, lambda i: A[i] + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    xo, _ = s[B].split(B.op.axis[0], factor=64)
+    s[B].parallel(xo)
+    return tvm.build(s, [A, B], "llvm")
+
+
+def test_group_runs_parallel_kernels():
+    func = _parallel_add_one()
+    group = partition_cores(1)[0]
+    ctx = tvm.cpu()
+    a = tvm.nd.array(np.random.uniform(size=1024).astype("float32"), ctx)
+    b = tvm.nd.empty((1024,), "float32", ctx)
+    with group:
+        func(a, b)
+    np.testing.assert_allclose(b.asnumpy(), a.asnumpy() + 1.0)
+
+    b = tvm.nd.empty((1024,), "float32", ctx)
+    group.bind(func)(a, b)
+    np.testing.assert_allclose(b.asnumpy(), a.asnumpy() + 1.0)
+
+
+def test_group_threads():
+    func = _parallel_add_one()
+    groups = partition_cores(min(2, len(partition_cores(1)[0].cpus)))
+    ctx = tvm.cpu()
+    data = np.random.uniform(size=1024).astype("float32")
+    errors = []
+
+    def _worker(group):
+        bound = group.bind(func)
+        try:
+            for _ in range(50):
+                a = tvm.nd.array(data, ctx)
+                b = tvm.nd.empty((1024,), "float32", ctx)
+                bound(a, b)
+                np.testing.assert_allclose(b.asnumpy(), data + 1.0)
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(err)
+
+    # two threads per group share its pool
+    threads = [threading.Thread(target=_worker, args=(g,)) for g in groups + groups]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="affinity is set on Linux")
+def test_group_affinity():
+    before = os.sched_getaffinity(0)
+    core = min(before)
+    group = tvm.runtime.ThreadPoolGroup([core])
+    with group:
+        assert os.sched_getaffinity(0) == {core}
+    assert os.sched_getaffinity(0) == before
+
+
+def test_bind_graph_module():
+    x = relay.var("x", shape=(4, 16))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.nn.relu(x) + relay.const(1.0)))
+    with tvm.transform.PassContext(opt_level=3):
+        lib = relay.build(mod, target="llvm")
+    group = partition_cores(1)[0]
+    data = np.random.uniform(-1, 1, size=(4, 16)).astype("float32")
+
+    module = graph_runtime.GraphModule(group.bind(lib["default"](tvm.cpu())))
+    module.set_input("x", data)
+    module.run()
+    np.testing.assert_allclose(module.get_output(0).asnumpy(), np.maximum(data, 0) + 1.0)
+
+    module = group.bind(graph_runtime.GraphModule(lib["default"](tvm.cpu())))
+    module.run(x=data)
+    np.testing.assert_allclose(module.get_output(0).asnumpy(), np.maximum(data, 0) + 1.0)
+
+    with pytest.raises(TypeError):
+        group.bind(object())
+
+
+def test_partition_cores():
+    groups = partition_cores(3, [0, 1, 2, 3, 4])
+    assert [g.cpus for g in groups] == [(0, 1), (2, 3), (4,)]
+    with pytest.raises(ValueError):
+        partition_cores(3, [0, 1])
+    with pytest.raises(ValueError):
+        tvm.runtime.ThreadPoolGroup([])
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_getaffinity"), reason="no affinity mask")
+def test_partition_cores_affinity():
+    # the default cores are the ones the process may run on
+    groups = partition_cores(1)
+    assert list(groups[0].cpus) == sorted(os.sched_getaffinity(0))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
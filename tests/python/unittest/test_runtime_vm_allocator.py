@@ -0,0 +1,93 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the memory allocators of the VM."""
+import subprocess
+import sys
+
+import pytest
+
+import tvm
+import tvm.testing
+from tvm.runtime.vm import VirtualMachine
+
+# The allocator of a context is created by the first VM using it, so the size
+# class allocator is tested in a fresh process.
+SIZE_CLASS_SCRIPT = """
+import numpy as np
+import tvm
+from tvm import relay
+from tvm.runtime.vm import VirtualMachine
+
+x = relay.var("x", shape=(relay.Any(),), dtype="float32")
+func = relay.Function([x], relay.exp(relay.exp(x) + relay.const(1.0)))
+exe = relay.vm.compile(tvm.IRModule.from_expr(func), "llvm")
+cfg = {"type": "size_class", "high_water_mark": 1 << 20, "classes_per_doubling": 1}
+vm = VirtualMachine(exe, tvm.cpu(), memory_cfg=cfg)
+
+for n in [1000, 900, 1000, 200000, 1000]:
+    data = np.random.uniform(size=(n,)).astype("float32")
+    res = vm.run(data).asnumpy()
+    np.testing.assert_allclose(res, np.exp(np.exp(data) + 1), rtol=1e-5)
+
+stats = vm.get_memory_stats()[tvm.cpu()]
+assert stats["type"] == "size_class", stats
+assert stats["classes_per_doubling"] == 1, stats
+# 900 and 1000 floats are in the same power of two class
+assert stats["num_hits"] > 0, stats
+# two tensors of 200000 floats go over the high water mark
+assert stats["peak_bytes"] > 1 << 20, stats
+assert stats["num_released"] > 0, stats
+assert stats["used_bytes"] <= 1 << 20 or stats["cached_bytes"] == 0, stats
+
+# 5000 floats are in a class of 23296 bytes with 4 classes per doubling, which is not
+# a class with 3, so the buffer in use is released when it is freed
+vm = VirtualMachine(exe, tvm.cpu(), memory_cfg={"type": "size_class", "classes_per_doubling": 4})
+res = vm.run(np.ones((5000,), "float32"))
+vm = VirtualMachine(exe, tvm.cpu(), memory_cfg={"type": "size_class", "classes_per_doubling": 3})
+released = vm.get_memory_stats()[tvm.cpu()]["num_released"]
+del res
+stats = vm.get_memory_stats()[tvm.cpu()]
+assert stats["num_released"] > released, stats
+assert stats["cached_bytes"] == 0, stats
+"""
+
+
+@tvm.testing.requires_llvm
+def test_size_class_allocator():
+    subprocess.check_call([sys.executable, "-c", SIZE_CLASS_SCRIPT])
+
+
+def test_parse_alloc_cfg():
+    assert VirtualMachine._parse_alloc_cfg("naive") == (VirtualMachine.NAIVE_ALLOCATOR, None)
+    alloc_type, options = VirtualMachine._parse_alloc_cfg(
+        {"type": "size_class", "high_water_mark": 1024}
+    )
+    assert alloc_type == VirtualMachine.SIZE_CLASS_ALLOCATOR
+    assert options == {"high_water_mark": 1024}
+    assert VirtualMachine._parse_alloc_cfg({"type": "pooled"}) == (
+        VirtualMachine.POOLED_ALLOCATOR,
+        None,
+    )
+    with pytest.raises(ValueError):
+        VirtualMachine._parse_alloc_cfg({"type": "pooled", "high_water_mark": 1024})
+    with pytest.raises(ValueError):
+        VirtualMachine._parse_alloc_cfg("buddy")
+
+
+if __name__ == "__main__":
+    test_size_class_allocator()
+    test_parse_alloc_cfg()
@@ -16,6 +16,7 @@
 # under the License.
 import numpy as np
 
+import tvm
 from tvm.runtime import profiler_vm
 from tvm import relay
 from tvm.relay.testing import resnet, enabled_targets
@@ -36,5 +37,41 @@ def test_basic():
         print("\n{}".format(vm.get_stat(False)))
 
 
+def test_shape_cache():
+    if not profiler_vm.enabled():
+        return
+
+    x = relay.var("x", shape=(relay.Any(), 4), dtype="float32")
+    y = relay.nn.relu(x + relay.const(1.0))
+    z = relay.sum(y, axis=1, keepdims=True) * y
+    mod = tvm.IRModule.from_expr(relay.Function([x], z))
+    exe = relay.vm.compile(mod, "llvm")
+    vm = profiler_vm.VirtualMachineProfiler(exe, tvm.cpu())
+    vm.set_shape_cache(2)
+
+    for rows in [2, 2, 3, 2, 5, 3]:
+        data = np.random.uniform(-1, 1, size=(rows, 4)).astype("float32")
+        res = vm.invoke("main", [data]).asnumpy()
+        ref = np.maximum(data + 1, 0)
+        ref = np.sum(ref, axis=1, keepdims=True) * ref
+        np.testing.assert_allclose(res, ref, rtol=1e-5, atol=1e-5)
+
+    stats = vm.get_shape_cache_stats()
+    # 5 rows evicts 3 rows, then 3 rows evicts 2 rows
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 2
+    assert stats["shape_func_hits"] > 0
+    assert stats["shape_func_misses"] > 0
+    assert "Shape Cache: 2 hits" in vm.get_stat()
+
+    vm.reset()
+    assert vm.get_shape_cache_stats()["hits"] == 0
+    vm.set_shape_cache(0)
+    vm.invoke("main", [data])
+    assert vm.get_shape_cache_stats()["misses"] == 0
+
+
 if __name__ == "__main__":
     test_basic()
+    test_shape_cache()
@@ -836,6 +836,61 @@ def test_array_inputs():
     tvm.testing.assert_allclose(out_nd.asnumpy(), out_ref)
 
 
+def test_vectorized_emulation(monkeypatch):
+    from tvm.te.hybrid import vectorizer
+    from tvm.topi.vision.nms import hybrid_get_valid_counts
+
+    def scale_shift(a, b):
+        c = output_tensor(a.shape, a.dtype)
+        s = output_tensor((a.shape[0],), a.dtype)
+        for i in parallel(a.shape[0]):
+            for j in vectorize(a.shape[1]):
+                t = a[i, j] * 2.0
+                t += b[j, i]
+                c[i, j] = max(sqrt(t), float32(0.5))
+        # a reduction, and a loop carried dependence run in the interpreter
+        for i in range(a.shape[0]):
+            s[i] = 0.0
+            for j in range(a.shape[1]):
+                s[i] += c[i, j]
+        for i in range(1, a.shape[0]):
+            c[i, 0] = c[i - 1, 0] + 1.0
+        for i in range(a.shape[0]):
+            for j in range(a.shape[1] // 2):
+                c[i, 2 * j + 1] = c[i, 2 * j + 1] - b[i, j]
+        return c, s
+
+    def prefix_sum(a):
+        b = output_tensor(a.shape, a.dtype)
+        b[0] = a[0]
+        for i in range(1, a.shape[0]):
+            b[i] = b[i - 1] + a[i]
+        return b
+
+    assert vectorizer.vectorize(scale_shift) is not scale_shift
+    assert vectorizer.vectorize(prefix_sum) is prefix_sum
+
+    a = numpy.random.uniform(size=(16, 16)).astype("float32")
+    b = numpy.random.uniform(size=(16, 16)).astype("float32")
+    data = numpy.random.uniform(size=(2, 32, 6)).astype("float32")
+    data[:, :, 0] = numpy.random.randint(-1, 3, size=(2, 32))
+    nms_args = (data, numpy.float32(0.5), 0, 1, numpy.float32(1.0), 2, 32)
+
+    def emulate():
+        return (
+            script(scale_shift)(a, b)
+            + (script(prefix_sum)(a[0]),)
+            + hybrid_get_valid_counts(*nms_args)
+        )
+
+    vectorized = emulate()
+    monkeypatch.setenv("TVM_HYBRID_VECTORIZE", "0")
+    interpreted = emulate()
+    for res, ref in zip(vectorized, interpreted):
+        assert res.dtype == ref.dtype
+        tvm.testing.assert_allclose(res, ref, rtol=1e-6)
+
+
 if __name__ == "__main__":
     test_outer_product()
     test_fanout()
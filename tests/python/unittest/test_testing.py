@@ -111,5 +111,50 @@ def test_check_numerical_grads():
                 raise AssertionError("tvm.testing.check_numerical_grads didn't raise an exception")
 
 
+def _add_one_schedule():
+    A = te.placeholder((16,), name="A")
+    B = te.compute(A.shape, lambda i: A[i] + 1.0, name="B")
+    return te.create_schedule(B.op), [A, B]
+
+
+def test_build_cache(tmpdir):
+    a = tvm.nd.array(np.arange(16, dtype="float32"))
+    b = tvm.nd.empty((16,), "float32")
+    with tvm.testing.build_cache() as cache:
+        f = tvm.build(*_add_one_schedule(), target="llvm")
+        g = tvm.build(*_add_one_schedule(), target="llvm")
+        assert f is g
+        assert cache.hits == 1 and cache.misses == 1
+        with tvm.transform.PassContext(opt_level=1):
+            tvm.build(*_add_one_schedule(), target="llvm")
+        assert cache.misses == 2
+
+    # a cache of another process, sharing the directory
+    with tvm.testing.build_cache(str(tmpdir)) as cache:
+        tvm.build(*_add_one_schedule(), target="llvm")
+        assert cache.misses == 1
+    with tvm.testing.build_cache(str(tmpdir)) as cache:
+        f = tvm.build(*_add_one_schedule(), target="llvm")
+        assert cache.hits == 1 and cache.misses == 0
+    f(a, b)
+    tvm.testing.assert_allclose(b.asnumpy(), a.asnumpy() + 1)
+
+
+def test_shard_items():
+    class Item:
+        def __init__(self, nodeid):
+            self.nodeid = nodeid
+
+    items = [Item("test_a.py::test_%d[%s]" % (i, t)) for i in range(20) for t in ["llvm", "cuda"]]
+    shards = [tvm.testing.shard_items(items, i, 3)[0] for i in range(3)]
+    assert sorted(sum(shards, []), key=items.index) == items
+    for shard in shards:
+        # the parametrizations of a test stay together
+        assert len(shard) % 2 == 0
+        assert [item.nodeid.split("[")[0] for item in shard[::2]] == [
+            item.nodeid.split("[")[0] for item in shard[1::2]
+        ]
+
+
 if __name__ == "__main__":
     test_tvm.testing.check_numerical_grads()
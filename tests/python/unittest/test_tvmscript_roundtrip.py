@@ -2662,6 +2662,47 @@ def test_opt_conv_tensorcore_mod_host():
     tvm.ir.assert_structural_equal(mod, rt_mod, True)
 
 
+def test_parse_cache(tmpdir):
+    from tvm.script.parse_cache import ParseCache, parse_cache
+
+    script = tvm.script.asscript(opt_conv_tensorcore_mod_host, True)
+    parse_cache.clear()
+    func = tvm.script.from_source(script)
+    assert tvm.script.from_source(script).same_as(func)
+    assert parse_cache.hits == 1 and parse_cache.misses == 1
+
+    # a cache with only a directory loads the scripts saved by another process
+    disk_cache = ParseCache(0, str(tmpdir))
+    key = disk_cache.key("<string input>", 0, script)
+    assert disk_cache.get(key) is None
+    disk_cache.put(key, func)
+    assert len(disk_cache) == 0 and len(tmpdir.listdir()) == 1
+    tvm.ir.assert_structural_equal(ParseCache(0, str(tmpdir)).get(key), func, True)
+    assert disk_cache.key("<string input>", 1, script) != key
+
+    # every caller gets a module of its own
+    script = tvm.script.asscript(Module1(), True)
+    mod = tvm.script.from_source(script)
+    mod["extra"] = mod["mmult"]
+    assert "extra" not in [
+        var.name_hint for var in tvm.script.from_source(script).get_global_vars()
+    ]
+
+
+def test_parse_profile():
+    from tvm.script.parse_cache import parse_cache
+
+    script = tvm.script.asscript(Module1(), True)
+    parse_cache.clear()
+    profile = tvm.script.ParseProfile()
+    rt_mod = tvm.script.from_source(script, profile=profile)
+    tvm.ir.assert_structural_equal(Module1(), rt_mod, True)
+    for phase in ["synr", "transform_Module", "transform_For", "cache_lookup", "cache_store"]:
+        assert phase in profile.timings
+    assert profile.timings["transform_Module"][0] == 1
+    assert profile.total > 0 and "transform_For" in str(profile)
+
+
 if __name__ == "__main__":
     test_opt_gemm_normalize()
     test_opt_gemm_mod_host()
@@ -2669,3 +2710,4 @@ if __name__ == "__main__":
     test_opt_conv_tensorcore_normalize()
     test_opt_conv_tensorcore_lower()
     test_opt_conv_tensorcore_mod_host()
+    test_parse_profile()
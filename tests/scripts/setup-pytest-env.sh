@@ -24,6 +24,10 @@ if [[ ! -z $CI_PYTEST_ADD_OPTIONS ]]; then
 else
     export PYTEST_ADDOPTS="-v $PYTEST_ADDOPTS"
 fi
+# run the tests in parallel, sharing the kernels they build
+if [[ ! -z $TVM_PYTEST_WORKERS ]]; then
+    export PYTEST_ADDOPTS="-n $TVM_PYTEST_WORKERS --build-cache $PYTEST_ADDOPTS"
+fi
 set -u
 
 export TVM_PATH=`pwd`